@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+Perfiles de contexto por aplicación.
+
+Cada aplicación activa tiene su propio buffer de palabra y ventana de
+contexto, de modo que lo escrito en una terminal no contamina el contexto de
+un cliente de correo. El número de perfiles vivos está acotado (LRU), cada
+perfil puede usar su propio espacio de nombres en la caché de correcciones y
+la corrección puede desactivarse para aplicaciones concretas.
+
+La aplicación activa se consulta como mucho una vez por intervalo, ya que la
+consulta al sistema cuesta bastante más que procesar una pulsación.
+"""
+
+import platform
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, Optional
+from interfaces import ITextBuffer
+from logger_manager import logger
+
+# Perfil usado cuando no se puede saber la aplicación activa
+DEFAULT_APP = "default"
+
+def _probe_macos() -> Optional[str]:
+    from AppKit import NSWorkspace
+    app = NSWorkspace.sharedWorkspace().frontmostApplication()
+    return app.localizedName() if app else None
+
+def _probe_windows() -> Optional[str]:
+    import ctypes
+    import psutil
+    user32 = ctypes.windll.user32
+    hwnd = user32.GetForegroundWindow()
+    if not hwnd:
+        return None
+    pid = ctypes.c_ulong()
+    user32.GetWindowThreadProcessId(hwnd, ctypes.byref(pid))
+    return psutil.Process(pid.value).name()
+
+def detect_probe() -> Optional[Callable[[], Optional[str]]]:
+    """
+    Elige la función que consulta la aplicación activa en esta plataforma.
+
+    Returns:
+        Optional[Callable]: Función sin argumentos que devuelve el nombre de
+        la aplicación, o None si la plataforma no está soportada
+    """
+    system = platform.system().lower()
+    if system == "darwin":  # macOS
+        try:
+            import AppKit  # noqa: F401
+            return _probe_macos
+        except ImportError:
+            return None
+    if system == "windows":
+        try:
+            import psutil  # noqa: F401
+            return _probe_windows
+        except ImportError:
+            return None
+    return None  # Linux y otros: un único perfil
+
+class ActiveAppTracker:
+    """Consulta limitada de la aplicación activa."""
+
+    def __init__(
+        self,
+        probe: Optional[Callable[[], Optional[str]]] = None,
+        interval: float = 0.25
+    ):
+        """
+        Inicializa el consultor.
+
+        Args:
+            probe: Función que devuelve la aplicación activa (None = siempre
+                DEFAULT_APP)
+            interval: Tiempo mínimo (s) entre consultas al sistema
+        """
+        self.probe = probe
+        self.interval = interval
+        self.app = DEFAULT_APP
+        self.probes = 0
+        self._checked_at = float("-inf")
+
+    def current(self, now: Optional[float] = None) -> str:
+        """
+        Obtiene la aplicación activa, consultando al sistema si toca.
+
+        Args:
+            now: Momento actual (time.perf_counter)
+
+        Returns:
+            str: Nombre de la aplicación activa
+        """
+        if self.probe is None:
+            return self.app
+        now = time.perf_counter() if now is None else now
+        if now - self._checked_at >= self.interval:
+            self._checked_at = now
+            self.probes += 1
+            try:
+                self.app = self.probe() or DEFAULT_APP
+            except Exception as e:
+                logger.debug(f"No se pudo consultar la aplicación activa: {e}")
+        return self.app
+
+@dataclass
+class AppProfile:
+    """Estado de corrección de una aplicación."""
+    app: str
+    buffer: ITextBuffer
+    enabled: bool = True
+    namespace: str = ""  # Espacio de nombres en la caché ("" = compartido)
+
+class ProfileManager:
+    """
+    Perfiles por aplicación con límite LRU.
+
+    Características:
+    - Un buffer y una ventana de contexto por aplicación
+    - Expulsión del perfil usado hace más tiempo
+    - Espacio de nombres de caché opcional por perfil
+    - Lista de aplicaciones con la corrección desactivada
+    """
+
+    def __init__(
+        self,
+        buffer_factory: Callable[[], ITextBuffer],
+        max_profiles: int = 8,
+        disabled_apps: Iterable[str] = (),
+        separate_caches: bool = False,
+        tracker: Optional[ActiveAppTracker] = None
+    ):
+        """
+        Inicializa los perfiles.
+
+        Args:
+            buffer_factory: Crea el buffer de un perfil nuevo
+            max_profiles: Máximo de perfiles vivos
+            disabled_apps: Aplicaciones sin corrección (sin distinguir mayúsculas)
+            separate_caches: Dar a cada perfil su propio espacio de nombres
+                en la caché de correcciones
+            tracker: Consultor de la aplicación activa
+        """
+        self.buffer_factory = buffer_factory
+        self.max_profiles = max(1, max_profiles)
+        self.disabled_apps = {app.lower() for app in disabled_apps}
+        self.separate_caches = separate_caches
+        self.tracker = tracker or ActiveAppTracker(detect_probe())
+        self.profiles: "OrderedDict[str, AppProfile]" = OrderedDict()
+        self.active: Optional[str] = None
+        self.switches = 0
+        self.evicted = 0
+
+    @classmethod
+    def from_config(
+        cls,
+        config: Optional[Dict],
+        buffer_factory: Callable[[], ITextBuffer]
+    ) -> "ProfileManager":
+        """
+        Crea los perfiles a partir de la sección "app_profiles" de la configuración.
+
+        Args:
+            config: Configuración del usuario (puede ser None)
+            buffer_factory: Crea el buffer de un perfil nuevo
+
+        Returns:
+            ProfileManager: Perfiles configurados
+        """
+        section = (config or {}).get('app_profiles', {})
+        return cls(
+            buffer_factory,
+            max_profiles=section.get('max_profiles', 8),
+            disabled_apps=section.get('disabled_apps', ()),
+            separate_caches=section.get('separate_caches', False)
+        )
+
+    def __len__(self) -> int:
+        return len(self.profiles)
+
+    def get(self, app: str) -> AppProfile:
+        """
+        Obtiene (o crea) el perfil de una aplicación y lo marca como reciente.
+
+        Args:
+            app: Nombre de la aplicación
+
+        Returns:
+            AppProfile: Perfil de la aplicación
+        """
+        profile = self.profiles.get(app)
+        if profile is not None:
+            self.profiles.move_to_end(app)
+            return profile
+
+        profile = self._new_profile(app, self.buffer_factory())
+        if len(self.profiles) > self.max_profiles:
+            evicted, _ = self.profiles.popitem(last=False)
+            self.evicted += 1
+            logger.debug(f"Perfil expulsado: {evicted}")
+        return profile
+
+    def adopt(self, app: str, buffer: ITextBuffer) -> AppProfile:
+        """Registra un buffer ya existente como perfil de la aplicación activa."""
+        self.profiles.pop(app, None)
+        self.active = app
+        return self._new_profile(app, buffer)
+
+    def _new_profile(self, app: str, buffer: ITextBuffer) -> AppProfile:
+        profile = AppProfile(
+            app,
+            buffer,
+            enabled=app.lower() not in self.disabled_apps,
+            namespace=app if self.separate_caches else ""
+        )
+        self.profiles[app] = profile
+        return profile
+
+    def set_enabled(self, app: str, enabled: bool):
+        """
+        Activa o desactiva la corrección para una aplicación.
+
+        Args:
+            app: Nombre de la aplicación
+            enabled: Si se debe corregir
+        """
+        if enabled:
+            self.disabled_apps.discard(app.lower())
+        else:
+            self.disabled_apps.add(app.lower())
+        if app in self.profiles:
+            self.profiles[app].enabled = enabled
+
+    def current(self, now: Optional[float] = None) -> AppProfile:
+        """
+        Perfil de la aplicación activa.
+
+        Args:
+            now: Momento actual (time.perf_counter)
+
+        Returns:
+            AppProfile: Perfil de la aplicación activa
+        """
+        app = self.tracker.current(now)
+        if app != self.active:
+            self.active = app
+            self.switches += 1
+        return self.get(app)
+
+    def get_stats(self) -> Dict[str, int]:
+        """Obtiene estadísticas de los perfiles."""
+        return {
+            'profiles': len(self.profiles),
+            'switches': self.switches,
+            'evicted': self.evicted,
+            'probes': self.tracker.probes
+        }
@@ -5,12 +5,13 @@ Implementa una cola de prioridad y procesamiento asíncrono.
 """
 
 import asyncio
+from contextlib import nullcontext
 from typing import Dict, List, Tuple, Optional, Any, Callable
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 import time
 from datetime import datetime
 import heapq
-from threading import Lock
+from threading import Lock, Thread
 from logger_manager import logger
 from interfaces import ICorrector
 
@@ -23,6 +24,11 @@ class CorrectionTask:
     context: str
     callback: Callable[[str, bool], None]
     batch_id: int = 0
+    cancelled: bool = field(default=False, compare=False)
+    # Palabras de una frase completa (modo frase); vacío para tareas de palabra
+    words: Tuple[str, ...] = field(default=(), compare=False)
+    # Espacio de nombres de caché del perfil de aplicación ("" = compartido)
+    namespace: str = field(default="", compare=False)
     
     def __post_init__(self):
         """Inicialización posterior para garantizar unicidad."""
@@ -47,9 +53,22 @@ class BatchProcessor:
         corrector: ICorrector,
         batch_size: int = 10,
         max_delay: float = 0.5,
-        min_batch_items: int = 3
+        min_batch_items: int = 3,
+        scorer: Optional[Any] = None
     ):
+        """
+        Inicializa el procesador.
+
+        Args:
+            corrector: Corrector para las palabras no resueltas localmente
+            batch_size: Tamaño máximo de lote
+            max_delay: Espera máxima antes de procesar un lote incompleto
+            min_batch_items: Mínimo de tareas para cerrar un lote
+            scorer: Ordenador local opcional (BatchScorer) que resuelve en una
+                sola pasada las palabras del lote con candidatos claros
+        """
         self.corrector = corrector
+        self.scorer = scorer
         self.batch_size = batch_size
         self.max_delay = max_delay
         self.min_batch_items = min_batch_items
@@ -60,6 +79,8 @@ class BatchProcessor:
         
         # Iniciar procesador asíncrono
         self.loop = asyncio.new_event_loop()
+        self.loop_thread = Thread(target=self.loop.run_forever, daemon=True)
+        self.loop_thread.start()
         self.running = True
         self.processor_task = asyncio.run_coroutine_threadsafe(
             self._process_batches(),
@@ -73,8 +94,9 @@ class BatchProcessor:
         word: str,
         context: str,
         callback: Callable[[str, bool], None],
-        priority: int = 1
-    ):
+        priority: int = 1,
+        namespace: str = ""
+    ) -> CorrectionTask:
         """
         Añade una tarea de corrección a la cola.
         
@@ -82,7 +104,12 @@ class BatchProcessor:
             word: Palabra a corregir
             context: Contexto de la palabra
             callback: Función a llamar con el resultado
-            priority: Prioridad (1-5, mayor número = mayor prioridad)
+            priority: Prioridad (1-5, mayor número = mayor prioridad;
+                0 para tareas especulativas)
+            namespace: Espacio de nombres de caché del perfil de aplicación
+            
+        Returns:
+            CorrectionTask: Tarea encolada (para poder cancelarla)
         """
         with self.batch_lock:
             task = CorrectionTask(
@@ -90,10 +117,55 @@ class BatchProcessor:
                 time.time(),
                 word,
                 context,
-                callback
+                callback,
+                namespace=namespace
             )
             heapq.heappush(self.tasks, task)
             logger.debug(f"Tarea añadida: {word} (prioridad: {priority})")
+        return task
+    
+    def add_sentence(
+        self,
+        words: List[str],
+        callback: Callable[[List[Tuple[str, bool]]], None],
+        priority: int = 1,
+        namespace: str = ""
+    ) -> CorrectionTask:
+        """
+        Añade una frase completa para corregirla en una sola llamada.
+
+        Args:
+            words: Palabras de la frase
+            callback: Función a llamar con la lista de (corrección, si fue
+                corregida), una por palabra
+            priority: Prioridad, como en add_task
+            namespace: Espacio de nombres de caché, como en add_task
+
+        Returns:
+            CorrectionTask: Tarea encolada
+        """
+        with self.batch_lock:
+            task = CorrectionTask(
+                -priority,
+                time.time(),
+                " ".join(words),
+                "",
+                callback,
+                words=tuple(words),
+                namespace=namespace
+            )
+            heapq.heappush(self.tasks, task)
+            logger.debug(f"Frase añadida: {len(words)} palabras (prioridad: {priority})")
+        return task
+
+    def cancel_task(self, task: CorrectionTask):
+        """
+        Cancela una tarea pendiente.
+        
+        La tarea se marca y se descarta al formar el siguiente lote, sin
+        reordenar la cola. Si ya está en proceso, su callback se llama igual.
+        """
+        task.cancelled = True
     
     async def _process_batches(self):
         """Procesa las tareas en lotes de forma asíncrona."""
@@ -122,6 +194,8 @@ class BatchProcessor:
             batch = []
             while self.tasks and len(batch) < self.batch_size:
                 task = heapq.heappop(self.tasks)
+                if task.cancelled:
+                    continue
                 task.batch_id = batch_id
                 batch.append(task)
                 
@@ -135,6 +209,25 @@ class BatchProcessor:
     async def _process_batch(self, batch: List[CorrectionTask]):
         """Procesa un lote de tareas."""
         try:
+            # Las frases se corrigen enteras, con una llamada cada una
+            sentences = [t for t in batch if t.words]
+            if sentences:
+                batch = [t for t in batch if not t.words]
+                for task in sentences:
+                    results = await self._correct_sentence(task)
+                    try:
+                        task.callback(results)
+                    except Exception as e:
+                        logger.error(f"Error en callback: {e}")
+                if not batch:
+                    return
+
+            # Resolver localmente las palabras con candidatos claros
+            if self.scorer is not None:
+                batch = self._score_locally(batch)
+                if not batch:
+                    return
+
             # Agrupar tareas por contexto similar
             context_groups = self._group_by_context(batch)
             
@@ -154,16 +247,40 @@ class BatchProcessor:
         except Exception as e:
             logger.error(f"Error procesando lote {batch[0].batch_id}: {e}")
     
+    def _score_locally(self, batch: List[CorrectionTask]) -> List[CorrectionTask]:
+        """
+        Puntúa el lote completo con el ordenador local.
+
+        Returns:
+            List[CorrectionTask]: Tareas que siguen necesitando el corrector
+        """
+        try:
+            corrections = self.scorer.rank_batch([(t.word, t.context) for t in batch])
+        except Exception as e:
+            logger.error(f"Error en puntuación local: {e}")
+            return batch
+
+        pending = []
+        for task, correction in zip(batch, corrections):
+            if correction is None:
+                pending.append(task)
+                continue
+            try:
+                task.callback(correction, True)
+            except Exception as e:
+                logger.error(f"Error en callback: {e}")
+        return pending
+
     def _group_by_context(
         self,
         batch: List[CorrectionTask]
-    ) -> Dict[str, List[CorrectionTask]]:
-        """Agrupa tareas con contexto similar."""
-        groups: Dict[str, List[CorrectionTask]] = {}
+    ) -> Dict[Tuple[str, str], List[CorrectionTask]]:
+        """Agrupa tareas con contexto similar (y el mismo espacio de nombres)."""
+        groups: Dict[Tuple[str, str], List[CorrectionTask]] = {}
         
         for task in batch:
             # Usar primeras 3 palabras como clave de contexto
-            context_key = " ".join(task.context.split()[:3])
+            context_key = (task.namespace, " ".join(task.context.split()[:3]))
             if context_key not in groups:
                 groups[context_key] = []
             groups[context_key].append(task)
@@ -182,12 +299,13 @@ class BatchProcessor:
             
             # Realizar corrección
             corrections = []
-            for word in words:
-                correction, was_corrected = self.corrector.correct_text(
-                    word,
-                    combined_context
-                )
-                corrections.append((correction, was_corrected))
+            with self._namespace(tasks[0].namespace):
+                for word in words:
+                    correction, was_corrected = self.corrector.correct_text(
+                        word,
+                        combined_context
+                    )
+                    corrections.append((correction, was_corrected))
             
             return corrections
             
@@ -196,20 +314,46 @@ class BatchProcessor:
             # Devolver palabras originales en caso de error
             return [(t.word, False) for t in tasks]
     
+    async def _correct_sentence(self, task: CorrectionTask) -> List[Tuple[str, bool]]:
+        """Corrige una frase; sin soporte del corrector, palabra a palabra."""
+        words = list(task.words)
+        try:
+            with self._namespace(task.namespace):
+                correct_sentence = getattr(self.corrector, 'correct_sentence', None)
+                if correct_sentence is not None:
+                    return correct_sentence(words)
+                return [self.corrector.correct_text(word, task.word) for word in words]
+        except Exception as e:
+            logger.error(f"Error en corrección de frase: {e}")
+            return [(word, False) for word in words]
+
+    def _namespace(self, namespace: str):
+        """Espacio de nombres de caché del corrector, si lo admite."""
+        scope = getattr(self.corrector, 'cache_namespace', None)
+        if namespace and scope is not None:
+            return scope(namespace)
+        return nullcontext()
+
     def stop(self):
         """Detiene el procesador de lotes."""
         self.running = False
+        try:
+            self.processor_task.result(timeout=self.max_delay + 1)
+        except Exception:
+            self.processor_task.cancel()
+
         # Procesar tareas restantes
         with self.batch_lock:
             remaining = len(self.tasks)
-            if remaining > 0:
-                logger.info(f"Procesando {remaining} tareas pendientes...")
-                batch = self._create_batch()
-                if batch:
-                    asyncio.run_coroutine_threadsafe(
-                        self._process_batch(batch),
-                        self.loop
-                    ).result()
+        if remaining > 0:
+            logger.info(f"Procesando {remaining} tareas pendientes...")
+            batch = self._create_batch()
+            if batch:
+                asyncio.run_coroutine_threadsafe(
+                    self._process_batch(batch),
+                    self.loop
+                ).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
         logger.info("BatchProcessor detenido")
     
     def get_stats(self) -> Dict[str, Any]:
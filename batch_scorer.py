@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+Puntuación vectorizada de candidatos para corrección por lotes.
+Empaqueta los rasgos de todos los candidatos de un lote (frecuencia, coste de
+edición, coincidencia fonética y puntuación de n-gramas) en arrays de NumPy y
+elige el mejor candidato de cada palabra en una sola pasada.
+"""
+
+import math
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import List, Optional, Sequence, Tuple
+import numpy as np
+from correction_rules import RULES, apply_case
+from phonetic_index import Candidate, PhoneticIndex, get_default_index
+from ngram_model import (
+    NgramModel,
+    ORDER,
+    LOG_FLOOR,
+    BACKOFF,
+    SENTENCE_START,
+    get_default_model,
+    ngram_hash,
+    tokenize
+)
+from logger_manager import logger
+
+@dataclass
+class ScoringWeights:
+    """Pesos de la combinación lineal de rasgos."""
+    frequency: float = 0.5
+    edit_cost: float = 1.0
+    phonetic: float = 2.0
+    ngram: float = 1.0
+    # Confianza mínima (sin contar n-gramas) para aceptar una corrección
+    min_score: float = -1.0
+
+@dataclass
+class CandidateBatch:
+    """Candidatos de un lote en formato columnar."""
+    words: List[str]
+    histories: List[List[str]]
+    owners: List[int] = field(default_factory=list)
+    candidates: List[str] = field(default_factory=list)
+    log_frequency: List[float] = field(default_factory=list)
+    edit_cost: List[int] = field(default_factory=list)
+    phonetic: List[bool] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.candidates)
+
+def _history(word: str, context: str) -> List[str]:
+    """Extrae las palabras anteriores a la palabra a corregir."""
+    history = tokenize(context) if context else []
+    if history and history[-1] == word.lower():
+        history = history[:-1]
+    return history[-(ORDER - 1):] or [SENTENCE_START]
+
+class BatchScorer:
+    """
+    Ordenador de candidatos por lotes.
+
+    Características:
+    - Generación de candidatos con caché por palabra
+    - Rasgos empaquetados en arrays de NumPy
+    - Búsqueda de n-gramas vectorizada con searchsorted
+    - Selección del mejor candidato por palabra sin bucles de Python
+    """
+
+    def __init__(
+        self,
+        index: Optional[PhoneticIndex] = None,
+        model: Optional[NgramModel] = None,
+        weights: Optional[ScoringWeights] = None,
+        max_candidates: int = 8,
+        cache_size: int = 10000
+    ):
+        """
+        Inicializa el ordenador.
+
+        Args:
+            index: Índice de candidatos (por defecto, el índice compartido)
+            model: Modelo de n-gramas (por defecto, el instalado si existe)
+            weights: Pesos de los rasgos
+            max_candidates: Candidatos máximos por palabra
+            cache_size: Palabras cuyos candidatos se guardan en caché
+        """
+        self.index = index or get_default_index()
+        self.model = model if model is not None else get_default_model()
+        self.weights = weights or ScoringWeights()
+        self.max_candidates = max_candidates
+        self.cache_size = cache_size
+        self._candidate_cache: "OrderedDict[str, List[Candidate]]" = OrderedDict()
+
+        if self.model is not None:
+            self._tables = [
+                (np.frombuffer(keys, dtype=np.uint64), np.frombuffer(values, dtype=np.uint8))
+                for keys, values in self.model.tables
+            ]
+
+    def _candidates(self, word: str) -> List[Candidate]:
+        """Obtiene los candidatos de una palabra desconocida, con caché."""
+        word = word.lower()
+        cached = self._candidate_cache.get(word)
+        if cached is not None:
+            self._candidate_cache.move_to_end(word)
+            return cached
+
+        if word in self.index or not word.isalpha():
+            candidates = []
+        elif self.index.complete:
+            candidates = self.index.candidates(word)[:self.max_candidates]
+        else:
+            candidates = self._rule_candidates(word)
+
+        self._candidate_cache[word] = candidates
+        if len(self._candidate_cache) > self.cache_size:
+            self._candidate_cache.popitem(last=False)
+        return candidates
+
+    def _rule_candidates(self, word: str) -> List[Candidate]:
+        """
+        Candidatos de una falta conocida por las reglas.
+
+        Con un léxico incompleto, una palabra ausente no es necesariamente
+        una falta: solo se puntúan la corrección de la regla y sus homófonos
+        ("ai" → "hay"/"ahí"), y el resto va al proveedor.
+        """
+        correction = RULES.lookup(word)
+        if correction is None:
+            return []
+        correction = correction.lower()
+        homophones = self.index.lookup(correction)
+        words = homophones if correction in homophones else [correction]
+        floor = 1.0 / (len(self.index) + 1)
+        return [
+            Candidate(w, self.index.frequencies.get(w, floor), 0, True)
+            for w in words[:self.max_candidates]
+        ]
+
+    def collect(self, items: Sequence[Tuple[str, str]]) -> CandidateBatch:
+        """
+        Reúne los candidatos de un lote en formato columnar.
+
+        Args:
+            items: Pares (palabra, contexto)
+
+        Returns:
+            CandidateBatch: Candidatos y rasgos del lote
+        """
+        batch = CandidateBatch(
+            words=[word for word, _ in items],
+            histories=[_history(word, context) for word, context in items]
+        )
+        for owner, (word, _) in enumerate(items):
+            for candidate in self._candidates(word):
+                batch.owners.append(owner)
+                batch.candidates.append(candidate.word)
+                batch.log_frequency.append(math.log10(candidate.frequency))
+                batch.edit_cost.append(candidate.edit_distance)
+                batch.phonetic.append(candidate.phonetic_match)
+        return batch
+
+    def _ngram_scores(self, batch: CandidateBatch, owners: np.ndarray) -> np.ndarray:
+        """Calcula la puntuación de n-gramas de todos los candidatos a la vez."""
+        if self.model is None or not len(batch):
+            return np.zeros(len(batch))
+
+        # Orden máximo utilizable según la longitud del historial de cada palabra
+        max_order = np.fromiter(
+            (len(h) + 1 for h in batch.histories),
+            dtype=np.int64,
+            count=len(batch.histories)
+        )[owners]
+        scores = LOG_FLOOR + BACKOFF * max_order.astype(np.float64)
+        resolved = np.zeros(len(batch), dtype=bool)
+        owner_list = owners.tolist()
+
+        for order in range(ORDER, 0, -1):
+            keys, values = self._tables[order - 1]
+            if not len(keys):
+                continue
+            hashes = np.fromiter(
+                (
+                    ngram_hash(" ".join(batch.histories[o][len(batch.histories[o]) - order + 1:] + [c]))
+                    for o, c in zip(owner_list, batch.candidates)
+                ),
+                dtype=np.uint64,
+                count=len(batch)
+            )
+            pos = np.minimum(np.searchsorted(keys, hashes), len(keys) - 1)
+            found = (keys[pos] == hashes) & (max_order >= order) & ~resolved
+            penalty = BACKOFF * (max_order[found] - order)
+            scores[found] = values[pos[found]] * (LOG_FLOOR / 255) + penalty
+            resolved |= found
+        return scores
+
+    def score(self, batch: CandidateBatch) -> List[Optional[str]]:
+        """
+        Elige el mejor candidato de cada palabra del lote.
+
+        Args:
+            batch: Candidatos reunidos con collect()
+
+        Returns:
+            List[Optional[str]]: Corrección por palabra, o None si no hay
+            candidato con puntuación suficiente
+        """
+        result: List[Optional[str]] = [None] * len(batch.words)
+        if not len(batch):
+            return result
+
+        w = self.weights
+        owners = np.asarray(batch.owners, dtype=np.int64)
+        # El contexto solo ordena; la confianza depende de la palabra en sí
+        confidence = (
+            w.frequency * np.asarray(batch.log_frequency)
+            - w.edit_cost * np.asarray(batch.edit_cost, dtype=np.float64)
+            + w.phonetic * np.asarray(batch.phonetic, dtype=np.float64)
+        )
+        scores = confidence + w.ngram * self._ngram_scores(batch, owners)
+
+        # Ordenar por (palabra, -puntuación) y quedarse con el primero de cada palabra
+        order = np.lexsort((-scores, owners))
+        first = np.unique(owners[order], return_index=True)[1]
+        best = order[first]
+        accepted = best[confidence[best] >= w.min_score]
+
+        for i in accepted.tolist():
+            result[batch.owners[i]] = batch.candidates[i]
+        return result
+
+    def score_python(self, batch: CandidateBatch) -> List[Optional[str]]:
+        """
+        Implementación de referencia en Python puro de score().
+        Se usa para validar y comparar el rendimiento.
+        """
+        w = self.weights
+        best: List[Tuple[float, float, Optional[str]]] = (
+            [(-math.inf, -math.inf, None)] * len(batch.words)
+        )
+        for i, owner in enumerate(batch.owners):
+            ngram = 0.0
+            if self.model is not None:
+                ngram = self.model.score(batch.candidates[i], batch.histories[owner])
+            confidence = (
+                w.frequency * batch.log_frequency[i]
+                - w.edit_cost * batch.edit_cost[i]
+                + w.phonetic * batch.phonetic[i]
+            )
+            score = confidence + w.ngram * ngram
+            if score > best[owner][0]:
+                best[owner] = (score, confidence, batch.candidates[i])
+        return [
+            word if confidence >= w.min_score else None
+            for _, confidence, word in best
+        ]
+
+    def rank_batch(self, items: Sequence[Tuple[str, str]]) -> List[Optional[str]]:
+        """
+        Corrige localmente un lote completo.
+
+        Args:
+            items: Pares (palabra, contexto)
+
+        Returns:
+            List[Optional[str]]: Corrección por palabra (con las mayúsculas del
+            original) o None si la palabra debe ir al proveedor
+        """
+        corrections = self.score(self.collect(items))
+        for i, correction in enumerate(corrections):
+            word = items[i][0]
+            if correction:
+                corrections[i] = apply_case(word, correction)
+        logger.debug(
+            f"Lote puntuado localmente: "
+            f"{sum(c is not None for c in corrections)}/{len(items)} resueltas"
+        )
+        return corrections
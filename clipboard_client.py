@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Cliente opcional de portapapeles para la API de corrección.
+
+Copia el texto seleccionado (Cmd+C), lo envía al demonio de corrección
+(correction_daemon.py) o, si no está en marcha, a la API HTTP local
+(correction_handler.py), y pega la corrección en su lugar, restaurando
+después el portapapeles original. Pensado para lanzarlo con un atajo de
+teclado (ver karabiner.json).
+"""
+
+import argparse
+import os
+import time
+import pyperclip
+import requests
+from pynput.keyboard import Controller, Key
+from correction_daemon import connect
+
+DEFAULT_URL = "http://127.0.0.1:8000/correct"
+
+keyboard = Controller()
+
+def notify(message):
+    os.system(f"""
+        osascript -e 'display notification "{message}" with title "Dyslexia Helper"'
+    """)
+
+def get_selected_text():
+    # Guardar el contenido actual del portapapeles
+    original_clipboard = pyperclip.paste()
+    
+    # Copiar texto seleccionado
+    keyboard.press(Key.cmd)
+    keyboard.press('c')
+    keyboard.release('c')
+    keyboard.release(Key.cmd)
+    time.sleep(0.2)  # Aumentamos el tiempo de espera
+    
+    selected_text = pyperclip.paste()
+    
+    # Restaurar el portapapeles original
+    time.sleep(0.1)
+    pyperclip.copy(original_clipboard)
+    
+    return selected_text
+
+def paste_corrected_text(corrected_text):
+    if not corrected_text:
+        return
+        
+    # Guardar el contenido actual del portapapeles
+    original_clipboard = pyperclip.paste()
+    
+    # Copiar el texto corregido al portapapeles
+    pyperclip.copy(corrected_text)
+    time.sleep(0.1)
+    
+    # Pegar el texto corregido
+    keyboard.press(Key.cmd)
+    keyboard.press('v')
+    keyboard.release('v')
+    keyboard.release(Key.cmd)
+    
+    # Restaurar el portapapeles original
+    time.sleep(0.2)
+    pyperclip.copy(original_clipboard)
+
+def main():
+    parser = argparse.ArgumentParser(description="Corrige el texto seleccionado")
+    parser.add_argument("--url", default=DEFAULT_URL, help="Endpoint /correct de la API")
+    args = parser.parse_args()
+
+    try:
+        text = get_selected_text()
+        if not text:
+            notify("No text selected!")
+            return
+
+        client = connect()
+        if client is not None:
+            try:
+                corrected_text = client.correct(text)
+            finally:
+                client.close()
+        else:
+            response = requests.post(args.url, json={"text": text}, timeout=15)
+            response.raise_for_status()
+            corrected_text = response.json()["corrected"]
+
+        if corrected_text != text:
+            paste_corrected_text(corrected_text)
+        notify(f"Original: {text}\nCorregido: {corrected_text}")
+
+    except Exception as e:
+        notify(f"Error: {str(e)}")
+
+if __name__ == "__main__":
+    main()
@@ -25,7 +25,7 @@ class ConfigWindow(QMainWindow):
         service_layout = QHBoxLayout()
         service_label = QLabel("Servicio de IA:")
         self.service_selector = QComboBox()
-        self.service_selector.addItems(["OpenAI", "Anthropic", "Mixtral"])
+        self.service_selector.addItems(["OpenAI", "Anthropic", "Mixtral", "Local"])
         service_layout.addWidget(service_label)
         service_layout.addWidget(self.service_selector)
         layout.addLayout(service_layout)
@@ -0,0 +1,550 @@
+#!/usr/bin/env python3
+"""
+Corrección por lotes de documentos y corpus.
+
+Recorre archivos de texto o directorios completos y los corrige por etapas:
+
+1. Lectura en bloques sobre el archivo mapeado en memoria (mmap_reader),
+   sin cargarlo ni copiarlo
+2. Segmentación en frases, conservando los separadores
+3. Eliminación de frases repetidas (caché por hash de frases ya corregidas)
+4. Corrección local (filtro de tokens, reglas, índice fonético y n-gramas)
+   repartida en un pool de procesos, porque es trabajo de CPU
+5. Solo las frases con palabras que la corrección local no resuelve van al
+   proveedor configurado (--provider), en llamadas de frase en paralelo
+6. Escritura en flujo, en orden, con un punto de control reanudable; las
+   frases sin cambios se copian del mapa sin decodificarse
+
+Los procesos del pool mapean el mismo archivo y reciben solo rangos de
+bytes, y las páginas ya escritas se liberan, así que la memoria residente no
+depende del tamaño de la entrada.
+
+Uso:
+    python corpus_corrector.py documentos/ -o corregidos/ --workers 4
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from mmap_reader import MappedFile, iter_segments
+from logger_manager import logger
+
+# Bytes de entrada por bloque (se corta en un párrafo, línea o frase)
+CHUNK_BYTES = 1 << 20
+
+# Frases por tarea enviada al pool de procesos
+SENTENCES_PER_TASK = 512
+
+# Frases corregidas que se recuerdan para no repetir trabajo
+DEDUPE_CACHE_SIZE = 100_000
+
+# Extensiones que se procesan al recorrer un directorio
+TEXT_EXTENSIONS = (".txt", ".md", ".log", ".csv")
+
+# Sufijo del archivo de salida junto al de entrada
+OUTPUT_SUFFIX = ".corrected"
+
+_TOKEN_RE = re.compile(r"\S+")
+_EDGE_PUNCT = "\"'«»“”‘’.,;:!?¡¿()[]"
+
+STAGES = ("lectura", "segmentación", "local", "proveedor", "escritura")
+
+def correct_tokens(
+    sentence: str,
+    decide: Callable[[str, str], Optional[Tuple[str, bool]]],
+    token_filter: Any
+) -> Tuple[str, List[str], int]:
+    """
+    Corrige las palabras de una frase conservando espacios y puntuación.
+
+    Args:
+        sentence: Frase a corregir
+        decide: Función (palabra, frase) → (corrección, si cambió), o None si
+            no sabe decidir
+        token_filter: Filtro de tokens elegibles
+
+    Returns:
+        Tuple[str, List[str], int]: Frase corregida, palabras sin decidir y
+        número de palabras elegibles
+    """
+    parts, unresolved = [], []
+    position = eligible = 0
+    for match in _TOKEN_RE.finditer(sentence):
+        token = match.group(0)
+        core = token.strip(_EDGE_PUNCT)
+        if not core or not token_filter.is_eligible(token):
+            continue
+        eligible += 1
+        result = decide(core, sentence)
+        if result is None:
+            unresolved.append(core)
+            continue
+        correction, changed = result
+        if changed and correction != core:
+            core_start = match.start() + token.find(core)
+            parts.append(sentence[position:core_start])
+            parts.append(correction)
+            position = core_start + len(core)
+    parts.append(sentence[position:])
+    return "".join(parts), unresolved, eligible
+
+def local_decider() -> Callable[[str, str], Optional[Tuple[str, bool]]]:
+    """
+    Corrección local de una palabra: solo reglas y léxico.
+
+    Una palabra ausente del léxico no se considera una falta (el léxico no
+    cubre el idioma): queda sin resolver y la decide el proveedor o, sin
+    él, se deja como está.
+
+    Returns:
+        Callable: Función (palabra, contexto) → (corrección, si cambió) o
+        None si la palabra es desconocida y no hay corrección local
+    """
+    from correction_rules import RULES
+    from phonetic_index import get_default_index
+    from text_corrector import fallback_correction
+
+    index = get_default_index()
+
+    def decide(word: str, context: str) -> Optional[Tuple[str, bool]]:
+        if RULES.lookup(word) is not None:
+            # Falta conocida; el fallback resuelve homófonos con el contexto
+            correction, changed = fallback_correction(word, context)
+            return correction, changed
+        if word.lower() in index:
+            return word, False  # Palabra conocida
+        return None
+
+    return decide
+
+# Estado de cada proceso del pool
+_worker: Dict[str, Any] = {}
+
+def _init_worker():
+    """Carga léxicos, reglas e índice una sola vez por proceso."""
+    if _worker:
+        return
+    from token_filter import get_default_filter
+
+    _worker['decide'] = local_decider()
+    _worker['filter'] = get_default_filter()
+
+def _worker_map(path: str) -> MappedFile:
+    """Mapa del archivo en curso en este proceso (se reutiliza entre tareas)."""
+    mapped = _worker.get('map')
+    if mapped is None or mapped.path != path:
+        if mapped is not None:
+            mapped.close()
+        mapped = _worker['map'] = MappedFile(path)
+    return mapped
+
+def correct_ranges(
+    path: str,
+    ranges: List[Tuple[int, int]]
+) -> Tuple[List[Tuple[Optional[str], bool, int]], int, float]:
+    """
+    Etapa local (se ejecuta en el pool de procesos).
+
+    Args:
+        path: Archivo de entrada (el proceso lo mapea por su cuenta)
+        ranges: Rangos de bytes de las frases únicas a corregir
+
+    Returns:
+        Tuple: ([(frase corregida o None si no cambió, si necesita el
+        proveedor, palabras)], palabras elegibles, segundos de CPU)
+    """
+    _init_worker()
+    mapped = _worker_map(path)
+    start = time.process_time()
+    results, words = [], 0
+    for first, last in ranges:
+        sentence = mapped.text(first, last)
+        corrected, unresolved, eligible = correct_tokens(sentence, _worker['decide'], _worker['filter'])
+        changed = corrected != sentence
+        results.append((corrected if changed or unresolved else None, bool(unresolved), len(sentence.split())))
+        words += eligible
+    mapped.release(ranges[0][0], ranges[-1][1])
+    return results, words, time.process_time() - start
+
+def sentence_key(view: memoryview) -> bytes:
+    """Clave de deduplicación de una frase (hash de sus bytes, sin copiarlos)."""
+    return hashlib.blake2b(view, digest_size=16).digest()
+
+class _Block:
+    """Bloque de entrada en curso."""
+
+    __slots__ = ('start', 'end', 'segments', 'batches', 'known')
+
+    def __init__(self, start, end, segments, batches, known):
+        self.start = start
+        self.end = end
+        self.segments = segments  # (clave o None, inicio, fin, fin del separador)
+        self.batches = batches
+        self.known = known  # Frases ya corregidas en bloques anteriores
+
+class CorpusCorrector:
+    """
+    Corrector de archivos y directorios por etapas.
+
+    Características:
+    - Entrada mapeada en memoria y salida en flujo: memoria acotada por
+      bloque, sea cual sea el tamaño del archivo
+    - Frases repetidas corregidas una sola vez
+    - Corrección local en un pool de procesos, con varios bloques en curso
+    - Proveedor solo para las frases que la corrección local no resuelve
+    - Punto de control por archivo: se reanuda donde se quedó, salvo que la
+      entrada haya cambiado (tamaño y fecha) o falte la salida
+    - Rendimiento por etapa
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        provider: Optional[Any] = None,
+        provider_workers: int = 4,
+        checkpoint_path: Optional[str] = None,
+        chunk_bytes: int = CHUNK_BYTES,
+        cache_size: int = DEDUPE_CACHE_SIZE
+    ):
+        """
+        Inicializa el corrector.
+
+        Args:
+            workers: Procesos de corrección local (por defecto, uno por CPU)
+            provider: Corrector con correct_sentence (p. ej., TextCorrector);
+                None para usar solo la corrección local
+            provider_workers: Llamadas simultáneas al proveedor
+            checkpoint_path: Archivo JSON del punto de control
+            chunk_bytes: Bytes de entrada por bloque
+            cache_size: Frases corregidas que se recuerdan
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.provider = provider
+        self.provider_workers = provider_workers
+        self.checkpoint_path = checkpoint_path
+        self.chunk_bytes = chunk_bytes
+        self.cache_size = cache_size
+        self.max_inflight = self.workers * 2
+        self._cache: "OrderedDict[bytes, Tuple[Optional[str], int]]" = OrderedDict()
+        self._checkpoint = self._load_checkpoint()
+        self.stats = {
+            'files': 0, 'bytes': 0, 'sentences': 0, 'duplicates': 0,
+            'words': 0, 'local_words': 0, 'provider_sentences': 0, 'provider_words': 0
+        }
+        self.timings = {stage: 0.0 for stage in STAGES}
+        self.elapsed = 0.0
+
+    def _load_checkpoint(self) -> Dict[str, Dict[str, Any]]:
+        if not self.checkpoint_path:
+            return {}
+        try:
+            with open(self.checkpoint_path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_checkpoint(self):
+        if not self.checkpoint_path:
+            return
+        tmp = self.checkpoint_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self._checkpoint, f)
+        os.replace(tmp, self.checkpoint_path)
+
+    @staticmethod
+    def output_path(path: str, output_dir: Optional[str] = None, root: Optional[str] = None) -> str:
+        """
+        Ruta de salida de un archivo.
+
+        Args:
+            path: Archivo de entrada
+            output_dir: Directorio de salida (None = junto a la entrada)
+            root: Directorio de entrada del que se conserva la estructura
+
+        Returns:
+            str: notas.txt → notas.corrected.txt, o la misma ruta relativa
+            dentro del directorio de salida
+        """
+        if output_dir is None:
+            base, ext = os.path.splitext(path)
+            return base + OUTPUT_SUFFIX + ext
+        relative = os.path.relpath(path, root) if root else os.path.basename(path)
+        return os.path.join(output_dir, relative)
+
+    @staticmethod
+    def iter_inputs(inputs: Iterable[str]) -> Iterator[Tuple[str, Optional[str]]]:
+        """Archivos a procesar: (ruta, directorio raíz o None)."""
+        for item in inputs:
+            if os.path.isdir(item):
+                for dirpath, _, filenames in os.walk(item):
+                    for name in sorted(filenames):
+                        if name.endswith(TEXT_EXTENSIONS) and OUTPUT_SUFFIX not in name:
+                            yield os.path.join(dirpath, name), item
+            else:
+                yield item, None
+
+    def run(self, inputs: Iterable[str], output_dir: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Corrige archivos y directorios.
+
+        Args:
+            inputs: Archivos o directorios
+            output_dir: Directorio de salida (None = junto a cada archivo)
+
+        Returns:
+            Dict[str, Any]: Estadísticas y tiempos por etapa
+
+        Raises:
+            ValueError: Si dos entradas distintas irían al mismo archivo de
+                salida (p. ej. a/notas.txt y b/notas.txt con -o)
+        """
+        # Antes de empezar: cada salida tiene su propio punto de control
+        jobs: List[Tuple[str, str]] = []
+        sources: Dict[str, str] = {}
+        for path, root in self.iter_inputs(inputs):
+            output = self.output_path(path, output_dir, root)
+            other = sources.setdefault(os.path.abspath(output), os.path.abspath(path))
+            if other != os.path.abspath(path):
+                raise ValueError(f"{other} y {path} se escribirían en el mismo archivo: {output}")
+            if (path, output) not in jobs:
+                jobs.append((path, output))
+
+        start = time.perf_counter()
+        # Cargado antes de crear el pool, los procesos lo heredan al bifurcarse
+        _init_worker()
+        with ProcessPoolExecutor(self.workers, initializer=_init_worker) as pool, \
+                ThreadPoolExecutor(self.provider_workers) as provider_pool:
+            for path, output in jobs:
+                self.process_file(pool, provider_pool, path, output)
+        self.elapsed += time.perf_counter() - start
+        return self.get_stats()
+
+    def process_file(self, pool, provider_pool, path: str, output: str):
+        """Corrige un archivo, reanudando desde el punto de control."""
+        key = os.path.abspath(path)
+        info = os.stat(path)
+        stamp = {'size': info.st_size, 'mtime': info.st_mtime_ns}
+        state = self._checkpoint.get(key, {})
+        if state and (state.get('size'), state.get('mtime')) != (stamp['size'], stamp['mtime']):
+            logger.info(f"La entrada cambió desde el punto de control; se corrige de nuevo: {path}")
+            state = {}
+        if state.get('done'):
+            logger.info(f"Ya corregido (punto de control): {path}")
+            return
+        offset, written = state.get('offset', 0), state.get('written', 0)
+        # Sin la salida ya escrita (borrada o más corta), no se puede reanudar
+        if written and (not os.path.exists(output) or os.path.getsize(output) < written):
+            logger.info(f"Falta la salida del punto de control; se empieza de cero: {output}")
+            offset, written = 0, 0
+        self._checkpoint[key] = dict(stamp, offset=offset, written=written)
+
+        directory = os.path.dirname(output)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        mode = "r+b" if written else "wb"
+        with MappedFile(path) as mapped, open(output, mode) as out:
+            out.seek(written)
+            out.truncate()
+            pending: deque = deque()
+            for block_start, block_end in self._blocks(mapped, offset):
+                pending.append(self._submit_block(pool, mapped, block_start, block_end))
+                if len(pending) >= self.max_inflight:
+                    self._finish_block(provider_pool, mapped, pending.popleft(), out, key)
+            while pending:
+                self._finish_block(provider_pool, mapped, pending.popleft(), out, key)
+            offset, written = mapped.size, out.tell()
+
+        self._checkpoint[key].update(offset=offset, written=written, done=True)
+        self._save_checkpoint()
+        self.stats['files'] += 1
+        logger.info(f"Corregido: {path} → {output}")
+
+    def _blocks(self, mapped: MappedFile, offset: int) -> Iterator[Tuple[int, int]]:
+        blocks = mapped.blocks(offset, self.chunk_bytes)
+        while True:
+            start = time.perf_counter()
+            block = next(blocks, None)
+            self.timings['lectura'] += time.perf_counter() - start
+            if block is None:
+                return
+            self.stats['bytes'] += block[1] - block[0]
+            yield block
+
+    def _submit_block(self, pool, mapped: MappedFile, block_start: int, block_end: int) -> _Block:
+        start = time.perf_counter()
+        segments = []
+        known: Dict[bytes, Tuple[Optional[str], int]] = {}
+        seen, todo = set(), []
+        for first, last, separator_end in iter_segments(mapped.buffer, block_start, block_end):
+            if first == last:
+                segments.append((None, first, last, separator_end))
+                continue
+            key = sentence_key(mapped.view(first, last))
+            segments.append((key, first, last, separator_end))
+            self.stats['sentences'] += 1
+
+            # Solo las frases nuevas van al pool
+            if key in seen or key in known:
+                self.stats['duplicates'] += 1
+            elif key in self._cache:
+                known[key] = self._cache[key]
+                self.stats['duplicates'] += 1
+            else:
+                seen.add(key)
+                todo.append((key, (first, last)))
+        batches = []
+        for i in range(0, len(todo), SENTENCES_PER_TASK):
+            batch = todo[i:i + SENTENCES_PER_TASK]
+            future = pool.submit(correct_ranges, mapped.path, [r for _, r in batch])
+            batches.append(([k for k, _ in batch], future))
+        self.timings['segmentación'] += time.perf_counter() - start
+        return _Block(block_start, block_end, segments, batches, known)
+
+    def _finish_block(self, provider_pool, mapped: MappedFile, block: _Block, out, file_key: str):
+        entries: Dict[bytes, Tuple[Optional[str], int]] = {}
+        needs_provider: List[Tuple[bytes, str]] = []
+        for keys, future in block.batches:
+            results, words, seconds = future.result()
+            self.stats['local_words'] += words
+            self.timings['local'] += seconds
+            for key, (fixed, unresolved, sentence_words) in zip(keys, results):
+                entries[key] = (fixed, sentence_words)
+                if unresolved and self.provider is not None:
+                    needs_provider.append((key, fixed))
+
+        if needs_provider:
+            start = time.perf_counter()
+            fixed_by_provider = provider_pool.map(lambda item: self._provider_correct(item[1]), needs_provider)
+            for (key, _), (fixed, words) in zip(needs_provider, fixed_by_provider):
+                entries[key] = (fixed, entries[key][1])
+                self.stats['provider_words'] += words
+            self.stats['provider_sentences'] += len(needs_provider)
+            self.timings['proveedor'] += time.perf_counter() - start
+
+        for key, entry in entries.items():
+            self._remember(key, entry)
+        entries.update(block.known)
+
+        # Las frases sin cambios y los separadores se copian del mapa
+        start = time.perf_counter()
+        for key, first, last, separator_end in block.segments:
+            fixed = None
+            if key is not None:
+                fixed, words = entries[key]
+                self.stats['words'] += words
+            if fixed is None:
+                out.write(mapped.view(first, separator_end))
+            else:
+                out.write(fixed.encode("utf-8"))
+                out.write(mapped.view(last, separator_end))
+        out.flush()
+        mapped.release(block.start, block.end)
+        self._checkpoint[file_key].update(offset=block.end, written=out.tell())
+        self._save_checkpoint()
+        self.timings['escritura'] += time.perf_counter() - start
+
+    def _provider_correct(self, sentence: str) -> Tuple[str, int]:
+        """Corrige con el proveedor las palabras de una frase, en una llamada."""
+        from token_filter import get_default_filter
+
+        token_filter = get_default_filter()
+        tokens = [
+            match for match in _TOKEN_RE.finditer(sentence)
+            if match.group(0).strip(_EDGE_PUNCT) and token_filter.is_eligible(match.group(0))
+        ]
+        words = [match.group(0).strip(_EDGE_PUNCT) for match in tokens]
+        try:
+            results = dict(zip(words, self.provider.correct_sentence(words)))
+        except Exception as e:
+            logger.error(f"Error del proveedor; se mantiene la corrección local: {e}")
+            return sentence, len(words)
+        fixed, _, _ = correct_tokens(sentence, lambda word, _: results.get(word), token_filter)
+        return fixed, len(words)
+
+    def _remember(self, key: bytes, entry: Tuple[Optional[str], int]):
+        self._cache[key] = entry
+        self._cache.move_to_end(key)
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Estadísticas y rendimiento por etapa.
+
+        El tiempo de la etapa local es el tiempo de CPU de los procesos del
+        pool repartido entre los que pueden ejecutarse a la vez.
+        """
+        parallel = min(self.workers, os.cpu_count() or 1)
+        words = {
+            'lectura': self.stats['words'],
+            'segmentación': self.stats['words'],
+            'local': self.stats['local_words'],
+            'proveedor': self.stats['provider_words'],
+            'escritura': self.stats['words']
+        }
+        stages = {}
+        for stage in STAGES:
+            seconds = self.timings[stage]
+            if stage == 'local':
+                seconds /= parallel
+            stages[stage] = {
+                'seconds': seconds,
+                'words': words[stage],
+                'words_per_s': words[stage] / seconds if seconds else 0.0
+            }
+        return dict(
+            self.stats,
+            elapsed=self.elapsed,
+            words_per_s=self.stats['words'] / self.elapsed if self.elapsed else 0.0,
+            stages=stages
+        )
+
+def print_report(stats: Dict[str, Any]):
+    """Muestra el resumen y el rendimiento por etapa."""
+    print(f"Archivos: {stats['files']}, {stats['bytes'] / 1e6:.1f} MB, {stats['words']} palabras")
+    print(f"Frases: {stats['sentences']} ({stats['duplicates']} repetidas)")
+    print(f"Frases enviadas al proveedor: {stats['provider_sentences']}")
+    print(f"Total: {stats['elapsed']:.2f}s, {stats['words_per_s']:.0f} palabras/s")
+    print(f"{'Etapa':<14} {'Tiempo':>9} {'Palabras':>10} {'Palabras/s':>12}")
+    for stage, s in stats['stages'].items():
+        print(f"{stage:<14} {s['seconds']:>8.2f}s {s['words']:>10} {s['words_per_s']:>12.0f}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Corrige archivos de texto o directorios completos")
+    parser.add_argument("inputs", nargs="+", help="Archivos o directorios")
+    parser.add_argument("-o", "--output-dir", default=None, help="Directorio de salida (por defecto, junto a cada archivo)")
+    parser.add_argument("--workers", type=int, default=None, help="Procesos de corrección local")
+    parser.add_argument("--provider", action="store_true", help="Enviar al proveedor configurado lo que no se resuelva localmente")
+    parser.add_argument("--provider-workers", type=int, default=4)
+    parser.add_argument("--checkpoint", default=None, help="Archivo del punto de control (reanudable)")
+    args = parser.parse_args()
+
+    provider = None
+    if args.provider:
+        from secure_cache import SecureCache
+        from text_corrector import TextCorrector
+
+        provider = TextCorrector(cache=SecureCache())
+
+    corpus = CorpusCorrector(
+        workers=args.workers,
+        provider=provider,
+        provider_workers=args.provider_workers,
+        checkpoint_path=args.checkpoint
+    )
+    try:
+        print_report(corpus.run(args.inputs, args.output_dir))
+    except ValueError as e:
+        parser.error(str(e))
+    finally:
+        if provider is not None:
+            provider.batch_processor.stop()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,486 @@
+#!/usr/bin/env python3
+"""
+Demonio de corrección compartido.
+
+Un único proceso en segundo plano es dueño de los servicios del contenedor
+de dependencias (caché, TextCorrector con su procesador por lotes y, con el
+proveedor "Local", el servidor de inferencia). Las interfaces (corrector en
+vivo, portapapeles) se conectan por un socket Unix y la API HTTP puede
+servirse desde el mismo proceso (--http), en lugar de crear cada una su
+corrector, su caché y su modelo: la memoria no se duplica y todas aprovechan
+la misma caché caliente.
+
+Protocolo binario (big-endian), igual para peticiones y respuestas:
+
+    cabecera: op (1 byte) | flags (1 byte) | id (4 bytes) | longitud (4 bytes)
+    cuerpo:   campos, cada uno con su longitud (4 bytes) y sus bytes UTF-8
+
+Cada conexión puede tener varias peticiones en curso; las respuestas llevan
+el id de su petición y pueden llegar en otro orden.
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import socket
+import statistics
+import struct
+import tempfile
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from interfaces import ICorrector
+from logger_manager import logger
+
+HEADER = struct.Struct("!BBII")
+_FIELD = struct.Struct("!I")
+
+# Operaciones
+OP_PING = 0
+OP_WORD = 1    # palabra, contexto, espacio de nombres → corrección
+OP_TEXT = 2    # texto, espacio de nombres → texto corregido
+OP_STATS = 3   # → estadísticas en JSON
+
+# Flags
+FLAG_CORRECTED = 0x01  # Respuesta: la palabra o el texto cambió
+FLAG_SENTENCE = 0x02   # Petición OP_TEXT: corregir por frases
+FLAG_ERROR = 0x80      # Respuesta: el único campo es el mensaje de error
+
+# Tamaño máximo del cuerpo de un mensaje
+MAX_PAYLOAD = 1 << 20
+
+# Sin sockets Unix (p. ej., Windows antiguos) no hay demonio: las interfaces
+# usan su propio corrector
+HAS_UNIX_SOCKETS = hasattr(socket, "AF_UNIX")
+
+def default_socket_path() -> str:
+    """Ruta del socket: $DYSLEXILESS_SOCKET, o en el directorio de ejecución del usuario."""
+    path = os.environ.get("DYSLEXILESS_SOCKET")
+    if path:
+        return path
+    base = os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+    # os.getuid no existe en Windows
+    user = os.getuid() if hasattr(os, "getuid") else os.environ.get("USERNAME", "user")
+    return os.path.join(base, f"dyslexiless-{user}.sock")
+
+def pack_message(op: int, flags: int, request_id: int, fields: Sequence[str] = ()) -> bytes:
+    """
+    Codifica un mensaje del protocolo.
+
+    Args:
+        op: Operación
+        flags: Flags del mensaje
+        request_id: Id de la petición
+        fields: Campos de texto
+
+    Returns:
+        bytes: Cabecera y cuerpo
+    """
+    parts = []
+    for field in fields:
+        data = field.encode("utf-8")
+        parts.append(_FIELD.pack(len(data)))
+        parts.append(data)
+    payload = b"".join(parts)
+    return HEADER.pack(op, flags, request_id, len(payload)) + payload
+
+def unpack_fields(payload: bytes) -> List[str]:
+    """
+    Decodifica los campos del cuerpo de un mensaje.
+
+    Raises:
+        ValueError: Si el cuerpo está truncado
+    """
+    fields, offset = [], 0
+    view = memoryview(payload)
+    while offset < len(payload):
+        if offset + _FIELD.size > len(payload):
+            raise ValueError("Campo truncado")
+        (length,) = _FIELD.unpack_from(payload, offset)
+        offset += _FIELD.size
+        if offset + length > len(payload):
+            raise ValueError("Campo truncado")
+        fields.append(str(view[offset:offset + length], "utf-8"))
+        offset += length
+    return fields
+
+def build_service(timeout: float = 10.0):
+    """
+    Crea el servicio de corrección a partir del contenedor de dependencias.
+
+    Registra la caché y el corrector por defecto si nadie los ha registrado
+    todavía, y los resuelve como singletons.
+
+    Args:
+        timeout: Espera máxima (s) por petición
+
+    Returns:
+        CorrectionService: Servicio sobre el corrector del contenedor
+    """
+    from correction_service import CorrectionService
+    from dependency_container import DependencyContainer
+    from interfaces import ICache
+
+    container = DependencyContainer()
+    try:
+        corrector = container.resolve(ICorrector)
+    except KeyError:
+        from secure_cache import SecureCache
+        from text_corrector import TextCorrector
+
+        container.register(ICache, SecureCache, singleton=True)
+        container.register(ICorrector, TextCorrector, singleton=True)
+        corrector = container.resolve(ICorrector)
+    return CorrectionService(corrector, timeout=timeout)
+
+class CorrectionDaemon:
+    """
+    Servidor de corrección sobre un socket Unix.
+
+    Características:
+    - Un solo corrector, caché y modelo para todas las interfaces
+    - Protocolo binario compacto con ids de petición
+    - Varias peticiones en curso por conexión
+    - Socket accesible solo para el usuario (permisos 0600)
+    """
+
+    def __init__(self, service: Any, path: Optional[str] = None):
+        """
+        Inicializa el demonio sin arrancarlo.
+
+        Args:
+            service: CorrectionService compartido
+            path: Ruta del socket (por defecto, default_socket_path())
+        """
+        self.service = service
+        self.path = path or default_socket_path()
+        self.stats = {'connections': 0, 'requests': 0, 'errors': 0}
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self):
+        """Empieza a aceptar conexiones."""
+        if not HAS_UNIX_SOCKETS:
+            raise RuntimeError("Esta plataforma no admite sockets Unix")
+        if os.path.exists(self.path):
+            # Un socket que ya no responde es de un demonio anterior
+            if ping(self.path):
+                raise RuntimeError(f"Ya hay un demonio escuchando en {self.path}")
+            os.unlink(self.path)
+        self._server = await asyncio.start_unix_server(self._handle, path=self.path)
+        os.chmod(self.path, 0o600)
+        logger.info(f"Demonio de corrección escuchando en {self.path}")
+
+    async def serve_forever(self):
+        """Arranca y atiende conexiones hasta que se cancele."""
+        await self.start()
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.close()
+
+    async def close(self):
+        """Deja de aceptar conexiones y elimina el socket."""
+        if self._server is None:
+            return
+        self._server.close()
+        await self._server.wait_closed()
+        self._server = None
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.stats['connections'] += 1
+        tasks = set()
+        try:
+            while True:
+                try:
+                    header = await reader.readexactly(HEADER.size)
+                except asyncio.IncompleteReadError:
+                    break
+                op, flags, request_id, length = HEADER.unpack(header)
+                if length > MAX_PAYLOAD:
+                    logger.warning(f"Mensaje de {length} bytes rechazado; se cierra la conexión")
+                    break
+                payload = await reader.readexactly(length) if length else b""
+                self.stats['requests'] += 1
+
+                if op == OP_PING:
+                    # Sin tarea: es la medida del coste del propio IPC
+                    writer.write(HEADER.pack(OP_PING, 0, request_id, 0))
+                    await writer.drain()
+                    continue
+                task = asyncio.create_task(self._dispatch(writer, op, flags, request_id, payload))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            for task in tasks:
+                task.cancel()
+            writer.close()
+
+    async def _dispatch(
+        self,
+        writer: asyncio.StreamWriter,
+        op: int,
+        flags: int,
+        request_id: int,
+        payload: bytes
+    ):
+        try:
+            fields = unpack_fields(payload)
+            if op == OP_WORD:
+                word, context, namespace = fields
+                correction, corrected = await self.service.correct_word(word, context, namespace)
+                response = pack_message(
+                    op, FLAG_CORRECTED if corrected else 0, request_id, [correction]
+                )
+            elif op == OP_TEXT:
+                text, namespace = fields
+                result = await self.service.correct(
+                    text, sentence_mode=bool(flags & FLAG_SENTENCE), namespace=namespace
+                )
+                response = pack_message(
+                    op, FLAG_CORRECTED if result['corrections'] else 0, request_id,
+                    [result['corrected']]
+                )
+            elif op == OP_STATS:
+                stats = dict(self.service.get_stats(), daemon=self.stats)
+                response = pack_message(op, 0, request_id, [json.dumps(stats, default=str)])
+            else:
+                raise ValueError(f"Operación desconocida: {op}")
+        except Exception as e:
+            self.stats['errors'] += 1
+            logger.error(f"Error en petición al demonio: {e}")
+            response = pack_message(op, FLAG_ERROR, request_id, [str(e)])
+
+        if writer.is_closing():
+            return
+        writer.write(response)
+        try:
+            await writer.drain()
+        except ConnectionError:
+            pass  # El cliente se fue; _handle cierra la conexión
+
+class DaemonClient(ICorrector):
+    """
+    Cliente síncrono del demonio de corrección.
+
+    Implementa ICorrector, así que sustituye al TextCorrector en cualquier
+    interfaz, y la interfaz de llamada del pipeline de transformers, como el
+    servidor de inferencia. Es seguro entre hilos: las peticiones de varios
+    hilos se serializan sobre la misma conexión.
+    """
+
+    def __init__(self, path: Optional[str] = None, timeout: float = 15.0):
+        """
+        Conecta con el demonio.
+
+        Args:
+            path: Ruta del socket (por defecto, default_socket_path())
+            timeout: Espera máxima (s) por respuesta
+
+        Raises:
+            OSError: Si el demonio no está escuchando o no hay sockets Unix
+        """
+        self.path = path or default_socket_path()
+        self.timeout = timeout
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._sock: Optional[socket.socket] = None
+        self._connect()
+
+    def _connect(self):
+        if not HAS_UNIX_SOCKETS:
+            raise OSError("Esta plataforma no admite sockets Unix")
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(self.path)
+        except OSError:
+            sock.close()
+            raise
+        self._sock = sock
+
+    def _disconnect(self):
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+
+    def _recv_exactly(self, size: int) -> bytes:
+        data = bytearray()
+        while len(data) < size:
+            chunk = self._sock.recv(size - len(data))
+            if not chunk:
+                raise ConnectionError("El demonio cerró la conexión")
+            data += chunk
+        return bytes(data)
+
+    def request(self, op: int, fields: Sequence[str] = (), flags: int = 0) -> Tuple[int, List[str]]:
+        """
+        Envía una petición y espera su respuesta.
+
+        Args:
+            op: Operación
+            fields: Campos de la petición
+            flags: Flags de la petición
+
+        Returns:
+            Tuple[int, List[str]]: Flags y campos de la respuesta
+
+        Raises:
+            RuntimeError: Si el demonio responde con un error
+            OSError: Si falla la conexión (la siguiente petición reconecta)
+        """
+        with self._lock:
+            request_id = next(self._ids) & 0xFFFFFFFF
+            try:
+                if self._sock is None:
+                    self._connect()
+                self._sock.sendall(pack_message(op, flags, request_id, fields))
+                _, flags, response_id, length = HEADER.unpack(self._recv_exactly(HEADER.size))
+                payload = self._recv_exactly(length) if length else b""
+                if response_id != request_id:
+                    raise ConnectionError(f"Respuesta {response_id} para la petición {request_id}")
+            except BaseException:
+                # Tras un timeout o una lectura a medias, la respuesta pendiente
+                # desalinearía todas las siguientes: se descarta la conexión
+                self._disconnect()
+                raise
+        fields = unpack_fields(payload)
+        if flags & FLAG_ERROR:
+            raise RuntimeError(fields[0] if fields else "Error del demonio")
+        return flags, fields
+
+    def ping(self):
+        """Ida y vuelta sin trabajo: mide el coste del IPC."""
+        self.request(OP_PING)
+
+    def correct_text(self, word: str, context: str, namespace: str = "") -> Tuple[str, bool]:
+        """Corrige una palabra con su contexto (ICorrector)."""
+        flags, fields = self.request(OP_WORD, [word, context, namespace])
+        return fields[0], bool(flags & FLAG_CORRECTED)
+
+    def correct(self, text: str, sentence_mode: bool = False, namespace: str = "") -> str:
+        """Corrige un texto completo con el filtro de tokens del demonio."""
+        _, fields = self.request(OP_TEXT, [text, namespace], FLAG_SENTENCE if sentence_mode else 0)
+        return fields[0]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Estadísticas del servicio, del procesador por lotes y del demonio."""
+        _, fields = self.request(OP_STATS)
+        return json.loads(fields[0])
+
+    def test_connection(self) -> bool:
+        try:
+            self.ping()
+            return True
+        except (OSError, RuntimeError):
+            return False
+
+    def __call__(self, text, max_length: int = 100, **kwargs):
+        texts = [text] if isinstance(text, str) else list(text)
+        return [{'generated_text': self.correct(t)} for t in texts]
+
+    def close(self):
+        with self._lock:
+            self._disconnect()
+
+def ping(path: Optional[str] = None, timeout: float = 1.0) -> bool:
+    """Comprueba si hay un demonio respondiendo en el socket."""
+    try:
+        client = DaemonClient(path, timeout)
+    except OSError:
+        return False
+    try:
+        return client.test_connection()
+    finally:
+        client.close()
+
+def connect(path: Optional[str] = None, timeout: float = 15.0) -> Optional[DaemonClient]:
+    """
+    Conecta con el demonio si está en marcha.
+
+    Returns:
+        Optional[DaemonClient]: Cliente conectado, o None si no hay demonio
+    """
+    try:
+        return DaemonClient(path, timeout)
+    except OSError:
+        return None
+
+def benchmark_ipc(client: DaemonClient, requests: int = 5000) -> Dict[str, float]:
+    """
+    Mide la latencia de ida y vuelta del IPC (peticiones PING).
+
+    Args:
+        client: Cliente conectado
+        requests: Peticiones a medir
+
+    Returns:
+        Dict[str, float]: Media, p50 y p99 en ms, y peticiones/s
+    """
+    for _ in range(min(100, requests)):
+        client.ping()  # Calentamiento
+    latencies = []
+    start = time.perf_counter()
+    for _ in range(requests):
+        t0 = time.perf_counter()
+        client.ping()
+        latencies.append(time.perf_counter() - t0)
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        'mean_ms': statistics.mean(latencies) * 1000,
+        'p50_ms': latencies[len(latencies) // 2] * 1000,
+        'p99_ms': latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000,
+        'requests_per_s': requests / elapsed
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Demonio de corrección compartido")
+    parser.add_argument("--socket", default=None, help="Ruta del socket Unix")
+    parser.add_argument(
+        "--benchmark", type=int, metavar="N", default=0,
+        help="Medir N peticiones PING contra un demonio en marcha"
+    )
+    parser.add_argument(
+        "--http", type=int, metavar="PUERTO", default=None,
+        help="Servir también la API HTTP en este puerto, con el mismo servicio"
+    )
+    args = parser.parse_args()
+
+    if args.benchmark:
+        client = DaemonClient(args.socket)
+        result = benchmark_ipc(client, args.benchmark)
+        client.close()
+        print(f"IPC: media {result['mean_ms']:.3f}ms, p50 {result['p50_ms']:.3f}ms, "
+              f"p99 {result['p99_ms']:.3f}ms, {result['requests_per_s']:.0f} peticiones/s")
+        return
+
+    service = build_service()
+    daemon = CorrectionDaemon(service, args.socket)
+
+    async def serve():
+        servers = [daemon.serve_forever()]
+        if args.http is not None:
+            import uvicorn
+            import correction_handler
+
+            correction_handler.set_service(service)
+            config = uvicorn.Config(correction_handler.app, host=correction_handler.DEFAULT_HOST, port=args.http)
+            servers.append(uvicorn.Server(config).serve())
+        await asyncio.gather(*servers)
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.processor.stop()
+
+if __name__ == "__main__":
+    main()
@@ -1,96 +1,179 @@
-import pyperclip
-import requests
-import time
-from pynput.keyboard import Controller, Key
-from fastapi import FastAPI
+#!/usr/bin/env python3
+"""
+API HTTP local de corrección.
+
+Servidor FastAPI que recibe el texto en el cuerpo de la petición y lo corrige
+con el pipeline completo del TextCorrector (filtro de tokens, reglas locales,
+procesador por lotes, caché y proveedor configurado). Las peticiones se
+atienden de forma asíncrona, así que muchos clientes pueden corregir a la vez
+compartiendo lotes y caché.
+
+Endpoints:
+- POST /correct: un texto
+- POST /correct/batch: varios textos en una sola petición
+- POST /correct/stream: flujo continuo de texto; responde en NDJSON con una
+  línea por corrección, según se deciden, y una línea final de resumen
+- GET /health: estado y estadísticas
+
+El flujo de portapapeles (copiar la selección, corregir y pegar) es ahora un
+cliente opcional: clipboard_client.py. Para compartir corrector y caché con
+las demás interfaces, la API puede servirse desde el demonio de corrección
+(correction_daemon.py --http).
+"""
+
+import argparse
+import codecs
+import json
+import threading
+from contextlib import asynccontextmanager
+from typing import List, Optional
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
 import uvicorn
-import os
-
-keyboard = Controller()
-app = FastAPI()
-
-def notify(message):
-    os.system(f"""
-        osascript -e 'display notification "{message}" with title "Dyslexia Helper"'
-    """)
-
-def get_selected_text():
-    # Guardar el contenido actual del portapapeles
-    original_clipboard = pyperclip.paste()
-    
-    # Copiar texto seleccionado
-    keyboard.press(Key.cmd)
-    keyboard.press('c')
-    keyboard.release('c')
-    keyboard.release(Key.cmd)
-    time.sleep(0.2)  # Aumentamos el tiempo de espera
-    
-    selected_text = pyperclip.paste()
-    
-    # Restaurar el portapapeles original
-    time.sleep(0.1)
-    pyperclip.copy(original_clipboard)
-    
-    return selected_text
-
-def paste_corrected_text(corrected_text):
-    if not corrected_text:
-        return
-        
-    # Guardar el contenido actual del portapapeles
-    original_clipboard = pyperclip.paste()
-    
-    # Copiar el texto corregido al portapapeles
-    pyperclip.copy(corrected_text)
-    time.sleep(0.1)
-    
-    # Pegar el texto corregido
-    keyboard.press(Key.cmd)
-    keyboard.press('v')
-    keyboard.release('v')
-    keyboard.release(Key.cmd)
-    
-    # Restaurar el portapapeles original
-    time.sleep(0.2)
-    pyperclip.copy(original_clipboard)
-
-@app.post("/correct")
-async def correct_text():
+from correction_service import CorrectionService
+from logger_manager import logger
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8000
+
+# Tamaño máximo de un texto por petición
+MAX_TEXT_LENGTH = 20000
+
+# Máximo de textos por petición de lote
+MAX_BATCH_TEXTS = 256
+
+class CorrectionRequest(BaseModel):
+    """Petición de corrección."""
+    text: str = Field(..., max_length=MAX_TEXT_LENGTH)
+    sentence_mode: bool = False
+    namespace: str = ""
+
+class BatchCorrectionRequest(BaseModel):
+    """Petición de corrección de varios textos."""
+    texts: List[str] = Field(..., max_length=MAX_BATCH_TEXTS)
+    sentence_mode: bool = False
+    namespace: str = ""
+
+class Correction(BaseModel):
+    """Una palabra corregida."""
+    word: str
+    correction: str
+    start: int
+
+class CorrectionResponse(BaseModel):
+    """Resultado de una corrección."""
+    original: str
+    corrected: str
+    corrections: List[Correction]
+    elapsed_ms: float
+
+_service: Optional[CorrectionService] = None
+_service_lock = threading.Lock()
+
+def get_service() -> CorrectionService:
+    """
+    Obtiene el servicio de corrección compartido, creándolo la primera vez.
+
+    Returns:
+        CorrectionService: Servicio sobre el TextCorrector configurado
+    """
+    global _service
+    if _service is None:
+        with _service_lock:
+            if _service is None:
+                from correction_daemon import build_service
+
+                _service = build_service()
+    return _service
+
+def set_service(service: CorrectionService):
+    """Usa un servicio ya creado (p. ej., el del demonio de corrección)."""
+    global _service
+    _service = service
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Crear el corrector al arrancar, no en la primera petición
+    get_service()
+    logger.info("API de corrección lista")
+    yield
+    if _service is not None:
+        _service.processor.stop()
+
+app = FastAPI(title="DyslexiLess", lifespan=lifespan)
+
+@app.post("/correct", response_model=CorrectionResponse)
+async def correct(request: CorrectionRequest):
+    """Corrige el texto recibido."""
+    try:
+        return await get_service().correct(
+            request.text,
+            sentence_mode=request.sentence_mode,
+            namespace=request.namespace
+        )
+    except Exception as e:
+        logger.error(f"Error en corrección: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/correct/batch", response_model=List[CorrectionResponse])
+async def correct_batch(request: BatchCorrectionRequest):
+    """Corrige varios textos en una sola petición."""
+    if any(len(text) > MAX_TEXT_LENGTH for text in request.texts):
+        raise HTTPException(status_code=422, detail=f"Texto de más de {MAX_TEXT_LENGTH} caracteres")
     try:
-        text = get_selected_text()
-        if not text:
-            notify("No text selected!")
-            return {"status": "error", "message": "No text selected"}
-
-        # Aquí implementamos una corrección simple
-        # (después podemos conectar con una API más sofisticada)
-        corrected_text = text.strip()
-        
-        # Ejemplo de correcciones básicas
-        common_fixes = {
-            "q": "que",
-            "xq": "porque",
-            "pq": "porque",
-            "tb": "también",
-            "tmb": "también"
-        }
-        
-        words = corrected_text.split()
-        corrected_words = [common_fixes.get(word.lower(), word) for word in words]
-        corrected_text = " ".join(corrected_words)
-        
-        # Notificar al usuario
-        notify(f"Original: {text}\nCorregido: {corrected_text}")
-        
-        # Pegar el texto corregido
-        paste_corrected_text(corrected_text)
-        
-        return {"status": "success", "original": text, "corrected": corrected_text}
-        
+        return await get_service().correct_batch(
+            request.texts,
+            sentence_mode=request.sentence_mode,
+            namespace=request.namespace
+        )
     except Exception as e:
-        notify(f"Error: {str(e)}")
-        return {"status": "error", "message": str(e)}
+        logger.error(f"Error en corrección por lotes: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/correct/stream")
+async def correct_stream(request: Request, namespace: str = ""):
+    """
+    Corrige el cuerpo de la petición según llega.
+
+    El cuerpo es texto UTF-8 en fragmentos (transfer-encoding chunked); la
+    respuesta es NDJSON: una línea por corrección y una línea final
+    {"done": true, ...}.
+    """
+    async def chunks():
+        # El decodificador incremental guarda los caracteres multibyte
+        # partidos entre fragmentos y sustituye los bytes inválidos
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        async for data in request.stream():
+            text = decoder.decode(data)
+            if text:
+                yield text
+        text = decoder.decode(b"", final=True)
+        if text:
+            yield text
+
+    async def lines():
+        try:
+            async for event in get_service().stream(chunks(), namespace=namespace):
+                yield json.dumps(event, ensure_ascii=False) + "\n"
+        except Exception as e:
+            logger.error(f"Error en corrección en flujo: {e}")
+            yield json.dumps({"error": str(e)}, ensure_ascii=False) + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+@app.get("/health")
+async def health():
+    """Estado del servicio y estadísticas del procesador por lotes."""
+    return {"status": "ok", "stats": get_service().get_stats()}
+
+def main():
+    parser = argparse.ArgumentParser(description="API HTTP local de corrección")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    args = parser.parse_args()
+
+    uvicorn.run(app, host=args.host, port=args.port)
 
 if __name__ == "__main__":
-    notify("Server started!")
-    uvicorn.run(app, host="127.0.0.1", port=8000)
\ No newline at end of file
+    main()
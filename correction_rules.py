@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Motor de reglas de corrección local.
+Compila las reglas de palabras completas, prefijos, sufijos y restauración de
+tildes en un único trie, de modo que aplicar las reglas a una palabra cuesta
+O(longitud de la palabra) sin importar cuántas reglas haya.
+"""
+
+import json
+import os
+from typing import Any, Dict, Optional, Tuple
+from logger_manager import logger
+
+# Reglas por defecto
+DEFAULT_RULES = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    "resources",
+    "correction_rules.json"
+)
+
+# Marcadores de inicio en el trie: cada tipo de regla vive en su propia rama
+_WORD_START = "^"     # ^palabra$ → palabra completa; ^prefijo → prefijo
+_WORD_END = "$"
+_SUFFIX_START = "<"   # <ojiffus (sufijo invertido)
+_VALUE = ""           # Clave del valor de un nodo (nunca es un carácter)
+
+def apply_case(source: str, target: str) -> str:
+    """
+    Copia el patrón de mayúsculas de una palabra a su corrección.
+
+    Args:
+        source: Palabra original (MAYÚSCULAS, Título, minúsculas o mixta)
+        target: Corrección en minúsculas
+
+    Returns:
+        str: Corrección con el patrón de mayúsculas del original
+    """
+    if not source or source.islower():
+        return target
+    if source.isupper() and len(source) > 1:
+        return target.upper()
+    if source[0].isupper() and (len(source) == 1 or source[1:].islower()):
+        return target[:1].upper() + target[1:]
+
+    # Patrón mixto: copiar posición a posición; el resto sigue al último carácter
+    chars = []
+    for i, ch in enumerate(target):
+        reference = source[min(i, len(source) - 1)]
+        chars.append(ch.upper() if reference.isupper() else ch)
+    return "".join(chars)
+
+class RuleEngine:
+    """
+    Motor de reglas compilado en un trie.
+
+    Características:
+    - Palabras completas y restauración de tildes
+    - Reescritura del prefijo más largo y del sufijo más largo
+    - Una sola estructura para todos los tipos de regla
+    - Conservación del patrón de mayúsculas
+    """
+
+    def __init__(self, rules: Optional[Dict[str, Dict[str, str]]] = None):
+        """
+        Inicializa el motor.
+
+        Args:
+            rules: Secciones "words", "accents", "prefixes" y "suffixes",
+                cada una con pares origen → reemplazo
+        """
+        self.root: Dict[str, Any] = {}
+        self.size = 0
+        for section, entries in (rules or {}).items():
+            for source, replacement in entries.items():
+                self.add_rule(section, source, replacement)
+
+    @classmethod
+    def from_file(cls, path: str = DEFAULT_RULES) -> "RuleEngine":
+        """
+        Carga y compila las reglas de un archivo JSON.
+
+        Args:
+            path: Ruta del archivo de reglas
+
+        Returns:
+            RuleEngine: Motor compilado
+        """
+        with open(path, "r", encoding="utf-8") as f:
+            engine = cls(json.load(f))
+        logger.info(f"Reglas de corrección compiladas: {engine.size}")
+        return engine
+
+    def add_rule(self, section: str, source: str, replacement: str):
+        """
+        Añade una regla al trie.
+
+        Args:
+            section: words, accents, prefixes o suffixes
+            source: Texto a reemplazar (en minúsculas)
+            replacement: Texto de reemplazo
+
+        Raises:
+            ValueError: Si la sección no existe
+        """
+        source = source.lower()
+        if section in ("words", "accents"):
+            path = _WORD_START + source + _WORD_END
+        elif section == "prefixes":
+            path = _WORD_START + source
+        elif section == "suffixes":
+            path = _SUFFIX_START + source[::-1]
+        else:
+            raise ValueError(f"Sección de reglas desconocida: {section}")
+
+        node = self.root
+        for ch in path:
+            node = node.setdefault(ch, {})
+        node[_VALUE] = (len(source), replacement)
+        self.size += 1
+
+    def _walk(self, start: str, text: str) -> Tuple[Optional[Tuple[int, str]], Optional[Dict]]:
+        """
+        Recorre el trie y devuelve la coincidencia más larga y el nodo final.
+        """
+        node = self.root.get(start)
+        longest = None
+        for ch in text:
+            if node is None:
+                return longest, None
+            node = node.get(ch)
+            if node is not None and _VALUE in node:
+                longest = node[_VALUE]
+        return longest, node
+
+    def word_state(self, text: str = "", state: Optional[Dict] = None) -> Optional[Dict]:
+        """
+        Avanza por la rama de palabras completas del trie.
+
+        Permite comprobar de forma incremental, carácter a carácter, si una
+        palabra a medio escribir es un error conocido.
+
+        Args:
+            text: Caracteres a recorrer (en minúsculas)
+            state: Estado anterior (None = inicio de palabra)
+
+        Returns:
+            Optional[Dict]: Nuevo estado, o None si ninguna regla empieza así
+        """
+        node = self.root.get(_WORD_START) if state is None else state
+        for ch in text:
+            if node is None:
+                return None
+            node = node.get(ch)
+        return node
+
+    @staticmethod
+    def is_word_match(state: Optional[Dict]) -> bool:
+        """Indica si un estado de word_state() completa una regla de palabra."""
+        return state is not None and _WORD_END in state
+
+    def lookup(self, word: str) -> Optional[str]:
+        """
+        Aplica las reglas a una palabra.
+
+        Args:
+            word: Palabra a corregir (con cualquier patrón de mayúsculas)
+
+        Returns:
+            Optional[str]: Palabra corregida con el patrón de mayúsculas del
+            original, o None si ninguna regla aplica
+        """
+        lower = word.lower()
+
+        # Palabra completa: ^palabra$ (el mismo recorrido da el prefijo más largo)
+        prefix, node = self._walk(_WORD_START, lower)
+        if node is not None and _WORD_END in node:
+            return apply_case(word, node[_WORD_END][_VALUE][1])
+
+        suffix, _ = self._walk(_SUFFIX_START, lower[::-1])
+
+        result = lower
+        prefix_len = prefix[0] if prefix else 0
+        if suffix and suffix[0] + prefix_len <= len(lower):
+            result = result[:len(result) - suffix[0]] + suffix[1]
+        if prefix:
+            result = prefix[1] + result[prefix_len:]
+
+        if result == lower:
+            return None
+        return apply_case(word, result)
+
+# Reglas compiladas una sola vez al importar el módulo
+RULES = RuleEngine.from_file(DEFAULT_RULES)
@@ -0,0 +1,372 @@
+#!/usr/bin/env python3
+"""
+Servicio de corrección de textos completos.
+
+Recibe un texto, lo divide en palabras, descarta las que no deben corregirse
+(URLs, números, código, otro idioma) y envía el resto al procesador por lotes
+del TextCorrector, de modo que las peticiones simultáneas de varios clientes
+comparten lotes, caché y circuit breakers. Cada palabra se resuelve con un
+Future de asyncio, sin bloquear el bucle de eventos del servidor HTTP.
+
+Además de textos sueltos, admite lotes de textos en una sola petición y un
+flujo continuo de texto del que se emiten las correcciones según se deciden.
+"""
+
+import asyncio
+import re
+import threading
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from token_filter import get_default_filter
+from logger_manager import logger
+
+# Puntuación que rodea a una palabra y se conserva al corregirla
+_EDGE_PUNCT = "\"'«»“”‘’.,;:!?¡¿()[]"
+_TOKEN_RE = re.compile(r"\S+")
+
+SENTENCE_END = ".?!"
+
+# Palabras anteriores que se envían como contexto
+CONTEXT_WORDS = 8
+
+class CorrectionService:
+    """
+    Corrección asíncrona de textos sobre el procesador por lotes.
+
+    Características:
+    - Texto completo en la petición (sin portapapeles)
+    - Filtro de tokens antes de encolar
+    - Modo palabra (una tarea por palabra) o modo frase (una por frase)
+    - Conservación de espacios y puntuación
+    - Tiempo máximo por petición: lo no resuelto se devuelve sin cambios
+    - Lotes de textos y flujos continuos sobre el mismo procesador
+    """
+
+    def __init__(
+        self,
+        corrector: Any,
+        token_filter: Optional[Any] = None,
+        timeout: float = 10.0
+    ):
+        """
+        Inicializa el servicio.
+
+        Args:
+            corrector: TextCorrector (con su batch_processor)
+            token_filter: Filtro de tokens (por defecto, el compartido)
+            timeout: Espera máxima (s) por petición
+        """
+        self.corrector = corrector
+        self.processor = corrector.batch_processor
+        self.token_filter = token_filter or get_default_filter()
+        self.timeout = timeout
+        self.stats = {'requests': 0, 'words': 0, 'corrected': 0, 'timeouts': 0}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _tokens(text: str) -> List[Tuple[int, str, str]]:
+        """Palabras del texto: (posición, token, núcleo sin puntuación)."""
+        return [
+            (match.start(), match.group(0), match.group(0).strip(_EDGE_PUNCT))
+            for match in _TOKEN_RE.finditer(text)
+        ]
+
+    async def correct(
+        self,
+        text: str,
+        sentence_mode: bool = False,
+        namespace: str = "",
+        priority: int = 3
+    ) -> Dict[str, Any]:
+        """
+        Corrige un texto completo.
+
+        Args:
+            text: Texto a corregir
+            sentence_mode: Corregir cada frase con una sola llamada
+            namespace: Espacio de nombres de caché del cliente
+            priority: Prioridad en el procesador por lotes
+
+        Returns:
+            Dict[str, Any]: Texto original, texto corregido, lista de
+            correcciones (palabra, corrección, posición) y tiempo empleado
+        """
+        start_time = time.perf_counter()
+        loop = asyncio.get_running_loop()
+        tokens = self._tokens(text)
+        eligible = [
+            i for i, (_, token, core) in enumerate(tokens)
+            if core and self.token_filter.is_eligible(token)
+        ]
+
+        pending: Dict[asyncio.Future, Tuple[Any, List[int]]] = {}
+        if sentence_mode:
+            for indices in self._sentences(tokens, eligible):
+                future = loop.create_future()
+                task = self.processor.add_sentence(
+                    [tokens[i][2] for i in indices],
+                    self._resolver(loop, future),
+                    priority=priority,
+                    namespace=namespace
+                )
+                pending[future] = (task, indices)
+        else:
+            for i in eligible:
+                context = " ".join(t[2] for t in tokens[max(0, i - CONTEXT_WORDS):i + 1])
+                future, task = self._submit_word(loop, tokens[i][2], context, namespace, priority)
+                pending[future] = (task, [i])
+
+        results: Dict[int, Tuple[str, bool]] = {}
+        if pending:
+            done, not_done = await asyncio.wait(list(pending), timeout=self.timeout)
+            for future in not_done:
+                task, _ = pending[future]
+                self.processor.cancel_task(task)
+                future.cancel()
+            for future in done:
+                _, indices = pending[future]
+                value = future.result()
+                values = value if sentence_mode else [value]
+                for i, result in zip(indices, values):
+                    results[i] = result
+            if not_done:
+                logger.warning(f"Petición con {len(not_done)} correcciones sin resolver a tiempo")
+                with self._lock:
+                    self.stats['timeouts'] += 1
+
+        corrected, corrections = self._rebuild(text, tokens, results)
+        with self._lock:
+            self.stats['requests'] += 1
+            self.stats['words'] += len(eligible)
+            self.stats['corrected'] += len(corrections)
+        return {
+            'original': text,
+            'corrected': corrected,
+            'corrections': corrections,
+            'elapsed_ms': (time.perf_counter() - start_time) * 1000
+        }
+
+    async def correct_word(
+        self,
+        word: str,
+        context: str,
+        namespace: str = "",
+        priority: int = 3
+    ) -> Tuple[str, bool]:
+        """
+        Corrige una sola palabra con su contexto, sin filtrarla.
+
+        Args:
+            word: Palabra a corregir
+            context: Contexto de la palabra
+            namespace: Espacio de nombres de caché del cliente
+            priority: Prioridad en el procesador por lotes
+
+        Returns:
+            Tuple[str, bool]: (corrección, si fue corregida); la palabra sin
+            cambios si no se resuelve a tiempo
+        """
+        future, task = self._submit_word(asyncio.get_running_loop(), word, context, namespace, priority)
+        try:
+            result = await asyncio.wait_for(future, self.timeout)
+        except asyncio.TimeoutError:
+            self.processor.cancel_task(task)
+            with self._lock:
+                self.stats['timeouts'] += 1
+            return word, False
+        with self._lock:
+            self.stats['requests'] += 1
+            self.stats['words'] += 1
+            self.stats['corrected'] += int(result[1] and result[0] != word)
+        return result
+
+    async def correct_batch(
+        self,
+        texts: List[str],
+        sentence_mode: bool = False,
+        namespace: str = "",
+        priority: int = 3
+    ) -> List[Dict[str, Any]]:
+        """
+        Corrige varios textos a la vez; sus palabras comparten lotes.
+
+        Args:
+            texts: Textos a corregir
+            sentence_mode: Corregir cada frase con una sola llamada
+            namespace: Espacio de nombres de caché del cliente
+            priority: Prioridad en el procesador por lotes
+
+        Returns:
+            List[Dict[str, Any]]: Resultado de cada texto, en el mismo orden
+        """
+        return list(await asyncio.gather(*[
+            self.correct(text, sentence_mode, namespace, priority) for text in texts
+        ]))
+
+    async def stream(
+        self,
+        chunks: AsyncIterator[str],
+        namespace: str = "",
+        priority: int = 3
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Corrige un flujo continuo de texto.
+
+        Cada palabra se encola en cuanto llega el espacio que la cierra (la
+        última, al terminar el flujo) y las correcciones se emiten según se
+        deciden, no en el orden del texto.
+
+        Args:
+            chunks: Fragmentos de texto según llegan
+            namespace: Espacio de nombres de caché del cliente
+            priority: Prioridad en el procesador por lotes
+
+        Yields:
+            Dict[str, Any]: Una corrección (palabra, corrección, posición en
+            el flujo) o, al final, el resumen {"done": True, ...}
+        """
+        loop = asyncio.get_running_loop()
+        events: asyncio.Queue = asyncio.Queue()
+        pending: Dict[asyncio.Future, Any] = {}
+        history: deque = deque(maxlen=CONTEXT_WORDS)
+        counts = {'words': 0, 'corrected': 0}
+
+        def submit(start: int, token: str):
+            core = token.strip(_EDGE_PUNCT)
+            if not core:
+                return
+            history.append(core)
+            if not self.token_filter.is_eligible(token):
+                return
+            future, task = self._submit_word(loop, core, " ".join(history), namespace, priority)
+            pending[future] = task
+            counts['words'] += 1
+            position = start + token.find(core)
+            future.add_done_callback(
+                lambda f: events.put_nowait((core, position, f)) if not f.cancelled() else None
+            )
+
+        async def feed():
+            buffer, offset = "", 0
+            try:
+                async for chunk in chunks:
+                    buffer += chunk
+                    # Solo las palabras cerradas por un espacio
+                    closed = 0
+                    for match in _TOKEN_RE.finditer(buffer):
+                        if match.end() < len(buffer):
+                            submit(offset + match.start(), match.group(0))
+                            closed = match.end()
+                    offset += closed
+                    buffer = buffer[closed:]
+                match = _TOKEN_RE.search(buffer)
+                if match:
+                    submit(offset + match.start(), match.group(0))
+                if pending:
+                    _, not_done = await asyncio.wait(list(pending), timeout=self.timeout)
+                    for future in not_done:
+                        self.processor.cancel_task(pending[future])
+                        future.cancel()
+            finally:
+                events.put_nowait(None)
+
+        feeder = asyncio.create_task(feed())
+        try:
+            while True:
+                event = await events.get()
+                if event is None:
+                    break
+                core, position, future = event
+                correction, was_corrected = future.result()
+                if was_corrected and correction != core:
+                    counts['corrected'] += 1
+                    yield {'word': core, 'correction': correction, 'start': position}
+            await feeder  # Propaga los errores del flujo de entrada
+        finally:
+            feeder.cancel()
+
+        with self._lock:
+            self.stats['requests'] += 1
+            self.stats['words'] += counts['words']
+            self.stats['corrected'] += counts['corrected']
+        yield {'done': True, **counts}
+
+    def _submit_word(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        word: str,
+        context: str,
+        namespace: str,
+        priority: int
+    ) -> Tuple[asyncio.Future, Any]:
+        """Encola una palabra; devuelve su Future y la tarea del procesador."""
+        future = loop.create_future()
+        task = self.processor.add_task(
+            word,
+            context,
+            self._resolver(loop, future),
+            priority=priority,
+            namespace=namespace
+        )
+        return future, task
+
+    @staticmethod
+    def _resolver(loop: asyncio.AbstractEventLoop, future: asyncio.Future):
+        """Callback del procesador que resuelve el Future en su bucle."""
+        def resolve(value):
+            if not future.done():
+                future.set_result(value)
+
+        def callback(*result):
+            # Modo palabra: (corrección, si fue corregida); modo frase: lista
+            value = result[0] if len(result) == 1 else result
+            try:
+                loop.call_soon_threadsafe(resolve, value)
+            except RuntimeError:
+                pass  # La petición ya terminó (tiempo agotado) y su bucle se cerró
+
+        return callback
+
+    @staticmethod
+    def _sentences(tokens: List[Tuple[int, str, str]], eligible: List[int]) -> List[List[int]]:
+        """Agrupa las palabras elegibles por frase."""
+        sentences, current = [], []
+        eligible_set = set(eligible)
+        for i, (_, token, _) in enumerate(tokens):
+            if i in eligible_set:
+                current.append(i)
+            if token.rstrip("\"')»”").endswith(tuple(SENTENCE_END)) and current:
+                sentences.append(current)
+                current = []
+        if current:
+            sentences.append(current)
+        return sentences
+
+    @staticmethod
+    def _rebuild(
+        text: str,
+        tokens: List[Tuple[int, str, str]],
+        results: Dict[int, Tuple[str, bool]]
+    ) -> Tuple[str, List[Dict[str, Any]]]:
+        """Aplica las correcciones conservando espacios y puntuación."""
+        parts, corrections = [], []
+        position = 0
+        for i, (start, token, core) in enumerate(tokens):
+            correction, was_corrected = results.get(i, (core, False))
+            if not was_corrected or correction == core:
+                continue
+            core_start = start + token.find(core)
+            parts.append(text[position:core_start])
+            parts.append(correction)
+            position = core_start + len(core)
+            corrections.append({'word': core, 'correction': correction, 'start': core_start})
+        parts.append(text[position:])
+        return "".join(parts), corrections
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Obtiene estadísticas del servicio y del procesador por lotes."""
+        with self._lock:
+            stats = dict(self.stats)
+        stats['batch'] = self.processor.get_stats()
+        return stats
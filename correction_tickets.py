@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Tickets de corrección por palabra.
+
+Cada palabra enviada a corregir recibe un ticket con la posición absoluta de
+su final en el flujo de texto escrito. Con la posición actual del cursor se
+sabe cuántos caracteres se han escrito desde entonces, de modo que varias
+correcciones pueden estar en curso a la vez y aplicarse en cualquier orden en
+el sitio correcto. Un ticket queda obsoleto si el usuario borra hasta la
+palabra o mueve el cursor fuera de la palabra actual.
+"""
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from itertools import count
+from threading import Lock
+from typing import Optional
+
+@dataclass
+class CorrectionTicket:
+    """Palabra pendiente de corrección y su posición en el texto."""
+    id: int
+    word: str
+    end: int  # Posición absoluta justo después del último carácter
+
+class TicketTracker:
+    """
+    Registro de tickets en curso.
+
+    Características:
+    - Posición absoluta del cursor actualizada en O(1) por pulsación
+    - Descarte barato de tickets obsoletos (los más recientes primero)
+    - Desplazamiento de los tickets posteriores al aplicar una corrección
+    - Límite de tickets en curso
+    """
+
+    def __init__(self, max_tickets: int = 64):
+        """
+        Inicializa el registro.
+
+        Args:
+            max_tickets: Máximo de tickets en curso (se descartan los más antiguos)
+        """
+        self.max_tickets = max_tickets
+        self.position = 0
+        self.tickets: "OrderedDict[int, CorrectionTicket]" = OrderedDict()
+        self.discarded = 0
+        self._ids = count(1)
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self.tickets)
+
+    def __contains__(self, ticket: CorrectionTicket) -> bool:
+        return ticket.id in self.tickets
+
+    def advance(self, chars: int = 1):
+        """
+        Registra caracteres escritos o movimientos del cursor (negativos
+        hacia la izquierda, sin borrar texto).
+        """
+        with self._lock:
+            self.position += chars
+
+    def delete_back(self, chars: int = 1):
+        """
+        Registra un borrado hacia atrás.
+
+        Descarta los tickets cuya palabra (o el espacio que la cierra) se
+        ha borrado. Los tickets están ordenados por posición, así que solo se
+        revisan los más recientes.
+        """
+        with self._lock:
+            self.position -= chars
+            while self.tickets:
+                ticket = next(reversed(self.tickets.values()))
+                if ticket.end < self.position:
+                    break
+                self.tickets.popitem()
+                self.discarded += 1
+
+    def invalidate(self):
+        """Descarta todos los tickets (posición del cursor desconocida)."""
+        with self._lock:
+            self.discarded += len(self.tickets)
+            self.tickets.clear()
+
+    def issue(self, word: str, trailing: int = 1) -> CorrectionTicket:
+        """
+        Crea un ticket para una palabra recién cerrada.
+
+        Args:
+            word: Palabra a corregir
+            trailing: Caracteres escritos tras la palabra (el espacio)
+
+        Returns:
+            CorrectionTicket: Ticket emitido
+        """
+        with self._lock:
+            ticket = CorrectionTicket(next(self._ids), word, self.position - trailing)
+            self.tickets[ticket.id] = ticket
+            if len(self.tickets) > self.max_tickets:
+                self.tickets.popitem(last=False)
+                self.discarded += 1
+            return ticket
+
+    def claim(self, ticket: CorrectionTicket) -> Optional[int]:
+        """
+        Retira un ticket para aplicar su corrección.
+
+        Args:
+            ticket: Ticket emitido por issue()
+
+        Returns:
+            Optional[int]: Caracteres entre el final de la palabra y el
+            cursor, o None si el ticket está obsoleto
+        """
+        with self._lock:
+            if self.tickets.pop(ticket.id, None) is None:
+                return None
+            return self.position - ticket.end
+
+    def release(self, ticket: CorrectionTicket):
+        """Descarta un ticket sin corrección."""
+        with self._lock:
+            self.tickets.pop(ticket.id, None)
+
+    def applied(self, ticket: CorrectionTicket, correction: str):
+        """
+        Registra que la palabra de un ticket se reemplazó en el texto.
+
+        Desplaza la posición del cursor y la de los tickets posteriores según
+        la diferencia de longitud.
+        """
+        delta = len(correction) - len(ticket.word)
+        if not delta:
+            return
+        with self._lock:
+            self.position += delta
+            for other in self.tickets.values():
+                if other.end > ticket.end:
+                    other.end += delta
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Planificador de ediciones mínimas para aplicar correcciones.
+
+En lugar de borrar la palabra y reescribir la corrección completa, calcula el
+script de edición mínimo entre la palabra escrita y su corrección (recorte del
+prefijo y sufijo comunes más alineación de Levenshtein) y lo convierte en el
+menor número de movimientos de cursor y pulsaciones.
+
+Las operaciones se expresan sin depender de pynput:
+("left", n), ("right", n), ("backspace", n) y ("type", texto).
+"""
+
+from typing import List, Tuple
+
+EditOp = Tuple[str, object]
+
+def _common_affixes(a: str, b: str) -> Tuple[int, int]:
+    """Longitud del prefijo y sufijo comunes (sin solaparse)."""
+    limit = min(len(a), len(b))
+    prefix = 0
+    while prefix < limit and a[prefix] == b[prefix]:
+        prefix += 1
+    suffix = 0
+    while suffix < limit - prefix and a[-1 - suffix] == b[-1 - suffix]:
+        suffix += 1
+    return prefix, suffix
+
+def align(a: str, b: str) -> List[Tuple[str, str]]:
+    """
+    Alineación de Levenshtein entre dos textos.
+
+    Args:
+        a: Texto original
+        b: Texto corregido
+
+    Returns:
+        List[Tuple[str, str]]: Pares (carácter original, carácter corregido);
+        "" indica inserción o borrado
+    """
+    rows, cols = len(a) + 1, len(b) + 1
+    dist = [[0] * cols for _ in range(rows)]
+    for i in range(rows):
+        dist[i][0] = i
+    for j in range(cols):
+        dist[0][j] = j
+    for i in range(1, rows):
+        for j in range(1, cols):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            dist[i][j] = min(
+                dist[i - 1][j] + 1,
+                dist[i][j - 1] + 1,
+                dist[i - 1][j - 1] + cost
+            )
+
+    pairs = []
+    i, j = len(a), len(b)
+    while i or j:
+        if i and j and dist[i][j] == dist[i - 1][j - 1] + (a[i - 1] != b[j - 1]):
+            pairs.append((a[i - 1], b[j - 1]))
+            i, j = i - 1, j - 1
+        elif i and dist[i][j] == dist[i - 1][j] + 1:
+            pairs.append((a[i - 1], ""))
+            i -= 1
+        else:
+            pairs.append(("", b[j - 1]))
+            j -= 1
+    pairs.reverse()
+    return pairs
+
+def _append(ops: List[EditOp], action: str, value):
+    """Añade una operación fusionándola con la anterior si es del mismo tipo."""
+    if not value:
+        return
+    if ops and ops[-1][0] == action:
+        previous = ops[-1][1]
+        ops[-1] = (action, previous + value)
+    else:
+        ops.append((action, value))
+
+def _aligned_plan(middle: List[Tuple[str, str]], suffix: int) -> List[EditOp]:
+    """Edita de derecha a izquierda moviendo el cursor sobre lo que no cambia."""
+    ops: List[EditOp] = []
+    moved = 0
+    _append(ops, "left", suffix)
+    moved += suffix
+
+    deleted, inserted = 0, ""
+    for source, target in reversed(middle):
+        if source and source == target:
+            _append(ops, "backspace", deleted)
+            _append(ops, "type", inserted)
+            deleted, inserted = 0, ""
+            _append(ops, "left", 1)
+            moved += 1
+            continue
+        if source:
+            deleted += 1
+        inserted = target + inserted
+    _append(ops, "backspace", deleted)
+    _append(ops, "type", inserted)
+
+    _append(ops, "right", moved)
+    return ops
+
+def plan_edit(original: str, correction: str, trailing: int = 1) -> List[EditOp]:
+    """
+    Calcula las pulsaciones mínimas para transformar una palabra.
+
+    Se asume el cursor `trailing` caracteres después del final de la palabra
+    (por defecto, tras el espacio que la cerró) y se deja en la misma posición.
+
+    Args:
+        original: Palabra escrita
+        correction: Corrección
+        trailing: Caracteres entre el final de la palabra y el cursor
+
+    Returns:
+        List[EditOp]: Operaciones a enviar
+    """
+    if original == correction:
+        return []
+
+    prefix, suffix = _common_affixes(original, correction)
+
+    # Opción 1: alinear el tramo central y moverse sobre lo que no cambia
+    middle = align(original[prefix:len(original) - suffix],
+                   correction[prefix:len(correction) - suffix])
+    aligned = _aligned_plan(middle, suffix + trailing)
+
+    # Opción 2: borrar desde el prefijo común y reescribir el resto
+    retype: List[EditOp] = []
+    _append(retype, "left", trailing)
+    _append(retype, "backspace", len(original) - prefix)
+    _append(retype, "type", correction[prefix:])
+    _append(retype, "right", trailing)
+
+    # A igual coste se prefiere reescribir: usa menos flechas
+    if count_keystrokes(aligned) < count_keystrokes(retype):
+        return aligned
+    return retype
+
+def count_keystrokes(ops: List[EditOp]) -> int:
+    """
+    Cuenta las pulsaciones de un plan.
+
+    Args:
+        ops: Operaciones del plan
+
+    Returns:
+        int: Pulsaciones (cada carácter escrito cuenta como una)
+    """
+    return sum(len(value) if action == "type" else value for action, value in ops)
+
+def apply_plan(text: str, cursor: int, ops: List[EditOp]) -> Tuple[str, int]:
+    """
+    Simula un plan sobre un texto (para pruebas y verificación).
+
+    Args:
+        text: Texto inicial
+        cursor: Posición inicial del cursor
+        ops: Operaciones del plan
+
+    Returns:
+        Tuple[str, int]: Texto resultante y posición final del cursor
+    """
+    for action, value in ops:
+        if action == "left":
+            cursor -= value
+        elif action == "right":
+            cursor += value
+        elif action == "backspace":
+            text = text[:cursor - value] + text[cursor:]
+            cursor -= value
+        elif action == "type":
+            text = text[:cursor] + value + text[cursor:]
+            cursor += len(value)
+    return text, cursor
@@ -85,7 +85,7 @@ class ServiceSelectionPage(QWizardPage):
         
         # Selector de servicio
         self.service_combo = QComboBox()
-        self.service_combo.addItems(["OpenAI (Recomendado)", "Anthropic", "Mixtral (Local)"])
+        self.service_combo.addItems(["OpenAI (Recomendado)", "Anthropic", "Mixtral", "Local (sin conexión)"])
         layout.addWidget(QLabel("Servicio de IA:"))
         layout.addWidget(self.service_combo)
         
@@ -106,7 +106,8 @@ class ServiceSelectionPage(QWizardPage):
         info = {
             0: "OpenAI ofrece el mejor balance entre precisión y velocidad. Recomendado para la mayoría de usuarios.",
             1: "Anthropic Claude es muy preciso pero puede ser más lento. Bueno para textos complejos.",
-            2: "Mixtral es una opción local que no requiere conexión a internet, pero puede ser menos precisa."
+            2: "Mixtral es un modelo abierto servido a través de la API de Together. Requiere conexión a internet.",
+            3: "El modelo local se ejecuta en este equipo y no requiere conexión a internet, pero puede ser menos preciso."
         }
         self.service_info.setText(info[self.service_combo.currentIndex()])
 
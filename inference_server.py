@@ -0,0 +1,450 @@
+#!/usr/bin/env python3
+"""
+Servidor de inferencia local con lotes dinámicos.
+
+El modelo seq2seq local se ejecuta en un proceso propio, de modo que la
+inferencia no compite por el GIL con el monitor de teclado ni con la
+interfaz. Las peticiones llegan por una cola; el proceso espera la primera,
+reúne las que lleguen durante la ventana de lote (hasta un máximo) y las
+ejecuta como un único lote con relleno. Cada petición se resuelve con un
+Future en el proceso cliente.
+
+El servidor tiene la interfaz de llamada del pipeline de transformers, así
+que lo pueden compartir el TextCorrector (proveedor "Local") y el corrector
+en vivo.
+"""
+
+import argparse
+import itertools
+import multiprocessing
+import queue
+import statistics
+import threading
+import time
+from concurrent.futures import Future, InvalidStateError, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from logger_manager import logger
+
+# Mensajes del proceso de inferencia
+_READY = "ready"
+_FAILED = "failed"
+_RESULTS = "results"
+_ERROR = "error"
+_STOPPED = "stopped"
+
+WARMUP_TEXT = "Hola, esto es una prueba de calentamiento."
+
+# Cada cuánto se comprueba que el proceso de inferencia sigue vivo (s)
+_POLL_INTERVAL = 0.5
+
+def _worker_main(
+    loader: Callable[..., Callable],
+    loader_args: Tuple,
+    requests: "multiprocessing.Queue",
+    responses: "multiprocessing.Queue",
+    batch_window: float,
+    max_batch: int
+):
+    """Bucle del proceso de inferencia."""
+    try:
+        model = loader(*loader_args)
+        model(WARMUP_TEXT, max_length=32)
+    except Exception as e:
+        responses.put((_FAILED, None, repr(e)))
+        return
+    responses.put((_READY, None, None))
+
+    stopping = False
+    while not stopping:
+        item = requests.get()
+        if item is None:
+            break
+
+        # Reunir peticiones durante la ventana de lote
+        batch = [item]
+        deadline = time.perf_counter() + batch_window
+        while len(batch) < max_batch:
+            remaining = deadline - time.perf_counter()
+            try:
+                item = requests.get(timeout=remaining) if remaining > 0 else requests.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                stopping = True
+                break
+            batch.append(item)
+
+        ids = [request_id for request_id, _, _, _ in batch]
+        kwargs = {}
+        prompts = [prompt for _, _, _, prompt in batch]
+        if getattr(model, 'supports_early_exit', False) and any(prompts):
+            kwargs['prompts'] = prompts
+        try:
+            outputs = model(
+                [text for _, text, _, _ in batch],
+                max_length=max(max_length for _, _, max_length, _ in batch),
+                **kwargs
+            )
+            responses.put((
+                _RESULTS,
+                [(request_id, out['generated_text']) for request_id, out in zip(ids, outputs)],
+                None
+            ))
+        except Exception as e:
+            responses.put((_ERROR, ids, repr(e)))
+
+    responses.put((_STOPPED, None, None))
+
+def _resolve(future: Future, result: Any = None, exception: Optional[Exception] = None):
+    """
+    Resuelve un futuro salvo que ya esté resuelto o cancelado.
+
+    _result cancela el futuro si se agota el tiempo justo después de que el
+    lector lo haya retirado de las peticiones pendientes; resolverlo entonces
+    lanzaría InvalidStateError y terminaría el hilo lector.
+    """
+    if future.done():
+        return
+    try:
+        if exception is not None:
+            future.set_exception(exception)
+        else:
+            future.set_result(result)
+    except InvalidStateError:
+        pass
+
+class InferenceServer:
+    """
+    Cliente del proceso de inferencia local.
+
+    Características:
+    - Modelo en un proceso aparte (sin contención del GIL)
+    - Lotes dinámicos: ventana de espera y tamaño máximo de lote
+    - Un Future por petición
+    - Indicador de disponibilidad tras la carga y el calentamiento
+    - Interfaz de llamada del pipeline de transformers
+    - Las peticiones fallan (no se bloquean) si el proceso termina
+    """
+
+    def __init__(
+        self,
+        loader: Optional[Callable[..., Callable]] = None,
+        loader_args: Sequence[Any] = (),
+        batch_window: float = 0.01,
+        max_batch: int = 16,
+        request_timeout: float = 30.0
+    ):
+        """
+        Inicializa el servidor sin arrancarlo.
+
+        Args:
+            loader: Función (importable) que carga el modelo en el proceso de
+                inferencia; por defecto local_model.load_backend
+            loader_args: Argumentos del cargador
+            batch_window: Tiempo máximo (s) que se espera a más peticiones
+            max_batch: Máximo de peticiones por lote
+            request_timeout: Espera máxima (s) por petición en __call__
+        """
+        if loader is None:
+            from local_model import load_backend
+            loader = load_backend
+        self.loader = loader
+        self.loader_args = tuple(loader_args)
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self.request_timeout = request_timeout
+        self.ready = threading.Event()
+        self.error: Optional[str] = None
+        self.stats = {'requests': 0, 'batches': 0, 'errors': 0}
+        self._pending: Dict[int, Future] = {}
+        self._ids = itertools.count()
+        self._lock = threading.Lock()
+        self._process = None
+        self._reader = None
+
+    @classmethod
+    def from_config(cls, config: Optional[Dict]) -> "InferenceServer":
+        """
+        Crea el servidor a partir de la sección "local_model" de la configuración.
+
+        Args:
+            config: Configuración del usuario (puede ser None)
+
+        Returns:
+            InferenceServer: Servidor configurado (sin arrancar)
+        """
+        from local_model import DEFAULT_MODEL
+
+        section = (config or {}).get('local_model', {})
+        return cls(
+            loader_args=(
+                section.get('model', DEFAULT_MODEL),
+                section.get('backend', "auto"),
+                section.get('threads')
+            ),
+            batch_window=section.get('batch_window_ms', 10) / 1000,
+            max_batch=section.get('max_batch', 16),
+            request_timeout=section.get('request_timeout', 30.0)
+        )
+
+    def start(self):
+        """Arranca el proceso de inferencia (solo la primera vez)."""
+        if self._process is not None:
+            return
+        self.error = None
+        context = multiprocessing.get_context("spawn")
+        self._requests = context.Queue()
+        self._responses = context.Queue()
+        self._process = context.Process(
+            target=_worker_main,
+            args=(
+                self.loader, self.loader_args, self._requests, self._responses,
+                self.batch_window, self.max_batch
+            ),
+            daemon=True
+        )
+        self._process.start()
+        self._reader = threading.Thread(target=self._read_responses, args=(self._process,), daemon=True)
+        self._reader.start()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Espera a que el modelo esté listo."""
+        return self.ready.wait(timeout)
+
+    def _read_responses(self, process):
+        while True:
+            try:
+                kind, payload, error = self._responses.get(timeout=_POLL_INTERVAL)
+            except queue.Empty:
+                if process.is_alive():
+                    continue
+                # Terminó sin avisar (señal, falta de memoria...): nadie
+                # resolverá las peticiones en curso
+                kind, error = _FAILED, f"El proceso de inferencia terminó (código {process.exitcode})"
+            if kind == _READY:
+                self.ready.set()
+                logger.info("Servidor de inferencia local listo")
+            elif kind == _RESULTS:
+                with self._lock:
+                    self.stats['batches'] += 1
+                    futures = [(self._pending.pop(i, None), text) for i, text in payload]
+                for future, text in futures:
+                    if future is not None:
+                        _resolve(future, result=text)
+            elif kind == _ERROR:
+                with self._lock:
+                    self.stats['errors'] += 1
+                    futures = [self._pending.pop(i, None) for i in payload]
+                for future in futures:
+                    if future is not None:
+                        _resolve(future, exception=RuntimeError(error))
+            else:  # _FAILED o _STOPPED
+                if kind == _FAILED:
+                    logger.error(f"Servidor de inferencia local no disponible: {error}")
+                # Las peticiones posteriores fallan en submit en lugar de esperar
+                self.error = error or "Servidor de inferencia detenido"
+                self.ready.clear()
+                self._fail_pending(RuntimeError(self.error))
+                return
+
+    def _fail_pending(self, exception: Exception):
+        with self._lock:
+            futures = list(self._pending.values())
+            self._pending.clear()
+        for future in futures:
+            _resolve(future, exception=exception)
+
+    def submit(self, text: str, max_length: int = 100, prompt=None) -> Future:
+        """
+        Encola un texto para corregir.
+
+        Args:
+            text: Texto a corregir
+            max_length: Longitud máxima de la salida en tokens
+            prompt: CorrectionPrompt del texto, para cortar la generación en
+                cuanto la palabra objetivo esté decodificada
+
+        Returns:
+            Future: Se resuelve con el texto corregido
+        """
+        return self._submit(text, max_length, prompt)[1]
+
+    def _submit(self, text: str, max_length: int, prompt=None) -> Tuple[Optional[int], Future]:
+        future: Future = Future()
+        if self.error is not None:
+            future.set_exception(RuntimeError(self.error))
+            return None, future
+        request_id = next(self._ids)
+        with self._lock:
+            self._pending[request_id] = future
+            self.stats['requests'] += 1
+        self._requests.put((request_id, text, max_length, prompt))
+        return request_id, future
+
+    def _result(self, request_id: Optional[int], future: Future, timeout: Optional[float]) -> str:
+        """Espera un resultado; si se agota el tiempo, olvida la petición."""
+        try:
+            return future.result(timeout)
+        except FutureTimeoutError:
+            with self._lock:
+                self._pending.pop(request_id, None)
+            future.cancel()
+            raise
+
+    def generate(
+        self,
+        text: str,
+        max_length: int = 100,
+        timeout: Optional[float] = None,
+        prompt=None
+    ) -> str:
+        """Corrige un texto y espera el resultado."""
+        return self._result(*self._submit(text, max_length, prompt), timeout)
+
+    def __call__(self, text, max_length: int = 100, **kwargs):
+        texts = [text] if isinstance(text, str) else list(text)
+        requests = [self._submit(t, max_length) for t in texts]
+        deadline = time.perf_counter() + self.request_timeout
+        try:
+            return [
+                {'generated_text': self._result(request_id, future, max(0.0, deadline - time.perf_counter()))}
+                for request_id, future in requests
+            ]
+        except FutureTimeoutError:
+            with self._lock:
+                for request_id, _ in requests:
+                    self._pending.pop(request_id, None)
+            raise
+
+    def stop(self, timeout: float = 5.0):
+        """Detiene el proceso de inferencia."""
+        if self._process is None:
+            return
+        self._requests.put(None)
+        self._process.join(timeout)
+        if self._process.is_alive():
+            self._process.terminate()
+            self._responses.put((_STOPPED, None, None))
+        self._reader.join(timeout)
+        self._process = None
+        self.ready.clear()
+
+    def get_stats(self) -> Dict[str, float]:
+        """Obtiene estadísticas de los lotes."""
+        with self._lock:
+            stats = dict(self.stats, pending=len(self._pending))
+        stats['mean_batch'] = stats['requests'] / stats['batches'] if stats['batches'] else 0.0
+        return stats
+
+_default_server: Optional[InferenceServer] = None
+_default_lock = threading.Lock()
+
+def get_default_server(config: Optional[Dict] = None) -> InferenceServer:
+    """
+    Obtiene el servidor compartido, arrancándolo la primera vez.
+
+    Args:
+        config: Configuración del usuario (solo se usa al crearlo)
+
+    Returns:
+        InferenceServer: Servidor compartido
+    """
+    global _default_server
+    if _default_server is None:
+        with _default_lock:
+            if _default_server is None:
+                server = InferenceServer.from_config(config)
+                server.start()
+                _default_server = server
+    return _default_server
+
+class SimulatedModel:
+    """Modelo simulado: coste fijo por lote más un coste por texto."""
+
+    def __init__(self, base_ms: float, item_ms: float):
+        self.base = base_ms / 1000
+        self.item = item_ms / 1000
+
+    def __call__(self, text, max_length: int = 100, **kwargs):
+        texts = [text] if isinstance(text, str) else list(text)
+        time.sleep(self.base + self.item * len(texts))
+        return [{'generated_text': t} for t in texts]
+
+def simulated_loader(base_ms: float = 40.0, item_ms: float = 4.0) -> SimulatedModel:
+    """Cargador del modelo simulado (para medir sin transformers)."""
+    return SimulatedModel(base_ms, item_ms)
+
+def benchmark_windows(
+    loader: Callable[..., Callable],
+    loader_args: Sequence[Any],
+    windows_ms: Sequence[float],
+    texts: List[str],
+    clients: int = 16,
+    max_batch: int = 16
+) -> Dict[float, Dict[str, float]]:
+    """
+    Mide el rendimiento según la ventana de lote.
+
+    Args:
+        loader: Cargador del modelo
+        loader_args: Argumentos del cargador
+        windows_ms: Ventanas de lote a comparar (ms)
+        texts: Textos de prueba
+        clients: Hilos cliente enviando peticiones a la vez
+        max_batch: Máximo de peticiones por lote
+
+    Returns:
+        Dict[float, Dict[str, float]]: Métricas por ventana
+    """
+    results = {}
+    for window in windows_ms:
+        server = InferenceServer(loader, loader_args, window / 1000, max_batch)
+        server.start()
+        server.wait()
+
+        def timed(text):
+            start = time.perf_counter()
+            server.generate(text)
+            return time.perf_counter() - start
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(clients) as pool:
+            latencies = list(pool.map(timed, texts))
+        elapsed = time.perf_counter() - start
+
+        stats = server.get_stats()
+        server.stop()
+        results[window] = {
+            'throughput': len(texts) / elapsed,
+            'p50_ms': statistics.median(latencies) * 1000,
+            'mean_batch': stats['mean_batch']
+        }
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Rendimiento del servidor de inferencia local por ventana de lote")
+    parser.add_argument("--windows", default="0,5,10,20,50", help="Ventanas de lote (ms)")
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--sentences", type=int, default=200)
+    parser.add_argument("--model", default=None, help="Modelo real (por defecto, simulado)")
+    parser.add_argument("--backend", default="auto")
+    args = parser.parse_args()
+
+    from generate_test_data import generate_load_test_data
+
+    texts = [s["input"] for s in generate_load_test_data(args.sentences)]
+    if args.model:
+        from local_model import load_backend
+        loader, loader_args = load_backend, (args.model, args.backend)
+    else:
+        loader, loader_args = simulated_loader, ()
+
+    windows = [float(w) for w in args.windows.split(",")]
+    results = benchmark_windows(loader, loader_args, windows, texts, args.clients)
+    print(f"{'Ventana':>8} {'Frases/s':>9} {'p50':>9} {'Lote medio':>11}")
+    for window, r in results.items():
+        print(f"{window:>6.0f}ms {r['throughput']:>9.1f} {r['p50_ms']:>7.1f}ms {r['mean_batch']:>11.1f}")
+
+if __name__ == "__main__":
+    main()
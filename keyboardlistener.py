@@ -7,13 +7,26 @@ from pynput import keyboard
 from pynput.keyboard import Key, Controller
 import threading
 import time
-from typing import List, Deque
+from functools import partial
+from typing import List, Deque, Optional
+from array import array
 from collections import deque
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from interfaces import ICorrector, INotifier, ITextBuffer, IInputMonitor
 from dependency_container import DependencyContainer
 from logger_manager import logger
+from text_injector import TextInjector
+from correction_tickets import CorrectionTicket, TicketTracker
+from speculative_corrector import SpeculativeCorrector
+from token_filter import get_default_filter
+from app_profiles import AppProfile, ProfileManager
+from keystroke_pipeline import (
+    KeystrokePipeline, EV_SPACE, EV_BACKSPACE, EV_ENTER, EV_LEFT, EV_RIGHT, EV_DELETE
+)
+
+# Signos que cierran una frase en modo frase
+SENTENCE_END = ".?!"
 
 @dataclass
 class BufferStats:
@@ -23,43 +36,153 @@ class BufferStats:
     buffer_usage: float = 0.0
     last_cleanup: datetime = datetime.now()
 
+class CharRing:
+    """
+    Buffer circular de caracteres con cursor sobre un array preasignado.
+
+    Añadir o borrar al final cuesta O(1); las ediciones a mitad de palabra
+    solo desplazan los caracteres que quedan a la derecha del cursor. Al
+    llenarse se descarta el carácter más antiguo, como un deque con maxlen.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._data = array('u', ' ' * capacity)
+        self._start = 0
+        self.length = 0
+        self.cursor = 0
+
+    def __len__(self) -> int:
+        return self.length
+
+    def _index(self, position: int) -> int:
+        return (self._start + position) % self.capacity
+
+    def insert(self, char: str):
+        """Inserta un carácter en la posición del cursor."""
+        if self.length == self.capacity:
+            # Lleno: descartar el carácter más antiguo
+            self._start = (self._start + 1) % self.capacity
+            self.length -= 1
+            self.cursor = max(0, self.cursor - 1)
+        data = self._data
+        for i in range(self.length, self.cursor, -1):
+            data[self._index(i)] = data[self._index(i - 1)]
+        data[self._index(self.cursor)] = char
+        self.length += 1
+        self.cursor += 1
+
+    def delete(self, position: int) -> str:
+        """Elimina y retorna el carácter en una posición."""
+        if not 0 <= position < self.length:
+            return ""
+        data = self._data
+        char = data[self._index(position)]
+        for i in range(position, self.length - 1):
+            data[self._index(i)] = data[self._index(i + 1)]
+        self.length -= 1
+        if self.cursor > position:
+            self.cursor -= 1
+        return char
+
+    def clear(self):
+        self._start = 0
+        self.length = 0
+        self.cursor = 0
+
+    def text(self) -> str:
+        """Retorna el contenido como cadena."""
+        end = self._start + self.length
+        if end <= self.capacity:
+            return self._data[self._start:end].tounicode()
+        return (
+            self._data[self._start:].tounicode()
+            + self._data[:end - self.capacity].tounicode()
+        )
+
 class OptimizedBuffer(ITextBuffer):
-    """Buffer optimizado para manejo eficiente de texto."""
+    """
+    Buffer optimizado para manejo eficiente de texto.
+
+    La palabra actual vive en un CharRing con cursor y la ventana de contexto
+    se mantiene de forma incremental al cerrar cada palabra, de modo que
+    ninguna pulsación recorre el historial completo.
+    """
     
-    def __init__(self, max_size: int = 1000):
-        self.chars: Deque[str] = deque(maxlen=max_size)
+    def __init__(self, max_size: int = 1000, context_words: int = 3):
+        self.chars = CharRing(max_size)
         self.words: Deque[str] = deque(maxlen=50)
         self.stats = BufferStats(max_chars=max_size)
+        self._window: Deque[str] = deque(maxlen=context_words)
+        self._context = ""
+        self._word: Optional[str] = ""  # Caché de la palabra actual
         
-    def add_char(self, char: str):
-        """Añade un carácter al buffer."""
-        self.chars.append(char)
+    def _update_stats(self):
+        self._word = None
         self.stats.total_chars = len(self.chars)
         self.stats.buffer_usage = self.stats.total_chars / self.stats.max_chars
         
+    def add_char(self, char: str):
+        """Añade un carácter en la posición del cursor."""
+        for ch in char:
+            self.chars.insert(ch)
+        self._update_stats()
+        
     def add_word(self, word: str):
-        """Añade una palabra al buffer."""
+        """Añade una palabra al buffer y actualiza la ventana de contexto."""
         self.words.append(word)
+        self._window.append(word)
+        self._context = " ".join(self._window)
         
     def pop_char(self) -> str:
-        """Elimina y retorna el último carácter."""
-        if self.chars:
-            self.stats.total_chars -= 1
-            return self.chars.pop()
-        return ""
+        """Elimina y retorna el carácter anterior al cursor (backspace)."""
+        char = self.chars.delete(self.chars.cursor - 1)
+        self._update_stats()
+        return char
+        
+    def delete_char(self) -> str:
+        """Elimina y retorna el carácter bajo el cursor (suprimir)."""
+        char = self.chars.delete(self.chars.cursor)
+        self._update_stats()
+        return char
+        
+    def move_cursor(self, offset: int) -> bool:
+        """
+        Mueve el cursor dentro de la palabra actual.
+        
+        Args:
+            offset: Desplazamiento (negativo hacia la izquierda)
+            
+        Returns:
+            bool: False si el cursor saldría de la palabra actual
+        """
+        position = self.chars.cursor + offset
+        if not 0 <= position <= len(self.chars):
+            return False
+        self.chars.cursor = position
+        return True
         
     def clear(self):
         """Limpia el buffer."""
         self.chars.clear()
-        self.stats.total_chars = 0
+        self._update_stats()
         
     def get_word(self) -> str:
         """Obtiene la palabra actual del buffer."""
-        return "".join(self.chars)
+        if self._word is None:
+            self._word = self.chars.text()
+        return self._word
         
     def get_context(self) -> str:
-        """Obtiene el contexto actual."""
-        return " ".join(list(self.words)[-3:])  # Últimas 3 palabras
+        """Obtiene el contexto actual (últimas palabras completas)."""
+        return self._context
+        
+    def context_with(self, word: str) -> str:
+        """Obtiene el contexto que habrá cuando se cierre la palabra dada."""
+        if not word:
+            return self._context
+        window = list(self._window)[1:] if len(self._window) == self._window.maxlen else list(self._window)
+        return " ".join(window + [word])
         
     def cleanup(self):
         """Realiza limpieza periódica del buffer."""
@@ -74,16 +197,69 @@ class OptimizedBuffer(ITextBuffer):
                 logger.info(f"Buffer cleanup: {len(old_words)} palabras eliminadas")
 
 class KeyboardListener(IInputMonitor):
-    def __init__(self, corrector: ICorrector, buffer: ITextBuffer, notifier: INotifier):
+    # Teclas especiales que se encolan como códigos negativos
+    SPECIAL_KEYS = {
+        Key.space: EV_SPACE,
+        Key.enter: EV_ENTER,
+        Key.backspace: EV_BACKSPACE,
+        Key.left: EV_LEFT,
+        Key.right: EV_RIGHT,
+        Key.delete: EV_DELETE,
+    }
+
+    # Palabras máximas por frase antes de enviarla sin esperar al final
+    MAX_SENTENCE_WORDS = 24
+
+    def __init__(
+        self,
+        corrector: ICorrector,
+        buffer: ITextBuffer,
+        notifier: INotifier,
+        sentence_mode: bool = False,
+        sentence_pause: float = 1.0,
+        profiles: Optional[ProfileManager] = None
+    ):
+        """
+        Inicializa el monitor.
+
+        Args:
+            corrector: Corrector con su procesador por lotes
+            buffer: Buffer de la palabra actual y su contexto
+            notifier: Sistema de notificaciones
+            sentence_mode: Acumular las palabras y corregir la frase entera
+                en una sola llamada (al cerrar con . ? ! o Enter, o tras una pausa)
+            sentence_pause: Pausa de escritura (s) que envía la frase en curso
+            profiles: Perfiles por aplicación (por defecto, un buffer del
+                mismo tipo que `buffer` por aplicación activa)
+        """
+        # Un buffer por aplicación; `buffer` es el de la aplicación activa
+        self.profiles = profiles if profiles is not None else ProfileManager(type(buffer))
+        self.profile = self.profiles.adopt(self.profiles.tracker.current(), buffer)
         self.buffer = buffer
         self.corrector = corrector
         self.notifier = notifier
         self.keyboard = Controller()
+        self.injector = TextInjector(self.keyboard)
         self.is_backspacing = False
         self.corrections_count = 0
         self.total_words = 0
         self.is_paused = False
-        self.current_word = None  # Palabra actual siendo procesada
+        self.ignored_keys = 0  # Pulsaciones sintéticas propias recibidas
+        # Una corrección en curso por palabra, con su posición en el texto
+        self.tickets = TicketTracker()
+        self.ready: Deque = deque()  # Correcciones recibidas pendientes de aplicar
+        self.sentence_mode = sentence_mode
+        self.sentence_pause = sentence_pause
+        self.sentence: List[CorrectionTicket] = []  # Palabras cerradas de la frase en curso
+        self._last_event = 0.0
+        # URLs, números, código y otros idiomas no pasan al corrector
+        self.token_filter = get_default_filter()
+        # Corrección especulativa de la palabra a medio escribir
+        self.speculator = SpeculativeCorrector(corrector.batch_processor)
+        self.speculator.namespace = self.profile.namespace
+        # El hook solo encola; la segmentación ocurre en el hilo consumidor
+        self.pipeline = KeystrokePipeline(self.handle_event, idle_handler=self.on_idle)
+        self.pipeline.start()
         logger.info("Iniciando KeyboardListener")
         self.notifier.notify("DyslexiLess iniciado y monitoreando", "info", "✨")
         
@@ -97,6 +273,7 @@ class KeyboardListener(IInputMonitor):
         """Detiene el monitor de teclado."""
         if hasattr(self, 'keyboard_listener'):
             self.keyboard_listener.stop()
+        self.pipeline.stop()
         logger.info("Monitor de teclado detenido")
         
     def pause(self):
@@ -109,84 +286,222 @@ class KeyboardListener(IInputMonitor):
         self.is_paused = False
         logger.info("Monitor de teclado reanudado")
 
-    def on_press(self, key):
+    def on_press(self, key, injected: Optional[bool] = None):
+        """
+        Callback del hook de teclado.
+
+        Se ejecuta en el hilo del hook del sistema operativo, así que solo
+        codifica la tecla y la encola en tiempo constante; el resto del
+        trabajo lo hace handle_event en el hilo consumidor.
+
+        Args:
+            key: Tecla pulsada
+            injected: Marca de evento sintético de pynput (1.8+). En Linux
+                llega como False también para nuestras propias pulsaciones,
+                así que si no es verdadera se comprueba la secuencia que el
+                inyector espera
+        """
+        # Nuestras propias pulsaciones sintéticas no son texto del usuario;
+        # las reales se procesan siempre, aunque lleguen durante una inyección
+        if injected:
+            self.injector.consume(key)
+        else:
+            injected = self.injector.consume(key)
+        if injected:
+            self.ignored_keys += 1
+            return
         if self.is_paused:
             return
-            
+
+        code = self.SPECIAL_KEYS.get(key)
+        if code is not None:
+            self.pipeline.push(code)
+        else:
+            char = getattr(key, 'char', None)
+            if char and len(char) == 1:
+                self.pipeline.push(ord(char))
+
+    def handle_event(self, code: int, timestamp: float = 0.0):
+        """
+        Procesa una pulsación encolada (hilo consumidor).
+
+        Args:
+            code: Código del carácter o evento especial (EV_*)
+            timestamp: Momento de la pulsación (time.perf_counter)
+        """
+        self._last_event = timestamp or time.perf_counter()
         try:
+            profile = self.profiles.current(self._last_event)
+            if profile is not self.profile:
+                self._switch_profile(profile)
+            if not profile.enabled:
+                return
+
             # Manejar backspace
-            if key == Key.backspace:
+            if code == EV_BACKSPACE:
                 self.is_backspacing = True
                 self.buffer.pop_char()
-                self.current_word = None  # Cancelar corrección pendiente
+                self.tickets.delete_back()  # Cancela las palabras borradas
+                self._speculate(timestamp)
                 return
 
-            if hasattr(key, 'char'):
-                self.buffer.add_char(key.char)
-                logger.debug(f"Buffer actual: {self.buffer.get_word()}")
-            elif key == Key.space and not self.is_backspacing:
+            if code in (EV_LEFT, EV_RIGHT):
+                offset = -1 if code == EV_LEFT else 1
+                if self.buffer.move_cursor(offset):
+                    self.tickets.advance(offset)
+                else:
+                    # Salir de la palabra actual invalida su contenido y posición
+                    self.buffer.clear()
+                    self.tickets.invalidate()
+                    self._speculate(timestamp)
+            elif code == EV_DELETE:
+                self.buffer.delete_char()
+                self._speculate(timestamp)
+            elif code >= 0:
+                self.buffer.add_char(chr(code))
+                self.tickets.advance()
+                self._speculate(timestamp)
+            elif code in (EV_SPACE, EV_ENTER):
+                self.tickets.advance()
+
+            if code in (EV_SPACE, EV_ENTER) and not self.is_backspacing:
                 word = self.buffer.get_word()
+                self.speculator.reset()
                 if word:
                     self.buffer.add_word(word)
                     self.buffer.clear()
                     self.total_words += 1
                     logger.debug(f"Palabra añadida: {word}")
-                    
-                    # Procesar corrección si tenemos contexto
-                    context = self.buffer.get_context()
-                    if context:
-                        self.process_correction(word, context)
-            
+
+                    if not self.token_filter.is_eligible(word):
+                        pass  # Descartada: no ocupa cola ni llamadas
+                    elif self.sentence_mode:
+                        self.sentence.append(self.tickets.issue(word))
+                    else:
+                        # Procesar corrección si tenemos contexto
+                        context = self.buffer.get_context()
+                        if context:
+                            self.process_correction(word, context)
+
+                if self.sentence_mode and (
+                    code == EV_ENTER
+                    or (word and word[-1] in SENTENCE_END)
+                    or len(self.sentence) >= self.MAX_SENTENCE_WORDS
+                ):
+                    self.flush_sentence()
+
             self.is_backspacing = False
-                
-        except AttributeError as e:
-            logger.error(f"Error en procesamiento de tecla: {e}")
+
         except Exception as e:
             logger.error(f"Error inesperado: {e}")
 
-    def apply_correction(self, original_text: str, corrected_text: str):
-        """Aplica una corrección reemplazando el texto original."""
-        if self.is_backspacing:
+    def _switch_profile(self, profile: AppProfile):
+        """
+        Cambia al perfil de otra aplicación.
+
+        Las correcciones pendientes se refieren al texto de la aplicación
+        anterior, así que sus tickets y la frase en curso se descartan.
+        """
+        logger.debug(f"Perfil activo: {profile.app}")
+        self.profile = profile
+        self.buffer = profile.buffer
+        self.tickets.invalidate()
+        self.sentence = []
+        self.speculator.reset()
+        self.speculator.namespace = profile.namespace
+
+    def _speculate(self, timestamp: float):
+        """Informa al especulador de la palabra parcial tras una edición."""
+        if self.sentence_mode:
+            return  # La especulación es por palabra: no aplica en modo frase
+        word = self.buffer.get_word()
+        if self.token_filter.classify(word) is not None:
+            word = ""  # Cancela la especulación en curso sin enviar nada
+        self.speculator.update(word, self.buffer.context_with(word), timestamp or None)
+
+    def on_idle(self):
+        """Trabajo del hilo consumidor cuando no quedan pulsaciones por procesar."""
+        self.apply_ready()
+        self.speculator.tick()
+        if self.sentence and time.perf_counter() - self._last_event >= self.sentence_pause:
+            self.flush_sentence()
+
+    def flush_sentence(self):
+        """Envía las palabras cerradas de la frase en curso en una sola tarea."""
+        # Descartar las palabras borradas o abandonadas desde que se cerraron
+        tickets = [ticket for ticket in self.sentence if ticket in self.tickets]
+        self.sentence = []
+        if not tickets:
             return
-            
-        cursor_position = len(original_text) + 1  # +1 por el espacio
-        
-        # Mover cursor atrás
-        for _ in range(cursor_position):
-            self.keyboard.press(Key.left)
-            self.keyboard.release(Key.left)
-            time.sleep(0.01)
-        
-        # Borrar texto original
-        for _ in range(len(original_text)):
-            self.keyboard.press(Key.delete)
-            self.keyboard.release(Key.delete)
-            time.sleep(0.01)
-        
-        # Escribir corrección
-        self.keyboard.type(corrected_text)
-        
-        # Volver a la posición original
-        self.keyboard.press(Key.right)
-        self.keyboard.release(Key.right)
-
-    def correction_callback(self, correction: str, was_corrected: bool):
-        """Callback para procesar el resultado de una corrección."""
-        if was_corrected and not self.is_backspacing and self.current_word:
+
+        self.corrector.batch_processor.add_sentence(
+            [ticket.word for ticket in tickets],
+            partial(self.sentence_callback, tickets),
+            priority=min(len(tickets), 5),
+            namespace=self.profile.namespace
+        )
+        self.buffer.cleanup()
+
+    def sentence_callback(self, tickets: List[CorrectionTicket], results):
+        """
+        Callback para el resultado de una frase (hilo del procesador por lotes).
+
+        Cada palabra sigue el camino normal de su ticket, de modo que la
+        frase se aplica como una serie de ediciones mínimas por palabra.
+        """
+        for ticket, (correction, was_corrected) in zip(tickets, results):
+            self.correction_callback(ticket, correction, was_corrected)
+
+    def apply_correction(self, original_text: str, corrected_text: str, trailing: int = 1):
+        """
+        Aplica una corrección reemplazando el texto original.
+
+        Args:
+            original_text: Palabra escrita
+            corrected_text: Corrección
+            trailing: Caracteres escritos desde el final de la palabra
+        """
+        result = self.injector.inject(original_text, corrected_text, trailing=trailing)
+        logger.info(
+            f"Corrección aplicada ({result.strategy}) en {result.elapsed * 1000:.1f}ms"
+        )
+
+    def correction_callback(self, ticket: CorrectionTicket, correction: str, was_corrected: bool):
+        """
+        Callback para procesar el resultado de una corrección.
+
+        Se ejecuta en el hilo del procesador por lotes: solo deja el resultado
+        en cola para que el hilo consumidor lo aplique entre pulsaciones,
+        cuando la posición del cursor está al día.
+        """
+        if was_corrected:
+            self.ready.append((ticket, correction))
+        else:
+            self.tickets.release(ticket)
+
+    def apply_ready(self):
+        """Aplica las correcciones recibidas cuyos tickets siguen vigentes."""
+        while self.ready:
+            ticket, correction = self.ready.popleft()
+            trailing = self.tickets.claim(ticket)
+            if trailing is None:
+                logger.debug(f"Corrección obsoleta descartada: {ticket.word}")
+                continue
+
             self.corrections_count += 1
             success_rate = (self.corrections_count / self.total_words) * 100 if self.total_words > 0 else 0
             
             # Notificar corrección
             self.notifier.notify(
-                f"Corrigiendo: {self.current_word} → {correction}\n"
+                f"Corrigiendo: {ticket.word} → {correction}\n"
                 f"Tasa de corrección: {success_rate:.1f}%",
                 "info",
                 "✅"
             )
             
-            # Aplicar corrección
-            self.apply_correction(self.current_word, correction)
-            self.current_word = None
+            # Aplicar corrección en su posición y desplazar los tickets posteriores
+            self.apply_correction(ticket.word, correction, trailing)
+            self.tickets.applied(ticket, correction)
 
     def process_correction(self, word: str, context: str):
         """
@@ -196,18 +511,23 @@ class KeyboardListener(IInputMonitor):
         if not word or not context:
             return
         
-        # Guardar palabra actual para el callback
-        self.current_word = word
-        
-        # Añadir tarea de corrección al procesador por lotes
-        # La prioridad se basa en la longitud del contexto
-        priority = min(len(context.split()), 5)  # Máximo 5
-        self.corrector.batch_processor.add_task(
-            word,
-            context,
-            self.correction_callback,
-            priority=priority
-        )
+        # Ticket con la posición de la palabra para aplicar el resultado
+        ticket = self.tickets.issue(word)
+        
+        callback = partial(self.correction_callback, ticket)
+        
+        # Resultado especulativo en caché o en curso para la misma palabra
+        if not self.speculator.take(word, context, callback):
+            # Añadir tarea de corrección al procesador por lotes
+            # La prioridad se basa en la longitud del contexto
+            priority = min(len(context.split()), 5)  # Máximo 5
+            self.corrector.batch_processor.add_task(
+                word,
+                context,
+                callback,
+                priority=priority,
+                namespace=self.profile.namespace
+            )
             
         # Realizar limpieza periódica del buffer
         self.buffer.cleanup()
@@ -222,7 +542,14 @@ def create_listener() -> IInputMonitor:
         container.register(ITextBuffer, OptimizedBuffer, singleton=True)
         container.register(IInputMonitor, KeyboardListener)
         
-        listener = container.resolve(IInputMonitor)
+        # Modo frase y perfiles por aplicación desde la configuración del usuario
+        from config_manager import load_config
+        config = load_config() or {}
+        listener = container.resolve(
+            IInputMonitor,
+            sentence_mode=bool(config.get('sentence_mode', False)),
+            profiles=ProfileManager.from_config(config, OptimizedBuffer)
+        )
         listener.start()
         logger.info("Monitor de teclado creado exitosamente")
         return listener
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Canal de pulsaciones fuera del hilo del hook de teclado.
+
+El callback del hook del sistema operativo solo codifica la tecla como un
+entero y la escribe en un buffer circular de un productor y un consumidor
+(SPSC) sin bloqueos. Un hilo consumidor separado hace la segmentación de
+palabras y el envío de correcciones, de modo que el hook nunca se retrasa.
+"""
+
+import threading
+import time
+from array import array
+from typing import Callable, Optional
+from logger_manager import logger
+
+# Códigos de eventos especiales (los caracteres usan su código Unicode >= 0)
+EV_SPACE = -1
+EV_BACKSPACE = -2
+EV_ENTER = -3
+EV_LEFT = -4
+EV_RIGHT = -5
+EV_DELETE = -6
+
+class SPSCRingBuffer:
+    """
+    Buffer circular de un productor y un consumidor sin bloqueos.
+
+    El productor solo escribe `tail` y el consumidor solo escribe `head`; con
+    el GIL cada escritura de un elemento de array o de un atributo entero es
+    atómica, así que no hace falta ningún lock. Si el buffer está lleno el
+    evento se descarta: el hilo del hook nunca espera.
+    """
+
+    def __init__(self, capacity: int = 4096):
+        """
+        Inicializa el buffer.
+
+        Args:
+            capacity: Número de eventos (se redondea a potencia de 2)
+        """
+        size = 1
+        while size < capacity:
+            size <<= 1
+        self.capacity = size
+        self._mask = size - 1
+        self._codes = array("q", bytes(8 * size))
+        self._times = array("d", bytes(8 * size))
+        self.head = 0  # Siguiente posición a leer (consumidor)
+        self.tail = 0  # Siguiente posición a escribir (productor)
+        self.dropped = 0
+
+    def __len__(self) -> int:
+        return self.tail - self.head
+
+    def push(self, code: int, timestamp: float) -> bool:
+        """
+        Escribe un evento (solo desde el hilo productor).
+
+        Returns:
+            bool: False si el buffer estaba lleno y el evento se descartó
+        """
+        tail = self.tail
+        if tail - self.head >= self.capacity:
+            self.dropped += 1
+            return False
+        slot = tail & self._mask
+        self._codes[slot] = code
+        self._times[slot] = timestamp
+        self.tail = tail + 1  # Publicar después de escribir el evento
+        return True
+
+    def pop(self):
+        """
+        Lee un evento (solo desde el hilo consumidor).
+
+        Returns:
+            Optional[Tuple[int, float]]: (código, timestamp) o None si está vacío
+        """
+        head = self.head
+        if head == self.tail:
+            return None
+        slot = head & self._mask
+        event = (self._codes[slot], self._times[slot])
+        self.head = head + 1
+        return event
+
+class KeystrokePipeline:
+    """
+    Canal productor/consumidor para pulsaciones de teclado.
+
+    Características:
+    - push() de coste constante, apto para el hilo del hook
+    - Hilo consumidor con espera adaptativa (sin locks en el productor)
+    - Estadísticas de eventos procesados y descartados
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[int, float], None],
+        capacity: int = 4096,
+        idle_sleep: float = 0.005,
+        idle_handler: Optional[Callable[[], None]] = None
+    ):
+        """
+        Inicializa el canal.
+
+        Args:
+            handler: Función llamada en el hilo consumidor con (código, timestamp)
+            capacity: Capacidad del buffer circular
+            idle_sleep: Espera máxima del consumidor cuando no hay eventos
+            idle_handler: Función llamada en el hilo consumidor cada vez que
+                el buffer queda vacío (todas las pulsaciones procesadas)
+        """
+        self.handler = handler
+        self.idle_handler = idle_handler
+        self.ring = SPSCRingBuffer(capacity)
+        self.idle_sleep = idle_sleep
+        self.processed = 0
+        self.running = False
+        self._thread: Optional[threading.Thread] = None
+
+    def push(self, code: int) -> bool:
+        """
+        Encola un evento. Pensado para llamarse desde el hook de teclado.
+
+        Args:
+            code: Código del carácter o evento especial (EV_*)
+
+        Returns:
+            bool: False si el evento se descartó por buffer lleno
+        """
+        return self.ring.push(code, time.perf_counter())
+
+    def start(self):
+        """Inicia el hilo consumidor."""
+        if self.running:
+            return
+        self.running = True
+        self._thread = threading.Thread(target=self._consume, daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 1.0):
+        """Detiene el hilo consumidor tras procesar los eventos pendientes."""
+        self.running = False
+        if self._thread:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+
+    def drain(self, timeout: float = 1.0) -> bool:
+        """
+        Espera a que el consumidor procese todos los eventos encolados.
+
+        Returns:
+            bool: True si el buffer quedó vacío antes del timeout
+        """
+        deadline = time.perf_counter() + timeout
+        # tail cuenta los eventos aceptados; processed, los ya manejados
+        while self.processed < self.ring.tail and time.perf_counter() < deadline:
+            time.sleep(0.001)
+        return self.processed >= self.ring.tail
+
+    def _consume(self):
+        """Loop del hilo consumidor."""
+        sleep = 0.0005
+        while self.running or len(self.ring):
+            event = self.ring.pop()
+            if event is None:
+                if self.idle_handler:
+                    try:
+                        self.idle_handler()
+                    except Exception as e:
+                        logger.error(f"Error en tarea del consumidor: {e}")
+                # Espera adaptativa: reacciona rápido tras actividad reciente
+                time.sleep(sleep)
+                sleep = min(sleep * 2, self.idle_sleep)
+                continue
+            sleep = 0.0005
+            try:
+                self.handler(*event)
+            except Exception as e:
+                logger.error(f"Error procesando pulsación: {e}")
+            self.processed += 1
+
+    def get_stats(self):
+        """Obtiene estadísticas del canal."""
+        return {
+            'pending_events': len(self.ring),
+            'processed_events': self.processed,
+            'dropped_events': self.ring.dropped,
+            'is_running': self.running
+        }
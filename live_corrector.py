@@ -1,82 +1,427 @@
+#!/usr/bin/env python3
+"""
+Corrector en vivo con un modelo local de transformers.
+
+El modelo se carga en un hilo en segundo plano después de arrancar el monitor
+de teclado, con una inferencia de calentamiento antes de marcarlo como listo.
+Mientras tanto, las correcciones las resuelve el diccionario local (patrones
+aprendidos, reglas compiladas e índice fonético). Se informa por separado del
+tiempo hasta que el monitor está listo y hasta que el modelo está listo.
+
+La re-corrección es incremental: solo se corrige una ventana acotada de frases
+alrededor de lo escrito desde el último ciclo, los ciclos sin pulsaciones
+nuevas no hacen nada y los resultados se guardan en caché por ventana.
+"""
+
 from pynput import keyboard
 from pynput.keyboard import Key, Controller
+import argparse
+import hashlib
+import json
+import re
 import time
 import threading
 import os
-from transformers import pipeline
-import torch
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
+from correction_rules import RULES, apply_case
+from phonetic_index import get_default_index
+from local_model import DEFAULT_MODEL, BACKENDS, load_backend
+from logger_manager import logger
+
+# Momento de arranque del proceso, para medir los tiempos de inicio
+STARTED_AT = time.perf_counter()
+
+MODEL_NAME = DEFAULT_MODEL
+WARMUP_TEXT = "Hola, esto es una prueba de calentamiento."
+PATTERNS_FILE = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    "learned_patterns.json"
+)
+
+# Ventana de re-corrección: frases alrededor de la región modificada
+WINDOW_SENTENCES = 2
+MAX_WINDOW_CHARS = 400
+SENTENCE_END = ".?!\n"
 
 keyboard_controller = Controller()
-text_buffer = []
 word_buffer = []
 correction_delay = 0.5
+learned_patterns: Dict[str, str] = {}
 
-# Inicializar el modelo de corrección
-corrector = pipeline(
-    "text2text-generation",
-    model="facebook/bart-large",
-    device=0 if torch.cuda.is_available() else -1
-)
+_WORD_RE = re.compile(r"[^\W\d_]+")
+
+def _build_pipeline(model_name: str, backend: str = "auto", threads: Optional[int] = None):
+    """Construye el modelo con el backend local (en CPU, int8 por defecto)."""
+    return load_backend(model_name, backend, threads)
+
+def _build_shared(model_name: str, backend: str = "auto", threads: Optional[int] = None):
+    """Usa el servidor de inferencia por lotes compartido con el TextCorrector."""
+    from inference_server import get_default_server
+
+    server = get_default_server({
+        'local_model': {'model': model_name, 'backend': backend, 'threads': threads}
+    })
+    while not server.wait(0.5):
+        if server.error is not None:
+            raise RuntimeError(server.error)
+    return server
+
+def _build_daemon(model_name: str, backend: str = "auto", threads: Optional[int] = None):
+    """
+    Corrige en el demonio de corrección (su caché y su modelo son
+    compartidos); sin demonio o sin sockets Unix, con el modelo propio.
+    """
+    from correction_daemon import connect
+
+    client = connect()
+    if client is None:
+        logger.warning("Demonio de corrección no disponible; se carga el modelo local")
+        return _build_pipeline(model_name, backend, threads)
+    return client
+
+class LazyModel:
+    """
+    Modelo de corrección cargado en segundo plano.
+
+    Características:
+    - Carga en un hilo daemon, sin bloquear el arranque
+    - Inferencia de calentamiento antes de marcarlo como listo
+    - Indicador de disponibilidad (threading.Event)
+    - Tiempos de carga y de calentamiento
+    """
+
+    def __init__(
+        self,
+        model_name: str = MODEL_NAME,
+        builder: Callable[[str], Callable] = _build_pipeline
+    ):
+        """
+        Inicializa el modelo sin cargarlo.
+
+        Args:
+            model_name: Alias o nombre del modelo a cargar
+            builder: Función que construye el pipeline a partir del nombre
+        """
+        self.model_name = model_name
+        self.builder = builder
+        self.pipeline = None
+        self.ready = threading.Event()
+        self.error: Optional[Exception] = None
+        self.load_time: Optional[float] = None
+        self.warmup_time: Optional[float] = None
+        self.ready_at: Optional[float] = None  # Segundos desde STARTED_AT
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        """Inicia la carga en segundo plano (solo la primera vez)."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._load, daemon=True)
+            self._thread.start()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Espera a que el modelo esté listo."""
+        return self.ready.wait(timeout)
+
+    def _load(self):
+        try:
+            start = time.perf_counter()
+            model = self.builder(self.model_name)
+            self.load_time = time.perf_counter() - start
+
+            # Calentar: la primera inferencia reserva memoria y compila kernels
+            start = time.perf_counter()
+            model(WARMUP_TEXT, max_length=32, do_sample=False)
+            self.warmup_time = time.perf_counter() - start
+
+            self.pipeline = model
+            self.ready_at = time.perf_counter() - STARTED_AT
+            self.ready.set()
+            logger.info(
+                f"Modelo {self.model_name} listo en {self.ready_at:.2f}s desde el inicio "
+                f"(carga {self.load_time:.2f}s, calentamiento {self.warmup_time:.2f}s)"
+            )
+        except Exception as e:
+            self.error = e
+            logger.error(f"No se pudo cargar el modelo {self.model_name}: {e}")
+
+    def correct(self, text: str) -> str:
+        """Corrige un texto con el modelo (debe estar listo)."""
+        return self.pipeline(text, max_length=100, do_sample=False)[0]['generated_text']
+
+model = LazyModel()
+
+def load_patterns() -> Dict[str, str]:
+    """Carga los patrones aprendidos por el usuario."""
+    try:
+        with open(PATTERNS_FILE, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_patterns(word: str, correction: str):
+    """Guarda un patrón aprendido."""
+    learned_patterns[word] = correction
+    try:
+        with open(PATTERNS_FILE, "w", encoding="utf-8") as f:
+            json.dump(learned_patterns, f, ensure_ascii=False, indent=2)
+    except OSError as e:
+        logger.error(f"Error guardando patrones: {e}")
+
+def dictionary_correct(text: str) -> Tuple[str, bool]:
+    """
+    Corrección palabra a palabra con el diccionario local.
+
+    Usa los patrones aprendidos, las reglas compiladas y el índice fonético;
+    conserva la puntuación, los espacios y el patrón de mayúsculas.
+
+    Args:
+        text: Texto a corregir
+
+    Returns:
+        Tuple[str, bool]: (texto corregido, si hubo cambios)
+    """
+    index = get_default_index()
+
+    def replace(match):
+        word = match.group(0)
+        lower = word.lower()
+        correction = learned_patterns.get(lower) or RULES.lookup(lower) or index.best(lower)
+        return apply_case(word, correction.lower()) if correction else word
+
+    corrected = _WORD_RE.sub(replace, text)
+    return corrected, corrected != text
 
 def ai_correct_text(text):
+    """Corrige con el modelo si está listo; si no, con el diccionario local."""
+    if not model.ready.is_set():
+        return dictionary_correct(text)
     try:
         # Generar la corrección usando el modelo
-        correction = corrector(
-            text,
-            max_length=100,
-            do_sample=False
-        )[0]['generated_text']
-        
+        correction = model.correct(text)
         return correction, correction != text
     except Exception as e:
         print(f"Error en corrección: {e}")
         return text, False
 
+def window_start(text: str, pos: int, sentences: int = WINDOW_SENTENCES) -> int:
+    """
+    Inicio de la ventana de frases que contiene una posición.
+
+    Args:
+        text: Texto completo
+        pos: Primera posición modificada
+        sentences: Frases a incluir (la de la posición y las anteriores)
+
+    Returns:
+        int: Posición donde empieza la ventana
+    """
+    lower = max(0, pos - MAX_WINDOW_CHARS)
+    found = 0
+    for i in range(min(pos, len(text)) - 1, lower - 1, -1):
+        if text[i] in SENTENCE_END:
+            found += 1
+            if found == sentences:
+                return i + 1
+    if lower == 0:
+        return 0
+    # Ventana recortada: empezar en una palabra completa
+    space = text.find(" ", lower, pos)
+    return space + 1 if space != -1 else lower
+
+class IncrementalCorrector:
+    """
+    Re-corrección incremental del texto escrito.
+
+    Características:
+    - Región modificada desde la última corrección
+    - Corrección de una ventana acotada de frases alrededor de la región
+    - Sin trabajo en los ciclos sin pulsaciones nuevas
+    - Caché de resultados por hash de la ventana
+    - Edición mínima (solo se reescribe desde el primer carácter distinto)
+    """
+
+    def __init__(
+        self,
+        correct: Callable[[str], Tuple[str, bool]],
+        inject: Callable[[int, str], None],
+        cache_size: int = 256
+    ):
+        """
+        Inicializa el corrector.
+
+        Args:
+            correct: Función que corrige una ventana de texto
+            inject: Función que borra n caracteres y escribe un texto
+            cache_size: Máximo de ventanas en caché
+        """
+        self.correct = correct
+        self.inject = inject
+        self.cache_size = cache_size
+        self.buffer: List[str] = []
+        self.dirty_from: Optional[int] = None  # Primera posición sin corregir
+        self.version = 0
+        self.cache: "OrderedDict[bytes, Tuple[str, bool]]" = OrderedDict()
+        self._corrected_version = 0
+        self._suppress = 0  # Pulsaciones propias pendientes de ignorar
+        self._lock = threading.Lock()
+        self.stats = {
+            'ticks': 0,
+            'idle_ticks': 0,
+            'cache_hits': 0,
+            'model_calls': 0,
+            'window_chars': 0,
+            'corrections': 0,
+            'stale': 0
+        }
+
+    def _touch(self, pos: int):
+        self.version += 1
+        if self.dirty_from is None or pos < self.dirty_from:
+            self.dirty_from = pos
+
+    def insert(self, char: str):
+        """Registra un carácter escrito."""
+        with self._lock:
+            if self._suppress:
+                self._suppress -= 1
+                return
+            self.buffer.append(char)
+            self._touch(len(self.buffer) - 1)
+
+    def delete(self):
+        """Registra un retroceso."""
+        with self._lock:
+            if self._suppress:
+                self._suppress -= 1
+                return
+            if self.buffer:
+                self.buffer.pop()
+            self._touch(len(self.buffer))
+
+    def text(self) -> str:
+        """Texto registrado completo."""
+        with self._lock:
+            return "".join(self.buffer)
+
+    def _window_key(self, window: str) -> bytes:
+        # El resultado depende de si el modelo ya está disponible
+        tag = b"m" if model.ready.is_set() else b"d"
+        return tag + hashlib.blake2b(window.encode("utf-8"), digest_size=16).digest()
+
+    def _cached_correct(self, window: str) -> Tuple[str, bool]:
+        key = self._window_key(window)
+        result = self.cache.get(key)
+        if result is not None:
+            self.cache.move_to_end(key)
+            self.stats['cache_hits'] += 1
+            return result
+
+        result = self.correct(window)
+        self.stats['model_calls'] += 1
+        self.stats['window_chars'] += len(window)
+        self.cache[key] = result
+        if len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+        return result
+
+    def tick(self) -> bool:
+        """
+        Un ciclo de corrección.
+
+        Returns:
+            bool: True si se reescribió texto
+        """
+        with self._lock:
+            self.stats['ticks'] += 1
+            if self.version == self._corrected_version or self.dirty_from is None:
+                self.stats['idle_ticks'] += 1
+                return False
+            version = self.version
+            dirty_from = min(self.dirty_from, len(self.buffer))
+            # Solo se une la cola del buffer, nunca todo lo escrito
+            base = max(0, dirty_from - MAX_WINDOW_CHARS)
+            tail = "".join(self.buffer[base:])
+
+        start = base + window_start(tail, dirty_from - base)
+        window = tail[start - base:]
+
+        if window.strip():
+            corrected, changed = self._cached_correct(window)
+        else:
+            corrected, changed = window, False
+
+        with self._lock:
+            if self.version != version:
+                # Llegaron pulsaciones durante la corrección: el próximo ciclo
+                # vuelve a corregir (con la caché, sin repetir la inferencia)
+                self.stats['stale'] += 1
+                return False
+
+            self._corrected_version = version
+            self.dirty_from = None
+            if not changed or corrected == window:
+                return False
+
+            prefix = 0
+            limit = min(len(window), len(corrected))
+            while prefix < limit and window[prefix] == corrected[prefix]:
+                prefix += 1
+            delete = len(window) - prefix
+            insert = corrected[prefix:]
+            self.buffer[start + prefix:] = list(insert)
+            self._suppress += delete + len(insert)
+            self.stats['corrections'] += 1
+
+        self.inject(delete, insert)
+        return True
+
+    def get_stats(self) -> Dict[str, int]:
+        """Obtiene estadísticas de la re-corrección."""
+        return dict(self.stats, cached_windows=len(self.cache))
+
+def _inject_keys(delete: int, text: str):
+    """Borra caracteres y escribe la corrección con el controlador de teclado."""
+    for _ in range(delete):
+        keyboard_controller.press(Key.backspace)
+        keyboard_controller.release(Key.backspace)
+        time.sleep(0.01)
+    keyboard_controller.type(text)
+
+corrector = IncrementalCorrector(lambda text: ai_correct_text(text), _inject_keys)
+
 def correct_text():
-    global text_buffer, word_buffer
     while True:
-        if text_buffer:
-            text = ''.join(text_buffer)
-            
-            if len(text.strip()) > 0:
-                corrected_text, needs_correction = ai_correct_text(text)
-                if needs_correction:
-                    # Borrar el texto original
-                    for _ in range(len(text)):
-                        keyboard_controller.press(Key.backspace)
-                        keyboard_controller.release(Key.backspace)
-                        time.sleep(0.01)
-                    
-                    # Escribir la corrección
-                    keyboard_controller.type(corrected_text)
-                    text_buffer = list(corrected_text)
-            
+        try:
+            corrector.tick()
+        except Exception as e:
+            print(f"Error en corrección: {e}")
         time.sleep(correction_delay)
 
 def on_press(key):
-    global text_buffer, word_buffer
+    global word_buffer
     try:
-        if hasattr(key, 'char'):
-            text_buffer.append(key.char)
+        if hasattr(key, 'char') and key.char:
+            corrector.insert(key.char)
             word_buffer.append(key.char)
         elif key == Key.space:
-            text_buffer.append(' ')
+            corrector.insert(' ')
             word_buffer = []  # Reset word buffer
         elif key == Key.backspace:
-            if text_buffer:
-                text_buffer.pop()
+            corrector.delete()
             if word_buffer:
                 word_buffer.pop()
         elif key == Key.enter:
             # Modo aprendizaje: Alt + Enter para guardar la última corrección
-            if keyboard.Key.alt in keyboard.Controller().pressed_keys:
-                if word_buffer:
-                    word = ''.join(word_buffer).lower()
-                    print(f"¿Cuál es la corrección para '{word}'?")
-                    correction = input()
-                    if correction:
-                        save_patterns(word, correction)
-                        print(f"Aprendido: {word} -> {correction}")
+            if keyboard.Key.alt not in keyboard.Controller().pressed_keys:
+                corrector.insert('\n')
+            elif word_buffer:
+                word = ''.join(word_buffer).lower()
+                print(f"¿Cuál es la corrección para '{word}'?")
+                correction = input()
+                if correction:
+                    save_patterns(word, correction)
+                    print(f"Aprendido: {word} -> {correction}")
     except AttributeError:
         pass
 
@@ -84,16 +429,63 @@ def on_release(key):
     if key == Key.esc:
         return False
 
-# Cargar patrones aprendidos
-learned_patterns = load_patterns()
+def get_startup_times() -> Dict[str, Optional[float]]:
+    """Tiempos de arranque en segundos desde el inicio del proceso."""
+    return {
+        'listener_ready': listener_ready_at,
+        'model_ready': model.ready_at,
+        'model_load': model.load_time,
+        'model_warmup': model.warmup_time
+    }
+
+listener_ready_at: Optional[float] = None
+
+def main():
+    global learned_patterns, listener_ready_at, model
+
+    parser = argparse.ArgumentParser(description="Corrector en vivo con modelo local")
+    parser.add_argument("--model", default=MODEL_NAME, help="Alias (base) o nombre del modelo")
+    parser.add_argument("--backend", default="auto", choices=("auto",) + BACKENDS)
+    parser.add_argument("--threads", type=int, default=None, help="Hilos de inferencia en CPU")
+    parser.add_argument(
+        "--shared-server", action="store_true",
+        help="Ejecutar el modelo en el servidor de inferencia por lotes"
+    )
+    parser.add_argument(
+        "--daemon", action="store_true",
+        help="Corregir en el demonio de corrección compartido"
+    )
+    args = parser.parse_args()
+
+    if args.daemon:
+        builder = _build_daemon
+    else:
+        builder = _build_shared if args.shared_server else _build_pipeline
+    model = LazyModel(
+        args.model,
+        lambda name: builder(name, args.backend, args.threads)
+    )
+
+    # Cargar patrones aprendidos
+    learned_patterns = load_patterns()
+
+    # Iniciar el hilo de corrección
+    correction_thread = threading.Thread(target=correct_text, daemon=True)
+    correction_thread.start()
 
-# Iniciar el hilo de corrección
-correction_thread = threading.Thread(target=correct_text, daemon=True)
-correction_thread.start()
+    # Iniciar el listener del teclado antes de cargar el modelo
+    with keyboard.Listener(on_press=on_press, on_release=on_release) as listener:
+        listener_ready_at = time.perf_counter() - STARTED_AT
+        model.start()
 
-print("Corrector iniciado. Presiona Alt + Enter para enseñar nuevas correcciones.")
-print("Presiona ESC para salir.")
+        print("Corrector iniciado. Presiona Alt + Enter para enseñar nuevas correcciones.")
+        print("Presiona ESC para salir.")
+        print(
+            f"Monitor listo en {listener_ready_at * 1000:.0f}ms; "
+            "el modelo se carga en segundo plano (mientras tanto, diccionario local)."
+        )
+        logger.info(f"Monitor de teclado listo en {listener_ready_at * 1000:.0f}ms")
+        listener.join()
 
-# Iniciar el listener del teclado
-with keyboard.Listener(on_press=on_press, on_release=on_release) as listener:
-    listener.join()
\ No newline at end of file
+if __name__ == "__main__":
+    main()
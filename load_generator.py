@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Generador de carga para la API HTTP local de corrección.
+
+Lanza muchos clientes concurrentes contra correction_handler.py y mide
+peticiones por segundo y percentiles de latencia. Sirve para comprobar que
+los clientes comparten lotes y caché del procesador por lotes.
+
+Modos:
+- single: una petición POST /correct por texto
+- batch: POST /correct/batch con varios textos por petición
+- stream: POST /correct/stream enviando el texto en fragmentos
+
+Uso:
+    python load_generator.py --mode batch --clients 32 --requests 500
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from typing import Any, Dict, List, Sequence
+
+DEFAULT_URL = "http://127.0.0.1:8000"
+MODES = ("single", "batch", "stream")
+
+def percentiles(
+    latencies: Sequence[float],
+    points: Sequence[int] = (50, 90, 99)
+) -> Dict[str, float]:
+    """
+    Calcula percentiles de latencia (método del rango más cercano).
+
+    Args:
+        latencies: Latencias medidas (s)
+        points: Percentiles a calcular
+
+    Returns:
+        Dict[str, float]: {"p50": ms, ...}; vacío si no hay medidas
+    """
+    ordered = sorted(latencies)
+    if not ordered:
+        return {}
+    result = {}
+    for point in points:
+        rank = max(1, -(-point * len(ordered) // 100))  # Techo de la división
+        result[f"p{point}"] = ordered[rank - 1] * 1000
+    return result
+
+async def _single(session, url: str, texts: List[str]):
+    async with session.post(f"{url}/correct", json={"text": texts[0]}) as response:
+        response.raise_for_status()
+        await response.json()
+
+async def _batch(session, url: str, texts: List[str]):
+    async with session.post(f"{url}/correct/batch", json={"texts": texts}) as response:
+        response.raise_for_status()
+        await response.json()
+
+async def _stream(session, url: str, texts: List[str]):
+    async def body():
+        for text in texts:
+            for word in text.split():
+                yield (word + " ").encode("utf-8")
+
+    async with session.post(f"{url}/correct/stream", data=body()) as response:
+        response.raise_for_status()
+        async for line in response.content:
+            if json.loads(line).get("done"):
+                break
+
+_REQUESTS = {"single": _single, "batch": _batch, "stream": _stream}
+
+async def run_load(
+    url: str,
+    mode: str,
+    texts: List[str],
+    clients: int = 16,
+    requests: int = 200,
+    batch_size: int = 8
+) -> Dict[str, Any]:
+    """
+    Ejecuta la prueba de carga.
+
+    Args:
+        url: URL base de la API
+        mode: "single", "batch" o "stream"
+        texts: Textos de prueba (se reutilizan cíclicamente)
+        clients: Peticiones simultáneas
+        requests: Total de peticiones
+        batch_size: Textos por petición en los modos batch y stream
+
+    Returns:
+        Dict[str, Any]: Peticiones/s, textos/s, errores y percentiles
+    """
+    import aiohttp
+
+    send = _REQUESTS[mode]
+    per_request = 1 if mode == "single" else batch_size
+    latencies: List[float] = []
+    errors = 0
+    counter = iter(range(requests))
+
+    async def client(session):
+        nonlocal errors
+        for i in counter:
+            chunk = [texts[(i * per_request + j) % len(texts)] for j in range(per_request)]
+            start = time.perf_counter()
+            try:
+                await send(session, url, chunk)
+                latencies.append(time.perf_counter() - start)
+            except Exception:
+                errors += 1
+
+    connector = aiohttp.TCPConnector(limit=clients)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        start = time.perf_counter()
+        await asyncio.gather(*[client(session) for _ in range(clients)])
+        elapsed = time.perf_counter() - start
+
+    done = len(latencies)
+    return {
+        'mode': mode,
+        'requests': done,
+        'errors': errors,
+        'elapsed_s': elapsed,
+        'requests_per_s': done / elapsed if elapsed else 0.0,
+        'texts_per_s': done * per_request / elapsed if elapsed else 0.0,
+        **percentiles(latencies)
+    }
+
+def print_report(result: Dict[str, Any]):
+    """Muestra el resultado de una prueba de carga."""
+    print(f"Modo: {result['mode']}")
+    print(f"Peticiones: {result['requests']} ({result['errors']} errores) en {result['elapsed_s']:.2f}s")
+    print(f"Peticiones/s: {result['requests_per_s']:.1f}")
+    print(f"Textos/s: {result['texts_per_s']:.1f}")
+    for key in ("p50", "p90", "p99"):
+        if key in result:
+            print(f"{key}: {result[key]:.1f}ms")
+
+def main():
+    parser = argparse.ArgumentParser(description="Prueba de carga de la API de corrección")
+    parser.add_argument("--url", default=DEFAULT_URL)
+    parser.add_argument("--mode", choices=MODES, default="single")
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--sentences", type=int, default=100)
+    args = parser.parse_args()
+
+    from generate_test_data import generate_load_test_data
+
+    texts = [s["input"] for s in generate_load_test_data(args.sentences)]
+    result = asyncio.run(run_load(
+        args.url, args.mode, texts, args.clients, args.requests, args.batch_size
+    ))
+    print_report(result)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,379 @@
+#!/usr/bin/env python3
+"""
+Backends de inferencia local para el corrector seq2seq.
+
+Sin CUDA, el pipeline de transformers ejecuta el modelo en precisión completa
+sobre la CPU. Este módulo ofrece alternativas optimizadas para CPU con la
+misma interfaz de llamada que el pipeline (devuelven
+[{'generated_text': ...}]):
+
+- "pytorch": pipeline original (referencia)
+- "int8": cuantización dinámica int8 de las capas lineales con PyTorch
+- "onnx": exportación a ONNX Runtime (vía optimum), opcionalmente cuantizada
+
+Los dos últimos admiten parada temprana por secuencia: la generación de cada
+texto termina en cuanto contiene la palabra objetivo.
+
+También permite elegir otro modelo de Hugging Face por nombre y ajustar el
+número de hilos. Ejecutado como script, compara latencia, rendimiento y
+memoria residente de los backends con las frases de prueba de carga.
+"""
+
+import argparse
+import multiprocessing
+import os
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, List, Optional
+from prompt_protocol import response_complete
+from logger_manager import logger
+
+# Modelos disponibles por alias
+MODELS = {
+    "base": "facebook/bart-large",
+}
+DEFAULT_MODEL = "base"
+
+BACKENDS = ("pytorch", "int8", "onnx")
+
+def resolve_model(name: str) -> str:
+    """Traduce un alias de modelo al nombre de Hugging Face."""
+    return MODELS.get(name, name)
+
+def cuda_available() -> bool:
+    """Indica si hay CUDA disponible (sin torch, no)."""
+    try:
+        import torch
+        return torch.cuda.is_available()
+    except ImportError:
+        return False
+
+def resolve_backend(backend: str = "auto", cuda: Optional[bool] = None) -> str:
+    """
+    Elige el backend efectivo.
+
+    Args:
+        backend: "auto" o uno de BACKENDS
+        cuda: Si hay GPU (None = detectar)
+
+    Returns:
+        str: "pytorch" con GPU; "int8" en CPU si se pidió "auto"
+    """
+    if backend == "auto":
+        cuda = cuda_available() if cuda is None else cuda
+        return "pytorch" if cuda else "int8"
+    if backend not in BACKENDS:
+        raise ValueError(f"Backend desconocido: {backend} (opciones: {', '.join(BACKENDS)})")
+    return backend
+
+def default_threads() -> int:
+    """
+    Número de hilos de inferencia por defecto: los núcleos físicos.
+
+    Con hiperthreading, usar todos los hilos lógicos suele empeorar la
+    latencia de las multiplicaciones de matrices.
+    """
+    try:
+        import psutil
+        physical = psutil.cpu_count(logical=False)
+    except ImportError:
+        physical = None
+    return max(1, physical or os.cpu_count() or 1)
+
+def configure_threads(threads: Optional[int] = None) -> int:
+    """
+    Ajusta los hilos de PyTorch.
+
+    Args:
+        threads: Hilos intra-operación (None = núcleos físicos)
+
+    Returns:
+        int: Hilos configurados
+    """
+    import torch
+
+    threads = threads or default_threads()
+    torch.set_num_threads(threads)
+    try:
+        torch.set_num_interop_threads(1)
+    except RuntimeError:
+        pass  # Solo se puede fijar antes de la primera operación paralela
+    return threads
+
+def _span_stopping(tokenizer, prompts: List):
+    """
+    Criterio de parada por secuencia: cada salida se da por terminada en
+    cuanto contiene el tramo de su palabra objetivo (ver response_complete).
+    """
+    import torch
+    from transformers import StoppingCriteria
+
+    class SpanStopping(StoppingCriteria):
+        def __call__(self, input_ids, scores, **kwargs):
+            done = []
+            for ids, prompt in zip(input_ids, prompts):
+                if prompt is None:
+                    done.append(False)
+                    continue
+                text = tokenizer.decode(ids, skip_special_tokens=True)
+                # El espacio final cierra la última palabra decodificada
+                done.append(response_complete(prompt, text + " ") is not None)
+            return torch.tensor(done, dtype=torch.bool, device=input_ids.device)
+
+    return SpanStopping()
+
+class Seq2SeqCorrector:
+    """
+    Modelo seq2seq con la interfaz de llamada del pipeline de transformers.
+
+    Características:
+    - Tokenizador y generación sin la capa de pipeline
+    - Generación voraz sin gradientes (torch.inference_mode)
+    - Corrección por lotes
+    - Parada temprana por secuencia al decodificar la palabra objetivo
+    """
+
+    supports_early_exit = True
+
+    def __init__(self, model, tokenizer, backend: str, threads: int):
+        """
+        Inicializa el corrector.
+
+        Args:
+            model: Modelo seq2seq (PyTorch u ONNX Runtime vía optimum)
+            tokenizer: Tokenizador del modelo
+            backend: Backend usado
+            threads: Hilos de inferencia
+        """
+        self.model = model
+        self.tokenizer = tokenizer
+        self.backend = backend
+        self.threads = threads
+
+    def generate(
+        self,
+        texts: List[str],
+        max_length: int = 100,
+        prompts: Optional[List] = None
+    ) -> List[str]:
+        """
+        Corrige un lote de textos.
+
+        Args:
+            texts: Textos a corregir
+            max_length: Longitud máxima de la salida en tokens
+            prompts: CorrectionPrompt por texto (o None) para parar la
+                generación en cuanto la palabra objetivo esté decodificada
+
+        Returns:
+            List[str]: Textos corregidos
+        """
+        import torch
+        from transformers import StoppingCriteriaList
+
+        kwargs = {}
+        if prompts and any(prompts):
+            kwargs['stopping_criteria'] = StoppingCriteriaList([
+                _span_stopping(self.tokenizer, prompts)
+            ])
+
+        inputs = self.tokenizer(texts, return_tensors="pt", padding=True, truncation=True)
+        with torch.inference_mode():
+            output = self.model.generate(
+                **inputs, max_length=max_length, num_beams=1, do_sample=False, **kwargs
+            )
+        outputs = self.tokenizer.batch_decode(output, skip_special_tokens=True)
+        if prompts:
+            outputs = [
+                (response_complete(prompt, out + " ") if prompt is not None else None) or out
+                for out, prompt in zip(outputs, prompts)
+            ]
+        return outputs
+
+    def __call__(self, text, max_length: int = 100, prompts: Optional[List] = None, **kwargs):
+        texts = [text] if isinstance(text, str) else list(text)
+        return [{'generated_text': out} for out in self.generate(texts, max_length, prompts)]
+
+def _load_pytorch(model_name: str, threads: int, quantize: bool):
+    import torch
+    from transformers import AutoModelForSeq2SeqLM, AutoTokenizer
+
+    configure_threads(threads)
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+    model = AutoModelForSeq2SeqLM.from_pretrained(model_name)
+    model.eval()
+    if quantize:
+        # Pesos int8 en las capas lineales; activaciones cuantizadas al vuelo
+        model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    return model, tokenizer
+
+def _load_onnx(model_name: str, threads: int, quantize: bool):
+    import onnxruntime
+    from optimum.onnxruntime import ORTModelForSeq2SeqLM
+    from transformers import AutoTokenizer
+
+    options = onnxruntime.SessionOptions()
+    options.intra_op_num_threads = threads
+    options.inter_op_num_threads = 1
+    options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+    model = ORTModelForSeq2SeqLM.from_pretrained(
+        model_name, export=True, session_options=options, provider="CPUExecutionProvider"
+    )
+    if quantize:
+        model = _quantize_onnx(model, options)
+    return model, tokenizer
+
+def _quantize_onnx(model, options):
+    import tempfile
+    from optimum.onnxruntime import ORTModelForSeq2SeqLM, ORTQuantizer
+    from optimum.onnxruntime.configuration import AutoQuantizationConfig
+
+    export_dir = tempfile.mkdtemp(prefix="dyslexiless_onnx_")
+    model.save_pretrained(export_dir)
+    config = AutoQuantizationConfig.avx2(is_static=False, per_channel=False)
+    for part in ("encoder_model", "decoder_model", "decoder_with_past_model"):
+        path = os.path.join(export_dir, f"{part}.onnx")
+        if os.path.exists(path):
+            ORTQuantizer.from_pretrained(export_dir, file_name=f"{part}.onnx").quantize(
+                save_dir=export_dir, quantization_config=config
+            )
+    return ORTModelForSeq2SeqLM.from_pretrained(
+        export_dir,
+        encoder_file_name="encoder_model_quantized.onnx",
+        decoder_file_name="decoder_model_quantized.onnx",
+        decoder_with_past_file_name="decoder_with_past_model_quantized.onnx",
+        session_options=options,
+        provider="CPUExecutionProvider"
+    )
+
+def load_backend(
+    model_name: str = DEFAULT_MODEL,
+    backend: str = "auto",
+    threads: Optional[int] = None,
+    quantize_onnx: bool = True
+) -> Callable:
+    """
+    Carga el modelo con el backend indicado.
+
+    Args:
+        model_name: Alias de MODELS o nombre de Hugging Face
+        backend: "auto" o uno de BACKENDS
+        threads: Hilos de inferencia (None = núcleos físicos)
+        quantize_onnx: Cuantizar a int8 el modelo exportado a ONNX
+
+    Returns:
+        Callable: Corrector con la interfaz del pipeline
+    """
+    model_name = resolve_model(model_name)
+    backend = resolve_backend(backend)
+    threads = threads or default_threads()
+
+    if backend == "pytorch":
+        from transformers import pipeline
+
+        cuda = cuda_available()
+        if not cuda:
+            configure_threads(threads)
+        logger.info(f"Cargando {model_name} (pytorch, {'GPU' if cuda else f'{threads} hilos'})")
+        return pipeline("text2text-generation", model=model_name, device=0 if cuda else -1)
+
+    logger.info(f"Cargando {model_name} ({backend}, {threads} hilos)")
+    if backend == "int8":
+        model, tokenizer = _load_pytorch(model_name, threads, quantize=True)
+    else:
+        model, tokenizer = _load_onnx(model_name, threads, quantize_onnx)
+    return Seq2SeqCorrector(model, tokenizer, backend, threads)
+
+def rss_mb() -> float:
+    """Memoria residente del proceso en MB."""
+    import psutil
+    return psutil.Process().memory_info().rss / 1024 / 1024
+
+def benchmark_backend(
+    loader: Callable[[], Callable],
+    sentences: List[str],
+    batch_size: int = 8,
+    max_length: int = 100
+) -> Dict[str, float]:
+    """
+    Mide un backend con las frases de prueba.
+
+    El backend se carga, se calienta con una frase y después se mide la
+    latencia por frase (una a una), el rendimiento por lotes y la memoria
+    residente añadida por el modelo.
+
+    Args:
+        loader: Función que carga el backend
+        sentences: Frases de prueba
+        batch_size: Tamaño de lote para el rendimiento
+        max_length: Longitud máxima de la salida
+
+    Returns:
+        Dict[str, float]: Métricas del backend
+    """
+    rss_before = rss_mb()
+    start = time.perf_counter()
+    model = loader()
+    load_time = time.perf_counter() - start
+    model(sentences[0], max_length=max_length)  # Calentamiento
+
+    latencies = []
+    for sentence in sentences:
+        start = time.perf_counter()
+        model(sentence, max_length=max_length)
+        latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for i in range(0, len(sentences), batch_size):
+        model(sentences[i:i + batch_size], max_length=max_length)
+    batch_time = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        'load_s': load_time,
+        'p50_ms': statistics.median(latencies) * 1000,
+        'p95_ms': latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] * 1000,
+        'throughput': len(sentences) / batch_time if batch_time else float("inf"),
+        'rss_mb': rss_mb() - rss_before
+    }
+
+def _benchmark_isolated(model_name, backend, threads, sentences, batch_size):
+    # En un proceso nuevo, para que la memoria de un backend no afecte al siguiente
+    return benchmark_backend(
+        lambda: load_backend(model_name, backend, threads), sentences, batch_size
+    )
+
+def print_benchmark(results: Dict[str, Dict[str, float]]):
+    """Muestra la comparación de backends."""
+    print(f"{'Backend':<20} {'Carga':>8} {'p50':>9} {'p95':>9} {'Frases/s':>9} {'RSS':>9}")
+    for name, r in results.items():
+        print(
+            f"{name:<20} {r['load_s']:>7.1f}s {r['p50_ms']:>7.1f}ms {r['p95_ms']:>7.1f}ms "
+            f"{r['throughput']:>9.2f} {r['rss_mb']:>7.0f}MB"
+        )
+
+def main():
+    parser = argparse.ArgumentParser(description="Comparativa de backends de inferencia local")
+    parser.add_argument("--model", default=DEFAULT_MODEL, help="Alias (base) o nombre del modelo")
+    parser.add_argument("--backends", default=",".join(BACKENDS), help="Backends a comparar")
+    parser.add_argument("--threads", type=int, default=None, help="Hilos de inferencia")
+    parser.add_argument("--sentences", type=int, default=50, help="Frases de prueba")
+    parser.add_argument("--batch-size", type=int, default=8)
+    args = parser.parse_args()
+
+    from generate_test_data import generate_load_test_data
+
+    sentences = [s["input"] for s in generate_load_test_data(args.sentences)]
+    results = {}
+    for backend in args.backends.split(","):
+        with ProcessPoolExecutor(1, mp_context=multiprocessing.get_context("spawn")) as pool:
+            results[f"{backend}:{args.model}"] = pool.submit(
+                _benchmark_isolated, args.model, backend, args.threads, sentences, args.batch_size
+            ).result()
+    print_benchmark(results)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Lectura de corpus grandes con archivos mapeados en memoria.
+
+El archivo se mapea (mmap) en lugar de leerse: los límites de bloque, de
+párrafo y de frase se buscan directamente sobre el mapa, sin copiar bytes, y
+cada frase se describe por su rango (inicio, fin). Los procesos del pool
+mapean el mismo archivo y reciben solo rangos, de modo que el texto no se
+copia ni se serializa entre procesos; cada uno obtiene un memoryview del
+rango y solo decodifica lo que corrige.
+
+Las páginas ya procesadas se devuelven al sistema (madvise), así que la
+memoria residente no depende del tamaño del archivo.
+"""
+
+import mmap
+import os
+import re
+from typing import Iterator, Optional, Tuple
+
+# Una frase termina en . ? ! seguidos de espacio, o en un salto de línea
+SEPARATOR_RE = re.compile(rb"(?<=[.?!])[ \t]+|\s*\n\s*")
+
+# Cortes de bloque, de mejor a peor: párrafo, línea, frase, espacio
+_BLOCK_CUTS = (
+    re.compile(rb"\n\s*\n"),
+    re.compile(rb"\n"),
+    re.compile(rb"[.?!][ \t]+"),
+    re.compile(rb"[ \t]+")
+)
+
+def iter_segments(buffer, start: int, end: int) -> Iterator[Tuple[int, int, int]]:
+    """
+    Frases de un rango del buffer, sin copiarlo.
+
+    Args:
+        buffer: mmap, bytes o memoryview
+        start: Inicio del rango
+        end: Fin del rango
+
+    Yields:
+        Tuple[int, int, int]: (inicio, fin de la frase, fin del separador
+        que la sigue); los rangos cubren el buffer sin huecos
+    """
+    position = start
+    for match in SEPARATOR_RE.finditer(buffer, start, end):
+        yield position, match.start(), match.end()
+        position = match.end()
+    if position < end:
+        yield position, end, end
+
+def _utf8_boundary(buffer, position: int, start: int) -> int:
+    """Retrocede hasta el inicio de un carácter UTF-8."""
+    while position > start and (buffer[position] & 0xC0) == 0x80:
+        position -= 1
+    return position
+
+class MappedFile:
+    """
+    Archivo de texto mapeado en memoria, de solo lectura.
+
+    Características:
+    - Sin lectura completa: el sistema carga las páginas bajo demanda
+    - Bloques cortados en párrafos, líneas o frases, nunca a mitad de un
+      carácter UTF-8
+    - Rangos como memoryview sin copia
+    - Liberación de las páginas ya procesadas
+    """
+
+    def __init__(self, path: str):
+        """
+        Mapea un archivo.
+
+        Args:
+            path: Archivo a mapear
+        """
+        self.path = path
+        self._file = open(path, "rb")
+        self.size = os.fstat(self._file.fileno()).st_size
+        # Un archivo vacío no se puede mapear
+        self._map: Optional[mmap.mmap] = (
+            mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if self.size else None
+        )
+        self.buffer = self._map if self._map is not None else b""
+        self._view = memoryview(self.buffer)
+
+    def __enter__(self) -> "MappedFile":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self) -> int:
+        return self.size
+
+    def view(self, start: int, end: int) -> memoryview:
+        """Rango del archivo como memoryview (sin copia)."""
+        return self._view[start:end]
+
+    def text(self, start: int, end: int) -> str:
+        """Rango del archivo decodificado (la única copia)."""
+        return str(self._view[start:end], "utf-8", "replace")
+
+    def blocks(self, start: int = 0, block_bytes: int = 1 << 20) -> Iterator[Tuple[int, int]]:
+        """
+        Divide el archivo en bloques de unos block_bytes.
+
+        Cada bloque termina en el primer final de párrafo tras block_bytes;
+        si no lo hay cerca, en un final de línea, luego de frase, luego en un
+        espacio (por delante o, si no, por detrás) y, en último caso, en el
+        límite de carácter más cercano.
+
+        Args:
+            start: Posición inicial (p. ej., la del punto de control)
+            block_bytes: Tamaño aproximado de los bloques
+
+        Yields:
+            Tuple[int, int]: (inicio, fin) de cada bloque
+        """
+        buffer = self.buffer
+        while start < self.size:
+            target = start + block_bytes
+            if target >= self.size:
+                yield start, self.size
+                return
+            limit = min(self.size, target + block_bytes)
+            end = None
+            for cut in _BLOCK_CUTS:
+                match = cut.search(buffer, target, limit)
+                if match:
+                    end = match.end()
+                    break
+            if end is None:
+                # Sin cortes por delante: el último espacio anterior o, si
+                # tampoco lo hay, el límite de carácter
+                back = max(buffer.rfind(b"\n", start, target), buffer.rfind(b" ", start, target))
+                end = back + 1 if back > start else _utf8_boundary(buffer, target, start)
+            yield start, end
+            start = end
+
+    def release(self, start: int, end: int):
+        """
+        Devuelve al sistema las páginas de un rango ya procesado.
+
+        Las páginas se vuelven a cargar del archivo si se leen de nuevo; sin
+        madvise (p. ej., en Windows) no hace nada.
+        """
+        if self._map is None or not hasattr(self._map, "madvise"):
+            return
+        page = mmap.PAGESIZE
+        first = start - start % page
+        length = min(self.size, end) - first
+        if length > 0:
+            self._map.madvise(mmap.MADV_DONTNEED, first, length)
+
+    def close(self):
+        """Cierra el mapa (no debe quedar ningún memoryview en uso)."""
+        self._view.release()
+        if self._map is not None:
+            self._map.close()
+        self._file.close()
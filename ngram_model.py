@@ -0,0 +1,462 @@
+#!/usr/bin/env python3
+"""
+Modelo de lenguaje de n-gramas de palabras para ordenar candidatos según el
+contexto, sin necesidad de llamar a un LLM.
+
+El modelo es un trigrama con backoff ("stupid backoff") cuyas probabilidades
+se cuantizan a 8 bits. Se guarda como arrays ordenados de hashes de 64 bits,
+de modo que puede cargarse con mmap sin copiar datos y consultarse con
+búsqueda binaria.
+
+Uso del constructor:
+    python ngram_model.py corpus.txt -o resources/ngram_es.bin
+
+El modelo incluido se construye con el corpus de resources/corpus_es.txt
+(make ngram-model); si falta el archivo, se construye en memoria la primera
+vez que se usa.
+"""
+
+import argparse
+import bisect
+import hashlib
+import math
+import mmap
+import os
+import re
+import struct
+import sys
+from array import array
+from collections import Counter
+from threading import Lock
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from logger_manager import logger
+
+# Modelo por defecto, generado con el constructor a partir de DEFAULT_CORPUS
+DEFAULT_MODEL = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    "resources",
+    "ngram_es.bin"
+)
+DEFAULT_CORPUS = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    "resources",
+    "corpus_es.txt"
+)
+
+MAGIC = b"DLNG"
+VERSION = 1
+ORDER = 3
+HEADER = struct.Struct("<4sHH3Q")
+
+# Cuantización de log10(p) en 256 niveles sobre [LOG_FLOOR, 0]
+LOG_FLOOR = -7.0
+BACKOFF = math.log10(0.4)
+SENTENCE_START = "<s>"
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+_SENTENCE_END_RE = re.compile(r"[.!?¡¿\n]+")
+
+def tokenize(text: str) -> List[str]:
+    """
+    Divide un texto en palabras normalizadas.
+
+    Args:
+        text: Texto a dividir
+
+    Returns:
+        List[str]: Palabras en minúsculas
+    """
+    return _TOKEN_RE.findall(text.lower())
+
+def ngram_hash(ngram: str) -> int:
+    """
+    Hash estable de 64 bits de un n-grama (independiente de PYTHONHASHSEED).
+
+    Args:
+        ngram: Palabras separadas por espacios
+
+    Returns:
+        int: Hash sin signo de 64 bits
+    """
+    digest = hashlib.blake2b(ngram.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+def quantize(log_prob: float) -> int:
+    """Cuantiza un log10(p) a un byte."""
+    clamped = min(0.0, max(LOG_FLOOR, log_prob))
+    return int(round(clamped / LOG_FLOOR * 255))
+
+def dequantize(value: int) -> float:
+    """Recupera el log10(p) aproximado de un byte cuantizado."""
+    return value * LOG_FLOOR / 255
+
+class NgramModel:
+    """
+    Modelo de trigramas cuantizado y respaldado por arrays.
+
+    Características:
+    - Claves: hashes de 64 bits ordenados (búsqueda binaria)
+    - Valores: log10(p) cuantizado a un byte
+    - Carga por mmap sin copiar los arrays
+    - Backoff trigrama → bigrama → unigrama
+    """
+
+    def __init__(self, tables: Sequence[Tuple[Sequence[int], Sequence[int]]]):
+        """
+        Inicializa el modelo.
+
+        Args:
+            tables: Para cada orden (1..3), par (hashes ordenados, valores)
+        """
+        if len(tables) != ORDER:
+            raise ValueError(f"Se esperaban {ORDER} tablas, recibidas {len(tables)}")
+        self.tables = list(tables)
+        self._mmap: Optional[mmap.mmap] = None
+        self._file = None
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_MODEL) -> "NgramModel":
+        """
+        Carga un modelo con mmap, sin copiar los arrays a memoria.
+
+        Args:
+            path: Ruta del archivo del modelo
+
+        Returns:
+            NgramModel: Modelo cargado
+
+        Raises:
+            ValueError: Si el archivo no es un modelo válido
+        """
+        f = open(path, "rb")
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, order, *counts = HEADER.unpack_from(mapped, 0)
+        if magic != MAGIC or version != VERSION or order != ORDER:
+            mapped.close()
+            f.close()
+            raise ValueError(f"Modelo de n-gramas inválido: {path}")
+
+        view = memoryview(mapped)
+        offset = HEADER.size
+        tables = []
+        for count in counts:
+            keys = view[offset:offset + 8 * count].cast("Q")
+            offset += 8 * count
+            values = view[offset:offset + count]
+            offset += count + (-count % 8)  # Alinear a 8 bytes
+            tables.append((keys, values))
+
+        model = cls(tables)
+        model._mmap = mapped
+        model._file = f
+        logger.info(
+            f"Modelo de n-gramas cargado: {path} "
+            f"({', '.join(str(c) for c in counts)} n-gramas)"
+        )
+        return model
+
+    def save(self, path: str):
+        """
+        Guarda el modelo en formato binario compatible con mmap.
+
+        Args:
+            path: Ruta de destino
+        """
+        with open(path, "wb") as f:
+            f.write(HEADER.pack(
+                MAGIC, VERSION, ORDER, *(len(keys) for keys, _ in self.tables)
+            ))
+            for keys, values in self.tables:
+                f.write(array("Q", keys).tobytes())
+                f.write(bytes(values))
+                f.write(b"\0" * (-len(values) % 8))
+
+    def close(self):
+        """Libera el mapeo de memoria."""
+        if self._mmap is not None:
+            self.tables = []
+            self._mmap.close()
+            self._file.close()
+            self._mmap = None
+
+    def _lookup(self, order: int, ngram: str) -> Optional[float]:
+        """Busca el log10(p) de un n-grama del orden indicado."""
+        keys, values = self.tables[order - 1]
+        key = ngram_hash(ngram)
+        pos = bisect.bisect_left(keys, key)
+        if pos < len(keys) and keys[pos] == key:
+            return dequantize(values[pos])
+        return None
+
+    def score(self, word: str, history: Sequence[str] = ()) -> float:
+        """
+        Puntúa una palabra dado su historial con stupid backoff.
+
+        Args:
+            word: Palabra candidata
+            history: Palabras anteriores (se usan las dos últimas)
+
+        Returns:
+            float: log10 de la puntuación (mayor es mejor)
+        """
+        word = word.lower()
+        history = [w.lower() for w in history[-(ORDER - 1):]]
+        penalty = 0.0
+        for start in range(len(history) + 1):
+            ngram = " ".join(history[start:] + [word])
+            log_prob = self._lookup(len(history) - start + 1, ngram)
+            if log_prob is not None:
+                return log_prob + penalty
+            penalty += BACKOFF
+        return LOG_FLOOR + penalty
+
+    def rank(
+        self,
+        candidates: Iterable[str],
+        context: str,
+        word: Optional[str] = None
+    ) -> List[Tuple[str, float]]:
+        """
+        Ordena candidatos según el contexto.
+
+        Args:
+            candidates: Candidatos a ordenar
+            context: Contexto tal como lo devuelve OptimizedBuffer.get_context
+            word: Palabra original; si el contexto termina con ella, se excluye
+                del historial
+
+        Returns:
+            List[Tuple[str, float]]: Pares (candidato, puntuación) de mejor a peor
+        """
+        history = tokenize(context) if context else []
+        if word and history and history[-1] == word.lower():
+            history = history[:-1]
+        if not history:
+            history = [SENTENCE_START]
+        scored = [(c, self.score(c, history)) for c in candidates]
+        scored.sort(key=lambda item: -item[1])
+        return scored
+
+    def best(
+        self,
+        candidates: Sequence[str],
+        context: str,
+        word: Optional[str] = None
+    ) -> Optional[str]:
+        """
+        Mejor candidato según el contexto.
+
+        Returns:
+            Optional[str]: Candidato con mayor puntuación o None si no hay
+        """
+        if not candidates:
+            return None
+        return self.rank(candidates, context, word)[0][0]
+
+class NgramBuilder:
+    """
+    Constructor de modelos por streaming.
+    Lee el corpus línea a línea y poda los n-gramas raros si la tabla crece
+    demasiado, para mantener la memoria acotada.
+    """
+
+    def __init__(self, min_count: int = 1, max_entries: int = 5_000_000):
+        """
+        Inicializa el constructor.
+
+        Args:
+            min_count: Frecuencia mínima para conservar un n-grama
+            max_entries: Entradas máximas antes de podar n-gramas únicos
+        """
+        self.min_count = min_count
+        self.max_entries = max_entries
+        self.counts: List[Dict[str, int]] = [{} for _ in range(ORDER)]
+        self.total_tokens = 0
+
+    def add_sentence(self, tokens: Sequence[str]):
+        """
+        Cuenta los n-gramas de una oración.
+
+        Args:
+            tokens: Palabras de la oración
+        """
+        if not tokens:
+            return
+        padded = [SENTENCE_START] * (ORDER - 1) + list(tokens)
+        for i in range(ORDER - 1, len(padded)):
+            for n in range(1, ORDER + 1):
+                ngram = " ".join(padded[i - n + 1:i + 1])
+                table = self.counts[n - 1]
+                table[ngram] = table.get(ngram, 0) + 1
+        self.total_tokens += len(tokens)
+
+        # Contexto de inicio para los bigramas/trigramas iniciales
+        for n in range(1, ORDER):
+            start = " ".join([SENTENCE_START] * n)
+            table = self.counts[n - 1]
+            table[start] = table.get(start, 0) + 1
+
+        if sum(len(t) for t in self.counts) > self.max_entries:
+            self._prune()
+
+    def feed(self, lines: Iterable[str]):
+        """
+        Procesa un corpus en streaming.
+
+        Args:
+            lines: Líneas de texto (p. ej. un archivo abierto)
+        """
+        for line in lines:
+            for sentence in _SENTENCE_END_RE.split(line):
+                self.add_sentence(tokenize(sentence))
+
+    def _prune(self):
+        """
+        Elimina los n-gramas más raros hasta dejar la mitad de max_entries.
+
+        El umbral se calcula con el histograma de frecuencias, de modo que
+        una sola pasada basta y la poda no se repite en cada oración. Es el
+        mismo para todos los órdenes: un prefijo es al menos tan frecuente
+        como sus n-gramas, así que nunca se poda el de uno que se conserva.
+        """
+        before = sum(len(t) for t in self.counts)
+        histogram = Counter(count for table in self.counts for count in table.values())
+        target = self.max_entries // 2
+        remaining, threshold = before, 0
+        for count in sorted(histogram):
+            if remaining <= target:
+                break
+            remaining -= histogram[count]
+            threshold = count
+        for table in self.counts:
+            for ngram in [k for k, v in table.items() if v <= threshold]:
+                del table[ngram]
+        logger.debug(
+            f"Poda de n-gramas (frecuencia <= {threshold}): "
+            f"{before} → {sum(len(t) for t in self.counts)}"
+        )
+
+    def build(self) -> NgramModel:
+        """
+        Calcula las probabilidades y genera el modelo.
+
+        Returns:
+            NgramModel: Modelo en memoria
+        """
+        unigrams = self.counts[0]
+        total = max(1, self.total_tokens)
+        tables = []
+        for n, table in enumerate(self.counts, start=1):
+            entries = []
+            for ngram, count in table.items():
+                if count < self.min_count:
+                    continue
+                if n == 1:
+                    denominator = total
+                else:
+                    prefix = ngram.rsplit(" ", 1)[0]
+                    denominator = self.counts[n - 2].get(prefix, 0)
+                    if not denominator:
+                        continue
+                log_prob = math.log10(min(1.0, count / denominator))
+                entries.append((ngram_hash(ngram), quantize(log_prob)))
+            entries.sort()
+            tables.append((
+                array("Q", (k for k, _ in entries)),
+                bytes(v for _, v in entries)
+            ))
+        logger.info(f"Modelo construido a partir de {total} palabras")
+        return NgramModel(tables)
+
+_default_model: Optional[NgramModel] = None
+_default_loaded = False
+_default_lock = Lock()
+
+def build_default_model(corpus: str = DEFAULT_CORPUS) -> NgramModel:
+    """
+    Construye el modelo por defecto a partir del corpus incluido.
+
+    Args:
+        corpus: Archivo de texto del corpus
+
+    Returns:
+        NgramModel: Modelo en memoria
+    """
+    builder = NgramBuilder(min_count=1)
+    with open(corpus, "r", encoding="utf-8") as f:
+        builder.feed(f)
+    return builder.build()
+
+def get_default_model() -> Optional[NgramModel]:
+    """
+    Obtiene el modelo por defecto.
+    Se carga una sola vez, bajo demanda; si no se ha generado el archivo,
+    se construye en memoria con el corpus incluido.
+
+    Returns:
+        Optional[NgramModel]: Modelo compartido o None si no hay ni modelo
+        ni corpus
+    """
+    global _default_model, _default_loaded
+    if not _default_loaded:
+        with _default_lock:
+            if not _default_loaded:
+                try:
+                    if os.path.exists(DEFAULT_MODEL):
+                        _default_model = NgramModel.load(DEFAULT_MODEL)
+                    elif os.path.exists(DEFAULT_CORPUS):
+                        _default_model = build_default_model()
+                except Exception as e:
+                    logger.error(f"Error cargando modelo de n-gramas: {e}")
+                _default_loaded = True
+    return _default_model
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Entrena un modelo de n-gramas a partir de un corpus de texto"
+    )
+
+    parser.add_argument(
+        "corpus",
+        nargs="+",
+        help="Archivos de texto del corpus ('-' para entrada estándar)"
+    )
+
+    parser.add_argument(
+        "-o", "--output",
+        default=DEFAULT_MODEL,
+        help="Archivo de salida del modelo"
+    )
+
+    parser.add_argument(
+        "--min-count",
+        type=int,
+        default=2,
+        help="Frecuencia mínima para conservar un n-grama"
+    )
+
+    parser.add_argument(
+        "--max-entries",
+        type=int,
+        default=5_000_000,
+        help="Entradas máximas en memoria antes de podar"
+    )
+
+    args = parser.parse_args()
+
+    builder = NgramBuilder(min_count=args.min_count, max_entries=args.max_entries)
+    for path in args.corpus:
+        print(f"Procesando {path}...")
+        if path == "-":
+            builder.feed(sys.stdin)
+        else:
+            with open(path, "r", encoding="utf-8", errors="replace") as f:
+                builder.feed(f)
+
+    model = builder.build()
+    model.save(args.output)
+    sizes = ", ".join(str(len(keys)) for keys, _ in model.tables)
+    print(f"Modelo guardado en {args.output} ({sizes} n-gramas)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,352 @@
+#!/usr/bin/env python3
+"""
+Índice fonético para errores de escritura típicos de la dislexia en español.
+Agrupa las confusiones fonéticas (b/v, c/s/z, ll/y, h muda, qu/k...) bajo una
+misma clave, de modo que los candidatos de una palabra mal escrita se obtienen
+con una sola búsqueda en un diccionario.
+"""
+
+import os
+import unicodedata
+from dataclasses import dataclass
+from threading import Lock
+from typing import Dict, Iterable, List, Optional, Set
+from logger_manager import logger
+
+# Léxico por defecto, ordenado por frecuencia de uso
+DEFAULT_LEXICON = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    "resources",
+    "lexicon_es.txt"
+)
+
+# Tamaño mínimo para que el léxico sirva de juez: en uno menor, una palabra
+# ausente suele ser una palabra correcta poco frecuente ("perro", "ola"),
+# no una falta
+COMPLETE_LEXICON_SIZE = 50000
+
+_VOWELS = "aeiou"
+
+def strip_accents(text: str) -> str:
+    """
+    Elimina tildes y diéresis conservando la ñ.
+
+    Args:
+        text: Texto a normalizar
+
+    Returns:
+        str: Texto sin tildes
+    """
+    text = text.replace("ñ", "\0")
+    decomposed = unicodedata.normalize("NFD", text)
+    stripped = "".join(c for c in decomposed if unicodedata.category(c) != "Mn")
+    return stripped.replace("\0", "ñ")
+
+def phonetic_key(word: str) -> str:
+    """
+    Calcula la clave fonética de una palabra en español.
+
+    Dos palabras que se pronuncian igual (p. ej. "aser" y "hacer", "boy" y
+    "voy", "ai" y "hay") producen la misma clave.
+
+    Args:
+        word: Palabra a codificar
+
+    Returns:
+        str: Clave fonética
+    """
+    w = strip_accents(word.lower())
+    out: List[str] = []
+    i = 0
+    n = len(w)
+
+    while i < n:
+        c = w[i]
+        nxt = w[i + 1] if i + 1 < n else ""
+
+        if c == "h":
+            # La h es muda salvo en "ch"
+            i += 1
+            continue
+        if c == "c":
+            if nxt == "h":
+                out.append("X")
+                i += 2
+                continue
+            out.append("s" if nxt in ("e", "i") else "k")
+        elif c == "q":
+            out.append("k")
+            if nxt == "u":
+                i += 1  # "qu" suena como "k"
+        elif c == "g":
+            if nxt == "u" and i + 2 < n and w[i + 2] in ("e", "i"):
+                out.append("g")
+                i += 1  # "gue"/"gui": la u no suena
+            else:
+                out.append("j" if nxt in ("e", "i") else "g")
+        elif c == "l" and nxt == "l":
+            out.append("y")
+            i += 1
+        elif c == "y":
+            # "y" final o ante consonante suena como "i"
+            out.append("y" if nxt and nxt in _VOWELS else "i")
+        elif c in ("v", "w"):
+            out.append("b")
+        elif c == "z":
+            out.append("s")
+        elif c == "x":
+            out.append("ks")
+        elif c == "n" and nxt in ("b", "v", "p"):
+            # Asimilación nasal: "tanbien" suena como "también"
+            out.append("m")
+        else:
+            out.append(c)
+        i += 1
+
+    # Colapsar letras repetidas ("rr", "ss", "cc"...)
+    key: List[str] = []
+    for ch in "".join(out):
+        if not key or key[-1] != ch:
+            key.append(ch)
+    return "".join(key)
+
+def edit_distance(a: str, b: str, max_distance: Optional[int] = None) -> int:
+    """
+    Distancia de Damerau-Levenshtein (transposiciones adyacentes incluidas).
+
+    Args:
+        a: Primera cadena
+        b: Segunda cadena
+        max_distance: Si se indica, corta el cálculo al superarla
+
+    Returns:
+        int: Número mínimo de ediciones
+    """
+    if a == b:
+        return 0
+    if max_distance is not None and abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+
+    prev_prev: List[int] = []
+    prev = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        row_min = i
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            current[j] = min(
+                prev[j] + 1,
+                current[j - 1] + 1,
+                prev[j - 1] + cost
+            )
+            if (i > 1 and j > 1 and a[i - 1] == b[j - 2]
+                    and a[i - 2] == b[j - 1]):
+                current[j] = min(current[j], prev_prev[j - 2] + 1)
+            row_min = min(row_min, current[j])
+        if max_distance is not None and row_min > max_distance:
+            return max_distance + 1
+        prev_prev, prev = prev, current
+    return prev[-1]
+
+@dataclass
+class Candidate:
+    """Candidato de corrección con sus rasgos para el ranking."""
+    word: str
+    frequency: float
+    edit_distance: int
+    phonetic_match: bool
+
+class PhoneticIndex:
+    """
+    Índice de candidatos de corrección.
+
+    Características:
+    - Clave fonética → palabras (una búsqueda en hash por consulta)
+    - Índice de borrados simétricos para candidatos por distancia de edición
+    - Frecuencias para desempatar candidatos
+    """
+
+    def __init__(
+        self,
+        words: Iterable[str] = (),
+        max_edit_distance: int = 1,
+        complete: Optional[bool] = None
+    ):
+        """
+        Inicializa el índice.
+
+        Args:
+            words: Palabras iniciales, ordenadas por frecuencia descendente
+            max_edit_distance: Distancia máxima para candidatos por edición
+            complete: Si el léxico es lo bastante grande para considerar
+                una falta cualquier palabra ausente (por defecto, según
+                COMPLETE_LEXICON_SIZE)
+        """
+        self.max_edit_distance = max_edit_distance
+        self._complete = complete
+        self.frequencies: Dict[str, float] = {}
+        self.by_key: Dict[str, List[str]] = {}
+        self.by_delete: Dict[str, Set[str]] = {}
+
+        for rank, word in enumerate(words, start=1):
+            # Frecuencia aproximada según la ley de Zipf
+            self.add_word(word, 1.0 / rank)
+
+    @classmethod
+    def from_file(cls, path: str = DEFAULT_LEXICON, **kwargs) -> "PhoneticIndex":
+        """
+        Construye el índice desde un léxico ordenado por frecuencia.
+
+        Args:
+            path: Ruta del léxico (una palabra por línea, '#' para comentarios)
+
+        Returns:
+            PhoneticIndex: Índice construido
+        """
+        with open(path, "r", encoding="utf-8") as f:
+            words = [
+                line.strip().lower() for line in f
+                if line.strip() and not line.startswith("#")
+            ]
+        index = cls(words, **kwargs)
+        logger.info(f"Índice fonético cargado: {len(index)} palabras")
+        return index
+
+    @property
+    def complete(self) -> bool:
+        """Si una palabra ausente del léxico puede tratarse como falta."""
+        if self._complete is not None:
+            return self._complete
+        return len(self) >= COMPLETE_LEXICON_SIZE
+
+    def __len__(self) -> int:
+        return len(self.frequencies)
+
+    def __contains__(self, word: str) -> bool:
+        return word.lower() in self.frequencies
+
+    def add_word(self, word: str, frequency: float = 1.0):
+        """
+        Añade una palabra correcta al índice.
+
+        Args:
+            word: Palabra a añadir
+            frequency: Frecuencia relativa de la palabra
+        """
+        word = word.lower()
+        if word in self.frequencies:
+            self.frequencies[word] = max(self.frequencies[word], frequency)
+            return
+
+        self.frequencies[word] = frequency
+
+        bucket = self.by_key.setdefault(phonetic_key(word), [])
+        bucket.append(word)
+        bucket.sort(key=lambda w: -self.frequencies[w])
+
+        for variant in self._deletes(strip_accents(word)):
+            self.by_delete.setdefault(variant, set()).add(word)
+
+    def _deletes(self, word: str) -> Set[str]:
+        """Genera las variantes por borrado hasta la distancia máxima."""
+        variants = {word}
+        frontier = {word}
+        for _ in range(self.max_edit_distance):
+            frontier = {
+                w[:i] + w[i + 1:]
+                for w in frontier
+                for i in range(len(w))
+            }
+            variants |= frontier
+        return variants
+
+    def lookup(self, word: str) -> List[str]:
+        """
+        Candidatos que suenan igual que la palabra.
+
+        Args:
+            word: Palabra (posiblemente mal escrita)
+
+        Returns:
+            List[str]: Palabras homófonas ordenadas por frecuencia
+        """
+        return self.by_key.get(phonetic_key(word), [])
+
+    def candidates(self, word: str) -> List[Candidate]:
+        """
+        Candidatos fonéticos y por distancia de edición, combinados.
+
+        Args:
+            word: Palabra (posiblemente mal escrita)
+
+        Returns:
+            List[Candidate]: Candidatos sin duplicados; primero las coincidencias
+            fonéticas, luego por distancia y frecuencia
+        """
+        word_lower = word.lower()
+        plain = strip_accents(word_lower)
+        phonetic = set(self.lookup(word_lower))
+
+        found: Set[str] = set(phonetic)
+        for variant in self._deletes(plain):
+            found |= self.by_delete.get(variant, set())
+
+        result = []
+        for candidate in found:
+            # Las tildes omitidas no cuentan como edición
+            distance = edit_distance(plain, strip_accents(candidate))
+            is_phonetic = candidate in phonetic
+            if not is_phonetic and distance > self.max_edit_distance:
+                continue
+            result.append(Candidate(
+                candidate,
+                self.frequencies[candidate],
+                distance,
+                is_phonetic
+            ))
+
+        result.sort(key=lambda c: (not c.phonetic_match, c.edit_distance, -c.frequency))
+        return result
+
+    def best(self, word: str, phonetic_only: bool = True) -> Optional[str]:
+        """
+        Mejor candidato para una palabra desconocida.
+
+        Solo con un léxico completo: si el léxico es pequeño, no estar en él
+        no indica una falta y la palabra se deja como está.
+
+        Args:
+            word: Palabra a corregir
+            phonetic_only: Si solo se aceptan candidatos homófonos
+
+        Returns:
+            Optional[str]: Corrección propuesta o None si la palabra es
+            conocida, el léxico no es completo o no hay candidato
+        """
+        if word in self or not self.complete:
+            return None
+        for candidate in self.candidates(word):
+            if candidate.phonetic_match or not phonetic_only:
+                return candidate.word
+        return None
+
+_default_index: Optional[PhoneticIndex] = None
+_default_lock = Lock()
+
+def get_default_index() -> PhoneticIndex:
+    """
+    Obtiene el índice construido con el léxico por defecto.
+    Se carga una sola vez, bajo demanda. DYSLEXILESS_LEXICON permite usar
+    un léxico completo en lugar del incluido.
+
+    Returns:
+        PhoneticIndex: Índice compartido
+    """
+    global _default_index
+    if _default_index is None:
+        with _default_lock:
+            if _default_index is None:
+                _default_index = PhoneticIndex.from_file(
+                    os.environ.get("DYSLEXILESS_LEXICON", DEFAULT_LEXICON)
+                )
+    return _default_index
@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""
+Protocolo de prompts mínimos para los proveedores de IA.
+Envía solo la palabra objetivo (marcada) con una ventana corta de contexto,
+pide como respuesta únicamente la palabra corregida y alinea la respuesta con
+la palabra original mediante un diff a nivel de palabra, para no contar como
+corrección una frase reescrita.
+
+En modo frase se envía la frase completa en una sola llamada y la respuesta
+se alinea palabra a palabra con el mismo diff.
+
+Las respuestas en streaming se leen solo hasta que contienen lo necesario
+(fin de línea, o el tramo de la palabra objetivo seguido de una palabra ya
+alineada), de modo que el proveedor puede cancelar el resto de la generación.
+"""
+
+import difflib
+import re
+from dataclasses import dataclass
+from typing import Iterable, List, Optional, Tuple
+
+SYSTEM_PROMPT = (
+    "Corrige la ortografía de la palabra entre [ ] en español. "
+    "Responde solo con esa palabra corregida."
+)
+
+SENTENCE_SYSTEM_PROMPT = (
+    "Corrige la ortografía de esta frase en español. "
+    "Responde solo con la frase corregida, sin añadir ni reordenar palabras."
+)
+
+# La respuesta esperada es una palabra: unos pocos tokens bastan
+MAX_RESPONSE_TOKENS = 8
+
+# Palabras de contexto a cada lado de la palabra objetivo
+DEFAULT_WINDOW = 3
+
+# Parecido mínimo entre una palabra y su sustituta en modo frase
+MIN_SIMILARITY = 0.34
+
+_TOKEN_RE = re.compile(r"\S+")
+_STRIP_CHARS = "[]\"'«»“”.,;:!?¡¿()"
+
+@dataclass
+class CorrectionPrompt:
+    """Prompt de corrección con la ventana usada para alinear la respuesta."""
+    system: str
+    user: str
+    window: List[str]
+    target: int
+
+    def as_text(self) -> str:
+        """Prompt en un solo texto, para APIs de completado."""
+        return f"Sistema: {self.system}\nUsuario: {self.user}\nAsistente:"
+
+def build_prompt(word: str, context: str, window: int = DEFAULT_WINDOW) -> CorrectionPrompt:
+    """
+    Construye el prompt mínimo para una palabra.
+
+    Args:
+        word: Palabra a corregir
+        context: Contexto completo (se recorta a la ventana)
+        window: Palabras de contexto a cada lado
+
+    Returns:
+        CorrectionPrompt: Prompt y ventana de alineación
+    """
+    tokens = _TOKEN_RE.findall(context or "")
+    normalized = [t.strip(_STRIP_CHARS).lower() for t in tokens]
+
+    # Usar la última aparición: el contexto termina en la palabra recién escrita
+    target = None
+    for i in range(len(tokens) - 1, -1, -1):
+        if normalized[i] == word.lower():
+            target = i
+            break
+    if target is None:
+        tokens.append(word)
+        target = len(tokens) - 1
+
+    start = max(0, target - window)
+    span = tokens[start:target + window + 1]
+    target -= start
+
+    marked = list(span)
+    marked[target] = f"[{word}]"
+    return CorrectionPrompt(SYSTEM_PROMPT, " ".join(marked), span, target)
+
+def extract_correction(word: str, prompt: CorrectionPrompt, response: str) -> Tuple[str, bool]:
+    """
+    Alinea la respuesta del proveedor con la palabra original.
+
+    Acepta tanto la respuesta compacta (solo la palabra) como una frase
+    reescrita completa; en ese caso se usa un diff a nivel de palabra para
+    extraer solo el tramo que corresponde a la palabra objetivo.
+
+    Args:
+        word: Palabra original
+        prompt: Prompt enviado
+        response: Texto devuelto por el proveedor
+
+    Returns:
+        Tuple[str, bool]: (corrección, si hubo cambio real)
+    """
+    words = [t.strip(_STRIP_CHARS) for t in _TOKEN_RE.findall(response or "")]
+    words = [w for w in words if w]
+    if not words:
+        return word, False
+
+    if len(words) == 1:
+        correction = words[0]
+    else:
+        correction = _align(prompt, words)
+        if correction is None:
+            return word, False
+
+    return _finish(word, correction)
+
+def _finish(word: str, correction: str) -> Tuple[str, bool]:
+    """Respeta el patrón de mayúsculas del original salvo cambios deliberados."""
+    if correction.lower() == word.lower():
+        return word, False
+    if word[:1].isupper() and correction[:1].islower():
+        correction = correction[:1].upper() + correction[1:]
+    return correction, True
+
+def _align(prompt: CorrectionPrompt, response: List[str]):
+    """Encuentra el tramo de la respuesta alineado con la palabra objetivo."""
+    source = [t.strip(_STRIP_CHARS).lower() for t in prompt.window]
+    target = [t.lower() for t in response]
+    matcher = difflib.SequenceMatcher(a=source, b=target, autojunk=False)
+
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if not i1 <= prompt.target < i2:
+            continue
+        if tag == "equal":
+            return response[j1 + prompt.target - i1]
+        # Reemplazo: aceptar solo sustituciones 1→1 o 1→2 ("aver" → "a ver")
+        if tag == "replace" and i2 - i1 == 1 and 1 <= j2 - j1 <= 2:
+            return " ".join(response[j1:j2])
+        return None
+    return None
+
+def build_sentence_prompt(words: List[str]) -> CorrectionPrompt:
+    """
+    Construye el prompt de una frase completa.
+
+    Args:
+        words: Palabras de la frase, tal como se escribieron
+
+    Returns:
+        CorrectionPrompt: Prompt con la frase como ventana (sin objetivo)
+    """
+    return CorrectionPrompt(SENTENCE_SYSTEM_PROMPT, " ".join(words), list(words), -1)
+
+def sentence_max_tokens(words: List[str]) -> int:
+    """Límite de tokens de respuesta para una frase (holgura para tildes)."""
+    return estimate_tokens(" ".join(words)) * 2 + MAX_RESPONSE_TOKENS
+
+def extract_sentence_corrections(words: List[str], response: str) -> List[Tuple[str, bool]]:
+    """
+    Alinea la frase devuelta por el proveedor con las palabras originales.
+
+    Solo se aceptan sustituciones 1→1 o 1→2 ("aver" → "a ver"); las
+    palabras añadidas o borradas dejan su tramo como estaba. Se conserva la puntuación que rodea cada palabra.
+
+    Args:
+        words: Palabras originales
+        response: Texto devuelto por el proveedor
+
+    Returns:
+        List[Tuple[str, bool]]: (corrección, si hubo cambio) por palabra
+    """
+    results = [(word, False) for word in words]
+    cores = [w.strip(_STRIP_CHARS) for w in words]
+    fixed = [t.strip(_STRIP_CHARS) for t in _TOKEN_RE.findall(response or "")]
+    fixed = [t for t in fixed if t]
+    if not fixed:
+        return results
+
+    matcher = difflib.SequenceMatcher(
+        a=[c.lower() for c in cores], b=[t.lower() for t in fixed], autojunk=False
+    )
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag != "replace":
+            continue
+        for i, correction in _split_replace(cores, fixed, i1, i2, j1, j2):
+            if not cores[i]:
+                continue
+            correction, changed = _finish(cores[i], correction)
+            if changed:
+                # Reinsertar la puntuación que rodeaba la palabra
+                start = words[i].find(cores[i])
+                results[i] = (words[i][:start] + correction + words[i][start + len(cores[i]):], True)
+    return results
+
+def _split_replace(cores: List[str], fixed: List[str], i1: int, i2: int, j1: int, j2: int):
+    """
+    Reparte un tramo reemplazado en sustituciones 1→1 y 1→2.
+
+    Si alguna pieza no se parece a su palabra original (texto añadido o
+    reordenado por el proveedor), el tramo entero se descarta.
+    """
+    j = j1
+    pairs = []
+    for i in range(i1, i2):
+        left, available = i2 - i, j2 - j
+        take = 1
+        if available > left:
+            joined = fixed[j] + fixed[j + 1]
+            # Obligatorio si no queda otra forma de repartir; si no, por parecido
+            if available - left >= left or _similarity(cores[i], joined) > _similarity(cores[i], fixed[j]):
+                take = 2
+        piece = fixed[j:j + take]
+        if _similarity(cores[i], "".join(piece)) < MIN_SIMILARITY:
+            return []
+        pairs.append((i, " ".join(piece)))
+        j += take
+    return pairs if j == j2 else []
+
+def _similarity(a: str, b: str) -> float:
+    return difflib.SequenceMatcher(a=a.lower(), b=b.lower(), autojunk=False).ratio()
+
+def response_complete(prompt: CorrectionPrompt, text: str) -> Optional[str]:
+    """
+    Indica si una respuesta parcial ya contiene todo lo necesario.
+
+    Una respuesta está completa al llegar un salto de línea (el resto sería
+    una explicación), cuando en modo palabra el tramo de la palabra objetivo
+    ya está alineado y seguido de una palabra igual al original, o cuando
+    tiene más palabras de las que puede tener una ventana reescrita.
+
+    Args:
+        prompt: Prompt enviado
+        text: Respuesta recibida hasta ahora
+
+    Returns:
+        Optional[str]: Parte útil de la respuesta si está completa; None si
+        hay que seguir leyendo
+    """
+    text = text.lstrip()
+    newline = text.find("\n")
+    if newline > 0:
+        return text[:newline]
+    if prompt.target < 0:
+        return None
+
+    # Solo cuentan las palabras ya cerradas por un espacio
+    tokens = _TOKEN_RE.findall(text)
+    if tokens and not text[-1].isspace():
+        tokens.pop()
+    words = [t.strip(_STRIP_CHARS).lower() for t in tokens]
+    if len(words) > len(prompt.window) + 2:
+        return " ".join(tokens[:len(prompt.window) + 2])
+    if len(words) < 2:
+        return None
+
+    source = [t.strip(_STRIP_CHARS).lower() for t in prompt.window]
+    matcher = difflib.SequenceMatcher(a=source, b=words, autojunk=False)
+    target_seen = False
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if target_seen and tag == "equal":
+            return " ".join(tokens[:j1 + 1])
+        if i1 <= prompt.target < i2:
+            if tag not in ("equal", "replace"):
+                return None  # La respuesta aún no cubre la palabra objetivo
+            if tag == "equal" and prompt.target + 1 < i2:
+                return " ".join(tokens[:j1 + prompt.target - i1 + 2])
+            target_seen = True
+    return None
+
+def read_stream(prompt: CorrectionPrompt, chunks: Iterable[str]) -> str:
+    """
+    Lee una respuesta en streaming hasta que está completa.
+
+    El llamador debe cerrar el stream al volver, para que el proveedor deje
+    de generar.
+
+    Args:
+        prompt: Prompt enviado
+        chunks: Fragmentos de texto según llegan
+
+    Returns:
+        str: Respuesta (recortada a la parte útil si se cortó antes del final)
+    """
+    text = ""
+    for chunk in chunks:
+        if not chunk:
+            continue
+        text += chunk
+        complete = response_complete(prompt, text)
+        if complete is not None:
+            return complete
+    return text
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimación aproximada de tokens (≈4 caracteres por token).
+
+    Args:
+        text: Texto a estimar
+
+    Returns:
+        int: Tokens estimados
+    """
+    return max(1, (len(text) + 3) // 4)
@@ -19,6 +19,7 @@ from logger_manager import logger
 
 from notification_system import NotificationSystem
 from telemetry_system import TelemetrySystem
+from token_filter import register_metrics as register_token_metrics
 
 class Metrics:
     """Interfaz para métricas globales del sistema."""
@@ -46,6 +47,9 @@ class Metrics:
             return len(self.telemetry.collectors.get("corrections_per_minute", []))
         self.telemetry.register_custom_metric("active_corrections", get_active_corrections)
 
+        # Tokens descartados antes de corregir, por motivo
+        register_token_metrics(self.telemetry)
+
 def setup_services():
     """
     Configura y registra todos los servicios en el contenedor.
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Corrección especulativa de la palabra que se está escribiendo.
+
+Mientras el usuario escribe, se envía una tarea de baja prioridad con la
+palabra parcial cuando la escritura se detiene durante un intervalo
+configurable o cuando la palabra parcial ya es un error conocido (recorrido
+incremental del trie de reglas). El resultado se guarda en caché, de modo que
+al pulsar espacio la corrección suele estar disponible al instante. Si la
+palabra cambia, la especulación en curso se cancela.
+"""
+
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Callable, Dict, List, Optional, Tuple
+from correction_rules import RULES, RuleEngine
+from logger_manager import logger
+
+# Prioridad de las tareas especulativas (por debajo de cualquier palabra real)
+SPECULATIVE_PRIORITY = 0
+
+Result = Tuple[str, bool]
+
+class SpeculativeCorrector:
+    """
+    Especulador de correcciones.
+
+    Características:
+    - Disparo por pausa (debounce) o por error conocido en el trie de reglas
+    - Estado del trie avanzado en O(1) por carácter añadido
+    - Caché LRU de resultados por (palabra, contexto)
+    - Cancelación de la especulación cuando la palabra cambia
+    - Los resultados en curso se entregan a la palabra final si coincide
+    """
+
+    def __init__(
+        self,
+        processor,
+        debounce: float = 0.5,
+        rules: Optional[RuleEngine] = None,
+        cache_size: int = 512,
+        min_length: int = 2
+    ):
+        """
+        Inicializa el especulador.
+
+        Args:
+            processor: BatchProcessor donde se encolan las tareas
+            debounce: Pausa de escritura (s) que dispara la especulación
+            rules: Motor de reglas cuyo trie de palabras detecta errores conocidos
+            cache_size: Máximo de resultados en caché
+            min_length: Longitud mínima de la palabra para especular
+        """
+        self.processor = processor
+        self.debounce = debounce
+        self.rules = rules or RULES
+        self.cache_size = cache_size
+        self.min_length = min_length
+        self.namespace = ""  # Espacio de nombres de caché del perfil activo
+
+        self.cache: "OrderedDict[Tuple[str, str], Result]" = OrderedDict()
+        self.inflight: Dict[Tuple[str, str], object] = {}   # clave → tarea
+        self.waiters: Dict[Tuple[str, str], List[Callable[[str, bool], None]]] = {}
+        self._lock = Lock()
+
+        # Palabra actual (solo desde el hilo consumidor)
+        self._key: Optional[Tuple[str, str]] = None
+        self._changed_at = 0.0
+        self.reset()
+
+        self.stats = {'submitted': 0, 'cancelled': 0, 'hits': 0, 'joined': 0, 'misses': 0}
+
+    def update(self, word: str, context: str, now: Optional[float] = None):
+        """
+        Registra la palabra parcial tras cada edición.
+
+        Args:
+            word: Palabra parcial actual
+            context: Contexto que tendrá la palabra al cerrarse
+            now: Momento de la edición (time.perf_counter)
+        """
+        self._changed_at = time.perf_counter() if now is None else now
+        key = (word, context)
+        if key == self._key:
+            return
+        self._cancel_current()
+        self._key = key if len(word) >= self.min_length else None
+
+        # Avanzar el trie solo con el carácter nuevo si la palabra creció en uno
+        lower = word.lower()
+        if lower and lower[:-1] == self._state_word:
+            if self._state is not None:
+                self._state = self.rules.word_state(lower[-1], self._state)
+        else:
+            self._state = self.rules.word_state(lower)
+        self._state_word = lower
+
+        if self._key and RuleEngine.is_word_match(self._state):
+            self._submit(self._key)
+
+    def tick(self, now: Optional[float] = None):
+        """Dispara la especulación si la escritura lleva una pausa (hilo consumidor)."""
+        if self._key is None:
+            return
+        now = time.perf_counter() if now is None else now
+        if now - self._changed_at >= self.debounce:
+            self._submit(self._key)
+
+    def reset(self):
+        """Olvida la palabra actual (cerrada o abandonada) sin cancelar nada."""
+        self._key = None
+        self._state = self.rules.word_state()
+        self._state_word = ""
+
+    def take(self, word: str, context: str, callback: Callable[[str, bool], None]) -> bool:
+        """
+        Entrega el resultado especulativo de una palabra cerrada.
+
+        Args:
+            word: Palabra cerrada
+            context: Contexto de la palabra
+            callback: Función a llamar con (corrección, si fue corregida)
+
+        Returns:
+            bool: True si se usó la caché o una especulación en curso; False
+            si hay que enviar la palabra por el camino normal
+        """
+        key = (word, context)
+        with self._lock:
+            result = self.cache.get(key)
+            if result is not None:
+                self.cache.move_to_end(key)
+                self.stats['hits'] += 1
+            elif key in self.inflight:
+                self.waiters.setdefault(key, []).append(callback)
+                self.stats['joined'] += 1
+                return True
+            else:
+                self.stats['misses'] += 1
+                return False
+        callback(*result)
+        return True
+
+    def _submit(self, key: Tuple[str, str]):
+        with self._lock:
+            if key in self.cache or key in self.inflight:
+                return
+            self.stats['submitted'] += 1
+            # Reservar la clave antes de encolar: el resultado puede llegar enseguida
+            self.inflight[key] = None
+        task = self.processor.add_task(
+            key[0],
+            key[1],
+            lambda correction, was_corrected: self._resolve(key, correction, was_corrected),
+            priority=SPECULATIVE_PRIORITY,
+            namespace=self.namespace
+        )
+        with self._lock:
+            if key in self.inflight:
+                self.inflight[key] = task
+        logger.debug(f"Especulación enviada: {key[0]}")
+
+    def _cancel_current(self):
+        """Cancela la especulación de la palabra anterior si nadie la espera."""
+        key = self._key
+        if key is None:
+            return
+        with self._lock:
+            task = self.inflight.get(key)
+            if task is None or key in self.waiters:
+                return
+            del self.inflight[key]
+            self.stats['cancelled'] += 1
+        self.processor.cancel_task(task)
+
+    def _resolve(self, key: Tuple[str, str], correction: str, was_corrected: bool):
+        """Guarda un resultado y lo entrega a las palabras que lo esperan."""
+        with self._lock:
+            self.inflight.pop(key, None)
+            self.cache[key] = (correction, was_corrected)
+            self.cache.move_to_end(key)
+            if len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+            waiters = self.waiters.pop(key, [])
+        for callback in waiters:
+            try:
+                callback(correction, was_corrected)
+            except Exception as e:
+                logger.error(f"Error en callback especulativo: {e}")
+
+    def get_stats(self) -> Dict[str, int]:
+        """Obtiene estadísticas de la especulación."""
+        with self._lock:
+            return dict(self.stats, cached=len(self.cache), inflight=len(self.inflight))
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Pruebas para los perfiles de contexto por aplicación.
+"""
+
+import unittest
+import time
+from unittest.mock import MagicMock, patch
+from app_profiles import ActiveAppTracker, ProfileManager, DEFAULT_APP
+from keystroke_pipeline import EV_SPACE
+
+class FakeBuffer:
+    """Buffer mínimo para identificar perfiles."""
+    created = 0
+
+    def __init__(self):
+        FakeBuffer.created += 1
+        self.id = FakeBuffer.created
+
+class TestActiveAppTracker(unittest.TestCase):
+    """Pruebas unitarias para ActiveAppTracker."""
+
+    def test_interval(self):
+        """Prueba que el sistema se consulta como mucho una vez por intervalo."""
+        apps = iter(["Mail", "Terminal", "Code"])
+        tracker = ActiveAppTracker(lambda: next(apps), interval=1.0)
+        self.assertEqual(tracker.current(10.0), "Mail")
+        self.assertEqual(tracker.current(10.5), "Mail")
+        self.assertEqual(tracker.current(11.0), "Terminal")
+        self.assertEqual(tracker.probes, 2)
+
+    def test_probe_errors(self):
+        """Prueba que un fallo de la consulta conserva la última aplicación."""
+        def probe():
+            raise OSError("sin acceso")
+        tracker = ActiveAppTracker(probe, interval=0)
+        self.assertEqual(tracker.current(), DEFAULT_APP)
+        self.assertEqual(ActiveAppTracker(None).current(), DEFAULT_APP)
+
+class TestProfileManager(unittest.TestCase):
+    """Pruebas unitarias para ProfileManager."""
+
+    def test_lru_bound(self):
+        """Prueba que se expulsa el perfil usado hace más tiempo."""
+        profiles = ProfileManager(FakeBuffer, max_profiles=2, tracker=ActiveAppTracker())
+        mail = profiles.get("Mail")
+        profiles.get("Terminal")
+        self.assertIs(profiles.get("Mail"), mail)
+        profiles.get("Code")
+        self.assertEqual(list(profiles.profiles), ["Mail", "Code"])
+        self.assertEqual(profiles.evicted, 1)
+
+    def test_disabled_and_namespaces(self):
+        """Prueba las aplicaciones desactivadas y los espacios de caché."""
+        profiles = ProfileManager(
+            FakeBuffer,
+            disabled_apps=["terminal"],
+            separate_caches=True,
+            tracker=ActiveAppTracker()
+        )
+        self.assertFalse(profiles.get("Terminal").enabled)
+        self.assertEqual(profiles.get("Mail").namespace, "Mail")
+
+        profiles.set_enabled("Mail", False)
+        self.assertFalse(profiles.get("Mail").enabled)
+        profiles.set_enabled("Terminal", True)
+        self.assertTrue(profiles.get("Terminal").enabled)
+
+        shared = ProfileManager(FakeBuffer, tracker=ActiveAppTracker())
+        self.assertEqual(shared.get("Mail").namespace, "")
+
+    def test_from_config(self):
+        """Prueba la lectura de la sección de configuración."""
+        config = {'app_profiles': {'max_profiles': 3, 'disabled_apps': ['iTerm2']}}
+        profiles = ProfileManager.from_config(config, FakeBuffer)
+        self.assertEqual(profiles.max_profiles, 3)
+        self.assertFalse(profiles.get("iTerm2").enabled)
+        self.assertEqual(ProfileManager.from_config(None, FakeBuffer).max_profiles, 8)
+
+class TestListenerProfiles(unittest.TestCase):
+    """Pruebas de integración de los perfiles en el monitor de teclado."""
+
+    def setUp(self):
+        from keyboardlistener import KeyboardListener, OptimizedBuffer
+
+        self.app = "Mail"
+        self.corrector = MagicMock()
+        self.profiles = ProfileManager(
+            OptimizedBuffer,
+            disabled_apps=["Terminal"],
+            separate_caches=True,
+            tracker=ActiveAppTracker(lambda: self.app, interval=0)
+        )
+        with patch('keyboardlistener.Controller', return_value=MagicMock()):
+            self.listener = KeyboardListener(
+                self.corrector, OptimizedBuffer(), MagicMock(), profiles=self.profiles
+            )
+
+    def tearDown(self):
+        self.listener.pipeline.stop()
+        self.listener.corrector = None
+
+    def type_text(self, text: str):
+        for char in text:
+            self.listener.handle_event(EV_SPACE if char == " " else ord(char))
+
+    def test_separate_context(self):
+        """Prueba que cada aplicación tiene su propio contexto."""
+        add_task = self.corrector.batch_processor.add_task
+        self.type_text("hola qe ")
+        self.assertEqual(add_task.call_args[0][:2], ("qe", "hola qe"))
+        self.assertEqual(add_task.call_args[1]['namespace'], "Mail")
+
+        self.app = "Notes"
+        self.type_text("kiero ")
+        self.assertEqual(add_task.call_args[0][:2], ("kiero", "kiero"))
+        self.assertEqual(add_task.call_args[1]['namespace'], "Notes")
+
+        # Al volver, el contexto de la primera aplicación sigue ahí
+        self.app = "Mail"
+        self.type_text("bamos ")
+        self.assertEqual(add_task.call_args[0][:2], ("bamos", "hola qe bamos"))
+
+    def test_switch_discards_tickets(self):
+        """Prueba que cambiar de aplicación descarta las correcciones pendientes."""
+        self.type_text("hola qe ")
+        self.assertGreater(len(self.listener.tickets), 0)
+        self.app = "Notes"
+        self.type_text("a")
+        self.assertEqual(len(self.listener.tickets), 0)
+
+    def test_disabled_app(self):
+        """Prueba que no se corrige en las aplicaciones desactivadas."""
+        self.app = "Terminal"
+        self.type_text("git comit -m ")
+        self.corrector.batch_processor.add_task.assert_not_called()
+
+def test_profile_switch_performance():
+    """
+    Mide el coste por pulsación de la comprobación de perfil con varias
+    aplicaciones alternándose.
+    """
+    print("\n=== Perfiles por Aplicación ===")
+
+    apps = ["Mail", "Terminal", "Code", "Notes"]
+    clock = [0.0]
+    profiles = ProfileManager(
+        FakeBuffer,
+        max_profiles=3,
+        tracker=ActiveAppTracker(lambda: apps[int(clock[0]) % len(apps)], interval=0.25)
+    )
+
+    keystrokes = 100000
+    start_time = time.perf_counter()
+    for i in range(keystrokes):
+        clock[0] = i * 0.01  # 100 pulsaciones por segundo
+        profiles.current(clock[0])
+    elapsed = time.perf_counter() - start_time
+
+    stats = profiles.get_stats()
+    print(f"Pulsaciones: {keystrokes}, consultas al sistema: {stats['probes']}")
+    print(f"Cambios de perfil: {stats['switches']}, expulsados: {stats['evicted']}")
+    print(f"Coste: {elapsed / keystrokes * 1e6:.2f}µs por pulsación")
+
+    return stats
+
+if __name__ == "__main__":
+    print("Ejecutando pruebas de perfiles por aplicación...")
+
+    try:
+        # Ejecutar pruebas unitarias
+        unittest.main(verbosity=2)
+    except SystemExit:
+        pass
+
+    # Ejecutar medición de rendimiento
+    test_profile_switch_performance()
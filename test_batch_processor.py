@@ -105,6 +105,12 @@ class TestBatchProcessor(unittest.TestCase):
         processed = [r[0] for r in self.results]
         self.assertEqual(processed, expected)
     
+    def wait_for_results(self, count: int, timeout: float):
+        """Espera hasta tener count resultados o agotar el tiempo."""
+        deadline = time.time() + timeout
+        while len(self.results) < count and time.time() < deadline:
+            time.sleep(0.01)
+
     def test_batch_size_limit(self):
         """Prueba que se respeta el límite de tamaño de lote."""
         # Añadir más tareas que el tamaño del lote
@@ -112,18 +118,33 @@ class TestBatchProcessor(unittest.TestCase):
         for word in words:
             self.processor.add_task(word, "test context", self.callback)
         
-        # Esperar primer lote
-        time.sleep(0.3)
-        
-        # Verificar que se procesó el primer lote
-        self.assertEqual(len(self.results), 5)
-        
-        # Esperar segundo lote
-        time.sleep(0.3)
-        
-        # Verificar que se procesaron todas las tareas
+        # El lote es serie: cada palabra cuesta self.corrector.delay
+        self.wait_for_results(10, timeout=10 * self.corrector.delay + 2)
         self.assertEqual(len(self.results), 10)
-    
+        
+        # Cada llamada ve el contexto combinado de su lote: nunca más de 5
+        # (los lotes tardíos se cortan antes, al pasar max_delay)
+        self.assertEqual(len(self.corrector.calls), 10)
+        sizes = [context.count("test context") for _, context in self.corrector.calls]
+        self.assertEqual(sizes[0], 5)
+        self.assertLessEqual(max(sizes), 5)
+    
+    def test_sentence_task(self):
+        """Prueba que una frase se corrige en una tarea y con un callback."""
+        sentences = []
+        self.processor.add_sentence(["creo", "qe", "aki"], sentences.append)
+
+        time.sleep(0.5)
+
+        self.assertEqual(sentences, [[("creo", False), ("que", True), ("aquí", True)]])
+        # Sin correct_sentence en el corrector, se corrige palabra a palabra
+        self.assertEqual([word for word, _ in self.corrector.calls], ["creo", "qe", "aki"])
+
+        self.corrector.correct_sentence = lambda words: [(w.upper(), True) for w in words]
+        self.processor.add_sentence(["si"], sentences.append)
+        time.sleep(0.5)
+        self.assertEqual(sentences[-1], [("SI", True)])
+
     def test_concurrent_access(self):
         """Prueba acceso concurrente al procesador."""
         def add_tasks():
@@ -149,8 +170,8 @@ class TestBatchProcessor(unittest.TestCase):
         for t in threads:
             t.join()
         
-        # Esperar procesamiento
-        time.sleep(1)
+        # Esperar procesamiento (60 palabras de self.corrector.delay cada una)
+        self.wait_for_results(60, timeout=60 * self.corrector.delay + 2)
         
         # Verificar que todas las tareas se procesaron
         self.assertEqual(len(self.results), 60)
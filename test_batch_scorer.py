@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Pruebas para la puntuación vectorizada de candidatos.
+"""
+
+import unittest
+import random
+import time
+from typing import Tuple
+from batch_scorer import BatchScorer
+from batch_processor import BatchProcessor
+from ngram_model import NgramBuilder
+from phonetic_index import get_default_index
+from interfaces import ICorrector
+from generate_test_data import generate_test_cases
+
+class EchoCorrector(ICorrector):
+    """Corrector que devuelve la palabra sin cambios."""
+
+    def __init__(self):
+        self.calls = []
+
+    def correct_text(self, word: str, context: str) -> Tuple[str, bool]:
+        self.calls.append(word)
+        return word, False
+
+    def test_connection(self) -> bool:
+        return True
+
+class TestBatchScorer(unittest.TestCase):
+    """Pruebas unitarias para BatchScorer."""
+
+    def setUp(self):
+        """Configura el entorno de prueba."""
+        builder = NgramBuilder()
+        builder.feed([
+            "ya no hay nada", "hoy no hay clase", "no hay tiempo",
+            "déjalo ahí", "ponlo ahí", "está ahí"
+        ])
+        self.scorer = BatchScorer(index=get_default_index(), model=builder.build())
+
+    def test_rank_batch(self):
+        """Prueba la corrección local de un lote."""
+        items = [
+            ("vien", "muy vien"),
+            ("Nesesito", "Nesesito"),
+            ("casa", "mi casa"),
+            ("ai", "no ai"),
+            ("ai", "déjalo ai"),
+            ("1234", "1234"),
+        ]
+        self.assertEqual(
+            self.scorer.rank_batch(items),
+            ["bien", "Necesito", None, "hay", "ahí", None]
+        )
+
+    def test_incomplete_lexicon(self):
+        """Prueba que las palabras correctas fuera del léxico van al proveedor."""
+        items = [("perro", "mi perro"), ("ola", "la ola"), ("tubo", "el tubo")]
+        self.assertEqual(self.scorer.rank_batch(items), [None, None, None])
+
+    def test_matches_python_scorer(self):
+        """Prueba que la versión vectorizada coincide con la de Python."""
+        cases = generate_test_cases(500)
+        items = [(c["input"], c["context"]) for c in cases]
+        batch = self.scorer.collect(items)
+        self.assertEqual(self.scorer.score(batch), self.scorer.score_python(batch))
+
+    def test_without_model(self):
+        """Prueba la puntuación sin modelo de n-gramas."""
+        scorer = BatchScorer(index=get_default_index(), model=None)
+        scorer.model = None
+        batch = scorer.collect([("voi", "yo voi"), ("qe", "creo qe")])
+        self.assertEqual(scorer.score(batch), ["voy", "que"])
+        self.assertEqual(scorer.score_python(batch), ["voy", "que"])
+
+    def test_batch_processor_integration(self):
+        """Prueba que el procesador resuelve localmente antes del corrector."""
+        corrector = EchoCorrector()
+        processor = BatchProcessor(
+            corrector,
+            batch_size=5,
+            max_delay=0.05,
+            min_batch_items=1,
+            scorer=self.scorer
+        )
+        results = []
+        try:
+            processor.add_task("vien", "muy vien", lambda c, w: results.append((c, w)))
+            processor.add_task("casa", "mi casa", lambda c, w: results.append((c, w)))
+            deadline = time.time() + 2
+            while len(results) < 2 and time.time() < deadline:
+                time.sleep(0.05)
+        finally:
+            processor.stop()
+
+        self.assertIn(("bien", True), results)
+        self.assertIn(("casa", False), results)
+        self.assertEqual(corrector.calls, ["casa"])
+
+def test_batch_scorer_performance():
+    """
+    Prueba de rendimiento del ordenador vectorizado.
+    Compara NumPy contra Python puro sobre 100k palabras.
+    """
+    print("\n=== Prueba de Rendimiento del Ordenador por Lotes ===")
+
+    cases = generate_test_cases(2000)
+    builder = NgramBuilder()
+    builder.feed(c["context"].replace(c["input"], c["expected"]) for c in cases)
+    scorer = BatchScorer(model=builder.build())
+
+    # Documento de 100k palabras: errores y palabras correctas mezcladas
+    vocabulary = [c["input"] for c in cases] + list(get_default_index().frequencies)
+    words = [random.choice(vocabulary) for _ in range(100_000)]
+    items = [
+        (word, " ".join(words[max(0, i - 2):i + 1]))
+        for i, word in enumerate(words)
+    ]
+
+    start_time = time.perf_counter()
+    batch = scorer.collect(items)
+    collect_time = time.perf_counter() - start_time
+    print(f"\nCandidatos reunidos: {len(batch)} en {collect_time:.2f}s")
+
+    start_time = time.perf_counter()
+    python_result = scorer.score_python(batch)
+    python_time = time.perf_counter() - start_time
+    print(f"Python puro: {len(items) / python_time:,.0f} palabras/s")
+
+    start_time = time.perf_counter()
+    numpy_result = scorer.score(batch)
+    numpy_time = time.perf_counter() - start_time
+    print(f"NumPy: {len(items) / numpy_time:,.0f} palabras/s")
+
+    assert numpy_result == python_result
+    print(f"\nAceleración: {python_time / numpy_time:.1f}x")
+
+    return python_time, numpy_time
+
+if __name__ == "__main__":
+    print("Ejecutando pruebas del ordenador por lotes...")
+
+    try:
+        # Ejecutar pruebas unitarias
+        unittest.main(verbosity=2)
+    except SystemExit:
+        pass
+
+    # Ejecutar prueba de rendimiento
+    test_batch_scorer_performance()
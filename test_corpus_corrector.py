@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Pruebas para la corrección por lotes de documentos y corpus.
+"""
+
+import unittest
+import json
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import List, Tuple
+from corpus_corrector import CorpusCorrector, correct_tokens, local_decider, print_report
+from token_filter import TokenFilter
+
+class FakeProvider:
+    """Proveedor simulado: corrige las palabras que conoce."""
+
+    def __init__(self):
+        self.calls = []
+
+    def correct_sentence(self, words: List[str]) -> List[Tuple[str, bool]]:
+        self.calls.append(tuple(words))
+        return [("Fragmento", True) if w == "xyzzy" else (w, False) for w in words]
+
+class TestLocalCorrection(unittest.TestCase):
+    """Pruebas de la corrección local de una frase."""
+
+    def test_correct_tokens(self):
+        """Prueba que se conservan espacios y puntuación y se filtran tokens."""
+        decide = local_decider()
+        corrected, unresolved, eligible = correct_tokens("¿Kiero  ir aki, 10:30 xyzzy?", decide, TokenFilter())
+        self.assertEqual(corrected, "¿Quiero  ir aquí, 10:30 xyzzy?")
+        self.assertEqual(unresolved, ["xyzzy"])
+        self.assertEqual(eligible, 4)
+
+    def test_unknown_words_unresolved(self):
+        """Prueba que las palabras fuera del léxico no se reescriben."""
+        decide = local_decider()
+        sentence = "El perro de mi vecino, la ola y el tubo"
+        corrected, unresolved, _ = correct_tokens(sentence, decide, TokenFilter())
+        self.assertEqual(corrected, sentence)
+        for word in ("perro", "ola", "tubo"):
+            self.assertIn(word, unresolved)
+
+class TestCorpusCorrector(unittest.TestCase):
+    """Pruebas de la corrección de archivos."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.input_dir = os.path.join(self.tmpdir.name, "docs")
+        os.makedirs(os.path.join(self.input_dir, "sub"))
+        self.write("a.txt", "yo kiero ir aki. qe bien.\nyo kiero ir aki.\n")
+        self.write("sub/b.md", "kiero un xyzzy.\n")
+        self.write("imagen.png", "kiero")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def write(self, name: str, text: str):
+        with open(os.path.join(self.input_dir, name), "w", encoding="utf-8") as f:
+            f.write(text)
+
+    def read(self, *parts: str) -> str:
+        with open(os.path.join(self.tmpdir.name, *parts), encoding="utf-8") as f:
+            return f.read()
+
+    def test_directory(self):
+        """Prueba un directorio completo: estructura, repetidas y extensiones."""
+        corpus = CorpusCorrector(workers=2)
+        stats = corpus.run([self.input_dir], os.path.join(self.tmpdir.name, "out"))
+        self.assertEqual(self.read("out", "a.txt"), "yo quiero ir aquí. que bien.\nyo quiero ir aquí.\n")
+        self.assertEqual(self.read("out", "sub", "b.md"), "quiero un xyzzy.\n")
+        self.assertFalse(os.path.exists(os.path.join(self.tmpdir.name, "out", "imagen.png")))
+        self.assertEqual(stats['files'], 2)
+        self.assertGreaterEqual(stats['duplicates'], 1)
+        self.assertEqual(stats['provider_sentences'], 0)
+
+    def test_duplicate_output_names(self):
+        """Prueba que se rechazan entradas distintas con la misma salida."""
+        other = os.path.join(self.tmpdir.name, "otros")
+        os.makedirs(other)
+        with open(os.path.join(other, "a.txt"), "w", encoding="utf-8") as f:
+            f.write("otro texto.\n")
+        out = os.path.join(self.tmpdir.name, "out")
+        paths = [os.path.join(self.input_dir, "a.txt"), os.path.join(other, "a.txt")]
+        with self.assertRaises(ValueError):
+            CorpusCorrector(workers=1).run(paths, out)
+        with self.assertRaises(ValueError):
+            CorpusCorrector(workers=1).run([self.input_dir, other], out)
+        self.assertFalse(os.path.exists(out))
+
+    def test_sidecar_output(self):
+        """Prueba la salida junto al archivo de entrada."""
+        path = os.path.join(self.input_dir, "a.txt")
+        CorpusCorrector(workers=1).run([path])
+        self.assertEqual(self.read("docs", "a.corrected.txt"), "yo quiero ir aquí. que bien.\nyo quiero ir aquí.\n")
+
+    def test_provider_only_for_unresolved(self):
+        """Prueba que solo las frases no resueltas localmente van al proveedor."""
+        provider = FakeProvider()
+        corpus = CorpusCorrector(workers=1, provider=provider)
+        stats = corpus.run([self.input_dir], os.path.join(self.tmpdir.name, "out"))
+        self.assertEqual(provider.calls, [("quiero", "un", "xyzzy")])
+        self.assertEqual(self.read("out", "sub", "b.md"), "quiero un Fragmento.\n")
+        self.assertEqual(stats['provider_sentences'], 1)
+
+    def write_checkpoint(self, checkpoint: str, path: str, state: dict):
+        """Escribe un punto de control para la versión actual de path."""
+        info = os.stat(path)
+        state = dict(state, size=info.st_size, mtime=info.st_mtime_ns)
+        with open(checkpoint, "w", encoding="utf-8") as f:
+            json.dump({os.path.abspath(path): state}, f)
+
+    def process(self, checkpoint: str, path: str, output: str):
+        with ProcessPoolExecutor(1) as pool, ThreadPoolExecutor(1) as provider_pool:
+            CorpusCorrector(workers=1, checkpoint_path=checkpoint).process_file(pool, provider_pool, path, output)
+        with open(output, "rb") as f:
+            return f.read().decode("utf-8")
+
+    def test_resume_without_output(self):
+        """Prueba que sin la salida escrita se empieza de cero (sin bytes nulos)."""
+        path = os.path.join(self.input_dir, "a.txt")
+        output = os.path.join(self.tmpdir.name, "a.out.txt")
+        checkpoint = os.path.join(self.tmpdir.name, "checkpoint.json")
+        self.write_checkpoint(checkpoint, path, {'offset': 27, 'written': 29})
+
+        self.assertEqual(
+            self.process(checkpoint, path, output),
+            "yo quiero ir aquí. que bien.\nyo quiero ir aquí.\n"
+        )
+
+    def test_resume_after_input_changed(self):
+        """Prueba que un punto de control de otra versión de la entrada se descarta."""
+        path = os.path.join(self.input_dir, "a.txt")
+        output = os.path.join(self.tmpdir.name, "a.out.txt")
+        checkpoint = os.path.join(self.tmpdir.name, "checkpoint.json")
+        self.write_checkpoint(checkpoint, path, {'offset': 0, 'written': 0, 'done': True})
+
+        self.write("a.txt", "qe bien.\n")
+        with open(output, "w", encoding="utf-8") as f:
+            f.write("versión anterior\n")
+        self.assertEqual(self.process(checkpoint, path, output), "que bien.\n")
+
+    def test_resume_from_checkpoint(self):
+        """Prueba que se reanuda sin repetir lo ya escrito."""
+        path = os.path.join(self.input_dir, "a.txt")
+        output = os.path.join(self.tmpdir.name, "a.out.txt")
+        checkpoint = os.path.join(self.tmpdir.name, "checkpoint.json")
+
+        # Primera línea ya procesada (con una marca para detectar si se repite)
+        done = "HECHO.\n"
+        with open(output, "w", encoding="utf-8") as f:
+            f.write(done + "basura de una escritura interrumpida")
+        self.write_checkpoint(checkpoint, path, {
+            'offset': len("yo kiero ir aki. qe bien.\n".encode("utf-8")),
+            'written': len(done.encode("utf-8"))
+        })
+
+        corpus = CorpusCorrector(workers=1, checkpoint_path=checkpoint)
+        with ProcessPoolExecutor(1) as pool, ThreadPoolExecutor(1) as provider_pool:
+            corpus.process_file(pool, provider_pool, path, output)
+
+        with open(output, encoding="utf-8") as f:
+            self.assertEqual(f.read(), "HECHO.\nyo quiero ir aquí.\n")
+        with open(checkpoint, encoding="utf-8") as f:
+            self.assertTrue(json.load(f)[os.path.abspath(path)]['done'])
+
+        # Un archivo terminado no se vuelve a procesar
+        with ProcessPoolExecutor(1) as pool, ThreadPoolExecutor(1) as provider_pool:
+            CorpusCorrector(workers=1, checkpoint_path=checkpoint).process_file(pool, provider_pool, path, output)
+        with open(output, encoding="utf-8") as f:
+            self.assertEqual(f.read(), "HECHO.\nyo quiero ir aquí.\n")
+
+def test_corpus_throughput():
+    """
+    Mide palabras por segundo del camino solo local, por etapa.
+    """
+    print("\n=== Corrección de Corpus ===")
+
+    from generate_test_data import generate_load_test_data
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "corpus.txt")
+        with open(path, "w", encoding="utf-8") as f:
+            for i, sentence in enumerate(generate_load_test_data(20000)):
+                f.write(sentence["input"] + (".\n" if i % 3 == 0 else ". "))
+
+        stats = CorpusCorrector().run([path], os.path.join(tmpdir, "out"))
+
+    print_report(stats)
+    print(f"Objetivo (solo local): 10000 palabras/s; total medido: {stats['words_per_s']:.0f}")
+
+    return stats['words_per_s']
+
+if __name__ == "__main__":
+    print("Ejecutando pruebas de corrección de corpus...")
+
+    try:
+        # Ejecutar pruebas unitarias
+        unittest.main(verbosity=2)
+    except SystemExit:
+        pass
+
+    # Ejecutar medición de rendimiento
+    test_corpus_throughput()
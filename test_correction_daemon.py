@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Pruebas para el demonio de corrección compartido.
+"""
+
+import unittest
+import asyncio
+import os
+import tempfile
+import socket
+import threading
+import time
+from unittest.mock import patch
+import correction_daemon
+from correction_daemon import (
+    CorrectionDaemon, DaemonClient, HEADER, OP_TEXT, FLAG_ERROR,
+    benchmark_ipc, connect, default_socket_path, pack_message, ping, unpack_fields
+)
+from correction_service import CorrectionService
+from test_correction_service import MockCorrector
+from token_filter import TokenFilter
+
+class DaemonThread:
+    """Demonio en un hilo con su propio bucle de eventos."""
+
+    def __init__(self, service, path):
+        self.daemon = CorrectionDaemon(service, path)
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        asyncio.run_coroutine_threadsafe(self.daemon.start(), self.loop).result(5)
+        return self.daemon
+
+    def __exit__(self, *exc):
+        asyncio.run_coroutine_threadsafe(self.daemon.close(), self.loop).result(5)
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join(5)
+        self.loop.close()
+
+class TestProtocol(unittest.TestCase):
+    """Pruebas del formato de los mensajes."""
+
+    def test_round_trip(self):
+        """Prueba que los campos se codifican y decodifican sin pérdida."""
+        fields = ["kiero", "yo kiero ñandú «ya»", ""]
+        message = pack_message(OP_TEXT, FLAG_ERROR, 7, fields)
+        op, flags, request_id, length = HEADER.unpack_from(message)
+        self.assertEqual((op, flags, request_id), (OP_TEXT, FLAG_ERROR, 7))
+        self.assertEqual(length, len(message) - HEADER.size)
+        self.assertEqual(unpack_fields(message[HEADER.size:]), fields)
+
+    def test_truncated_payload(self):
+        """Prueba que un cuerpo truncado se rechaza."""
+        payload = pack_message(OP_TEXT, 0, 1, ["kiero"])[HEADER.size:]
+        with self.assertRaises(ValueError):
+            unpack_fields(payload[:-1])
+
+class TestCorrectionDaemon(unittest.TestCase):
+    """Pruebas del demonio con clientes reales sobre un socket Unix."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "daemon.sock")
+        self.corrector = MockCorrector(delay=0.001)
+        self.service = CorrectionService(self.corrector, TokenFilter(), timeout=5)
+
+    def tearDown(self):
+        self.corrector.batch_processor.stop()
+        self.tmpdir.cleanup()
+
+    def test_word_and_text(self):
+        """Prueba la corrección de palabras y de textos completos."""
+        with DaemonThread(self.service, self.path):
+            client = DaemonClient(self.path)
+            self.assertEqual(client.correct_text("kiero", "yo kiero"), ("quiero", True))
+            self.assertEqual(client.correct_text("ir", "kiero ir"), ("ir", False))
+            self.assertEqual(client.correct("Kiero ir aki, 10:30"), "Quiero ir aquí, 10:30")
+            self.assertEqual(client.correct("yo kiero. qe bien", sentence_mode=True), "yo quiero. que bien")
+            stats = client.get_stats()
+            self.assertEqual(stats['requests'], 4)
+            self.assertEqual(stats['daemon']['connections'], 1)
+            client.close()
+
+    def test_shared_between_clients(self):
+        """Prueba que varios clientes comparten el mismo corrector."""
+        with DaemonThread(self.service, self.path):
+            clients = [DaemonClient(self.path) for _ in range(4)]
+            results = [None] * len(clients)
+
+            def run(i):
+                results[i] = clients[i].correct(f"kiero {i} qe vengas")
+
+            threads = [threading.Thread(target=run, args=(i,)) for i in range(len(clients))]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join(10)
+            self.assertEqual(results, [f"quiero {i} que vengas" for i in range(4)])
+            self.assertEqual(clients[0].get_stats()['daemon']['connections'], 4)
+            for client in clients:
+                client.close()
+
+    def test_error_response(self):
+        """Prueba que un error en el demonio llega al cliente como excepción."""
+        with DaemonThread(self.service, self.path):
+            client = DaemonClient(self.path)
+            with self.assertRaises(RuntimeError):
+                client.request(OP_TEXT, ["solo el texto"])
+            self.assertTrue(client.test_connection())
+            client.close()
+
+    def test_reconnect_after_timeout(self):
+        """Prueba que una respuesta tardía no desalinea las peticiones siguientes."""
+        with DaemonThread(self.service, self.path):
+            client = DaemonClient(self.path, timeout=0.2)
+            self.corrector.delay = 0.5
+            with self.assertRaises(socket.timeout):
+                client.correct_text("kiero", "yo kiero")
+            self.corrector.delay = 0.001
+            # La respuesta tardía llega a la conexión descartada, no a esta
+            time.sleep(0.5)
+            self.assertTrue(client.test_connection())
+            self.assertEqual(client.correct_text("qe", "creo qe"), ("que", True))
+            client.close()
+
+    def test_stale_socket(self):
+        """Prueba que un socket abandonado se reemplaza y se elimina al cerrar."""
+        open(self.path, "w").close()
+        self.assertFalse(ping(self.path))
+        with DaemonThread(self.service, self.path):
+            self.assertTrue(ping(self.path))
+        self.assertFalse(os.path.exists(self.path))
+
+class TestPlatform(unittest.TestCase):
+    """Pruebas del comportamiento sin sockets Unix (Windows)."""
+
+    def test_socket_path_without_getuid(self):
+        """Prueba la ruta del socket sin os.getuid."""
+        getuid = getattr(os, "getuid", None)
+        try:
+            if getuid is not None:
+                del os.getuid
+            with patch.dict(os.environ, {"USERNAME": "ana"}):
+                os.environ.pop("DYSLEXILESS_SOCKET", None)
+                self.assertTrue(default_socket_path().endswith("dyslexiless-ana.sock"))
+        finally:
+            if getuid is not None:
+                os.getuid = getuid
+
+    def test_no_unix_sockets(self):
+        """Prueba que sin sockets Unix no hay demonio y se usa otra vía."""
+        with patch.object(correction_daemon, "HAS_UNIX_SOCKETS", False):
+            self.assertIsNone(connect())
+            self.assertFalse(ping())
+            with self.assertRaises(RuntimeError):
+                asyncio.run(CorrectionDaemon(None, "daemon.sock").start())
+
+def test_ipc_performance():
+    """
+    Mide el coste del IPC (ida y vuelta sin trabajo) y lo compara con una
+    corrección de palabra a través del demonio.
+    """
+    print("\n=== Demonio de Corrección ===")
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "daemon.sock")
+        corrector = MockCorrector(delay=0)
+        service = CorrectionService(corrector, TokenFilter())
+        with DaemonThread(service, path):
+            client = DaemonClient(path)
+            result = benchmark_ipc(client, 5000)
+
+            start = time.perf_counter()
+            for _ in range(50):
+                client.correct_text("kiero", "yo kiero")
+            word_ms = (time.perf_counter() - start) / 50 * 1000
+            client.close()
+        corrector.batch_processor.stop()
+
+    print(f"IPC: media {result['mean_ms']:.3f}ms, p50 {result['p50_ms']:.3f}ms, p99 {result['p99_ms']:.3f}ms")
+    print(f"Rendimiento: {result['requests_per_s']:.0f} peticiones/s")
+    print(f"Palabra completa (incluye la espera del procesador por lotes): {word_ms:.1f}ms")
+
+    return result['p50_ms']
+
+if __name__ == "__main__":
+    print("Ejecutando pruebas del demonio de corrección...")
+
+    try:
+        # Ejecutar pruebas unitarias
+        unittest.main(verbosity=2)
+    except SystemExit:
+        pass
+
+    # Ejecutar medición de rendimiento
+    test_ipc_performance()
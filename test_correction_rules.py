@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Pruebas para el motor de reglas de corrección.
+"""
+
+import unittest
+import random
+import string
+import time
+from correction_rules import RULES, RuleEngine, apply_case
+from text_corrector import fallback_correction
+
+class TestApplyCase(unittest.TestCase):
+    """Pruebas para la conservación de mayúsculas."""
+
+    def test_case_patterns(self):
+        """Prueba los patrones de mayúsculas."""
+        self.assertEqual(apply_case("qe", "que"), "que")
+        self.assertEqual(apply_case("Qe", "que"), "Que")
+        self.assertEqual(apply_case("Q", "que"), "Que")
+        self.assertEqual(apply_case("QE", "que"), "QUE")
+        self.assertEqual(apply_case("tAnbien", "también"), "tAmbién")
+        self.assertEqual(apply_case("aSER", "hacer"), "hACER")
+
+class TestRuleEngine(unittest.TestCase):
+    """Pruebas unitarias para RuleEngine."""
+
+    def setUp(self):
+        """Configura el entorno de prueba."""
+        self.engine = RuleEngine({
+            "words": {"qe": "que", "xq": "porque"},
+            "accents": {"tambien": "también"},
+            "prefixes": {"enp": "emp", "in": "XX", "inp": "imp"},
+            "suffixes": {"cion": "ción", "sion": "sión", "on": "XX"}
+        })
+
+    def test_whole_word(self):
+        """Prueba las reglas de palabra completa."""
+        self.assertEqual(self.engine.lookup("qe"), "que")
+        self.assertEqual(self.engine.lookup("Tambien"), "También")
+        self.assertIsNone(self.engine.lookup("qeso"))
+
+    def test_longest_prefix_and_suffix(self):
+        """Prueba que gana la regla más larga."""
+        self.assertEqual(self.engine.lookup("enpezar"), "empezar")
+        self.assertEqual(self.engine.lookup("inportante"), "importante")
+        self.assertEqual(self.engine.lookup("cancion"), "canción")
+        self.assertEqual(self.engine.lookup("Inpresion"), "Impresión")
+
+    def test_no_overlap(self):
+        """Prueba que prefijo y sufijo no se solapan."""
+        engine = RuleEngine({"prefixes": {"abc": "x"}, "suffixes": {"bcd": "y"}})
+        self.assertEqual(engine.lookup("abcd"), "xd")
+
+    def test_unknown_section(self):
+        """Prueba que se rechazan secciones desconocidas."""
+        with self.assertRaises(ValueError):
+            RuleEngine({"infixes": {"a": "b"}})
+
+    def test_default_rules(self):
+        """Prueba las reglas por defecto a través del fallback."""
+        self.assertEqual(fallback_correction("Aser", ""), ("Hacer", True))
+        self.assertEqual(fallback_correction("XQ", ""), ("PORQUE", True))
+        self.assertEqual(fallback_correction("estacion", ""), ("estación", True))
+        self.assertEqual(fallback_correction("casa", ""), ("casa", False))
+
+    def test_correct_words_outside_lexicon(self):
+        """Prueba que no se reescriben palabras correctas fuera del léxico."""
+        for word in ("perro", "ola", "tubo", "echo", "caza", "halla"):
+            self.assertEqual(fallback_correction(word, "mi " + word), (word, False))
+
+def test_rule_engine_performance():
+    """
+    Prueba de rendimiento del motor de reglas.
+    El coste por búsqueda no debe depender del número de reglas.
+    """
+    print("\n=== Prueba de Rendimiento del Motor de Reglas ===")
+
+    words = ["qe", "tambien", "enpezar", "cancion", "importante", "casa"] * 10000
+
+    def random_word() -> str:
+        return "".join(random.choices(string.ascii_lowercase, k=random.randint(3, 10)))
+
+    results = {}
+    for extra_rules in (0, 10000, 100000):
+        engine = RuleEngine({
+            "words": {random_word(): "x" for _ in range(extra_rules)},
+            "suffixes": {random_word()[:4]: "y" for _ in range(extra_rules // 10)}
+        })
+        engine.add_rule("words", "qe", "que")
+        engine.add_rule("prefixes", "enp", "emp")
+        engine.add_rule("suffixes", "cion", "ción")
+
+        start_time = time.perf_counter()
+        for word in words:
+            engine.lookup(word)
+        elapsed = time.perf_counter() - start_time
+        results[engine.size] = elapsed / len(words) * 1e6
+        print(f"Reglas: {engine.size:>7} → {results[engine.size]:.2f}µs por búsqueda")
+
+    start_time = time.perf_counter()
+    for word in words:
+        RULES.lookup(word)
+    elapsed = time.perf_counter() - start_time
+    print(f"\nReglas por defecto: {len(words) / elapsed:,.0f} búsquedas/s")
+
+    return results
+
+if __name__ == "__main__":
+    print("Ejecutando pruebas del motor de reglas...")
+
+    try:
+        # Ejecutar pruebas unitarias
+        unittest.main(verbosity=2)
+    except SystemExit:
+        pass
+
+    # Ejecutar prueba de rendimiento
+    test_rule_engine_performance()
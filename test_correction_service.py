@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Pruebas para el servicio de corrección de textos completos.
+"""
+
+import unittest
+import asyncio
+import time
+from typing import List, Tuple
+from batch_processor import BatchProcessor
+from correction_service import CorrectionService
+from interfaces import ICorrector
+from token_filter import TokenFilter
+
+CORRECTIONS = {"qe": "que", "kiero": "quiero", "aki": "aquí", "Kiero": "Quiero"}
+
+class MockCorrector(ICorrector):
+    """Corrector simulado con latencia de proveedor."""
+
+    def __init__(self, delay: float = 0.05):
+        self.delay = delay
+        self.calls = []
+        self.batch_processor = BatchProcessor(self, batch_size=10, max_delay=0.05, min_batch_items=1)
+
+    def correct_text(self, word: str, context: str) -> Tuple[str, bool]:
+        self.calls.append((word, context))
+        time.sleep(self.delay)
+        correction = CORRECTIONS.get(word, word)
+        return correction, correction != word
+
+    def correct_sentence(self, words: List[str]) -> List[Tuple[str, bool]]:
+        self.calls.append(tuple(words))
+        time.sleep(self.delay)
+        return [(CORRECTIONS.get(w, w), w in CORRECTIONS) for w in words]
+
+    def test_connection(self) -> bool:
+        return True
+
+class TestCorrectionService(unittest.TestCase):
+    """Pruebas unitarias para CorrectionService."""
+
+    def setUp(self):
+        self.corrector = MockCorrector()
+        self.service = CorrectionService(self.corrector, TokenFilter(), timeout=5)
+
+    def tearDown(self):
+        self.corrector.batch_processor.stop()
+
+    def test_correct_text(self):
+        """Prueba que se corrige el texto conservando espacios y puntuación."""
+        result = asyncio.run(self.service.correct("Kiero  ir aki, 10:30 ¿qe?"))
+        self.assertEqual(result['corrected'], "Quiero  ir aquí, 10:30 ¿que?")
+        self.assertEqual(
+            [(c['word'], c['correction'], c['start']) for c in result['corrections']],
+            [("Kiero", "Quiero", 0), ("aki", "aquí", 10), ("qe", "que", 22)]
+        )
+        # Los números no llegan al corrector; el contexto termina en la palabra
+        words = [word for word, _ in self.corrector.calls]
+        self.assertNotIn("10:30", words)
+        # (el procesador puede unir contextos de un mismo grupo)
+        contexts = [context for word, context in self.corrector.calls if word == "qe"]
+        self.assertTrue(contexts[0].endswith("Kiero ir aki 10:30 qe"))
+
+    def test_sentence_mode(self):
+        """Prueba una llamada por frase."""
+        result = asyncio.run(self.service.correct("yo kiero. qe bien", sentence_mode=True))
+        self.assertEqual(result['corrected'], "yo quiero. que bien")
+        self.assertEqual(self.corrector.calls, [("yo", "kiero"), ("qe", "bien")])
+
+    def test_concurrent_requests(self):
+        """Prueba que las peticiones simultáneas comparten lotes."""
+        async def run():
+            return await asyncio.gather(*[
+                self.service.correct(f"kiero {i} qe vengas") for i in range(10)
+            ])
+
+        results = asyncio.run(run())
+        self.assertEqual(
+            [r['corrected'] for r in results],
+            [f"quiero {i} que vengas" for i in range(10)]
+        )
+        self.assertEqual(self.service.get_stats()['requests'], 10)
+
+    def test_timeout(self):
+        """Prueba que lo no resuelto a tiempo se devuelve sin cambios."""
+        self.corrector.delay = 0.5
+        self.service.timeout = 0.1
+        result = asyncio.run(self.service.correct("kiero"))
+        self.assertEqual(result['corrected'], "kiero")
+        self.assertEqual(self.service.get_stats()['timeouts'], 1)
+
+    def test_correct_batch(self):
+        """Prueba varios textos en una sola llamada, en su orden."""
+        results = asyncio.run(self.service.correct_batch(["kiero ir", "https://x.es", "aki qe"]))
+        self.assertEqual(
+            [r['corrected'] for r in results],
+            ["quiero ir", "https://x.es", "aquí que"]
+        )
+
+    def test_stream(self):
+        """Prueba que las palabras se corrigen según llegan los fragmentos."""
+        async def chunks():
+            # "kiero" llega partida en dos fragmentos; "aki" cierra el flujo
+            for chunk in ["yo ki", "ero ir ", "10:30 a", "ki"]:
+                yield chunk
+                await asyncio.sleep(0.01)
+
+        async def run():
+            return [event async for event in self.service.stream(chunks())]
+
+        events = asyncio.run(run())
+        self.assertEqual(events[-1], {'done': True, 'words': 4, 'corrected': 2})
+        self.assertEqual(
+            sorted((e['word'], e['correction'], e['start']) for e in events[:-1]),
+            [("aki", "aquí", 18), ("kiero", "quiero", 3)]
+        )
+        # Cada palabra se envía una sola vez y los números no se envían
+        words = [word for word, _ in self.corrector.calls]
+        self.assertEqual(sorted(words), ["aki", "ir", "kiero", "yo"])
+
+class TestLoadGenerator(unittest.TestCase):
+    """Pruebas del cálculo de percentiles del generador de carga."""
+
+    def test_percentiles(self):
+        from load_generator import percentiles
+
+        latencies = [i / 1000 for i in range(1, 101)]
+        self.assertEqual(percentiles(latencies), {'p50': 50.0, 'p90': 90.0, 'p99': 99.0})
+        self.assertEqual(percentiles([0.005], (50, 99)), {'p50': 5.0, 'p99': 5.0})
+        self.assertEqual(percentiles([]), {})
+
+def test_service_throughput():
+    """
+    Mide peticiones por segundo con muchos clientes simultáneos sobre el
+    mismo procesador por lotes.
+    """
+    print("\n=== Servicio de Corrección ===")
+
+    from generate_test_data import generate_load_test_data
+
+    corrector = MockCorrector(delay=0.002)
+    service = CorrectionService(corrector, TokenFilter(), timeout=30)
+    texts = [s["input"] for s in generate_load_test_data(100)]
+
+    async def run():
+        return await asyncio.gather(*[service.correct(text) for text in texts])
+
+    start = time.perf_counter()
+    results = asyncio.run(run())
+    elapsed = time.perf_counter() - start
+    corrector.batch_processor.stop()
+
+    latencies = sorted(r['elapsed_ms'] for r in results)
+    print(f"Peticiones: {len(texts)} simultáneas, {elapsed:.2f}s")
+    print(f"Rendimiento: {len(texts) / elapsed:.1f} peticiones/s")
+    print(f"Latencia p50: {latencies[len(latencies) // 2]:.0f}ms, p95: {latencies[int(len(latencies) * 0.95)]:.0f}ms")
+
+    return len(texts) / elapsed
+
+if __name__ == "__main__":
+    print("Ejecutando pruebas del servicio de corrección...")
+
+    try:
+        # Ejecutar pruebas unitarias
+        unittest.main(verbosity=2)
+    except SystemExit:
+        pass
+
+    # Ejecutar medición de rendimiento
+    test_service_throughput()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Pruebas para los tickets de corrección por palabra.
+"""
+
+import unittest
+from correction_tickets import TicketTracker
+from edit_planner import plan_edit, apply_plan
+
+class TestTicketTracker(unittest.TestCase):
+    """Pruebas unitarias para TicketTracker."""
+
+    def type_text(self, tracker: TicketTracker, text: str, words: list):
+        """Escribe texto emitiendo un ticket por cada palabra cerrada."""
+        word = ""
+        for ch in text:
+            tracker.advance()
+            if ch == " ":
+                if word:
+                    words.append(tracker.issue(word))
+                word = ""
+            else:
+                word += ch
+
+    def test_out_of_order_corrections(self):
+        """Prueba correcciones aplicadas en orden inverso en su posición."""
+        tracker = TicketTracker()
+        tickets = []
+        text = "qe aser ke tanbien "
+        self.type_text(tracker, text, tickets)
+        fixes = {"qe": "que", "aser": "hacer", "ke": "que", "tanbien": "también"}
+
+        cursor = len(text)
+        for ticket in reversed(tickets):
+            trailing = tracker.claim(ticket)
+            self.assertIsNotNone(trailing)
+            correction = fixes[ticket.word]
+            text, cursor = apply_plan(text, cursor, plan_edit(ticket.word, correction, trailing))
+            tracker.applied(ticket, correction)
+
+        self.assertEqual(text, "que hacer que también ")
+        self.assertEqual(cursor, len(text))
+        self.assertEqual(tracker.position, len(text))
+
+    def test_shift_later_tickets(self):
+        """Prueba que una corrección desplaza los tickets posteriores."""
+        tracker = TicketTracker()
+        tickets = []
+        text = "qe ke "
+        self.type_text(tracker, text, tickets)
+
+        first, second = tickets
+        tracker.claim(first)
+        text, _ = apply_plan(text, len(text), plan_edit("qe", "que", len(text) - first.end))
+        tracker.applied(first, "que")
+
+        trailing = tracker.claim(second)
+        text, _ = apply_plan(text, len(text), plan_edit("ke", "que", trailing))
+        self.assertEqual(text, "que que ")
+
+    def test_backspace_discards(self):
+        """Prueba que borrar hasta una palabra descarta su ticket."""
+        tracker = TicketTracker()
+        tickets = []
+        self.type_text(tracker, "qe ke ", tickets)
+
+        tracker.delete_back()  # Borra el espacio tras "ke"
+        self.assertIsNone(tracker.claim(tickets[1]))
+        self.assertIsNotNone(tracker.claim(tickets[0]))
+        self.assertEqual(tracker.discarded, 1)
+
+    def test_invalidate_and_limit(self):
+        """Prueba la invalidación y el límite de tickets en curso."""
+        tracker = TicketTracker(max_tickets=2)
+        tickets = []
+        self.type_text(tracker, "a b c ", tickets)
+        self.assertEqual(len(tracker), 2)
+        self.assertIsNone(tracker.claim(tickets[0]))
+
+        tracker.invalidate()
+        self.assertEqual(len(tracker), 0)
+        self.assertIsNone(tracker.claim(tickets[2]))
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
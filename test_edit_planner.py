@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Pruebas para el planificador de ediciones mínimas.
+"""
+
+import unittest
+from edit_planner import plan_edit, count_keystrokes, apply_plan, align
+from generate_test_data import generate_test_cases
+
+class TestEditPlanner(unittest.TestCase):
+    """Pruebas unitarias para el planificador."""
+
+    def check(self, original: str, correction: str) -> int:
+        """Aplica el plan tras "palabra + espacio" y devuelve las pulsaciones."""
+        ops = plan_edit(original, correction)
+        text, cursor = apply_plan(original + " ", len(original) + 1, ops)
+        self.assertEqual(text, correction + " ")
+        self.assertEqual(cursor, len(text))
+        return count_keystrokes(ops)
+
+    def test_single_insertion(self):
+        """Prueba que 'qe' → 'que' conserva el prefijo común."""
+        self.assertEqual(plan_edit("qe", "que"), [
+            ("left", 1), ("backspace", 1), ("type", "ue"), ("right", 1)
+        ])
+        self.assertEqual(self.check("qe", "que"), 5)
+
+    def test_common_prefix_untouched(self):
+        """Prueba que el prefijo común nunca se borra."""
+        ops = plan_edit("tanbien", "también")
+        deleted = sum(value for action, value in ops if action == "backspace")
+        self.assertLessEqual(deleted, len("tanbien") - len("ta"))
+        self.assertEqual(self.check("tanbien", "también"), 12)
+
+    def test_suffix_edit(self):
+        """Prueba que un cambio al final no necesita moverse."""
+        self.assertEqual(plan_edit("despues", "después"), [
+            ("left", 1), ("backspace", 2), ("type", "és"), ("right", 1)
+        ])
+
+    def test_scattered_edits(self):
+        """Prueba varias ediciones separadas dentro de la palabra."""
+        for original, correction in [
+            ("ecsepcion", "excepción"),
+            ("aser", "hacer"),
+            ("tanbien", "también"),
+            ("xq", "porque"),
+            ("berdá", "verdad"),
+            ("casa", "casa"),
+            ("", "que"),
+            ("que", "")
+        ]:
+            keystrokes = self.check(original, correction)
+            # Nunca peor que borrar y reescribir la palabra completa
+            self.assertLessEqual(keystrokes, len(original) + len(correction) + 2)
+
+    def test_alignment(self):
+        """Prueba la alineación de Levenshtein."""
+        self.assertEqual(align("ab", "axb"), [("a", "a"), ("", "x"), ("b", "b")])
+        self.assertEqual(align("abc", "ac"), [("a", "a"), ("b", ""), ("c", "c")])
+
+def test_keystrokes_per_correction():
+    """
+    Compara las pulsaciones inyectadas por corrección en el corpus generado:
+    borrar y reescribir (método anterior) frente al plan mínimo.
+    """
+    print("\n=== Pulsaciones por Corrección ===")
+
+    cases = [c for c in generate_test_cases(2000) if c["input"] != c["expected"]]
+    before = after = 0
+    for case in cases:
+        original, correction = case["input"], case["expected"]
+        # Anterior: flechas sobre palabra y espacio, suprimir, escribir, volver
+        before += (len(original) + 1) + len(original) + len(correction) + 1
+        after += count_keystrokes(plan_edit(original, correction))
+
+    print(f"\nAnterior: {before / len(cases):.1f} pulsaciones por corrección")
+    print(f"Plan mínimo: {after / len(cases):.1f} pulsaciones por corrección")
+    print(f"Reducción: {(1 - after / before) * 100:.1f}%")
+
+    return before / len(cases), after / len(cases)
+
+if __name__ == "__main__":
+    print("Ejecutando pruebas del planificador de ediciones...")
+
+    try:
+        # Ejecutar pruebas unitarias
+        unittest.main(verbosity=2)
+    except SystemExit:
+        pass
+
+    # Ejecutar comparación de pulsaciones
+    test_keystrokes_per_correction()
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Pruebas para el servidor de inferencia local con lotes dinámicos.
+"""
+
+import unittest
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from unittest.mock import MagicMock
+from inference_server import InferenceServer, simulated_loader, benchmark_windows
+from text_corrector import TextCorrector
+
+def failing_loader():
+    """Cargador que falla (importable desde el proceso de inferencia)."""
+    raise OSError("sin modelo")
+
+class HangingModel:
+    """Modelo que no termina con los textos "cuelga"."""
+
+    def __call__(self, text, max_length: int = 100, **kwargs):
+        texts = [text] if isinstance(text, str) else list(text)
+        if "cuelga" in texts:
+            time.sleep(60)
+        return [{'generated_text': t} for t in texts]
+
+def hanging_loader():
+    """Cargador del modelo que se cuelga (importable desde el proceso)."""
+    return HangingModel()
+
+class FakeServer:
+    """Servidor en proceso con una corrección fija."""
+
+    def __init__(self, ready=True):
+        self.ready = threading.Event()
+        if ready:
+            self.ready.set()
+        self.texts = []
+
+    def generate(self, text, max_length=100, timeout=None, prompt=None):
+        self.texts.append(text)
+        return text.replace("qe", "que").replace("kiero", "quiero")
+
+class TestInferenceServer(unittest.TestCase):
+    """Pruebas del proceso de inferencia."""
+
+    def test_dynamic_batching(self):
+        """Prueba que las peticiones simultáneas se agrupan en lotes."""
+        server = InferenceServer(simulated_loader, (20.0, 1.0), batch_window=0.05, max_batch=8)
+        server.start()
+        try:
+            self.assertTrue(server.wait(30))
+            with ThreadPoolExecutor(8) as pool:
+                results = list(pool.map(server.generate, [f"frase {i}" for i in range(16)]))
+            self.assertEqual(results, [f"frase {i}" for i in range(16)])
+            stats = server.get_stats()
+            self.assertEqual(stats['requests'], 16)
+            self.assertLess(stats['batches'], 16)
+            self.assertEqual(server(["a", "b"]), [{'generated_text': "a"}, {'generated_text': "b"}])
+        finally:
+            server.stop()
+
+    def test_load_failure(self):
+        """Prueba que un fallo de carga se propaga a las peticiones."""
+        server = InferenceServer(failing_loader)
+        server.start()
+        try:
+            server._reader.join(30)
+            self.assertFalse(server.ready.is_set())
+            self.assertIn("sin modelo", server.error)
+            with self.assertRaises(RuntimeError):
+                server.generate("hola", timeout=1)
+        finally:
+            server.stop()
+
+    def test_timeout_and_dead_worker(self):
+        """Prueba los tiempos de espera y la muerte del proceso de inferencia."""
+        server = InferenceServer(hanging_loader, request_timeout=0.2)
+        server.start()
+        try:
+            self.assertTrue(server.wait(30))
+            # Una petición agotada no queda pendiente
+            with self.assertRaises(FutureTimeoutError):
+                server.generate("cuelga", timeout=0.2)
+            with self.assertRaises(FutureTimeoutError):
+                server(["hola", "cuelga"])
+            self.assertEqual(server.get_stats()['pending'], 0)
+
+            # Si el proceso muere, las peticiones en curso fallan en vez de colgarse
+            future = server.submit("hola")
+            server._process.kill()
+            with self.assertRaises(RuntimeError):
+                future.result(10)
+            with self.assertRaises(RuntimeError):
+                server.generate("hola", timeout=1)
+            self.assertFalse(server.ready.is_set())
+        finally:
+            server.stop()
+
+    def test_cancelled_before_result(self):
+        """Prueba que un futuro cancelado por tiempo no detiene al lector."""
+        from concurrent.futures import Future
+        from inference_server import _RESULTS, _ERROR
+
+        server = InferenceServer(simulated_loader, (1.0, 0.0))
+        server.start()
+        try:
+            self.assertTrue(server.wait(30))
+            # El lector retira los futuros y _result los cancela antes de resolverlos
+            for kind, request_id in ((_RESULTS, -1), (_ERROR, -2)):
+                future = Future()
+                future.cancel()
+                server._pending[request_id] = future
+                payload = [(request_id, "tarde")] if kind == _RESULTS else [request_id]
+                server._responses.put((kind, payload, "fallo"))
+            self.assertEqual(server.generate("hola", timeout=10), "hola")
+            self.assertTrue(server._reader.is_alive())
+        finally:
+            server.stop()
+
+class TestLocalProvider(unittest.TestCase):
+    """Pruebas del proveedor "Local" del TextCorrector."""
+
+    def setUp(self):
+        self.corrector = TextCorrector.__new__(TextCorrector)
+        self.corrector._local = threading.local()
+        self.corrector.cache = MagicMock()
+        self.corrector.cache.get.return_value = None
+        self.corrector.service = "Local"
+        self.corrector.local_server = FakeServer()
+
+    def test_local_correct(self):
+        """Prueba que se corrige la ventana y se extrae la palabra."""
+        result = self.corrector.local_correct("qe", "creo qe")
+        self.assertEqual(result, ("que", True))
+        self.assertEqual(self.corrector.local_server.texts, ["creo qe"])
+        self.corrector.cache.add.assert_called_once()
+
+    def test_fallback_while_loading(self):
+        """Prueba que se usa el fallback mientras el modelo carga."""
+        self.corrector.local_server = FakeServer(ready=False)
+        self.assertEqual(self.corrector.local_correct("kiero", "yo kiero"), ("quiero", True))
+        self.assertEqual(self.corrector.local_server.texts, [])
+
+    def test_sentence(self):
+        """Prueba la corrección de frase con el modelo local."""
+        results = self.corrector.correct_sentence(["yo", "kiero", "qe", "vengas"])
+        self.assertEqual(results[1], ("quiero", True))
+        self.assertEqual(results[2], ("que", True))
+
+def test_batch_window_performance():
+    """
+    Mide el rendimiento del servidor según la ventana de lote con un modelo
+    simulado (coste fijo por lote más un coste por frase).
+    """
+    print("\n=== Servidor de Inferencia Local ===")
+
+    texts = [f"frase de prueba {i}" for i in range(96)]
+    results = benchmark_windows(simulated_loader, (20.0, 1.0), [0, 10, 30], texts, clients=16)
+    print(f"{'Ventana':>8} {'Frases/s':>9} {'p50':>9} {'Lote medio':>11}")
+    for window, r in results.items():
+        print(f"{window:>6.0f}ms {r['throughput']:>9.1f} {r['p50_ms']:>7.1f}ms {r['mean_batch']:>11.1f}")
+
+    return results
+
+if __name__ == "__main__":
+    print("Ejecutando pruebas del servidor de inferencia...")
+
+    try:
+        # Ejecutar pruebas unitarias
+        unittest.main(verbosity=2)
+    except SystemExit:
+        pass
+
+    # Ejecutar medición de rendimiento
+    test_batch_window_performance()
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+Pruebas para el canal de pulsaciones fuera del hilo del hook.
+"""
+
+import unittest
+import threading
+import time
+import statistics
+from unittest.mock import MagicMock, patch
+from keystroke_pipeline import SPSCRingBuffer, KeystrokePipeline, EV_SPACE, EV_BACKSPACE
+
+class TestSPSCRingBuffer(unittest.TestCase):
+    """Pruebas unitarias para SPSCRingBuffer."""
+
+    def test_fifo_order(self):
+        """Prueba que los eventos salen en orden de llegada."""
+        ring = SPSCRingBuffer(capacity=4)
+        for code in (104, 111, EV_SPACE):
+            self.assertTrue(ring.push(code, 1.0))
+        self.assertEqual(len(ring), 3)
+        self.assertEqual([ring.pop()[0] for _ in range(3)], [104, 111, EV_SPACE])
+        self.assertIsNone(ring.pop())
+
+    def test_capacity_and_drops(self):
+        """Prueba que un buffer lleno descarta eventos sin bloquear."""
+        ring = SPSCRingBuffer(capacity=3)
+        self.assertEqual(ring.capacity, 4)
+        for code in range(6):
+            ring.push(code, 0.0)
+        self.assertEqual(len(ring), 4)
+        self.assertEqual(ring.dropped, 2)
+
+        # Tras leer, el espacio liberado se reutiliza
+        ring.pop()
+        self.assertTrue(ring.push(99, 0.0))
+        self.assertEqual([ring.pop()[0] for _ in range(4)], [1, 2, 3, 99])
+
+    def test_concurrent_producer_consumer(self):
+        """Prueba un productor y un consumidor en hilos distintos."""
+        ring = SPSCRingBuffer(capacity=64)
+        received = []
+        total = 20000
+
+        def consume():
+            while len(received) < total:
+                event = ring.pop()
+                if event is None:
+                    time.sleep(0)
+                    continue
+                received.append(event[0])
+
+        consumer = threading.Thread(target=consume)
+        consumer.start()
+        for code in range(total):
+            while not ring.push(code, 0.0):
+                time.sleep(0)
+        consumer.join(timeout=10)
+
+        self.assertEqual(received, list(range(total)))
+
+class TestKeystrokePipeline(unittest.TestCase):
+    """Pruebas unitarias para KeystrokePipeline."""
+
+    def test_dispatch_in_consumer_thread(self):
+        """Prueba que el manejador se ejecuta fuera del hilo productor."""
+        seen = []
+        pipeline = KeystrokePipeline(
+            lambda code, ts: seen.append((code, threading.current_thread()))
+        )
+        pipeline.start()
+        try:
+            for char in "hola":
+                pipeline.push(ord(char))
+            pipeline.push(EV_BACKSPACE)
+            self.assertTrue(pipeline.drain())
+        finally:
+            pipeline.stop()
+
+        self.assertEqual([code for code, _ in seen], [104, 111, 108, 97, EV_BACKSPACE])
+        self.assertTrue(all(t is not threading.current_thread() for _, t in seen))
+        self.assertEqual(pipeline.get_stats()['processed_events'], 5)
+
+    def test_handler_errors(self):
+        """Prueba que un error del manejador no detiene el consumidor."""
+        seen = []
+
+        def handler(code, timestamp):
+            if code == 0:
+                raise ValueError("fallo")
+            seen.append(code)
+
+        pipeline = KeystrokePipeline(handler)
+        pipeline.start()
+        pipeline.push(0)
+        pipeline.push(1)
+        pipeline.drain()
+        pipeline.stop()
+        self.assertEqual(seen, [1])
+
+class TestSyntheticKeys(unittest.TestCase):
+    """Pruebas de las pulsaciones sintéticas en el callback del hook."""
+
+    def setUp(self):
+        from keyboardlistener import KeyboardListener, OptimizedBuffer
+
+        with patch('keyboardlistener.Controller', return_value=MagicMock()):
+            self.listener = KeyboardListener(MagicMock(), OptimizedBuffer(), MagicMock())
+        self.seen = []
+        self.listener.pipeline.push = lambda code: self.seen.append(code)
+
+    def tearDown(self):
+        self.listener.stop()
+
+    def test_injected_flag(self):
+        """Prueba que la marca de pynput decide, también durante una inyección."""
+        from pynput.keyboard import Key, KeyCode
+
+        self.listener.on_press(Key.left, injected=True)
+        self.listener.on_press(KeyCode.from_char("a"), injected=False)
+        self.assertEqual(self.seen, [ord("a")])
+        self.assertEqual(self.listener.ignored_keys, 1)
+
+    def test_expected_sequence(self):
+        """Prueba que sin la marca se ignoran solo las teclas esperadas."""
+        from pynput.keyboard import Key, KeyCode
+
+        self.listener.injector.inject("qe", "que", "minimal")
+        expected = list(self.listener.injector.expected)
+
+        # Una tecla real llega en mitad de la inyección y otra después
+        self.listener.on_press(self.key(expected[0]))
+        self.listener.on_press(KeyCode.from_char("x"))
+        for key in expected[1:]:
+            self.listener.on_press(self.key(key))
+        self.listener.on_press(Key.space)
+
+        self.assertEqual(self.seen, [ord("x"), EV_SPACE])
+        self.assertEqual(self.listener.ignored_keys, len(expected))
+
+    def test_expected_sequence_not_injected(self):
+        """Prueba que con la marca a False (Linux) se reconocen las esperadas."""
+        from pynput.keyboard import Key, KeyCode
+
+        self.listener.injector.inject("qe", "que", "minimal")
+        expected = list(self.listener.injector.expected)
+
+        self.listener.on_press(self.key(expected[0]), False)
+        self.listener.on_press(KeyCode.from_char("x"), False)
+        for key in expected[1:]:
+            self.listener.on_press(self.key(key), False)
+        self.listener.on_press(Key.space, False)
+
+        self.assertEqual(self.seen, [ord("x"), EV_SPACE])
+        self.assertEqual(self.listener.ignored_keys, len(expected))
+        self.assertFalse(self.listener.injector.expected)
+
+    def test_ticket_position_after_injection(self):
+        """Prueba que la posición de los tickets sigue al texto real."""
+        from pynput.keyboard import KeyCode
+
+        listener = self.listener
+        del listener.pipeline.push  # Encolado real hacia handle_event
+        for char in "yo qe ":
+            listener.pipeline.push(EV_SPACE if char == " " else ord(char))
+        listener.pipeline.drain()
+        ticket = next(iter(listener.tickets.tickets.values()))
+
+        # La corrección se aplica y el hook recibe después sus pulsaciones,
+        # con una tecla del usuario intercalada
+        listener.correction_callback(ticket, "que", True)
+        listener.apply_ready()
+        expected = list(listener.injector.expected)
+        listener.on_press(self.key(expected[0]))
+        listener.on_press(KeyCode.from_char("x"))
+        for key in expected[1:]:
+            listener.on_press(self.key(key))
+        listener.pipeline.drain()
+
+        self.assertEqual(listener.tickets.position, len("yo que x"))
+        self.assertEqual(listener.buffer.get_word(), "x")
+
+    @staticmethod
+    def key(value):
+        from pynput.keyboard import KeyCode
+        return KeyCode.from_char(value) if isinstance(value, str) else value
+
+def test_keystroke_callback_performance():
+    """
+    Mide el tiempo del callback del hook por pulsación a 20 y 200 teclas/s.
+    Compara el procesamiento síncrono anterior (handle_event en el hook)
+    con el encolado actual (on_press).
+    """
+    from pynput.keyboard import Key
+    from keyboardlistener import KeyboardListener, OptimizedBuffer
+
+    print("\n=== Tiempo de Callback por Pulsación ===")
+
+    corrector = MagicMock()
+    with patch('keyboardlistener.Controller'):
+        listener = KeyboardListener(corrector, OptimizedBuffer(), MagicMock())
+
+    text = "el dislexico escrive mui rapido cuando tiene prisa "
+    keys = [
+        Key.space if ch == " " else type('obj', (), {'char': ch})()
+        for ch in text
+    ]
+
+    def synchronous(key):
+        # Camino anterior: todo el trabajo dentro del hook
+        char = getattr(key, 'char', None)
+        listener.handle_event(ord(char) if char else EV_SPACE)
+
+    results = {}
+    try:
+        for rate in (20, 200):
+            interval = 1.0 / rate
+            count = min(len(keys) * (rate // 20), 400)
+            for name, callback in (("síncrono", synchronous), ("encolado", listener.on_press)):
+                timings = []
+                for i in range(count):
+                    key = keys[i % len(keys)]
+                    start = time.perf_counter()
+                    callback(key)
+                    timings.append((time.perf_counter() - start) * 1e6)
+                    time.sleep(interval)
+                listener.pipeline.drain()
+                timings.sort()
+                p99 = timings[int(len(timings) * 0.99) - 1]
+                results[(rate, name)] = (statistics.mean(timings), p99)
+                print(
+                    f"{rate:>3} teclas/s {name:>9}: "
+                    f"media {statistics.mean(timings):7.1f}µs, p99 {p99:7.1f}µs"
+                )
+    finally:
+        listener.stop()
+
+    stats = listener.pipeline.get_stats()
+    print(f"\nEventos descartados: {stats['dropped_events']}")
+    return results
+
+if __name__ == "__main__":
+    print("Ejecutando pruebas del canal de pulsaciones...")
+
+    try:
+        # Ejecutar pruebas unitarias
+        unittest.main(verbosity=2)
+    except SystemExit:
+        pass
+
+    # Ejecutar prueba de rendimiento
+    test_keystroke_callback_performance()
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Pruebas para la carga diferida del modelo del corrector en vivo.
+"""
+
+import unittest
+import threading
+import time
+from unittest.mock import patch
+import live_corrector
+from live_corrector import LazyModel, IncrementalCorrector, window_start, WARMUP_TEXT
+
+class FakePipeline:
+    """Pipeline mínimo que registra las llamadas."""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, text, **kwargs):
+        self.calls.append(text)
+        return [{'generated_text': text.replace("qe", "que")}]
+
+class TestLazyModel(unittest.TestCase):
+    """Pruebas unitarias para LazyModel."""
+
+    def test_background_load_and_warmup(self):
+        """Prueba que la carga no bloquea y que se calienta antes de estar listo."""
+        release = threading.Event()
+        fake = FakePipeline()
+
+        def builder(name):
+            release.wait(5)
+            return fake
+
+        model = LazyModel("prueba", builder)
+        start = time.perf_counter()
+        model.start()
+        self.assertLess(time.perf_counter() - start, 0.5)
+        self.assertFalse(model.ready.is_set())
+
+        release.set()
+        self.assertTrue(model.wait(5))
+        self.assertEqual(fake.calls, [WARMUP_TEXT])
+        self.assertIsNotNone(model.ready_at)
+        self.assertEqual(model.correct("qe tal"), "que tal")
+
+    def test_load_error(self):
+        """Prueba que un fallo de carga deja el modelo sin marcar como listo."""
+        def builder(name):
+            raise OSError("sin modelo")
+
+        model = LazyModel("prueba", builder)
+        model.start()
+        model._thread.join(5)
+        self.assertFalse(model.ready.is_set())
+        self.assertIsInstance(model.error, OSError)
+
+class TestFallback(unittest.TestCase):
+    """Pruebas del diccionario local mientras el modelo carga."""
+
+    def test_dictionary_before_ready(self):
+        """Prueba que antes de estar listo se usa el diccionario local."""
+        model = LazyModel("prueba", lambda name: FakePipeline())
+        with patch.object(live_corrector, 'model', model):
+            corrected, changed = live_corrector.ai_correct_text("Kiero ir aki, qe bien.")
+            self.assertTrue(changed)
+            self.assertEqual(corrected, "Quiero ir aquí, que bien.")
+
+            model.start()
+            model.wait(5)
+            self.assertEqual(live_corrector.ai_correct_text("qe"), ("que", True))
+
+    def test_learned_patterns(self):
+        """Prueba que los patrones aprendidos tienen prioridad."""
+        with patch.dict(live_corrector.learned_patterns, {'ola': 'hola'}):
+            self.assertEqual(live_corrector.dictionary_correct("Ola 123"), ("Hola 123", True))
+        self.assertEqual(live_corrector.dictionary_correct("casa"), ("casa", False))
+
+class RecordingCorrector:
+    """Corrector de ventanas que registra lo que recibe."""
+
+    def __init__(self):
+        self.windows = []
+
+    def __call__(self, text):
+        self.windows.append(text)
+        corrected = text.replace("qe", "que")
+        return corrected, corrected != text
+
+class TestIncrementalCorrector(unittest.TestCase):
+    """Pruebas unitarias para IncrementalCorrector."""
+
+    def setUp(self):
+        self.correct = RecordingCorrector()
+        self.injected = []
+        self.corrector = IncrementalCorrector(
+            self.correct, lambda delete, text: self.injected.append((delete, text))
+        )
+
+    def type_text(self, text):
+        for char in text:
+            self.corrector.insert(char)
+
+    def test_window_start(self):
+        """Prueba los límites de la ventana de frases."""
+        text = "Uno. Dos. Tres cuatro"
+        self.assertEqual(window_start(text, len(text) - 1, 1), 9)
+        self.assertEqual(window_start(text, len(text) - 1, 2), 4)
+        self.assertEqual(window_start(text, len(text) - 1, 5), 0)
+        self.assertEqual(window_start(text, 3, 1), 0)
+
+    def test_idle_ticks(self):
+        """Prueba que sin pulsaciones nuevas no se corrige nada."""
+        self.assertFalse(self.corrector.tick())
+        self.type_text("hola")
+        self.corrector.tick()
+        self.corrector.tick()
+        self.assertEqual(len(self.correct.windows), 1)
+        self.assertEqual(self.corrector.get_stats()['idle_ticks'], 2)
+
+    def test_bounded_window_and_minimal_edit(self):
+        """Prueba que solo se corrigen las frases cercanas y se reescribe lo mínimo."""
+        self.type_text("Primera frase. Segunda frase.")
+        self.corrector.tick()
+        self.type_text(" Tercera y qe")
+        self.assertTrue(self.corrector.tick())
+        self.assertEqual(self.correct.windows[-1], " Segunda frase. Tercera y qe")
+        self.assertEqual(self.injected, [(1, "ue")])
+        self.assertEqual(self.corrector.text(), "Primera frase. Segunda frase. Tercera y que")
+
+        # Las pulsaciones propias no cuentan como texto nuevo
+        self.corrector.delete()
+        self.type_text("ue")
+        self.assertEqual(self.corrector.text(), "Primera frase. Segunda frase. Tercera y que")
+        self.assertFalse(self.corrector.tick())
+
+        self.type_text(" bien. Cuarta")
+        self.corrector.tick()
+        self.assertEqual(self.correct.windows[-1], " Segunda frase. Tercera y que bien. Cuarta")
+
+    def test_window_cache(self):
+        """Prueba que una ventana repetida no vuelve a pasar por el modelo."""
+        self.type_text("Hola. casa")
+        self.corrector.tick()
+        self.corrector.delete()
+        self.corrector.tick()
+        self.corrector.insert("a")
+        self.corrector.tick()
+        self.assertEqual(len(self.correct.windows), 2)
+        self.assertEqual(self.corrector.get_stats()['cache_hits'], 1)
+
+    def test_stale_result(self):
+        """Prueba que se descarta una corrección si se escribió mientras tanto."""
+        def correct(text):
+            self.corrector.insert("x")
+            return text.upper(), True
+
+        self.corrector.correct = correct
+        self.type_text("qe")
+        self.assertFalse(self.corrector.tick())
+        self.assertEqual(self.injected, [])
+        self.assertEqual(self.corrector.text(), "qex")
+
+def test_incremental_performance():
+    """
+    Compara los caracteres enviados al modelo corrigiendo todo el buffer en
+    cada ciclo con la re-corrección incremental por ventanas.
+    """
+    print("\n=== Re-corrección Incremental ===")
+
+    from generate_test_data import generate_load_test_data
+
+    text = ". ".join(s["input"] for s in generate_load_test_data(100)) + "."
+    chunk = 20  # Caracteres escritos por ciclo
+
+    full_chars = 0
+    for end in range(chunk, len(text) + chunk, chunk):
+        full_chars += len(text[:end])
+
+    correct = RecordingCorrector()
+    corrector = IncrementalCorrector(correct, lambda delete, text: None)
+    start_time = time.perf_counter()
+    for i in range(0, len(text), chunk):
+        for char in text[i:i + chunk]:
+            corrector.insert(char)
+        corrector.tick()
+        corrector.tick()  # Ciclo sin pulsaciones nuevas
+    elapsed = time.perf_counter() - start_time
+
+    stats = corrector.get_stats()
+    print(f"Texto: {len(text)} caracteres, {stats['ticks']} ciclos ({stats['idle_ticks']} sin cambios)")
+    print(f"Caracteres al modelo (buffer completo): {full_chars}")
+    print(f"Caracteres al modelo (incremental): {stats['window_chars']}")
+    print(f"Reducción: {full_chars / max(1, stats['window_chars']):.1f}x")
+    print(f"Coste propio: {elapsed / stats['ticks'] * 1e6:.1f}µs por ciclo")
+
+    return full_chars, stats['window_chars']
+
+def test_startup_performance():
+    """
+    Mide el tiempo hasta poder corregir con un modelo que tarda en cargar,
+    comparando la carga bloqueante con la carga en segundo plano.
+    """
+    print("\n=== Arranque del Corrector en Vivo ===")
+
+    load_delay = 0.5
+
+    def builder(name):
+        time.sleep(load_delay)
+        return FakePipeline()
+
+    start = time.perf_counter()
+    model = LazyModel("prueba", builder)
+    model.start()
+    first_correction = live_corrector.dictionary_correct("qe")  # Ya se puede corregir
+    listener_ready = time.perf_counter() - start
+    model.wait()
+    model_ready = time.perf_counter() - start
+
+    print(f"Carga simulada del modelo: {load_delay * 1000:.0f}ms")
+    print(f"Listo para corregir: {listener_ready * 1000:.1f}ms ({first_correction[0]!r})")
+    print(f"Modelo listo: {model_ready * 1000:.1f}ms")
+
+    return listener_ready, model_ready
+
+if __name__ == "__main__":
+    print("Ejecutando pruebas del corrector en vivo...")
+
+    try:
+        # Ejecutar pruebas unitarias
+        unittest.main(verbosity=2)
+    except SystemExit:
+        pass
+
+    # Ejecutar medición de rendimiento
+    test_startup_performance()
+    test_incremental_performance()
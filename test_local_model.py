@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Pruebas para los backends de inferencia local.
+"""
+
+import unittest
+import time
+from local_model import (
+    resolve_backend, resolve_model, default_threads, benchmark_backend,
+    print_benchmark, MODELS
+)
+
+class FakeModel:
+    """Modelo con la interfaz del pipeline y una latencia fija por llamada."""
+
+    def __init__(self, delay=0.001):
+        self.delay = delay
+        self.calls = 0
+
+    def __call__(self, text, max_length=100, **kwargs):
+        self.calls += 1
+        time.sleep(self.delay)
+        texts = [text] if isinstance(text, str) else text
+        return [{'generated_text': t} for t in texts]
+
+class TestLocalModel(unittest.TestCase):
+    """Pruebas unitarias de la selección de backend y la comparativa."""
+
+    def test_resolve_backend(self):
+        """Prueba la elección automática de backend."""
+        self.assertEqual(resolve_backend("auto", cuda=False), "int8")
+        self.assertEqual(resolve_backend("auto", cuda=True), "pytorch")
+        self.assertEqual(resolve_backend("onnx"), "onnx")
+        with self.assertRaises(ValueError):
+            resolve_backend("tensorrt")
+
+    def test_resolve_model(self):
+        """Prueba los alias de modelo."""
+        self.assertEqual(resolve_model("base"), MODELS["base"])
+        self.assertEqual(resolve_model("org/modelo"), "org/modelo")
+
+    def test_default_threads(self):
+        """Prueba que siempre hay al menos un hilo."""
+        self.assertGreaterEqual(default_threads(), 1)
+
+    def test_benchmark_backend(self):
+        """Prueba las métricas de la comparativa."""
+        model = FakeModel()
+        sentences = [f"frase {i}" for i in range(10)]
+        result = benchmark_backend(lambda: model, sentences, batch_size=4)
+        # Calentamiento + una a una + 3 lotes
+        self.assertEqual(model.calls, 1 + 10 + 3)
+        self.assertGreaterEqual(result['p95_ms'], result['p50_ms'])
+        self.assertGreater(result['throughput'], 0)
+        self.assertEqual(
+            set(result), {'load_s', 'p50_ms', 'p95_ms', 'throughput', 'rss_mb'}
+        )
+        print_benchmark({"fake": result})
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -41,6 +41,51 @@ class TestOptimizedBuffer(unittest.TestCase):
         context = self.buffer.get_context()
         self.assertEqual(context, "hola mundo python test")
     
+    def test_incremental_word(self):
+        """Prueba la palabra actual y la ventana de contexto incrementales."""
+        for char in "hola":
+            self.buffer.add_char(char)
+        self.assertEqual(self.buffer.get_word(), "hola")
+        self.assertEqual(self.buffer.pop_char(), "a")
+        self.assertEqual(self.buffer.get_word(), "hol")
+
+        for word in ["uno", "dos", "tres", "cuatro"]:
+            self.buffer.add_word(word)
+        self.assertEqual(self.buffer.get_context(), "dos tres cuatro")
+
+    def test_cursor_edits(self):
+        """Prueba movimientos de cursor y ediciones a mitad de palabra."""
+        for char in "csa":
+            self.buffer.add_char(char)
+
+        # "c|sa" → insertar "o" → "cosa"
+        self.assertTrue(self.buffer.move_cursor(-2))
+        self.buffer.add_char("o")
+        self.assertEqual(self.buffer.get_word(), "cosa")
+
+        # Suprimir bajo el cursor y backspace antes del cursor
+        self.assertEqual(self.buffer.delete_char(), "s")
+        self.assertEqual(self.buffer.pop_char(), "o")
+        self.assertEqual(self.buffer.get_word(), "ca")
+        self.assertEqual(self.buffer.stats.total_chars, 2)
+
+        # El cursor no puede salir de la palabra actual
+        self.assertFalse(self.buffer.move_cursor(-5))
+        self.assertTrue(self.buffer.move_cursor(1))
+        self.assertFalse(self.buffer.move_cursor(1))
+
+    def test_ring_overflow(self):
+        """Prueba que al llenarse se descartan los caracteres más antiguos."""
+        buffer = OptimizedBuffer(max_size=4)
+        for char in "abcdef":
+            buffer.add_char(char)
+        self.assertEqual(buffer.get_word(), "cdef")
+
+        # Edición a mitad de palabra con el contenido dando la vuelta al array
+        buffer.move_cursor(-1)
+        buffer.add_char("X")
+        self.assertEqual(buffer.get_word(), "deXf")
+
     def test_cleanup(self):
         """Prueba la limpieza automática del buffer."""
         # Llenar el buffer
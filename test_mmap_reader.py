@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Pruebas para la lectura de corpus con archivos mapeados en memoria.
+"""
+
+import unittest
+import os
+import tempfile
+import threading
+import time
+from mmap_reader import MappedFile, iter_segments
+
+class TestMappedFile(unittest.TestCase):
+    """Pruebas unitarias para MappedFile."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "corpus.txt")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def write(self, text: str) -> bytes:
+        data = text.encode("utf-8")
+        with open(self.path, "wb") as f:
+            f.write(data)
+        return data
+
+    def test_segments(self):
+        """Prueba que las frases y separadores reproducen el texto exacto."""
+        data = self.write("Hola. \nyo kiero ir. ¿Qe tal?  Bien!\n\nhttps://x.es aki")
+        with MappedFile(self.path) as mapped:
+            segments = list(iter_segments(mapped.buffer, 0, len(mapped)))
+            self.assertEqual(
+                b"".join(bytes(mapped.view(first, end)) for first, _, end in segments),
+                data
+            )
+            self.assertEqual(
+                [mapped.text(first, last) for first, last, _ in segments if last > first],
+                ["Hola.", "yo kiero ir.", "¿Qe tal?", "Bien!", "https://x.es aki"]
+            )
+
+    def test_blocks(self):
+        """Prueba que los bloques cubren el archivo y se cortan en buenos límites."""
+        data = self.write("Párrafo uno, ñandú.\n\nyo kiero ir. ¿Qe tal? " * 50 + "ñ" * 40)
+        with MappedFile(self.path) as mapped:
+            blocks = list(mapped.blocks(0, 64))
+            self.assertEqual(blocks[0][0], 0)
+            self.assertEqual(blocks[-1][1], len(data))
+            for (_, end), (start, _) in zip(blocks, blocks[1:]):
+                self.assertEqual(end, start)
+            # Nunca a mitad de una palabra (salvo en la tira final sin espacios)
+            for start, end in blocks[:-2]:
+                self.assertIn(data[end - 1:end], (b" ", b"\n"))
+            # Siempre en un límite de carácter
+            for start, end in blocks:
+                bytes(mapped.view(start, end)).decode("utf-8")
+
+            # Reanudar desde una posición intermedia
+            resumed = list(mapped.blocks(blocks[3][0], 64))
+            self.assertEqual(resumed, blocks[3:])
+
+    def test_zero_copy_view(self):
+        """Prueba que los rangos son vistas del mapa, no copias."""
+        self.write("yo kiero ir")
+        with MappedFile(self.path) as mapped:
+            view = mapped.view(3, 8)
+            self.assertIsInstance(view, memoryview)
+            self.assertEqual(bytes(view), b"kiero")
+            view.release()
+            mapped.release(0, len(mapped))
+            self.assertEqual(mapped.text(0, 2), "yo")
+
+    def test_empty_file(self):
+        """Prueba que un archivo vacío no produce bloques ni falla."""
+        self.write("")
+        with MappedFile(self.path) as mapped:
+            self.assertEqual(list(mapped.blocks()), [])
+            self.assertEqual(list(iter_segments(mapped.buffer, 0, 0)), [])
+
+def test_memory_performance():
+    """
+    Compara la memoria residente máxima al corregir un corpus y otro cuatro
+    veces mayor: con la entrada mapeada no debería crecer con el tamaño.
+    """
+    print("\n=== Lectura Mapeada en Memoria ===")
+
+    import psutil
+    from corpus_corrector import CorpusCorrector, _init_worker
+    from generate_test_data import generate_load_test_data
+
+    _init_worker()  # Léxicos cargados antes de medir
+    process = psutil.Process()
+    text = "".join(
+        s["input"] + (".\n" if i % 3 == 0 else ". ")
+        for i, s in enumerate(generate_load_test_data(5000))
+    ).encode("utf-8")
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        results = []
+        for copies in (16, 64):
+            path = os.path.join(tmpdir, f"corpus{copies}.txt")
+            with open(path, "wb") as f:
+                for i in range(copies):
+                    f.write(text)
+                    f.write(f"Copia {i}.\n".encode("utf-8"))
+
+            peak = [process.memory_info().rss]
+            done = threading.Event()
+
+            def sample():
+                while not done.is_set():
+                    peak[0] = max(peak[0], process.memory_info().rss)
+                    time.sleep(0.005)
+
+            baseline = process.memory_info().rss
+            sampler = threading.Thread(target=sample, daemon=True)
+            sampler.start()
+            stats = CorpusCorrector(workers=2).run([path], os.path.join(tmpdir, f"out{copies}"))
+            done.set()
+            sampler.join()
+            results.append((os.path.getsize(path), (peak[0] - baseline) / 1024 / 1024, stats))
+
+    for size, growth, stats in results:
+        print(f"Entrada: {size / 1e6:.1f} MB, {stats['words_per_s']:.0f} palabras/s, "
+              f"RSS máximo sobre la base: {growth:.1f} MB")
+
+    return results
+
+if __name__ == "__main__":
+    print("Ejecutando pruebas de lectura mapeada en memoria...")
+
+    try:
+        # Ejecutar pruebas unitarias
+        unittest.main(verbosity=2)
+    except SystemExit:
+        pass
+
+    # Ejecutar medición de rendimiento
+    test_memory_performance()
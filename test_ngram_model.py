@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Pruebas para el modelo de n-gramas de palabras.
+"""
+
+import unittest
+import os
+import tempfile
+import time
+from ngram_model import (
+    DEFAULT_MODEL,
+    NgramBuilder,
+    NgramModel,
+    build_default_model,
+    get_default_model,
+    tokenize,
+    quantize,
+    dequantize
+)
+
+CORPUS = [
+    "No hay nada que hacer.",
+    "Hoy no hay clase.",
+    "Creo que hay tiempo.",
+    "Ya no hay pan en la mesa.",
+    "El libro está ahí encima.",
+    "Déjalo ahí mismo.",
+    "Ponlo ahí por favor.",
+    "Voy a hacer la tarea.",
+    "Vamos a hacer la comida.",
+]
+
+class TestNgramModel(unittest.TestCase):
+    """Pruebas unitarias para NgramModel."""
+
+    def setUp(self):
+        """Configura el entorno de prueba."""
+        builder = NgramBuilder(min_count=1)
+        builder.feed(CORPUS)
+        self.model = builder.build()
+
+    def test_tokenize(self):
+        """Prueba la tokenización."""
+        self.assertEqual(tokenize("¿Qué hay ahí?"), ["qué", "hay", "ahí"])
+
+    def test_quantization(self):
+        """Prueba que la cuantización pierde poca precisión."""
+        for log_prob in (0.0, -0.5, -2.3, -6.9):
+            self.assertAlmostEqual(dequantize(quantize(log_prob)), log_prob, delta=0.02)
+        self.assertEqual(quantize(-100.0), 255)
+
+    def test_context_ranking(self):
+        """Prueba que el contexto decide entre homófonos."""
+        self.assertEqual(self.model.best(["hay", "ahí"], "ya no ai", word="ai"), "hay")
+        self.assertEqual(self.model.best(["hay", "ahí"], "déjalo ai", word="ai"), "ahí")
+        self.assertEqual(self.model.best(["hacer", "a ser"], "voy a"), "hacer")
+
+    def test_backoff(self):
+        """Prueba que los n-gramas conocidos puntúan más que los desconocidos."""
+        seen = self.model.score("hay", ["no"])
+        unseen = self.model.score("hay", ["zzz"])
+        unknown = self.model.score("xyz", ["no"])
+        self.assertGreater(seen, unseen)
+        self.assertGreater(unseen, unknown)
+
+    def test_mmap_roundtrip(self):
+        """Prueba guardar y cargar el modelo con mmap."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "model.bin")
+            self.model.save(path)
+            loaded = NgramModel.load(path)
+            try:
+                for word, history in [("hay", ["no"]), ("ahí", ["déjalo"]), ("xyz", [])]:
+                    self.assertAlmostEqual(
+                        loaded.score(word, history),
+                        self.model.score(word, history)
+                    )
+            finally:
+                loaded.close()
+
+    def test_invalid_file(self):
+        """Prueba que se rechazan archivos inválidos."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "model.bin")
+            with open(path, "wb") as f:
+                f.write(b"\0" * 64)
+            with self.assertRaises(ValueError):
+                NgramModel.load(path)
+
+    def test_prune_single_pass(self):
+        """Prueba que una poda deja la tabla por debajo del límite."""
+        builder = NgramBuilder(min_count=1, max_entries=200)
+        prunes = []
+        prune = builder._prune
+        builder._prune = lambda: (prunes.append(1), prune())
+        for i in range(300):
+            builder.add_sentence(tokenize(f"palabra{i} hay que hacer la tarea {i % 7}"))
+            self.assertLessEqual(sum(len(t) for t in builder.counts), 200)
+        # Con la mitad de margen, cada poda deja sitio para muchas oraciones
+        self.assertLess(len(prunes), 20)
+        # Los n-gramas frecuentes sobreviven
+        self.assertIn("hay que", builder.counts[1])
+
+    def test_default_model(self):
+        """Prueba el modelo incluido y que coincide con su corpus."""
+        self.assertTrue(os.path.exists(DEFAULT_MODEL))
+        model = get_default_model()
+        self.assertIsNotNone(model)
+        self.assertEqual(model.best(["hay", "ahí"], "ya no ai", word="ai"), "hay")
+        self.assertEqual(model.best(["hay", "ahí"], "déjalo ai", word="ai"), "ahí")
+
+        built = build_default_model()
+        self.assertEqual(
+            [len(keys) for keys, _ in built.tables],
+            [len(keys) for keys, _ in model.tables]
+        )
+
+def test_ngram_performance():
+    """
+    Prueba de rendimiento del modelo de n-gramas.
+    Mide el tiempo por decisión de contexto.
+    """
+    print("\n=== Prueba de Rendimiento del Modelo de N-gramas ===")
+
+    builder = NgramBuilder(min_count=1)
+    builder.feed(CORPUS * 1000)
+    model = builder.build()
+
+    contexts = ["ya no ai", "déjalo ai", "hoy no ai", "ponlo ai"] * 2500
+    start_time = time.perf_counter()
+    for context in contexts:
+        model.best(["hay", "ahí"], context, word="ai")
+    elapsed = time.perf_counter() - start_time
+
+    per_decision = elapsed / len(contexts) * 1000
+    print(f"\nDecisiones: {len(contexts)}")
+    print(f"Tiempo por decisión: {per_decision:.4f}ms")
+
+    return per_decision
+
+if __name__ == "__main__":
+    print("Ejecutando pruebas del modelo de n-gramas...")
+
+    try:
+        # Ejecutar pruebas unitarias
+        unittest.main(verbosity=2)
+    except SystemExit:
+        pass
+
+    # Ejecutar prueba de rendimiento
+    test_ngram_performance()
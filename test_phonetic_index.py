@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Pruebas para el índice fonético de candidatos.
+"""
+
+import unittest
+import time
+from phonetic_index import (
+    PhoneticIndex,
+    phonetic_key,
+    edit_distance,
+    get_default_index
+)
+from generate_test_data import COMMON_MISSPELLINGS, generate_test_cases
+
+class TestPhoneticKey(unittest.TestCase):
+    """Pruebas para la clave fonética."""
+
+    def test_dyslexia_confusions(self):
+        """Prueba que las confusiones fonéticas comparten clave."""
+        pairs = [
+            ("aser", "hacer"),      # h muda, c/s
+            ("vien", "bien"),       # b/v
+            ("boy", "voy"),         # b/v, y final
+            ("abia", "había"),      # h muda, tilde
+            ("nesesito", "necesito"),
+            ("qe", "que"),          # qu/k
+            ("kiero", "quiero"),
+            ("ai", "hay"),
+            ("ai", "ahí"),
+            ("jente", "gente"),     # g/j
+            ("tanbien", "también"), # n/m ante b
+            ("yamar", "llamar"),    # ll/y
+            ("ciempre", "siempre"),
+        ]
+        for misspelled, correct in pairs:
+            self.assertEqual(
+                phonetic_key(misspelled),
+                phonetic_key(correct),
+                f"{misspelled} / {correct}"
+            )
+
+    def test_distinct_sounds(self):
+        """Prueba que sonidos distintos no colisionan."""
+        self.assertNotEqual(phonetic_key("casa"), phonetic_key("cama"))
+        self.assertNotEqual(phonetic_key("chico"), phonetic_key("sico"))
+        self.assertNotEqual(phonetic_key("gato"), phonetic_key("jato"))
+
+    def test_edit_distance(self):
+        """Prueba la distancia de edición con transposiciones."""
+        self.assertEqual(edit_distance("qe", "que"), 1)
+        self.assertEqual(edit_distance("qeu", "que"), 1)
+        self.assertEqual(edit_distance("casa", "casa"), 0)
+        self.assertEqual(edit_distance("abc", "xyz"), 3)
+        self.assertEqual(edit_distance("abcdef", "a", max_distance=2), 3)
+
+class TestPhoneticIndex(unittest.TestCase):
+    """Pruebas para PhoneticIndex."""
+
+    def setUp(self):
+        """Configura el entorno de prueba."""
+        self.index = PhoneticIndex(["que", "hay", "ahí", "voy", "bien", "casa", "cosa"], complete=True)
+
+    def test_single_lookup(self):
+        """Prueba la búsqueda por clave fonética."""
+        self.assertEqual(self.index.lookup("boy"), ["voy"])
+        self.assertEqual(self.index.lookup("ai"), ["hay", "ahí"])
+        self.assertEqual(self.index.lookup("zzz"), [])
+
+    def test_merged_candidates(self):
+        """Prueba que se combinan candidatos fonéticos y por edición."""
+        words = [c.word for c in self.index.candidates("csa")]
+        self.assertIn("casa", words)
+        self.assertIn("cosa", words)
+
+        candidates = self.index.candidates("vien")
+        self.assertEqual(candidates[0].word, "bien")
+        self.assertTrue(candidates[0].phonetic_match)
+
+    def test_known_word_not_corrected(self):
+        """Prueba que las palabras conocidas no se corrigen."""
+        self.assertIsNone(self.index.best("casa"))
+        self.assertEqual(self.index.best("boy"), "voy")
+
+    def test_incomplete_lexicon(self):
+        """Prueba que un léxico pequeño no decide qué palabras son faltas."""
+        index = PhoneticIndex(["pero", "hola", "tuvo"])
+        self.assertFalse(index.complete)
+        self.assertIsNone(index.best("perro"))
+        self.assertIsNone(index.best("ola"))
+        # Los homófonos siguen disponibles para otras etapas
+        self.assertEqual(index.lookup("tubo"), ["tuvo"])
+
+    def test_default_index(self):
+        """Prueba que el léxico por defecto cubre los errores comunes."""
+        index = get_default_index()
+        self.assertIs(index, get_default_index())
+        for correct in COMMON_MISSPELLINGS:
+            self.assertIn(correct, index)
+
+def test_phonetic_index_performance():
+    """
+    Prueba de rendimiento del índice fonético.
+    Mide búsquedas por segundo y precisión sobre casos generados.
+    """
+    print("\n=== Prueba de Rendimiento del Índice Fonético ===")
+
+    index = get_default_index()
+    cases = generate_test_cases(5000)
+    # Descartar casos donde la "falta" coincide con la palabra correcta
+    cases = [c for c in cases if c["input"] != c["expected"]]
+
+    # 1. Solo búsqueda fonética (un acceso a hash)
+    start_time = time.perf_counter()
+    hits = 0
+    for case in cases:
+        if case["expected"] in index.lookup(case["input"]):
+            hits += 1
+    elapsed = time.perf_counter() - start_time
+    print(f"\nBúsqueda fonética: {len(cases) / elapsed:,.0f} búsquedas/s")
+    print(f"Cobertura fonética: {hits / len(cases) * 100:.1f}%")
+
+    # 2. Candidatos combinados (fonética + distancia de edición)
+    start_time = time.perf_counter()
+    recall = 0
+    top1 = 0
+    for case in cases:
+        candidates = [c.word for c in index.candidates(case["input"])]
+        if case["expected"] in candidates:
+            recall += 1
+            if candidates[0] == case["expected"]:
+                top1 += 1
+    elapsed = time.perf_counter() - start_time
+    print(f"\nCandidatos combinados: {len(cases) / elapsed:,.0f} búsquedas/s")
+    print(f"Cobertura combinada: {recall / len(cases) * 100:.1f}%")
+    print(f"Precisión top-1: {top1 / len(cases) * 100:.1f}%")
+
+    # 3. Corrector fallback completo (reglas + índice fonético si el léxico
+    # es completo)
+    from text_corrector import fallback_correction
+    fixed = sum(
+        1 for case in cases
+        if fallback_correction(case["input"], case["context"])[0] == case["expected"]
+    )
+    print(f"\nPrecisión del fallback: {fixed / len(cases) * 100:.1f}%")
+
+    return hits / len(cases), recall / len(cases), top1 / len(cases)
+
+if __name__ == "__main__":
+    print("Ejecutando pruebas del índice fonético...")
+
+    try:
+        # Ejecutar pruebas unitarias
+        unittest.main(verbosity=2)
+    except SystemExit:
+        pass
+
+    # Ejecutar prueba de rendimiento
+    test_phonetic_index_performance()
@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+Pruebas para el protocolo de prompts mínimos.
+"""
+
+import unittest
+import threading
+from unittest.mock import MagicMock, patch
+from prompt_protocol import (
+    build_prompt,
+    build_sentence_prompt,
+    extract_correction,
+    extract_sentence_corrections,
+    estimate_tokens,
+    response_complete,
+    read_stream,
+    sentence_max_tokens,
+    MAX_RESPONSE_TOKENS
+)
+from generate_test_data import generate_load_test_data
+
+def split_tokens(text: str, size: int = 4):
+    """Trocea una respuesta como la enviaría un proveedor en streaming."""
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+class TestPromptProtocol(unittest.TestCase):
+    """Pruebas unitarias del protocolo de prompts."""
+
+    def test_window(self):
+        """Prueba que solo se envía una ventana alrededor de la palabra."""
+        context = "uno dos tres cuatro cinco seis siete qe ocho nueve diez once doce"
+        prompt = build_prompt("qe", context, window=2)
+        self.assertEqual(prompt.user, "seis siete [qe] ocho nueve")
+        self.assertEqual(prompt.window[prompt.target], "qe")
+
+    def test_last_occurrence(self):
+        """Prueba que se marca la última aparición de la palabra."""
+        prompt = build_prompt("qe", "creo qe sí. Dijo qe", window=1)
+        self.assertEqual(prompt.user, "Dijo [qe]")
+
+    def test_missing_word(self):
+        """Prueba que la palabra se añade si no está en el contexto."""
+        prompt = build_prompt("qe", "creo", window=3)
+        self.assertEqual(prompt.user, "creo [qe]")
+
+    def test_compact_response(self):
+        """Prueba la respuesta compacta de una palabra."""
+        prompt = build_prompt("qe", "creo qe esto")
+        self.assertEqual(extract_correction("qe", prompt, " que\n"), ("que", True))
+        self.assertEqual(extract_correction("Qe", prompt, "que"), ("Que", True))
+        self.assertEqual(extract_correction("casa", prompt, "[casa]"), ("casa", False))
+        self.assertEqual(extract_correction("qe", prompt, ""), ("qe", False))
+
+    def test_sentence_response(self):
+        """Prueba que una frase reescrita se alinea con la palabra."""
+        prompt = build_prompt("qe", "creo qe esto funciona")
+        self.assertEqual(
+            extract_correction("qe", prompt, "Creo que esto funciona."),
+            ("que", True)
+        )
+        # Cambios en otras palabras no cuentan como corrección de la objetivo
+        prompt = build_prompt("casa", "mi casa es grande")
+        self.assertEqual(
+            extract_correction("casa", prompt, "Mi casa es muy grande."),
+            ("casa", False)
+        )
+
+    def test_split_word(self):
+        """Prueba sustituciones de una palabra por dos."""
+        prompt = build_prompt("aver", "vamos aver si")
+        self.assertEqual(
+            extract_correction("aver", prompt, "vamos a ver si"),
+            ("a ver", True)
+        )
+
+    def test_unaligned_rewrite(self):
+        """Prueba que una reescritura sin alineación no produce cambios."""
+        prompt = build_prompt("qe", "creo qe esto")
+        self.assertEqual(
+            extract_correction("qe", prompt, "Pienso de otra manera completamente"),
+            ("qe", False)
+        )
+
+    def test_sentence_corrections(self):
+        """Prueba la alineación palabra a palabra de una frase corregida."""
+        words = "Creo qe bamos, ¿berdad? aver si llegamos oi.".split()
+        self.assertEqual(build_sentence_prompt(words).user, " ".join(words))
+        results = extract_sentence_corrections(
+            words, "Creo que vamos, ¿verdad? A ver si llegamos hoy."
+        )
+        self.assertEqual(results, [
+            ("Creo", False), ("que", True), ("vamos,", True), ("¿verdad?", True),
+            ("A ver", True), ("si", False), ("llegamos", False), ("hoy.", True)
+        ])
+
+    def test_sentence_rewrite(self):
+        """Prueba que el texto añadido por el proveedor no desplaza palabras."""
+        words = ["aver", "qe", "pasa"]
+        self.assertEqual(
+            extract_sentence_corrections(words, "Bueno, a ver qué pasa ahora"),
+            [("aver", False), ("qe", False), ("pasa", False)]
+        )
+        self.assertEqual(
+            extract_sentence_corrections(words, ""),
+            [("aver", False), ("qe", False), ("pasa", False)]
+        )
+
+class TestStreaming(unittest.TestCase):
+    """Pruebas de la lectura en streaming con parada temprana."""
+
+    def test_response_complete(self):
+        """Prueba cuándo una respuesta parcial ya es suficiente."""
+        prompt = build_prompt("kiero", "hola yo kiero ir a casa")
+        self.assertIsNone(response_complete(prompt, "quiero"))
+        self.assertIsNone(response_complete(prompt, "hola yo quiero "))
+        self.assertEqual(response_complete(prompt, "hola yo quiero ir "), "hola yo quiero ir")
+        self.assertEqual(response_complete(prompt, "quiero\n(corregido)"), "quiero")
+        # "a ver" puede ser la corrección completa de una sola palabra
+        self.assertIsNone(response_complete(prompt, "a ver "))
+
+        sentence = build_sentence_prompt(["yo", "kiero"])
+        self.assertIsNone(response_complete(sentence, "yo quiero "))
+        self.assertEqual(response_complete(sentence, "yo quiero\nHe corregido"), "yo quiero")
+
+    def test_read_stream(self):
+        """Prueba que se deja de leer al completar la respuesta."""
+        consumed = []
+
+        def chunks():
+            for chunk in ["qui", "ero", "\n", "Expli", "cación", "..."]:
+                consumed.append(chunk)
+                yield chunk
+
+        prompt = build_prompt("kiero", "yo kiero")
+        self.assertEqual(read_stream(prompt, chunks()), "quiero")
+        self.assertEqual(consumed, ["qui", "ero", "\n"])
+        self.assertEqual(read_stream(prompt, iter(["quiero"])), "quiero")
+
+    def test_provider_streams(self):
+        """Prueba que OpenAI y Anthropic cierran el stream al completar."""
+        from text_corrector import TextCorrector
+
+        corrector = TextCorrector.__new__(TextCorrector)
+        corrector._local = threading.local()
+        corrector.config = {'api_key': "clave"}
+        prompt = build_prompt("kiero", "yo kiero")
+
+        def chunk(text):
+            return MagicMock(choices=[MagicMock(delta=MagicMock(content=text))])
+
+        with patch('openai.OpenAI') as client:
+            stream = MagicMock()
+            stream.__iter__.return_value = iter([chunk("quiero"), chunk("\n"), chunk("Nota")])
+            client.return_value.chat.completions.create.return_value = stream
+            self.assertEqual(corrector._openai_complete(prompt, 8), "quiero")
+            self.assertTrue(client.return_value.chat.completions.create.call_args[1]['stream'])
+            stream.close.assert_called_once()
+
+        with patch('anthropic.Anthropic') as client:
+            stream = MagicMock()
+            stream.text_stream = iter(["qui", "ero\n", "Nota"])
+            manager = client.return_value.messages.stream.return_value
+            manager.__enter__.return_value = stream
+            self.assertEqual(corrector._anthropic_complete(prompt, 8), "quiero")
+            manager.__exit__.assert_called_once()
+
+def test_streaming_time_to_correction():
+    """
+    Estima el tiempo hasta la corrección leyendo la respuesta completa frente
+    a la lectura en streaming con parada temprana, con respuestas típicas de
+    los proveedores (palabra sola, palabra con explicación, ventana reescrita
+    y frase con explicación). Cuenta además las correcciones que empeoran o
+    mejoran al cortar (la explicación añadida confunde la alineación).
+    """
+    print("\n=== Streaming con Parada Temprana ===")
+
+    first_token_ms, token_ms = 300.0, 25.0
+    full_ms = early_ms = 0.0
+    calls = worse = better = 0
+
+    def compare(early_ok, full_ok):
+        nonlocal worse, better
+        worse += full_ok and not early_ok
+        better += early_ok and not full_ok
+
+    def simulate(prompt, response, max_tokens):
+        nonlocal full_ms, early_ms, calls
+        chunks = split_tokens(response)[:max_tokens]
+        consumed = []
+
+        def stream():
+            for chunk in chunks:
+                consumed.append(chunk)
+                yield chunk
+
+        text = read_stream(prompt, stream())
+        full_ms += first_token_ms + token_ms * len(chunks)
+        early_ms += first_token_ms + token_ms * len(consumed)
+        calls += 1
+        return text, "".join(chunks)
+
+    for n, sentence in enumerate(generate_load_test_data(50)):
+        words = sentence["input"].split()
+        fixed = sentence["original"].split()
+        for i, word in enumerate(words):
+            prompt = build_prompt(word, " ".join(words[:i + 1]))
+            shape = (n + i) % 3
+            if shape == 0:
+                response = fixed[i]
+            elif shape == 1:
+                response = f"{fixed[i]}\n\n(La palabra correcta es {fixed[i]}.)"
+            else:
+                response = " ".join(fixed[max(0, i - 3):i + 1]) + "\nCorregido."
+            early, full = simulate(prompt, response, MAX_RESPONSE_TOKENS)
+            compare(
+                extract_correction(word, prompt, early)[0] == fixed[i],
+                extract_correction(word, prompt, full)[0] == fixed[i]
+            )
+
+        prompt = build_sentence_prompt(words)
+        response = sentence["original"] + "\n\nHe corregido la ortografía de varias palabras."
+        early, full = simulate(prompt, response, sentence_max_tokens(words))
+        compare(
+            [w for w, _ in extract_sentence_corrections(words, early)] == fixed,
+            [w for w, _ in extract_sentence_corrections(words, full)] == fixed
+        )
+
+    print(f"Llamadas simuladas: {calls}")
+    print(f"Tiempo medio hasta la corrección (completa): {full_ms / calls:.0f}ms")
+    print(f"Tiempo medio hasta la corrección (streaming): {early_ms / calls:.0f}ms")
+    print(f"Reducción: {(1 - early_ms / full_ms) * 100:.1f}%")
+    print(f"Correcciones que empeoran al cortar: {worse}, que mejoran: {better}")
+
+    return full_ms / calls, early_ms / calls, worse
+
+def test_prompt_token_usage():
+    """
+    Compara los tokens por corrección antes y después del protocolo.
+    Usa una estimación de ~4 caracteres por token.
+    """
+    print("\n=== Tokens por Corrección ===")
+
+    old_system = "Eres un asistente que corrige texto a español correcto."
+    old_max_tokens = 50
+
+    sentences = generate_load_test_data(500, words_per_sentence=20)
+    before = after = corrections = 0
+    for sentence in sentences:
+        words = sentence["input"].split()
+        for i, word in enumerate(words):
+            # Contexto acumulado tal como lo recibe el proveedor en un lote
+            context = " ".join(words[:i + 1])
+            before += estimate_tokens(old_system) + estimate_tokens(context) + old_max_tokens
+            prompt = build_prompt(word, context)
+            after += (
+                estimate_tokens(prompt.system)
+                + estimate_tokens(prompt.user)
+                + MAX_RESPONSE_TOKENS
+            )
+            corrections += 1
+
+    print(f"\nAntes: {before / corrections:.1f} tokens por corrección (máximo)")
+    print(f"Después: {after / corrections:.1f} tokens por corrección (máximo)")
+    print(f"Reducción: {(1 - after / before) * 100:.1f}%")
+
+    return before / corrections, after / corrections
+
+if __name__ == "__main__":
+    print("Ejecutando pruebas del protocolo de prompts...")
+
+    try:
+        # Ejecutar pruebas unitarias
+        unittest.main(verbosity=2)
+    except SystemExit:
+        pass
+
+    # Ejecutar comparación de tokens
+    test_prompt_token_usage()
+    test_streaming_time_to_correction()
@@ -14,6 +14,7 @@ from test_utils import TestCaseWithServices, async_test, simulate_typing, wait_f
 from test_config import TEST_CORRECTIONS, LOAD_TEST_TEXTS, BATCH_TEST_CONFIG
 from interfaces import ICorrector, INotifier, ITextBuffer
 from keyboardlistener import KeyboardListener
+from keystroke_pipeline import EV_SPACE
 from batch_processor import BatchProcessor
 from text_corrector import TextCorrector
 
@@ -160,12 +161,29 @@ class TestRealtimeCorrection(TestCaseWithServices):
         # Simular backspace
         self.listener.on_press(MagicMock(name='backspace'))
         
-        # Verificar que se canceló la corrección pendiente
-        self.assertIsNone(
-            self.listener.current_word,
-            "La palabra actual debería ser None después de backspace"
+        # Verificar que no queda ninguna corrección pendiente
+        self.assertEqual(
+            len(self.listener.tickets),
+            0,
+            "No debería haber tickets pendientes después de backspace"
         )
     
+    def test_sentence_mode(self):
+        """Prueba que en modo frase se envía una sola tarea por frase."""
+        self.listener.sentence_mode = True
+        with patch.object(self.corrector.batch_processor, 'add_sentence') as add_sentence:
+            for char in "creo qe si. ":
+                self.listener.handle_event(EV_SPACE if char == " " else ord(char))
+
+        add_sentence.assert_called_once()
+        words, callback = add_sentence.call_args[0][:2]
+        self.assertEqual(words, ["creo", "qe", "si."])
+
+        # Cada palabra corregida vuelve por su ticket para aplicarse por separado
+        callback([("creo", False), ("que", True), ("sí.", True)])
+        self.assertEqual([ticket.word for ticket, _ in self.listener.ready], ["qe", "si."])
+        self.assertEqual(len(self.listener.tickets), 2)
+    
     def test_load_handling(self):
         """Prueba manejo de carga alta."""
         # Cargar texto de prueba
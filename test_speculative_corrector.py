@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Pruebas para la corrección especulativa.
+"""
+
+import time
+import unittest
+from batch_processor import BatchProcessor
+from correction_rules import RuleEngine
+from speculative_corrector import SpeculativeCorrector, SPECULATIVE_PRIORITY
+from test_batch_scorer import EchoCorrector
+
+class FakeTask:
+    """Tarea encolada en el procesador simulado."""
+    def __init__(self, word, context, callback, priority):
+        self.word = word
+        self.context = context
+        self.callback = callback
+        self.priority = priority
+        self.cancelled = False
+
+class FakeProcessor:
+    """Procesador que guarda las tareas para resolverlas a mano."""
+    def __init__(self):
+        self.tasks = []
+
+    def add_task(self, word, context, callback, priority=1, namespace=""):
+        task = FakeTask(word, context, callback, priority)
+        self.tasks.append(task)
+        return task
+
+    def cancel_task(self, task):
+        task.cancelled = True
+
+class TestSpeculativeCorrector(unittest.TestCase):
+    """Pruebas unitarias para SpeculativeCorrector."""
+
+    def setUp(self):
+        """Configura el entorno de prueba."""
+        self.processor = FakeProcessor()
+        self.rules = RuleEngine({"words": {"aser": "hacer"}})
+        self.speculator = SpeculativeCorrector(self.processor, debounce=0.3, rules=self.rules)
+
+    def type_word(self, word: str, context: str = "voy a", start: float = 0.0):
+        """Escribe una palabra carácter a carácter cada 50ms."""
+        for i in range(1, len(word) + 1):
+            self.speculator.update(word[:i], f"{context} {word[:i]}", start + i * 0.05)
+
+    def test_known_misspelling_trigger(self):
+        """Prueba que un error conocido se envía sin esperar la pausa."""
+        self.type_word("aser")
+        self.assertEqual(len(self.processor.tasks), 1)
+        task = self.processor.tasks[0]
+        self.assertEqual((task.word, task.priority), ("aser", SPECULATIVE_PRIORITY))
+
+        # Al seguir escribiendo, la especulación se cancela
+        self.speculator.update("asert", "voy a asert", 1.0)
+        self.assertTrue(task.cancelled)
+
+    def test_debounce_and_cache_hit(self):
+        """Prueba el disparo por pausa y el acierto de caché al cerrar la palabra."""
+        self.type_word("kiero")
+        self.speculator.tick(0.3)
+        self.assertEqual(self.processor.tasks, [])
+        self.speculator.tick(0.6)
+        self.assertEqual(len(self.processor.tasks), 1)
+
+        # Llega el resultado antes de pulsar espacio
+        self.processor.tasks[0].callback("quiero", True)
+        results = []
+        self.assertTrue(self.speculator.take("kiero", "voy a kiero", lambda c, w: results.append((c, w))))
+        self.assertEqual(results, [("quiero", True)])
+        self.assertEqual(self.speculator.get_stats()['hits'], 1)
+
+    def test_join_inflight(self):
+        """Prueba que la palabra cerrada espera a la especulación en curso."""
+        self.type_word("aser")
+        self.speculator.reset()
+        results = []
+        self.assertTrue(self.speculator.take("aser", "voy a aser", lambda c, w: results.append(c)))
+        self.assertEqual(results, [])
+
+        self.processor.tasks[0].callback("hacer", True)
+        self.assertEqual(results, ["hacer"])
+
+    def test_miss(self):
+        """Prueba que una palabra sin especulación sigue el camino normal."""
+        self.assertFalse(self.speculator.take("casa", "mi casa", lambda c, w: None))
+
+    def test_batch_processor_cancel(self):
+        """Prueba que el procesador descarta las tareas canceladas."""
+        corrector = EchoCorrector()
+        processor = BatchProcessor(corrector, max_delay=0.05, min_batch_items=1)
+        try:
+            task = processor.add_task("uno", "uno", lambda c, w: None)
+            processor.cancel_task(task)
+            processor.add_task("dos", "dos", lambda c, w: None)
+            time.sleep(0.3)
+        finally:
+            processor.stop()
+        self.assertEqual(corrector.calls, ["dos"])
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Pruebas para el motor de inyección de texto.
+"""
+
+import unittest
+import time
+from unittest.mock import patch
+from pynput.keyboard import Key
+from text_injector import TextInjector, BATCHED, SELECT, CLIPBOARD, MINIMAL
+
+class MockKeyboard:
+    """Mock del teclado que reproduce el efecto de las teclas sobre un texto."""
+    def __init__(self, text: str = ""):
+        self.text = text
+        self.cursor = len(text)
+        self.anchor = None  # Inicio de la selección
+        self.shift = False
+        self.events = 0
+
+    def _replace_selection(self, value: str):
+        if self.anchor is not None:
+            start, end = sorted((self.anchor, self.cursor))
+            self.text = self.text[:start] + self.text[end:]
+            self.cursor = start
+            self.anchor = None
+        self.text = self.text[:self.cursor] + value + self.text[self.cursor:]
+        self.cursor += len(value)
+
+    def press(self, key):
+        self.events += 1
+        if key == Key.shift:
+            self.shift = True
+        elif key == Key.left:
+            if self.shift and self.anchor is None:
+                self.anchor = self.cursor
+            elif not self.shift:
+                self.anchor = None
+            self.cursor = max(0, self.cursor - 1)
+        elif key == Key.right:
+            self.anchor = None
+            self.cursor = min(len(self.text), self.cursor + 1)
+        elif key == Key.delete:
+            self.text = self.text[:self.cursor] + self.text[self.cursor + 1:]
+        elif key == Key.backspace and self.cursor:
+            self.text = self.text[:self.cursor - 1] + self.text[self.cursor:]
+            self.cursor -= 1
+
+    def release(self, key):
+        if key == Key.shift:
+            self.shift = False
+
+    def type(self, text):
+        self.events += len(text)
+        self._replace_selection(text)
+
+class MockClipboard:
+    """Mock de pyperclip."""
+    def __init__(self, content: str):
+        self.content = content
+
+    def copy(self, text):
+        self.content = text
+
+    def paste(self):
+        return self.content
+
+class TestTextInjector(unittest.TestCase):
+    """Pruebas unitarias para TextInjector."""
+
+    def test_strategies_replace_word(self):
+        """Prueba que cada estrategia deja el texto corregido y el cursor al final."""
+        for strategy in (BATCHED, SELECT, MINIMAL):
+            keyboard = MockKeyboard("creo qe ")
+            injector = TextInjector(keyboard)
+            result = injector.inject("qe", "que", strategy)
+            self.assertEqual(keyboard.text, "creo que ")
+            self.assertEqual(keyboard.cursor, len(keyboard.text))
+            self.assertEqual(result.strategy, strategy)
+
+    def test_select_is_preferred(self):
+        """Prueba que se elige la estrategia con menos pulsaciones."""
+        injector = TextInjector(MockKeyboard(), strategies=(BATCHED, SELECT))
+        self.assertEqual(injector.choose("kiero", "quiero"), SELECT)
+
+        # El script mínimo gana cuando la corrección es pequeña
+        injector = TextInjector(MockKeyboard())
+        self.assertEqual(injector.choose("kiero", "quiero"), MINIMAL)
+
+        injector = TextInjector(MockKeyboard(), strategies=(BATCHED,))
+        self.assertEqual(injector.choose("kiero", "quiero"), BATCHED)
+
+    def test_clipboard_restore(self):
+        """Prueba que el pegado restaura el portapapeles del usuario."""
+        clipboard = MockClipboard("contenido del usuario")
+        keyboard = MockKeyboard("texto ")
+
+        with patch('text_injector.pyperclip', clipboard):
+            injector = TextInjector(
+                keyboard,
+                strategies=(SELECT, CLIPBOARD),
+                clipboard_min_length=0,
+                restore_delay=0.01
+            )
+            self.assertEqual(injector.choose("a", "una corrección muy larga de varias palabras"), CLIPBOARD)
+            injector.inject("texto", "textos", CLIPBOARD)
+            self.assertEqual(clipboard.content, "textos")
+            time.sleep(0.05)
+
+        self.assertEqual(clipboard.content, "contenido del usuario")
+
+    def test_expected_keystrokes(self):
+        """Prueba que se reconocen las pulsaciones propias y no las del usuario."""
+        from pynput.keyboard import KeyCode
+
+        injector = TextInjector(MockKeyboard("qe "))
+        injector.inject("qe", "que", MINIMAL)
+        expected = list(injector.expected)
+        self.assertEqual(len(expected), injector.stats[MINIMAL]['keystrokes'])
+
+        # Una tecla real intercalada no se confunde con las sintéticas
+        self.assertFalse(injector.consume(KeyCode.from_char("x")))
+        for key in expected:
+            self.assertTrue(injector.consume(KeyCode.from_char(key) if isinstance(key, str) else key))
+        self.assertFalse(injector.consume(Key.left))
+
+    def test_unknown_strategy(self):
+        """Prueba que se rechazan estrategias desconocidas."""
+        with self.assertRaises(ValueError):
+            TextInjector(MockKeyboard(), strategies=("telepatia",))
+
+def test_injection_performance():
+    """
+    Compara el tiempo de inyección por corrección con el método anterior
+    (una tecla con sleep de 10ms por carácter) y con cada estrategia.
+    """
+    print("\n=== Tiempo de Inyección por Corrección ===")
+
+    pairs = [("qe", "que"), ("kiero", "quiero"), ("ecsepcion", "excepción"), ("tanbien", "también")]
+
+    # Método anterior
+    keyboard = MockKeyboard()
+    start_time = time.perf_counter()
+    for original, correction in pairs:
+        for _ in range(len(original) + 1):
+            keyboard.press(Key.left)
+            keyboard.release(Key.left)
+            time.sleep(0.01)
+        for _ in range(len(original)):
+            keyboard.press(Key.delete)
+            keyboard.release(Key.delete)
+            time.sleep(0.01)
+        keyboard.type(correction)
+    legacy = (time.perf_counter() - start_time) / len(pairs) * 1000
+    print(f"Anterior: {legacy:.1f}ms por corrección")
+
+    injector = TextInjector(MockKeyboard(), strategies=(BATCHED, SELECT, MINIMAL))
+    for strategy in (BATCHED, SELECT, MINIMAL):
+        for _ in range(250):
+            for original, correction in pairs:
+                injector.inject(original, correction, strategy)
+
+    for strategy, stats in injector.get_stats().items():
+        print(
+            f"{strategy:>9}: {stats['avg_time_ms']:.3f}ms por corrección, "
+            f"{stats['avg_keystrokes']:.1f} pulsaciones"
+        )
+
+    return legacy, injector.get_stats()
+
+if __name__ == "__main__":
+    print("Ejecutando pruebas del motor de inyección...")
+
+    try:
+        # Ejecutar pruebas unitarias
+        unittest.main(verbosity=2)
+    except SystemExit:
+        pass
+
+    # Ejecutar prueba de rendimiento
+    test_injection_performance()
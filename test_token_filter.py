@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Pruebas para el filtro de elegibilidad de tokens.
+"""
+
+import unittest
+import time
+from unittest.mock import MagicMock
+from token_filter import (
+    TokenFilter, LanguageModel, get_default_filter, register_metrics,
+    URL, EMAIL, NUMBER, CODE, FOREIGN, SYMBOL
+)
+from generate_test_data import generate_load_test_data
+
+class TestTokenFilter(unittest.TestCase):
+    """Pruebas unitarias para TokenFilter."""
+
+    def setUp(self):
+        self.filter = get_default_filter()
+
+    def test_spanish_words(self):
+        """Prueba que las palabras en español, bien o mal escritas, son elegibles."""
+        words = [
+            "a", "y", "qe", "kiero", "aki", "aver", "tanbien", "berdad", "haser",
+            "también", "mañana", "Hola", "HOLA", "hoy.", "¿verdad?", "(casa)",
+            "franco-alemán"
+        ]
+        for word in words:
+            self.assertIsNone(self.filter.classify(word), word)
+
+    def test_skipped_tokens(self):
+        """Prueba los motivos de descarte."""
+        cases = {
+            "https://ejemplo.com/ruta": URL,
+            "www.google.es": URL,
+            "ejemplo.com": URL,
+            "ana@correo.es": EMAIL,
+            "10:30": NUMBER,
+            "3,5": NUMBER,
+            "1º": NUMBER,
+            "20%": NUMBER,
+            "mp3": CODE,
+            "getValue": CODE,
+            "snake_case": CODE,
+            "a==b": CODE,
+            "...": SYMBOL,
+            "meeting": FOREIGN,
+            "shopping": FOREIGN,
+            "coffee": FOREIGN,
+        }
+        for token, reason in cases.items():
+            self.assertEqual(self.filter.classify(token), reason, token)
+
+    def test_without_language_model(self):
+        """Prueba que sin identificador de idioma no se descartan palabras."""
+        token_filter = TokenFilter()
+        self.assertIsNone(token_filter.classify("meeting"))
+        self.assertEqual(token_filter.classify("http://x.es"), URL)
+
+    def test_language_model(self):
+        """Prueba la puntuación del identificador de idioma."""
+        model = LanguageModel(["casa", "perro", "queso"], ["the", "with", "though"])
+        self.assertGreater(model.score("these"), 0)
+        self.assertLess(model.score("quesos"), 0)
+
+    def test_skip_counts(self):
+        """Prueba los contadores por motivo y su lectura por intervalo."""
+        token_filter = TokenFilter()
+        self.assertTrue(token_filter.is_eligible("casa"))
+        self.assertFalse(token_filter.is_eligible("10:30"))
+        self.assertFalse(token_filter.is_eligible("20%"))
+        self.assertEqual(token_filter.get_stats(), {NUMBER: 2, "checked": 3})
+        self.assertEqual(token_filter.take_skipped(NUMBER), 2.0)
+        self.assertEqual(token_filter.take_skipped(NUMBER), 0.0)
+
+        telemetry = MagicMock()
+        register_metrics(telemetry, token_filter)
+        self.assertEqual(telemetry.add_collector.call_count, 6)
+        name, collector = telemetry.register_custom_metric.call_args_list[2][0]
+        self.assertEqual(name, "skipped_tokens_number")
+        token_filter.is_eligible("7")
+        self.assertEqual(collector(), 1.0)
+
+def test_filter_performance():
+    """
+    Mide el coste por token del filtro y la fracción de tokens descartados en
+    un texto mixto (español con URLs, números, código y palabras en inglés).
+    """
+    print("\n=== Filtro de Tokens ===")
+
+    extra = [
+        "https://ejemplo.com/doc", "ana@correo.es", "10:30", "3,5", "getValue",
+        "meeting", "feedback", "download", "v2.1", "#include"
+    ]
+    tokens = []
+    for i, sentence in enumerate(generate_load_test_data(200)):
+        tokens.extend(sentence["input"].split())
+        tokens.append(extra[i % len(extra)])
+
+    token_filter = get_default_filter()
+    start_time = time.perf_counter()
+    for token in tokens:
+        token_filter.classify(token)
+    elapsed = time.perf_counter() - start_time
+
+    skipped = sum(1 for token in tokens if token_filter.classify(token) is not None)
+    print(f"Tokens: {len(tokens)}")
+    print(f"Coste: {elapsed / len(tokens) * 1e6:.2f}µs por token")
+    print(f"Descartados: {skipped} ({skipped / len(tokens) * 100:.1f}%)")
+
+    return elapsed / len(tokens), skipped
+
+if __name__ == "__main__":
+    print("Ejecutando pruebas del filtro de tokens...")
+
+    try:
+        # Ejecutar pruebas unitarias
+        unittest.main(verbosity=2)
+    except SystemExit:
+        pass
+
+    # Ejecutar medición de rendimiento
+    test_filter_performance()
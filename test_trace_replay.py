@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Pruebas para la grabación y reproducción de trazas de pulsaciones.
+"""
+
+import os
+import tempfile
+import unittest
+from keystroke_pipeline import KeystrokePipeline, EV_SPACE, EV_BACKSPACE
+from trace_replay import KeystrokeTrace, TraceRecorder, anonymize
+from generate_test_data import generate_load_test_data
+
+class TestKeystrokeTrace(unittest.TestCase):
+    """Pruebas unitarias para trazas y grabación."""
+
+    def test_anonymize(self):
+        """Prueba que solo se conserva la clase de cada carácter."""
+        self.assertEqual(anonymize(ord("q")), ord("a"))
+        self.assertEqual(anonymize(ord("Ñ")), ord("A"))
+        self.assertEqual(anonymize(ord("7")), ord("0"))
+        self.assertEqual(anonymize(ord("¿")), ord("."))
+        self.assertEqual(anonymize(EV_BACKSPACE), EV_BACKSPACE)
+
+    def test_save_and_load(self):
+        """Prueba que una traza se guarda y se carga sin cambios."""
+        trace = KeystrokeTrace.from_text("Hola qe tal ", seed=1)
+        self.assertEqual(len(trace), 12)
+        self.assertEqual(trace.events[4][1], EV_SPACE)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "trace.json")
+            trace.save(path)
+            loaded = KeystrokeTrace.load(path)
+
+        self.assertEqual([c for _, c in loaded.events], [c for _, c in trace.events])
+        self.assertAlmostEqual(loaded.duration, trace.duration, places=3)
+
+        # Misma semilla, misma traza
+        self.assertEqual(KeystrokeTrace.from_text("Hola qe tal ", seed=1).events, trace.events)
+
+    def test_recorder(self):
+        """Prueba que el grabador captura las pulsaciones del canal."""
+        seen = []
+        pipeline = KeystrokePipeline(lambda code, ts: seen.append(code))
+        recorder = TraceRecorder()
+        recorder.attach(pipeline)
+        pipeline.start()
+        try:
+            for char in "Qe":
+                pipeline.push(ord(char))
+            pipeline.push(EV_SPACE)
+            pipeline.drain()
+        finally:
+            pipeline.stop()
+            recorder.detach()
+
+        self.assertEqual(seen, [ord("Q"), ord("e"), EV_SPACE])
+        self.assertEqual([c for _, c in recorder.trace().events], [ord("A"), ord("a"), EV_SPACE])
+        self.assertTrue(all(delay >= 0 for delay, _ in recorder.trace().events))
+
+def test_replay_performance():
+    """
+    Reproduce una traza sintética a 1x, 10x y velocidad máxima e informa de
+    la latencia pulsación → corrección, las pérdidas y la CPU por pulsación.
+    """
+    from trace_replay import replay_trace, print_report
+
+    print("\n=== Reproducción de Trazas de Pulsaciones ===")
+
+    text = " ".join(s["input"] for s in generate_load_test_data(10)) + " "
+    trace = KeystrokeTrace.from_text(text, keys_per_second=8.0, seed=42)
+    print(f"Traza: {len(trace)} pulsaciones, {trace.duration:.1f}s a 1x")
+
+    reports = []
+    for speed in (1.0, 10.0, None):
+        report = replay_trace(trace, speed=speed, seed=42)
+        print_report(report)
+        reports.append(report)
+
+    # Modo frase: una llamada al corrector por frase en lugar de por palabra
+    print("\n=== Modo Frase ===")
+    text = ". ".join(s["input"] for s in generate_load_test_data(10)) + ". "
+    trace = KeystrokeTrace.from_text(text, keys_per_second=8.0, seed=42)
+    for sentence_mode in (False, True):
+        report = replay_trace(trace, speed=None, seed=42, sentence_mode=sentence_mode)
+        print(f"\n{'Frase' if sentence_mode else 'Palabra'}:", end="")
+        print_report(report)
+        reports.append(report)
+    return reports
+
+if __name__ == "__main__":
+    print("Ejecutando pruebas de trazas de pulsaciones...")
+
+    try:
+        # Ejecutar pruebas unitarias
+        unittest.main(verbosity=2)
+    except SystemExit:
+        pass
+
+    # Ejecutar reproducción
+    test_replay_performance()
@@ -3,11 +3,23 @@
 Servicio de corrección de texto con soporte para múltiples proveedores de IA.
 """
 
+import asyncio
+import threading
 import time
-from typing import Tuple, Optional, Dict, Any
+from contextlib import contextmanager
+from typing import List, Tuple, Optional, Dict, Any
 from interfaces import ICorrector, ICache
+from batch_processor import BatchProcessor
 from secure_cache import SecureCache
-from circuit_breaker import with_circuit_breaker
+from circuit_breaker import CircuitBreakerRegistry, with_circuit_breaker
+from correction_rules import RULES, apply_case
+from phonetic_index import get_default_index
+from prompt_protocol import (
+    CorrectionPrompt, build_prompt, extract_correction, MAX_RESPONSE_TOKENS,
+    build_sentence_prompt, extract_sentence_corrections, sentence_max_tokens,
+    read_stream
+)
+from ngram_model import get_default_model
 from logger_manager import logger
 import openai
 import anthropic
@@ -15,6 +27,14 @@ import requests
 from functools import wraps
 import random
 
+try:
+    from batch_scorer import BatchScorer
+except ImportError:  # NumPy no disponible
+    BatchScorer = None
+
+# Contexto con el que se guardan en caché las frases completas
+SENTENCE_CACHE_CONTEXT = "<frase>"
+
 def retry_on_error(max_retries=3, initial_delay=1, backoff_factor=2, jitter=0.1):
     """
     Decorador para reintentar operaciones que pueden fallar.
@@ -62,45 +82,24 @@ def fallback_correction(word: str, context: str) -> Tuple[str, bool]:
     Returns:
         Tuple[str, bool]: (texto corregido, si fue corregido)
     """
-    # Diccionario de correcciones comunes en español
-    common_corrections = {
-        "qe": "que",
-        "qeu": "que",
-        "pq": "porque",
-        "xq": "porque",
-        "porqe": "porque",
-        "kiero": "quiero",
-        "aser": "hacer",
-        "ablar": "hablar",
-        "aver": "haber",
-        "ai": "hay",
-        "ahi": "ahí",
-        "ahy": "ahí",
-        "voi": "voy",
-        "soi": "soy",
-        "mui": "muy",
-        "oi": "hoy",
-        "ves": "vez",
-        "veses": "veces",
-        "enpesar": "empezar",
-        "entonses": "entonces",
-        "inportante": "importante",
-        "tanbien": "también",
-        "tanvien": "también",
-        "desir": "decir",
-        "dise": "dice",
-        "nesesito": "necesito",
-        "nesecito": "necesito"
-    }
-    
-    word_lower = word.lower()
-    if word_lower in common_corrections:
-        correction = common_corrections[word_lower]
-        if word[0].isupper():
-            correction = correction.capitalize()
-        return correction, True
-    
-    return word, False
+    # Reglas compiladas (palabras, prefijos, sufijos y tildes)
+    correction = RULES.lookup(word)
+    index = get_default_index()
+    if correction is None:
+        # Buscar homófonos en el índice fonético (b/v, c/s/z, ll/y, h muda...);
+        # solo si el léxico es completo, para no reescribir palabras correctas
+        correction = index.best(word.lower())
+    if not correction:
+        return word, False
+
+    # Resolver homófonos ambiguos ("ai" → "hay"/"ahí") con el modelo de n-gramas
+    model = get_default_model()
+    if model is not None and context:
+        homophones = index.lookup(correction)
+        if len(homophones) > 1 and correction.lower() in homophones:
+            correction = model.best(homophones, context, word)
+
+    return apply_case(word, correction.lower()), True
 
 class TextCorrector(ICorrector):
     """
@@ -116,12 +115,16 @@ class TextCorrector(ICorrector):
             batch_size: Tamaño máximo de lote para procesamiento
         """
         self.cache = cache
+        self._local = threading.local()  # Espacio de nombres de caché por hilo
         self.config = self._load_config()
+        # La resolución local antes del proveedor es opcional ('local_scoring')
+        local_scoring = bool((self.config or {}).get('local_scoring', False))
         self.batch_processor = BatchProcessor(
             self,  # El corrector mismo implementa ICorrector
             batch_size=batch_size,
             max_delay=0.2,  # 200ms máximo de espera
-            min_batch_items=3
+            min_batch_items=3,
+            scorer=BatchScorer() if BatchScorer and local_scoring else None
         )
         self.setup_service()
         logger.info("TextCorrector inicializado")
@@ -162,9 +165,36 @@ class TextCorrector(ICorrector):
             logger.error(f"Error al probar conexión: {e}")
             return False
     
+    @contextmanager
+    def cache_namespace(self, namespace: str):
+        """
+        Usa un espacio de nombres de caché propio dentro del bloque.
+
+        Las correcciones de un perfil de aplicación con caché separada no
+        se mezclan con las de otros perfiles. Afecta solo al hilo actual.
+
+        Args:
+            namespace: Espacio de nombres ("" = caché compartida)
+        """
+        previous = getattr(self._local, 'namespace', "")
+        self._local.namespace = namespace
+        try:
+            yield
+        finally:
+            self._local.namespace = previous
+
+    def _cache_key(self, word: str) -> str:
+        namespace = getattr(self._local, 'namespace', "")
+        return f"{namespace}\x1f{word}" if namespace else word
+
     def setup_service(self):
         """Configura el servicio de corrección seleccionado."""
         self.service = self.config.get('service', "OpenAI")
+        if self.service == "Local":
+            # El modelo se carga en su propio proceso; hasta que esté listo
+            # se corrige con el sistema fallback
+            from inference_server import get_default_server
+            self.local_server = get_default_server(self.config)
         logger.info(f"Servicio configurado: {self.service}")
         
     def correct_text(self, word: str, context: str) -> Tuple[str, bool]:
@@ -176,129 +206,204 @@ class TextCorrector(ICorrector):
         service_map = {
             "OpenAI": self.openai_correct,
             "Anthropic": self.anthropic_correct,
-            "Mixtral": self.mixtral_correct
+            "Mixtral": self.mixtral_correct,
+            "Local": self.local_correct
         }
         
         correction_func = service_map.get(self.service, self.fallback_correct)
         return correction_func(word, context)
     
+    def _openai_complete(self, prompt: CorrectionPrompt, max_tokens: int) -> str:
+        """Llamada a OpenAI en streaming; devuelve el texto de la respuesta."""
+        client = openai.OpenAI(api_key=self.config.get('api_key'))
+        stream = client.chat.completions.create(
+            model="gpt-4",
+            messages=[
+                {
+                    "role": "system",
+                    "content": prompt.system
+                },
+                {
+                    "role": "user",
+                    "content": prompt.user
+                }
+            ],
+            temperature=0.1,
+            max_tokens=max_tokens,
+            stream=True
+        )
+        try:
+            return read_stream(prompt, (
+                chunk.choices[0].delta.content
+                for chunk in stream if chunk.choices
+            ))
+        finally:
+            # Cerrar la conexión cancela el resto de la generación
+            stream.close()
+
+    def _anthropic_complete(self, prompt: CorrectionPrompt, max_tokens: int) -> str:
+        """Llamada a Anthropic Claude en streaming; devuelve el texto de la respuesta."""
+        client = anthropic.Anthropic(api_key=self.config.get('api_key'))
+        with client.messages.stream(
+            model="claude-3-opus-20240229",
+            max_tokens=max_tokens,
+            temperature=0.1,
+            system=prompt.system,
+            messages=[
+                {
+                    "role": "user",
+                    "content": prompt.user
+                }
+            ]
+        ) as stream:
+            # Salir del bloque cierra la conexión y cancela la generación
+            return read_stream(prompt, stream.text_stream)
+
+    def _mixtral_complete(self, prompt: CorrectionPrompt, max_tokens: int) -> str:
+        """Llamada a Mixtral; devuelve el texto de la respuesta."""
+        response = requests.post(
+            "https://api.together.xyz/inference",
+            headers={
+                "Authorization": f"Bearer {self.config.get('api_key')}",
+                "Content-Type": "application/json"
+            },
+            json={
+                "model": "mistralai/Mixtral-8x7B-Instruct-v0.1",
+                "prompt": prompt.as_text(),
+                "temperature": 0.1,
+                "max_tokens": max_tokens,
+                "stop": ["\n"]
+            },
+            timeout=10
+        )
+
+        response.raise_for_status()
+        data = response.json()
+
+        if 'output' not in data or 'choices' not in data['output']:
+            raise ValueError("Formato de respuesta inválido")
+        return data['output']['choices'][0]['text']
+
+    def _provider_correct(self, complete, word: str, context: str) -> Tuple[str, bool]:
+        """Corrección de una palabra con la llamada del proveedor indicado."""
+        # Intentar obtener del caché primero
+        cached = self.cache.get(self._cache_key(word), context)
+        if cached is not None:
+            return cached
+
+        prompt = build_prompt(word, context)
+        correction, was_corrected = extract_correction(
+            word, prompt, complete(prompt, MAX_RESPONSE_TOKENS)
+        )
+
+        # Guardar en caché
+        self.cache.add(self._cache_key(word), context, correction, was_corrected)
+        return correction, was_corrected
+
     @retry_on_error(max_retries=3, initial_delay=1)
     @with_circuit_breaker("openai", fallback=fallback_correction)
     def openai_correct(self, word: str, context: str) -> Tuple[str, bool]:
         """Corrección usando OpenAI."""
-        # Intentar obtener del caché primero
-        cached = self.cache.get(word, context)
-        if cached is not None:
-            return cached
-        
         try:
-            client = openai.OpenAI(api_key=self.config.get('api_key'))
-            response = client.chat.completions.create(
-                model="gpt-4",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "Eres un asistente que corrige texto a español correcto."
-                    },
-                    {
-                        "role": "user",
-                        "content": f"{context}"
-                    }
-                ],
-                temperature=0.1,
-                max_tokens=50
-            )
-            
-            correction = response.choices[0].message.content.strip()
-            was_corrected = correction != word
-            
-            # Guardar en caché
-            self.cache.add(word, context, correction, was_corrected)
-            
-            return correction, was_corrected
-            
+            return self._provider_correct(self._openai_complete, word, context)
         except Exception as e:
             logger.error(f"Error en corrección OpenAI: {e}")
             raise
-    
+
     @retry_on_error(max_retries=3, initial_delay=1)
     @with_circuit_breaker("anthropic", fallback=fallback_correction)
     def anthropic_correct(self, word: str, context: str) -> Tuple[str, bool]:
         """Corrección usando Anthropic Claude."""
-        cached = self.cache.get(word, context)
-        if cached is not None:
-            return cached
-        
         try:
-            client = anthropic.Anthropic(api_key=self.config.get('api_key'))
-            message = client.messages.create(
-                model="claude-3-opus-20240229",
-                max_tokens=50,
-                temperature=0.1,
-                system="Eres un asistente que corrige texto a español correcto.",
-                messages=[
-                    {
-                        "role": "user",
-                        "content": f"{context}"
-                    }
-                ]
-            )
-            
-            correction = message.content[0].text.strip()
-            was_corrected = correction != word
-            
-            self.cache.add(word, context, correction, was_corrected)
-            return correction, was_corrected
-            
+            return self._provider_correct(self._anthropic_complete, word, context)
         except Exception as e:
             logger.error(f"Error en corrección Anthropic: {e}")
             raise
-    
+
     @retry_on_error(max_retries=3, initial_delay=1)
     @with_circuit_breaker("mixtral", fallback=fallback_correction)
     def mixtral_correct(self, word: str, context: str) -> Tuple[str, bool]:
         """Corrección usando Mixtral."""
-        cached = self.cache.get(word, context)
+        try:
+            return self._provider_correct(self._mixtral_complete, word, context)
+        except Exception as e:
+            logger.error(f"Error en corrección Mixtral: {e}")
+            raise
+
+    @with_circuit_breaker("local", fallback=fallback_correction)
+    def local_correct(self, word: str, context: str) -> Tuple[str, bool]:
+        """Corrección usando el modelo local (servidor de inferencia por lotes)."""
+        if not self.local_server.ready.is_set():
+            return self.fallback_correct(word, context)
+
+        cached = self.cache.get(self._cache_key(word), context)
         if cached is not None:
             return cached
-            
+
+        # El modelo corrige la ventana entera; se alinea para sacar la palabra
+        prompt = build_prompt(word, context)
         try:
-            response = requests.post(
-                "https://api.together.xyz/inference",
-                headers={
-                    "Authorization": f"Bearer {self.config.get('api_key')}",
-                    "Content-Type": "application/json"
-                },
-                json={
-                    "model": "mistralai/Mixtral-8x7B-Instruct-v0.1",
-                    "prompt": f"Sistema: Eres un asistente que corrige texto a español correcto.\nUsuario: {context}",
-                    "temperature": 0.1,
-                    "max_tokens": 50,
-                    "stop": ["\n"]
-                },
-                timeout=10
-            )
-            
-            response.raise_for_status()
-            data = response.json()
-            
-            if 'output' not in data or 'choices' not in data['output']:
-                raise ValueError("Formato de respuesta inválido")
-                
-            correction = data['output']['choices'][0]['text'].strip()
-            was_corrected = correction != word
-            
-            self.cache.add(word, context, correction, was_corrected)
-            return correction, was_corrected
-            
+            response = self.local_server.generate(" ".join(prompt.window), prompt=prompt, timeout=10)
         except Exception as e:
-            logger.error(f"Error en corrección Mixtral: {e}")
+            logger.error(f"Error en corrección local: {e}")
             raise
-    
+        correction, was_corrected = extract_sentence_corrections(prompt.window, response)[prompt.target]
+
+        self.cache.add(self._cache_key(word), context, correction, was_corrected)
+        return correction, was_corrected
+
+    def _local_complete(self, prompt: CorrectionPrompt, max_tokens: int) -> str:
+        """Frase completa con el modelo local; devuelve el texto corregido."""
+        return self.local_server.generate(" ".join(prompt.window), prompt=prompt, timeout=10)
+
+    def correct_sentence(self, words: List[str]) -> List[Tuple[str, bool]]:
+        """
+        Corrige una frase completa con una sola llamada al proveedor.
+
+        Args:
+            words: Palabras de la frase, tal como se escribieron
+
+        Returns:
+            List[Tuple[str, bool]]: (corrección, si fue corregida) por palabra
+        """
+        complete_map = {
+            "OpenAI": self._openai_complete,
+            "Anthropic": self._anthropic_complete,
+            "Mixtral": self._mixtral_complete,
+            "Local": self._local_complete
+        }
+        complete = complete_map.get(self.service)
+        sentence = " ".join(words)
+        if complete is None or (self.service == "Local" and not self.local_server.ready.is_set()):
+            return [fallback_correction(word, sentence) for word in words]
+
+        # La frase corregida se guarda entera y se vuelve a alinear al leerla
+        cached = self.cache.get(self._cache_key(sentence), SENTENCE_CACHE_CONTEXT)
+        if cached is not None:
+            return extract_sentence_corrections(words, cached[0])
+
+        breaker = CircuitBreakerRegistry().get_breaker(self.service.lower())
+        if breaker.allow_request():
+            try:
+                prompt = build_sentence_prompt(words)
+                response = complete(prompt, sentence_max_tokens(words))
+                breaker.record_success()
+                results = extract_sentence_corrections(words, response)
+                self.cache.add(
+                    self._cache_key(sentence), SENTENCE_CACHE_CONTEXT, response,
+                    any(changed for _, changed in results)
+                )
+                return results
+            except Exception as e:
+                breaker.record_failure()
+                logger.error(f"Error en corrección de frase ({self.service}): {e}")
+
+        return [fallback_correction(word, sentence) for word in words]
+
     def fallback_correct(self, word: str, context: str) -> Tuple[str, bool]:
         """Corrección usando el sistema fallback local."""
         # Intentar obtener del caché primero
-        cached = self.cache.get(word, context)
+        cached = self.cache.get(self._cache_key(word), context)
         if cached is not None:
             return cached
         
@@ -306,7 +411,7 @@ class TextCorrector(ICorrector):
         
         # Guardar en caché si hubo corrección
         if was_corrected:
-            self.cache.add(word, context, correction, True)
+            self.cache.add(self._cache_key(word), context, correction, True)
         
         return correction, was_corrected
         
@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+"""
+Motor de inyección de texto para aplicar correcciones.
+
+Sustituye la palabra recién escrita (seguida de un espacio) por su corrección
+con una de varias estrategias, sin pausas entre eventos:
+
+- batched: flechas y suprimir en ráfaga, luego escribir la corrección
+- select: seleccionar la palabra con Mayús+flechas y escribir encima
+- clipboard: seleccionar y pegar desde el portapapeles, restaurándolo después
+- minimal: solo las pulsaciones del script de edición mínimo (edit_planner)
+
+El motor elige la estrategia permitida más rápida según el coste medido de
+cada una e informa del tiempo de inyección por corrección.
+"""
+
+import sys
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Dict, List, Optional, Sequence, Tuple
+from pynput.keyboard import Key, Controller
+from logger_manager import logger
+from edit_planner import plan_edit
+
+try:
+    import pyperclip
+except ImportError:  # El modo portapapeles es opcional
+    pyperclip = None
+
+BATCHED = "batched"
+SELECT = "select"
+CLIPBOARD = "clipboard"
+MINIMAL = "minimal"
+STRATEGIES = (BATCHED, SELECT, CLIPBOARD, MINIMAL)
+
+# Teclas de las operaciones del planificador de ediciones
+_EDIT_KEYS = {"left": Key.left, "right": Key.right, "backspace": Key.backspace}
+
+# Modificador de pegado según la plataforma
+PASTE_MODIFIER = Key.cmd if sys.platform == "darwin" else Key.ctrl
+
+# Evento de teclado: ("tap" | "press" | "release", tecla) o ("type", texto)
+KeyEvent = Tuple[str, object]
+
+@dataclass
+class InjectionResult:
+    """Resultado de aplicar una corrección."""
+    strategy: str
+    keystrokes: int
+    elapsed: float  # Segundos
+
+class TextInjector:
+    """
+    Motor de inyección de correcciones.
+
+    Características:
+    - Eventos sintéticos en ráfaga, sin sleeps
+    - Selección y sobrescritura en una sola secuencia
+    - Pegado con guardado y restauración del portapapeles
+    - Elección de la estrategia más rápida entre las permitidas
+    - Estadísticas de tiempo por estrategia
+    - Registro de las pulsaciones sintéticas para reconocerlas en el hook
+    """
+
+    def __init__(
+        self,
+        controller: Optional[Controller] = None,
+        strategies: Sequence[str] = STRATEGIES,
+        clipboard_min_length: int = 20,
+        restore_delay: float = 0.3
+    ):
+        """
+        Inicializa el motor.
+
+        Args:
+            controller: Controlador de teclado de pynput
+            strategies: Estrategias seguras en la aplicación actual (la
+                selección con Mayús o el pegado no funcionan en terminales)
+            clipboard_min_length: Longitud mínima de la corrección para pegar
+            restore_delay: Espera antes de restaurar el portapapeles
+        """
+        unknown = set(strategies) - set(STRATEGIES)
+        if unknown:
+            raise ValueError(f"Estrategias de inyección desconocidas: {unknown}")
+
+        self.keyboard = controller or Controller()
+        self.strategies = [
+            s for s in strategies if s != CLIPBOARD or pyperclip is not None
+        ]
+        if not self.strategies:
+            self.strategies = [BATCHED]
+        self.clipboard_min_length = clipboard_min_length
+        self.restore_delay = restore_delay
+        # Teclas sintéticas enviadas que el hook aún no ha visto, en orden
+        self.expected: Deque[object] = deque(maxlen=1024)
+        self._expected_lock = threading.Lock()
+
+        # Costes estimados (media móvil) para elegir estrategia
+        self.key_cost = 0.0005       # Segundos por pulsación sintética
+        self.clipboard_cost = 0.02   # Segundos fijos de copiar al portapapeles
+        self.stats: Dict[str, Dict[str, float]] = {
+            s: {'count': 0, 'total_time': 0.0, 'keystrokes': 0} for s in STRATEGIES
+        }
+        self._restore_lock = threading.Lock()
+
+    @staticmethod
+    def plan(strategy: str, original: str, correction: str, trailing: int = 1) -> List[KeyEvent]:
+        """
+        Construye la secuencia de eventos de una estrategia.
+
+        Se asume el cursor `trailing` caracteres después del final de la
+        palabra (por defecto, justo tras el espacio que la cerró) y se deja
+        en la misma posición relativa.
+
+        Args:
+            strategy: batched, select, clipboard o minimal
+            original: Palabra escrita
+            correction: Texto corregido
+            trailing: Caracteres escritos después de la palabra
+
+        Returns:
+            List[KeyEvent]: Eventos a enviar (el pegado se marca con "paste")
+        """
+        if strategy == MINIMAL:
+            events = []
+            for action, value in plan_edit(original, correction, trailing):
+                if action == "type":
+                    events.append(("type", value))
+                else:
+                    events += [("tap", _EDIT_KEYS[action])] * value
+            return events
+
+        if strategy == BATCHED:
+            events = [("tap", Key.left)] * (len(original) + trailing)
+            events += [("tap", Key.delete)] * len(original)
+            events.append(("type", correction))
+        else:
+            # Saltar lo escrito después y seleccionar la palabra hacia la izquierda
+            events = [("tap", Key.left)] * trailing + [("press", Key.shift)]
+            events += [("tap", Key.left)] * len(original)
+            events.append(("release", Key.shift))
+            if strategy == CLIPBOARD:
+                events.append(("paste", correction))
+            else:
+                events.append(("type", correction))
+        events += [("tap", Key.right)] * trailing
+        return events
+
+    @staticmethod
+    def count_keystrokes(events: List[KeyEvent]) -> int:
+        """Cuenta las pulsaciones de una secuencia (escribir = una por carácter)."""
+        total = 0
+        for action, value in events:
+            if action == "type":
+                total += len(value)
+            elif action in ("tap", "press"):
+                total += 1
+            elif action == "paste":
+                total += 2  # Modificador + V
+        return total
+
+    def choose(self, original: str, correction: str, trailing: int = 1) -> str:
+        """
+        Elige la estrategia permitida con menor coste estimado.
+
+        Args:
+            original: Palabra escrita
+            correction: Texto corregido
+            trailing: Caracteres escritos después de la palabra
+
+        Returns:
+            str: Estrategia elegida
+        """
+        best, best_cost = None, None
+        for strategy in self.strategies:
+            if strategy == CLIPBOARD and len(correction) < self.clipboard_min_length:
+                continue
+            keystrokes = self.count_keystrokes(
+                self.plan(strategy, original, correction, trailing)
+            )
+            cost = keystrokes * self.key_cost
+            if strategy == CLIPBOARD:
+                cost += self.clipboard_cost
+            if best_cost is None or cost < best_cost:
+                best, best_cost = strategy, cost
+        return best or self.strategies[0]
+
+    def inject(
+        self,
+        original: str,
+        correction: str,
+        strategy: Optional[str] = None,
+        trailing: int = 1
+    ) -> InjectionResult:
+        """
+        Sustituye la palabra escrita por su corrección.
+
+        Args:
+            original: Palabra escrita
+            correction: Texto corregido
+            strategy: Estrategia a usar (por defecto, la más rápida permitida)
+            trailing: Caracteres escritos después de la palabra
+
+        Returns:
+            InjectionResult: Estrategia, pulsaciones y tiempo empleado
+        """
+        strategy = strategy or self.choose(original, correction, trailing)
+        events = self.plan(strategy, original, correction, trailing)
+
+        start = time.perf_counter()
+        self._send(events)
+        elapsed = time.perf_counter() - start
+
+        keystrokes = self.count_keystrokes(events)
+        self._record(strategy, keystrokes, elapsed)
+        logger.debug(
+            f"Inyección {strategy}: {original} → {correction} "
+            f"({keystrokes} pulsaciones, {elapsed * 1000:.1f}ms)"
+        )
+        return InjectionResult(strategy, keystrokes, elapsed)
+
+    def consume(self, key) -> bool:
+        """
+        Reconoce una pulsación sintética propia recibida por el hook.
+
+        Para pynput sin la marca `injected`: las pulsaciones sintéticas
+        llegan en el orden en que se enviaron, así que una tecla es propia
+        si coincide con la siguiente esperada. Las teclas reales escritas
+        durante una inyección no coinciden y se procesan con normalidad.
+
+        Args:
+            key: Tecla recibida por on_press (Key o KeyCode)
+
+        Returns:
+            bool: True si la tecla es sintética (y se retira de las esperadas)
+        """
+        char = getattr(key, 'char', None)
+        with self._expected_lock:
+            if self.expected and self.expected[0] in (key, char):
+                self.expected.popleft()
+                return True
+            return False
+
+    def _expect(self, events: List[KeyEvent]):
+        """Registra las pulsaciones que el hook recibirá de una secuencia."""
+        keys: List[object] = []
+        for action, value in events:
+            if action in ("tap", "press"):
+                keys.append(value)
+            elif action == "type":
+                keys.extend(value)
+            elif action == "paste":
+                keys += [PASTE_MODIFIER, 'v']
+        with self._expected_lock:
+            self.expected.extend(keys)
+
+    def _send(self, events: List[KeyEvent]):
+        """Envía los eventos sin pausas entre ellos."""
+        # Antes de enviar: el hook puede recibirlos mientras tanto
+        self._expect(events)
+        keyboard = self.keyboard
+        for action, value in events:
+            if action == "tap":
+                keyboard.press(value)
+                keyboard.release(value)
+            elif action == "press":
+                keyboard.press(value)
+            elif action == "release":
+                keyboard.release(value)
+            elif action == "type":
+                keyboard.type(value)
+            elif action == "paste":
+                self._paste(value)
+
+    def _paste(self, text: str):
+        """Pega un texto conservando el contenido previo del portapapeles."""
+        with self._restore_lock:
+            try:
+                saved = pyperclip.paste()
+            except Exception:
+                saved = None
+            pyperclip.copy(text)
+
+        self.keyboard.press(PASTE_MODIFIER)
+        self.keyboard.press('v')
+        self.keyboard.release('v')
+        self.keyboard.release(PASTE_MODIFIER)
+
+        if saved is not None:
+            # Restaurar más tarde: la aplicación lee el portapapeles de forma asíncrona
+            timer = threading.Timer(self.restore_delay, self._restore, args=(text, saved))
+            timer.daemon = True
+            timer.start()
+
+    def _restore(self, pasted: str, saved: str):
+        """Restaura el portapapeles si nadie lo ha cambiado desde el pegado."""
+        with self._restore_lock:
+            try:
+                if pyperclip.paste() == pasted:
+                    pyperclip.copy(saved)
+            except Exception as e:
+                logger.error(f"Error restaurando el portapapeles: {e}")
+
+    def _record(self, strategy: str, keystrokes: int, elapsed: float):
+        """Actualiza las estadísticas y los costes estimados."""
+        stats = self.stats[strategy]
+        stats['count'] += 1
+        stats['total_time'] += elapsed
+        stats['keystrokes'] += keystrokes
+
+        if strategy == CLIPBOARD:
+            self.clipboard_cost = 0.8 * self.clipboard_cost + 0.2 * elapsed
+        elif keystrokes:
+            self.key_cost = 0.8 * self.key_cost + 0.2 * (elapsed / keystrokes)
+
+    def get_stats(self) -> Dict[str, Dict[str, float]]:
+        """Obtiene el tiempo medio de inyección por estrategia."""
+        return {
+            strategy: {
+                'corrections': stats['count'],
+                'avg_time_ms': stats['total_time'] / stats['count'] * 1000,
+                'avg_keystrokes': stats['keystrokes'] / stats['count']
+            }
+            for strategy, stats in self.stats.items()
+            if stats['count']
+        }
@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+Filtro de elegibilidad de tokens antes de la corrección.
+
+Decide en microsegundos si una palabra cerrada merece pasar por el
+procesador por lotes. URLs, correos, números, identificadores de código y
+palabras en otro idioma se descartan antes de ocupar un hueco en la cola o una
+llamada a la API. El orden de las comprobaciones prioriza el caso común: una
+palabra solo de letras pasa por un recorrido de clases de carácter y, si es
+desconocida, por un identificador de idioma de n-gramas de caracteres; las
+expresiones regulares compiladas solo se evalúan para los tokens con dígitos
+o símbolos.
+"""
+
+import math
+import os
+import re
+from collections import Counter
+from threading import Lock
+from typing import Dict, Iterable, Optional, Set
+from correction_rules import RULES
+from phonetic_index import DEFAULT_LEXICON, get_default_index
+from logger_manager import logger
+
+# Léxico inglés para el identificador de idioma
+ENGLISH_LEXICON = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    "resources",
+    "lexicon_en.txt"
+)
+
+# Motivos de descarte
+URL = "url"
+EMAIL = "email"
+NUMBER = "number"
+CODE = "code"
+FOREIGN = "foreign"
+SYMBOL = "symbol"
+REASONS = (URL, EMAIL, NUMBER, CODE, FOREIGN, SYMBOL)
+
+# Puntuación que puede rodear a una palabra sin cambiar su naturaleza
+_EDGE_PUNCT = "\"'«»“”‘’.,;:!?¡¿()[]"
+
+_URL_RE = re.compile(
+    r"^(?:[a-z][a-z0-9+.-]*://|www\.)\S+$"
+    r"|^(?:[\w-]+\.)+(?:com|org|net|edu|gov|io|dev|app|es|mx|ar|co|cl|pe|uk|de|fr|info)(?:[/:?#]\S*)?$",
+    re.IGNORECASE
+)
+_EMAIL_RE = re.compile(r"^[\w.+-]+@[\w-]+(?:\.[\w-]+)+$")
+_NUMBER_RE = re.compile(r"^[+\-±]?[€$£]?\d[\d.,:/\-]*(?:%|€|\$|º|ª|h|k|km|kg|cm|mm|ml|m|g|s|x)?$", re.IGNORECASE)
+# Palabras compuestas con guion o apóstrofo ("franco-alemán", "O'Neill")
+_COMPOUND_RE = re.compile(r"^[^\W\d_]+(?:[-'’][^\W\d_]+)+$")
+
+# Longitud mínima para aplicar el identificador de idioma
+MIN_LANGUAGE_LENGTH = 4
+
+class LanguageModel:
+    """
+    Identificador de idioma mínimo (español frente a inglés).
+
+    Modelo de trigramas de caracteres con suavizado aditivo entrenado con
+    los léxicos de cada idioma. La puntuación es la diferencia media de
+    log-probabilidad por trigrama, de modo que no depende de la longitud.
+    """
+
+    def __init__(self, spanish: Iterable[str], english: Iterable[str], alpha: float = 0.5):
+        """
+        Entrena el modelo.
+
+        Args:
+            spanish: Palabras en español
+            english: Palabras en inglés
+            alpha: Suavizado aditivo
+        """
+        self.spanish = self._train(spanish, alpha)
+        self.english = self._train(english, alpha)
+
+    @staticmethod
+    def _trigrams(word: str):
+        padded = f"^{word}$"
+        return [padded[i:i + 3] for i in range(len(padded) - 2)]
+
+    def _train(self, words: Iterable[str], alpha: float):
+        counts = Counter()
+        for word in words:
+            counts.update(self._trigrams(word.lower()))
+        total = sum(counts.values())
+        vocabulary = len(counts) + 1
+        denominator = total + alpha * vocabulary
+        table = {gram: math.log((count + alpha) / denominator) for gram, count in counts.items()}
+        return table, math.log(alpha / denominator)
+
+    def score(self, word: str) -> float:
+        """
+        Puntuación de idioma de una palabra.
+
+        Args:
+            word: Palabra en minúsculas
+
+        Returns:
+            float: Positiva si se parece más al inglés que al español
+        """
+        es_table, es_floor = self.spanish
+        en_table, en_floor = self.english
+        grams = self._trigrams(word)
+        total = 0.0
+        for gram in grams:
+            total += en_table.get(gram, en_floor) - es_table.get(gram, es_floor)
+        return total / len(grams)
+
+class TokenFilter:
+    """
+    Clasificador de tokens elegibles para corrección.
+
+    Características:
+    - Camino rápido para palabras solo de letras (recorrido de caracteres)
+    - Expresiones regulares compiladas para URLs, correos y números
+    - Detección de identificadores (camelCase, snake_case, símbolos)
+    - Identificación de idioma por trigramas de caracteres, sin descartar
+      los errores conocidos en español
+    - Contadores de descartes por motivo para la telemetría
+    """
+
+    def __init__(
+        self,
+        lexicon: Optional[Set[str]] = None,
+        language_model: Optional[LanguageModel] = None,
+        foreign_threshold: float = 1.0
+    ):
+        """
+        Inicializa el filtro.
+
+        Args:
+            lexicon: Palabras en español siempre elegibles
+            language_model: Identificador de idioma (None = sin filtro de idioma)
+            foreign_threshold: Puntuación a partir de la cual una palabra se
+                considera de otro idioma
+        """
+        self.lexicon = lexicon or set()
+        self.language_model = language_model
+        self.foreign_threshold = foreign_threshold
+        self.skipped: Counter = Counter()
+        self.checked = 0
+        self._reported: Counter = Counter()
+        self._lock = Lock()
+
+    @classmethod
+    def from_files(
+        cls,
+        spanish_path: str = DEFAULT_LEXICON,
+        english_path: str = ENGLISH_LEXICON,
+        **kwargs
+    ) -> "TokenFilter":
+        """
+        Construye el filtro a partir de los léxicos por defecto.
+
+        Args:
+            spanish_path: Léxico en español
+            english_path: Léxico en inglés
+
+        Returns:
+            TokenFilter: Filtro con identificador de idioma
+        """
+        spanish = _read_lexicon(spanish_path)
+        english = _read_lexicon(english_path)
+        model = LanguageModel(spanish, english) if spanish and english else None
+        logger.info(f"Filtro de tokens cargado: {len(spanish)} palabras es, {len(english)} en")
+        return cls(set(spanish), model, **kwargs)
+
+    def classify(self, token: str) -> Optional[str]:
+        """
+        Clasifica un token.
+
+        Args:
+            token: Palabra tal como se escribió
+
+        Returns:
+            Optional[str]: Motivo de descarte, o None si es elegible
+        """
+        core = token.strip(_EDGE_PUNCT)
+        if not core:
+            return SYMBOL
+
+        if core.isalpha():
+            # Mayúsculas internas ("iPhone", "getValue"): identificador
+            if len(core) > 1 and not core[1:].islower() and not core.isupper():
+                return CODE
+            return self._language(core.lower())
+
+        if "@" in core:
+            return EMAIL if _EMAIL_RE.match(core) else CODE
+        if _URL_RE.match(core):
+            return URL
+        if any(c.isdigit() for c in core):
+            return NUMBER if _NUMBER_RE.match(core) else CODE
+        if _COMPOUND_RE.match(core):
+            return None
+        return CODE
+
+    def _language(self, word: str) -> Optional[str]:
+        if (
+            self.language_model is None
+            or len(word) < MIN_LANGUAGE_LENGTH
+            or word in self.lexicon
+        ):
+            return None
+        if self.language_model.score(word) < self.foreign_threshold:
+            return None
+        # Un error conocido en español no es otro idioma ("aver" → "haber")
+        if RULES.lookup(word) is not None or get_default_index().best(word) is not None:
+            return None
+        return FOREIGN
+
+    def is_eligible(self, token: str) -> bool:
+        """
+        Indica si un token debe corregirse, contando los descartes.
+
+        Args:
+            token: Palabra tal como se escribió
+
+        Returns:
+            bool: True si el token debe pasar al corrector
+        """
+        reason = self.classify(token)
+        with self._lock:
+            self.checked += 1
+            if reason is not None:
+                self.skipped[reason] += 1
+        if reason is not None:
+            logger.debug(f"Token descartado ({reason}): {token}")
+        return reason is None
+
+    def take_skipped(self, reason: str) -> float:
+        """
+        Descartes de un motivo desde la última lectura.
+
+        Pensado como métrica personalizada de la telemetría, que lo llama una
+        vez por intervalo de recolección.
+        """
+        with self._lock:
+            value = self.skipped[reason] - self._reported[reason]
+            self._reported[reason] = self.skipped[reason]
+        return float(value)
+
+    def get_stats(self) -> Dict[str, int]:
+        """Obtiene los tokens revisados y los descartes por motivo."""
+        with self._lock:
+            return dict(self.skipped, checked=self.checked)
+
+def _read_lexicon(path: str):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return [
+                line.strip().lower() for line in f
+                if line.strip() and not line.startswith("#")
+            ]
+    except OSError as e:
+        logger.warning(f"No se pudo leer el léxico {path}: {e}")
+        return []
+
+def register_metrics(telemetry, token_filter: Optional["TokenFilter"] = None):
+    """
+    Registra los descartes por motivo como métricas de la telemetría.
+
+    Args:
+        telemetry: TelemetrySystem donde registrar las métricas
+        token_filter: Filtro a observar (por defecto, el compartido)
+    """
+    from telemetry_system import MetricConfig
+
+    token_filter = token_filter or get_default_filter()
+    for reason in REASONS:
+        name = f"skipped_tokens_{reason}"
+        telemetry.add_collector(MetricConfig(
+            name=name,
+            description=f"Tokens descartados antes de corregir ({reason})",
+            unit="tokens/intervalo",
+            aggregation="sum"
+        ))
+        telemetry.register_custom_metric(
+            name, lambda reason=reason: token_filter.take_skipped(reason)
+        )
+
+_default_filter: Optional[TokenFilter] = None
+_default_lock = Lock()
+
+def get_default_filter() -> TokenFilter:
+    """
+    Obtiene el filtro construido con los léxicos por defecto.
+    Se carga una sola vez, bajo demanda.
+
+    Returns:
+        TokenFilter: Filtro compartido
+    """
+    global _default_filter
+    if _default_filter is None:
+        with _default_lock:
+            if _default_filter is None:
+                _default_filter = TokenFilter.from_files()
+    return _default_filter
@@ -0,0 +1,425 @@
+#!/usr/bin/env python3
+"""
+Grabación y reproducción determinista de pulsaciones.
+
+- TraceRecorder captura del KeyboardListener la secuencia de pulsaciones con
+  sus tiempos, anonimizada: solo se conserva la clase de cada carácter
+  (minúscula, mayúscula, dígito o signo), la longitud de las palabras y las
+  teclas especiales.
+- replay_trace reproduce una traza en el KeyboardListener (con el Controller
+  simulado) a 1x, 10x o velocidad máxima contra un corrector sustituto, e
+  informa de la latencia pulsación → corrección, las correcciones perdidas y
+  el coste de CPU por pulsación.
+"""
+
+import argparse
+import json
+import random
+import statistics
+import threading
+import time
+import zlib
+from dataclasses import dataclass, asdict
+from typing import Dict, List, Optional, Tuple
+from interfaces import ICorrector
+from keystroke_pipeline import EV_ENTER, EV_SPACE, KeystrokePipeline
+from logger_manager import logger
+
+TRACE_VERSION = 1
+
+def anonymize(code: int) -> int:
+    """
+    Reduce un código de pulsación a su clase de carácter.
+
+    Args:
+        code: Código de carácter (>= 0) o evento especial (EV_*)
+
+    Returns:
+        int: Código anonimizado
+    """
+    if code < 0:
+        return code
+    char = chr(code)
+    if char.isalpha():
+        return ord("A") if char.isupper() else ord("a")
+    if char.isdigit():
+        return ord("0")
+    if char.isspace():
+        return code
+    return ord(".")
+
+@dataclass
+class KeystrokeTrace:
+    """Secuencia de pulsaciones: (segundos desde la anterior, código)."""
+    events: List[Tuple[float, int]]
+
+    def __len__(self) -> int:
+        return len(self.events)
+
+    @property
+    def duration(self) -> float:
+        return sum(delay for delay, _ in self.events)
+
+    def save(self, path: str):
+        """Guarda la traza en JSON."""
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({
+                "version": TRACE_VERSION,
+                "events": [[round(delay, 6), code] for delay, code in self.events]
+            }, f)
+
+    @classmethod
+    def load(cls, path: str) -> "KeystrokeTrace":
+        """
+        Carga una traza guardada.
+
+        Raises:
+            ValueError: Si la versión del archivo no es compatible
+        """
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("version") != TRACE_VERSION:
+            raise ValueError(f"Versión de traza no soportada: {data.get('version')}")
+        return cls([(float(delay), int(code)) for delay, code in data["events"]])
+
+    @classmethod
+    def from_text(
+        cls,
+        text: str,
+        keys_per_second: float = 6.0,
+        jitter: float = 0.3,
+        seed: int = 0
+    ) -> "KeystrokeTrace":
+        """
+        Sintetiza una traza anonimizada a partir de un texto.
+
+        Args:
+            text: Texto a "escribir"
+            keys_per_second: Velocidad media de escritura
+            jitter: Variación relativa de los intervalos
+            seed: Semilla para que la traza sea reproducible
+        """
+        rng = random.Random(seed)
+        interval = 1.0 / keys_per_second
+        events = []
+        for char in text:
+            if char == " ":
+                code = EV_SPACE
+            elif char == "\n":
+                code = EV_ENTER
+            else:
+                code = anonymize(ord(char))
+            delay = max(0.0, rng.gauss(interval, interval * jitter))
+            events.append((delay, code))
+        return cls(events)
+
+class TraceRecorder:
+    """
+    Grabador de pulsaciones.
+
+    Se engancha al manejador del canal de pulsaciones, de modo que graba en
+    el hilo consumidor con el tiempo medido en el hook y no añade trabajo al
+    callback del teclado.
+    """
+
+    def __init__(self):
+        self.events: List[Tuple[float, int]] = []
+        self._last: Optional[float] = None
+        self._pipeline: Optional[KeystrokePipeline] = None
+        self._handler = None
+
+    def attach(self, pipeline: KeystrokePipeline):
+        """Empieza a grabar las pulsaciones de un canal."""
+        self._pipeline = pipeline
+        self._handler = pipeline.handler
+
+        def handler(code: int, timestamp: float):
+            self.record(code, timestamp)
+            self._handler(code, timestamp)
+
+        pipeline.handler = handler
+
+    def detach(self):
+        """Deja de grabar y restaura el manejador original."""
+        if self._pipeline is not None:
+            self._pipeline.handler = self._handler
+            self._pipeline = None
+
+    def record(self, code: int, timestamp: float):
+        """Añade una pulsación anonimizada."""
+        delay = 0.0 if self._last is None else timestamp - self._last
+        self._last = timestamp
+        self.events.append((delay, anonymize(code)))
+
+    def trace(self) -> KeystrokeTrace:
+        """Retorna la traza grabada."""
+        return KeystrokeTrace(list(self.events))
+
+class SimulatedCorrector(ICorrector):
+    """
+    Corrector sustituto determinista.
+
+    Corrige una fracción fija de las palabras tras una latencia simulada. La
+    decisión depende solo de la palabra, su contexto y la semilla (no del
+    orden de llegada), y expone su propio procesador por lotes como
+    TextCorrector.
+    """
+
+    def __init__(self, correction_rate: float = 0.2, latency: float = 0.005, seed: int = 0):
+        from batch_processor import BatchProcessor
+
+        self.correction_rate = correction_rate
+        self.latency = latency
+        self.seed = seed
+        self.calls = 0
+        self.batch_processor = BatchProcessor(self)
+
+    def correct_text(self, word: str, context: str) -> Tuple[str, bool]:
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        return self._decide(word, context)
+
+    def correct_sentence(self, words: List[str]) -> List[Tuple[str, bool]]:
+        """Corrige una frase entera con una sola llamada simulada."""
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        context = " ".join(words)
+        return [self._decide(word, context) for word in words]
+
+    def _decide(self, word: str, context: str) -> Tuple[str, bool]:
+        digest = zlib.crc32(f"{self.seed}:{context}:{word}".encode("utf-8"))
+        if digest / 0xFFFFFFFF < self.correction_rate:
+            return word + "a", True
+        return word, False
+
+    def test_connection(self) -> bool:
+        return True
+
+@dataclass
+class ReplayReport:
+    """Resultados de una reproducción."""
+    speed: str
+    keystrokes: int
+    words: int
+    provider_calls: int
+    corrections: int
+    applied: int
+    dropped: int
+    ignored_keystrokes: int
+    latency_p50_ms: float
+    latency_p90_ms: float
+    latency_p99_ms: float
+    cpu_per_keystroke_us: float
+    wall_time: float
+
+def _percentile(values: List[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+def replay_trace(
+    trace: KeystrokeTrace,
+    speed: Optional[float] = 1.0,
+    correction_rate: float = 0.2,
+    corrector_latency: float = 0.005,
+    seed: int = 0,
+    settle: float = 3.0,
+    sentence_mode: bool = False
+) -> ReplayReport:
+    """
+    Reproduce una traza en un KeyboardListener con el teclado simulado.
+
+    Args:
+        trace: Traza a reproducir
+        speed: Factor de velocidad (None = tan rápido como sea posible)
+        correction_rate: Fracción de palabras que corrige el sustituto
+        corrector_latency: Latencia simulada por palabra del sustituto
+        seed: Semilla del corrector sustituto
+        settle: Espera máxima final para las correcciones en curso
+        sentence_mode: Reproducir con el modo frase del monitor
+
+    Returns:
+        ReplayReport: Latencias, correcciones perdidas y CPU por pulsación
+    """
+    from unittest.mock import MagicMock, patch
+    from pynput.keyboard import KeyCode
+    from keyboardlistener import KeyboardListener, OptimizedBuffer
+
+    corrector = SimulatedCorrector(correction_rate, corrector_latency, seed)
+    with patch('keyboardlistener.Controller', return_value=MagicMock()):
+        listener = KeyboardListener(
+            corrector, OptimizedBuffer(), MagicMock(), sentence_mode=sentence_mode
+        )
+
+    special_keys = {code: key for key, code in KeyboardListener.SPECIAL_KEYS.items()}
+    keys = [
+        special_keys.get(code) if code < 0 else KeyCode.from_char(chr(code))
+        for _, code in trace.events
+    ]
+
+    # Instrumentar: pulsación que cierra la palabra → ticket → aplicación
+    issued: Dict[int, float] = {}
+    latencies: List[float] = []
+    last_key = [0.0]
+    handler = listener.pipeline.handler
+
+    def timed_handler(code: int, timestamp: float):
+        last_key[0] = timestamp
+        handler(code, timestamp)
+
+    issue, applied = listener.tickets.issue, listener.tickets.applied
+
+    def timed_issue(word: str, trailing: int = 1):
+        ticket = issue(word, trailing)
+        issued[ticket.id] = last_key[0]
+        return ticket
+
+    def timed_applied(ticket, correction: str):
+        applied(ticket, correction)
+        latencies.append(time.perf_counter() - issued.pop(ticket.id, time.perf_counter()))
+
+    delivered = [0]
+    correction_callback = listener.correction_callback
+
+    def counted_callback(ticket, correction: str, was_corrected: bool):
+        if was_corrected:
+            delivered[0] += 1
+        correction_callback(ticket, correction, was_corrected)
+
+    listener.pipeline.handler = timed_handler
+    listener.tickets.issue = timed_issue
+    listener.tickets.applied = timed_applied
+    listener.correction_callback = counted_callback
+
+    cpu_start = time.process_time()
+    start = time.perf_counter()
+    try:
+        scheduled = 0.0
+        for (delay, _), key in zip(trace.events, keys):
+            if speed:
+                scheduled += delay / speed
+                wait = start + scheduled - time.perf_counter()
+                if wait > 0:
+                    time.sleep(wait)
+            if key is not None:
+                listener.on_press(key)
+
+        # Esperar a que terminen las correcciones en curso
+        listener.pipeline.drain(timeout=settle)
+        deadline = time.perf_counter() + settle
+        while time.perf_counter() < deadline and (
+            corrector.batch_processor.get_stats()['pending_tasks']
+            or len(listener.tickets) or listener.ready or listener.sentence
+        ):
+            time.sleep(0.01)
+        wall_time = time.perf_counter() - start
+        cpu = time.process_time() - cpu_start
+    finally:
+        listener.stop()
+        corrector.batch_processor.stop()
+
+    report = ReplayReport(
+        speed=f"{speed:g}x" if speed else "max",
+        keystrokes=len(trace),
+        words=listener.total_words,
+        provider_calls=corrector.calls,
+        corrections=delivered[0],
+        applied=len(latencies),
+        dropped=delivered[0] - len(latencies),
+        ignored_keystrokes=listener.ignored_keys + listener.pipeline.ring.dropped,
+        latency_p50_ms=_percentile(latencies, 0.5) * 1000,
+        latency_p90_ms=_percentile(latencies, 0.9) * 1000,
+        latency_p99_ms=_percentile(latencies, 0.99) * 1000,
+        cpu_per_keystroke_us=cpu / max(1, len(trace)) * 1e6,
+        wall_time=wall_time
+    )
+    logger.info(f"Reproducción {report.speed}: {asdict(report)}")
+    return report
+
+def print_report(report: ReplayReport):
+    """Muestra un informe de reproducción."""
+    print(f"\n--- Velocidad {report.speed} ---")
+    print(f"Pulsaciones: {report.keystrokes} ({report.words} palabras) en {report.wall_time:.2f}s")
+    print(
+        f"Llamadas al corrector: {report.provider_calls} "
+        f"({report.provider_calls / max(1, report.words):.2f} por palabra)"
+    )
+    print(f"Correcciones: {report.applied}/{report.corrections} aplicadas, {report.dropped} perdidas")
+    print(f"Pulsaciones ignoradas: {report.ignored_keystrokes}")
+    print(
+        f"Latencia pulsación → corrección: p50 {report.latency_p50_ms:.1f}ms, "
+        f"p90 {report.latency_p90_ms:.1f}ms, p99 {report.latency_p99_ms:.1f}ms"
+    )
+    print(f"CPU por pulsación: {report.cpu_per_keystroke_us:.1f}µs")
+
+def record(output: str):
+    """Graba las pulsaciones reales hasta Ctrl+C."""
+    from keyboardlistener import create_listener
+
+    listener = create_listener()
+    recorder = TraceRecorder()
+    recorder.attach(listener.pipeline)
+    print("Grabando pulsaciones (anonimizadas). Ctrl+C para terminar...")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        recorder.detach()
+        listener.stop()
+
+    trace = recorder.trace()
+    trace.save(output)
+    print(f"Traza guardada en {output}: {len(trace)} pulsaciones, {trace.duration:.1f}s")
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Graba y reproduce trazas de pulsaciones de teclado"
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    record_parser = subparsers.add_parser("record", help="Grabar pulsaciones reales")
+    record_parser.add_argument("-o", "--output", default="trace.json", help="Archivo de salida")
+
+    replay_parser = subparsers.add_parser("replay", help="Reproducir una traza")
+    replay_parser.add_argument("trace", nargs="?", help="Archivo de traza (por defecto, una sintética)")
+    replay_parser.add_argument(
+        "--speed",
+        nargs="+",
+        default=["1", "10", "max"],
+        help="Velocidades de reproducción (factor o 'max')"
+    )
+    replay_parser.add_argument("--rate", type=float, default=0.2, help="Fracción de palabras corregidas")
+    replay_parser.add_argument("--latency", type=float, default=0.005, help="Latencia del corrector (s)")
+    replay_parser.add_argument("--seed", type=int, default=0, help="Semilla del corrector")
+    replay_parser.add_argument("--sentence", action="store_true", help="Usar el modo frase")
+
+    args = parser.parse_args()
+
+    if args.command == "record":
+        record(args.output)
+        return
+
+    if args.trace:
+        trace = KeystrokeTrace.load(args.trace)
+    else:
+        from generate_test_data import generate_load_test_data
+        text = ". ".join(s["input"] for s in generate_load_test_data(20)) + ". "
+        trace = KeystrokeTrace.from_text(text, seed=args.seed)
+
+    for speed in args.speed:
+        report = replay_trace(
+            trace,
+            speed=None if speed == "max" else float(speed),
+            correction_rate=args.rate,
+            corrector_latency=args.latency,
+            seed=args.seed,
+            sentence_mode=args.sentence
+        )
+        print_report(report)
+
+if __name__ == "__main__":
+    main()